@@ -0,0 +1,80 @@
+######################################################################
+#                           CONFIG CORPUS                            #
+######################################################################
+
+import hashlib
+import random
+import string
+from config_parser import CHECKSUM_END, CHECKSUM_START
+
+SECTIONS = ['Packages', 'Pip-Packages', 'Node-Packages', 'Editor-Extensions']
+
+# Characters which mean something to the parser, mutations favour them
+SPECIAL = ['[', ']', '=>', ':', '#', '"', '\n', '\r\n', ' ', '\t', '<electric>', '\ufeff']
+
+
+def name(rng: random.Random) -> str:
+    return ''.join(rng.choice(string.ascii_lowercase + '-') for _ in range(rng.randint(3, 16))).strip('-') or 'package'
+
+
+def version(rng: random.Random) -> str:
+    return '.'.join(str(rng.randint(0, 30)) for _ in range(3))
+
+
+def generate_config(entries: int, seed: int = 0, signed: bool = False, newline: str = '\n') -> bytes:
+    """
+    Generates a valid .electric configuration, entries are spread over every section which takes packages
+
+    #### Arguments
+        entries (int): Number of packages and extensions in the configuration
+        seed (int): Seed the names and versions are generated from
+        signed (bool): Append a checksum like `electric sign` does
+        newline (str): Line ending of the configuration
+
+    Returns:
+        bytes: Contents of the configuration
+    """
+    rng = random.Random(seed)
+    lines = [
+        '[ Info ]',
+        '# Generated configuration',
+        'Publisher => "electric"',
+        'Description => "Benchmark Configuration"',
+        '',
+    ]
+    for index, section in enumerate(SECTIONS):
+        lines.append(f'[ {section} ]')
+        for _ in range(entries // len(SECTIONS) + (index < entries % len(SECTIONS))):
+            if rng.random() < 0.5:
+                lines.append(name(rng))
+            else:
+                lines.append(f'{name(rng)} => "{version(rng)}"')
+        lines.append('')
+    lines += ['[ Editor-Configuration ]', 'Editor => "Visual Studio Code"']
+
+    content = newline.join(lines).encode()
+    if signed:
+        content += (newline + newline.join([
+            CHECKSUM_START,
+            f'# {hashlib.md5(content).hexdigest()}',
+            f'# {hashlib.sha256(content).hexdigest()}',
+            CHECKSUM_END,
+        ])).encode()
+    return content
+
+
+def mutate(content: bytes, rng: random.Random, mutations: int = 3) -> bytes:
+    """
+    Randomly inserts, deletes or replaces parts of a configuration
+    """
+    data = bytearray(content)
+    for _ in range(mutations):
+        position = rng.randint(0, len(data))
+        action = rng.random()
+        if action < 0.4:
+            data[position:position] = rng.choice(SPECIAL).encode()
+        elif action < 0.7:
+            del data[position:position + rng.randint(1, 8)]
+        else:
+            data[position:position + 1] = bytes([rng.randint(0, 255)])
+    return bytes(data)
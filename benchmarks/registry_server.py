@@ -0,0 +1,212 @@
+######################################################################
+#                          BENCHMARK SERVER                          #
+######################################################################
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+import hashlib
+import io
+import json
+import random
+import re
+import time
+import zipfile
+
+
+WORDS = ['sublime', 'text', 'visual', 'studio', 'code', 'node', 'python', 'git', 'atom', 'vlc', 'zoom',
+         'android', 'docker', 'firefox', 'chrome', 'discord', 'slack', 'notepad', 'plus', 'go', 'rust', 'java']
+
+
+def generate_names(count: int, seed: int = 0) -> list:
+    """
+    Generates unique package names that look like the ones in the registry
+
+    #### Arguments
+        count (int): Number of names
+        seed (int): Seed so every run serves the same registry
+
+    Returns:
+        list: Package names
+    """
+    rng = random.Random(seed)
+    names = []
+    while len(names) < count:
+        name = '-'.join(rng.sample(WORDS, rng.randint(1, 3)))
+        if name not in names:
+            names.append(name)
+    return names
+
+
+def generate_blob(size: int, seed: int = 0) -> bytes:
+    """
+    Generates an incompressible installer of a given size
+    """
+    return random.Random(seed).randbytes(size)
+
+
+def generate_archive(files: int, file_size: int, seed: int = 0) -> bytes:
+    """
+    Generates a zip archive like the ones portable packages ship
+    """
+    rng = random.Random(seed)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for index in range(files):
+            # Half random, half repeated so the archive compresses like real binaries
+            data = rng.randbytes(file_size // 2) + bytes(file_size - file_size // 2)
+            zf.writestr(f'bin/file-{index}.dll', data)
+    return buffer.getvalue()
+
+
+class Registry:
+    """
+    Synthetic package registry and CDN, every file it serves is kept in memory
+    """
+
+    def __init__(self, packages: int = 200, blob_size: int = 8 * 1024 * 1024, archive_files: int = 200, archive_file_size: int = 64 * 1024):
+        self.names = generate_names(packages)
+        self.files = {}
+        self.checksums = {}
+
+        self.files['/package-list.json'] = json.dumps({'packages': self.names}).encode()
+
+        for index, name in enumerate(self.names[:20]):
+            blob = generate_blob(blob_size, seed=index)
+            self.files[f'/blobs/{name}.exe'] = blob
+            self.checksums[name] = hashlib.sha256(blob).hexdigest().upper()
+
+        self.files['/blobs/portable.zip'] = generate_archive(archive_files, archive_file_size)
+
+        for name in self.names:
+            self.files[f'/packages/{name}.json'] = json.dumps(self.manifest(name)).encode()
+
+        self.files['/bundles/benchmark.json'] = json.dumps({
+            'display-name': 'Benchmark',
+            'dependencies': self.names[:10],
+        }).encode()
+
+    def manifest(self, name: str) -> dict:
+        version = '1.0.0'
+        return {
+            'package-name': name,
+            'display-name': name.replace('-', ' ').title(),
+            'latest-version': version,
+            version: {
+                'url': f'<registry>/blobs/{name}.exe',
+                'file-type': '.exe',
+                'custom-location': '/D=',
+                'install-switches': ['/S'],
+                'uninstall-switches': ['/S'],
+                'dependencies': None,
+                'checksum': self.checksums.get(name),
+            },
+        }
+
+
+class RegistryHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *_):
+        pass
+
+    def do_HEAD(self):
+        self.respond(body=False)
+
+    def do_GET(self):
+        self.respond(body=True)
+
+    def respond(self, body: bool):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+
+        data = server.registry.files.get(self.path.split('?')[0])
+        if data is None:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        data = data.replace(b'<registry>', server.url.encode()) if self.path.endswith('.json') else data
+        start, end = 0, len(data) - 1
+        status = 200
+
+        requested = self.headers.get('Range')
+        if requested and server.ranges:
+            match = re.fullmatch(r'bytes=(\d*)-(\d*)', requested.strip())
+            if not match or (not match.group(1) and not match.group(2)):
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            if match.group(1):
+                start = int(match.group(1))
+                end = min(int(match.group(2)), end) if match.group(2) else end
+            else:
+                # Suffix range, the last n bytes of the file
+                start = max(len(data) - int(match.group(2)), 0)
+            if start > end:
+                self.send_response(416)
+                self.send_header('Content-Range', f'bytes */{len(data)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            status = 206
+
+        self.send_response(status)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Content-Type', 'application/json' if self.path.endswith('.json') else 'application/octet-stream')
+        if server.ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(data)}')
+        self.end_headers()
+
+        if body:
+            self.send_body(memoryview(data)[start:end + 1])
+
+    def send_body(self, data: memoryview):
+        bandwidth = self.server.bandwidth
+        chunk = 64 * 1024
+        try:
+            for offset in range(0, len(data), chunk):
+                piece = data[offset:offset + chunk]
+                self.wfile.write(piece)
+                if bandwidth:
+                    time.sleep(len(piece) / bandwidth)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class RegistryServer(ThreadingHTTPServer):
+    """
+    Serves a synthetic registry on localhost with a configurable latency, bandwidth and Range support
+
+    #### Arguments
+        registry (Registry): Files to serve
+        latency (float): Seconds to wait before answering each request
+        bandwidth (int): Bytes per second each response is limited to, None for unlimited
+        ranges (bool): Whether Range requests are honoured
+    """
+    daemon_threads = True
+
+    def __init__(self, registry: Registry, latency: float = 0, bandwidth: int = None, ranges: bool = True):
+        super().__init__(('127.0.0.1', 0), RegistryHandler)
+        self.registry = registry
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.ranges = ranges
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def start(self):
+        self.thread = Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
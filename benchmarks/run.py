@@ -0,0 +1,289 @@
+######################################################################
+#                          BENCHMARK RUNNER                          #
+######################################################################
+
+from contextlib import redirect_stdout
+from time import perf_counter
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import click
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCHMARKS), 'src'))
+sys.path.insert(0, BENCHMARKS)
+
+from registry_server import Registry, RegistryServer  # noqa: E402
+
+
+cases = {}
+
+
+def case(name: str):
+    """
+    Registers a benchmark, the function prepares a run and returns the callable to time with the number of bytes it processes
+    """
+    def decorator(function):
+        cases[name] = function
+        return function
+    return decorator
+
+
+class Context:
+    def __init__(self, registry: Registry, server: RegistryServer, directory: str):
+        self.registry = registry
+        self.server = server
+        self.directory = directory
+        self.runs = 0
+
+    def unique(self, name: str) -> str:
+        self.runs += 1
+        return f'{name}-{self.runs}'
+
+    def metadata(self):
+        from Classes.Metadata import Metadata
+        from Classes.Setting import Setting
+
+        settings = Setting({}, 'default', False, False, False, '', False, False, True, False)
+        return Metadata(True, True, True, True, False, False, None, False, False, -1, settings, False)
+
+    def blob(self, name: str) -> str:
+        """
+        Writes an installer served by the registry to disk once and returns its path
+        """
+        path = os.path.join(self.directory, f'{name}.exe')
+        if not os.path.isfile(path):
+            with open(path, 'wb') as f:
+                f.write(self.registry.files[f'/blobs/{name}.exe'])
+        return path
+
+
+@case('manifest-resolution')
+def manifest_resolution(context: Context):
+    import utils
+
+    names = context.registry.names[:20]
+
+    def run():
+        for name in names:
+            utils.send_req_package(name)
+
+    return run, sum(len(context.registry.files[f'/packages/{name}.json']) for name in names)
+
+
+@case('package-list')
+def package_list(context: Context):
+    import utils
+
+    return lambda: utils.get_correct_package_names(all=True), len(context.registry.files['/package-list.json'])
+
+
+@case('autocorrect')
+def autocorrect(context: Context):
+    import utils
+
+    # Drop a character from each name so every lookup needs a correction
+    names = context.registry.names
+    misspelled = [name[:-1] for name in names[:20]]
+    metadata = context.metadata()
+
+    return lambda: utils.get_autocorrections(misspelled, names, metadata), None
+
+
+@case('download-single')
+def download_single(context: Context):
+    import utils
+
+    name = context.registry.names[0]
+    url = f'{context.server.url}/blobs/{name}.exe'
+    metadata = context.metadata()
+    unique = context.unique(name)
+
+    return lambda: utils.download(url, unique, metadata, '.exe'), len(context.registry.files[f'/blobs/{name}.exe'])
+
+
+@case('download-concurrent')
+def download_concurrent(context: Context):
+    from Classes.Download import Download
+    from Classes.ThreadedInstaller import ThreadedInstaller, get_executor
+
+    names = context.registry.names[:8]
+    installer = ThreadedInstaller([], context.metadata())
+    downloads = [Download(f'{context.server.url}/blobs/{name}.exe', '.exe', context.unique(name), name, None)
+                 for name in names]
+
+    def run():
+        for future in [get_executor().submit(installer.download, download) for download in downloads]:
+            future.result()
+
+    return run, sum(len(context.registry.files[f'/blobs/{name}.exe']) for name in names)
+
+
+@case('checksum')
+def checksum(context: Context):
+    import utils
+
+    name = context.registry.names[0]
+    path = context.blob(name)
+    metadata = context.metadata()
+
+    return lambda: utils.verify_checksum(path, context.registry.checksums[name], False, metadata), os.path.getsize(path)
+
+
+@case('extract')
+def extract(context: Context):
+    from zip_utils import unzip_file
+
+    # unzip_file removes the archive once it is extracted, so every run gets a copy
+    name = context.unique('portable')
+    path = os.path.join(context.directory, f'{name}.zip')
+    with open(path, 'wb') as f:
+        f.write(context.registry.files['/blobs/portable.zip'])
+
+    return lambda: unzip_file(path, os.path.join(context.directory, name), '.zip', context.metadata()), os.path.getsize(path)
+
+
+@case('extract-parallel')
+def extract_parallel(context: Context):
+    from zip_extract import extract_zip
+
+    path = os.path.join(context.directory, 'portable.zip')
+    if not os.path.isfile(path):
+        with open(path, 'wb') as f:
+            f.write(context.registry.files['/blobs/portable.zip'])
+    destination = os.path.join(context.directory, context.unique('portable'))
+
+    return lambda: extract_zip(path, destination), os.path.getsize(path)
+
+
+@case('extract-stream')
+def extract_stream(context: Context):
+    from zip_stream import stream_archive
+
+    url = f'{context.server.url}/blobs/portable.zip'
+    destination = os.path.join(context.directory, context.unique('portable'))
+
+    return lambda: stream_archive(url, '.zip', destination), len(context.registry.files['/blobs/portable.zip'])
+
+
+@case('config-parse')
+def config_parse(context: Context):
+    from config_parser import parse_file
+    from corpus import generate_config
+
+    path = os.path.join(context.directory, 'benchmark.electric')
+    if not os.path.isfile(path):
+        with open(path, 'wb') as f:
+            f.write(generate_config(50000, signed=True))
+
+    return lambda: parse_file(path).verify(), os.path.getsize(path)
+
+
+def run_case(name: str, context: Context, repeat: int) -> dict:
+    """
+    Times a benchmark, each repetition is prepared separately so only the measured call is timed
+
+    Returns:
+        dict: Timings of the benchmark, or why it was skipped or failed
+    """
+    result = {'name': name, 'status': 'ok'}
+    timings = []
+    processed = None
+
+    with open(os.devnull, 'w') as devnull:
+        for _ in range(repeat):
+            try:
+                function, processed = cases[name](context)
+                with redirect_stdout(devnull):
+                    start = perf_counter()
+                    function()
+                    timings.append(perf_counter() - start)
+            except ImportError as err:
+                # Cases built on Windows only modules can't run elsewhere
+                return {**result, 'status': 'skipped', 'reason': str(err)}
+            except (Exception, SystemExit) as err:
+                return {**result, 'status': 'failed', 'reason': f'{type(err).__name__}: {err}'}
+
+    result.update({
+        'runs': timings,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.mean(timings),
+        'bytes': processed,
+        'throughput': processed / statistics.median(timings) if processed else None,
+    })
+    return result
+
+
+@click.command()
+@click.option('--output', '-o', 'output', type=click.Path(dir_okay=False), help='Write the results as json to a file instead of stdout')
+@click.option('--repeat', '-r', default=5, show_default=True, help='Number of timed runs of each benchmark')
+@click.option('--case', '-c', 'selected', multiple=True, type=click.Choice(list(cases)), help='Only run these benchmarks')
+@click.option('--latency', default=0.0, show_default=True, help='Milliseconds the registry waits before answering a request')
+@click.option('--bandwidth', default=0.0, show_default=True, help='Megabytes per second each response is limited to, 0 for unlimited')
+@click.option('--blob-size', default=8.0, show_default=True, help='Size of each installer in megabytes')
+@click.option('--packages', default=200, show_default=True, help='Number of packages in the registry')
+@click.option('--no-ranges', is_flag=True, help='Ignore Range requests like a server without resume support')
+def main(output: str, repeat: int, selected: tuple, latency: float, bandwidth: float, blob_size: float, packages: int, no_ranges: bool):
+    '''
+    Benchmarks electric against a synthetic registry served from localhost
+    '''
+    config = {
+        'repeat': repeat,
+        'latency_ms': latency,
+        'bandwidth_mbps': bandwidth,
+        'blob_size_mb': blob_size,
+        'packages': packages,
+        'ranges': not no_ranges,
+    }
+
+    registry = Registry(packages=packages, blob_size=int(blob_size * 1000000))
+    server = RegistryServer(registry, latency=latency / 1000,
+                            bandwidth=int(bandwidth * 1000000) or None, ranges=not no_ranges)
+    server.start()
+
+    # Electric reads the registry url and appdata / temp directories when its
+    # modules are imported, so everything is pointed at the sandbox beforehand
+    directory = tempfile.mkdtemp(prefix='electric-benchmark-')
+    os.environ['ELECTRIC_REGISTRY'] = server.url
+    os.environ['APPDATA'] = os.path.join(directory, 'appdata')
+    os.makedirs(os.environ['APPDATA'])
+    for variable in ['TEMP', 'TMP', 'TMPDIR']:
+        os.environ[variable] = os.path.join(directory, 'temp')
+    os.makedirs(os.environ['TEMP'])
+    tempfile.tempdir = None
+
+    from info import __version__
+
+    cwd = os.getcwd()
+    try:
+        results = []
+        for name in selected or cases:
+            click.echo(f'Running {name}...', err=True)
+            results.append(run_case(name, Context(registry, server, directory), repeat))
+    finally:
+        os.chdir(cwd)
+        server.stop()
+        shutil.rmtree(directory, ignore_errors=True)
+
+    report = json.dumps({
+        'electric': __version__,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'results': results,
+    }, indent=4)
+
+    if output:
+        with open(output, 'w') as f:
+            f.write(report)
+    else:
+        click.echo(report)
+
+
+if __name__ == '__main__':
+    main()  # pylint: disable=no-value-for-parameter
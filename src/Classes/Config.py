@@ -1,5 +1,4 @@
-from utils import confirm, find_existing_installation, copy_to_clipboard, is_admin, get_install_flags
-from tempfile import gettempdir
+from utils import confirm, find_existing_installation, copy_to_clipboard, is_admin
 from sys import platform
 from subprocess import Popen, PIPE
 from Classes.PathManager import PathManager
@@ -7,44 +6,13 @@ from Classes.Metadata import Metadata
 from colorama import Fore
 import colorama
 import requests
+import toolchain
 import click
 import os
 import sys
 import json as js
 import time
 
-tags = [
-    '<pip>',
-    '<pip:name>',
-    '<pip:name,version>',
-    '<python>',
-    '<python:name>',
-    '<python:name,version>',
-    '<npm>',
-    '<npm:name>',
-    '<npm:name,version>',
-    '<node:name>',
-    '<node>',
-    '<node:name,version',
-    '<vscode>',
-    '<vscode:name>',
-    '<vscode:name,version>',
-    '<vscode-insiders>',
-    '<vscode-insiders:name>',
-    '<vscode-insiders:name,version>',
-    '<atom>',
-    '<atom:name>',
-    '<atom:name,version>',
-    '<apm>',
-    '<apm:name>',
-    '<apm:name,version>',
-    '<sublime>',
-    '<sublime:name>',
-    '<electric>',
-    '<electric:name>',
-    '<electric:name,version>'
-]
-
 
 class Config:
 
@@ -80,23 +48,17 @@ class Config:
 
         packages = self.dictionary['Packages'] if 'Packages' in self.headers else None
 
-        if 'Pip-Packages' in headers:
-            try:
-                Popen('pip', stdin=PIPE, stdout=PIPE, stderr=PIPE)
-            except FileNotFoundError:
-                if all('python' not in package for package in packages):
-                    click.echo(click.style(
-                        'Pip Not Found, Aborting Config Installation!', fg='red'))
-                    sys.exit()
+        if 'Pip-Packages' in headers and not toolchain.find('pip'):
+            if all('python' not in package for package in packages):
+                click.echo(click.style(
+                    'Pip Not Found, Aborting Config Installation!', fg='red'))
+                sys.exit()
 
-        if 'Node-Packages' in headers:
-            try:
-                Popen('npm', stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
-            except FileNotFoundError:
-                if all('nodejs' not in package for package in packages):
-                    click.echo(click.style(
-                        'Node Not Found, Aborting Config Installation!', fg='red'))
-                    sys.exit()
+        if 'Node-Packages' in headers and not toolchain.find('npm'):
+            if all('nodejs' not in package for package in packages):
+                click.echo(click.style(
+                    'Node Not Found, Aborting Config Installation!', fg='red'))
+                sys.exit()
 
         editor_type = self.dictionary['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
         if editor_type:
@@ -106,13 +68,9 @@ class Config:
                 click.echo(click.style(
                     'Visual Studio Code Not Found, Aborting Config Installation!', fg='red'))
             else:
-                if editor_type == 'Visual Studio Code':
-                    try:
-                        Popen('code --help', stdin=PIPE,
-                              stdout=PIPE, stderr=PIPE, shell=True)
-                    except FileNotFoundError:
-                        click.echo(click.style(
-                            'Visual Studio Code Found But Shell Extension Not Found, Aborting Config Installation!', fg='red'))
+                if editor_type == 'Visual Studio Code' and not toolchain.find('code'):
+                    click.echo(click.style(
+                        'Visual Studio Code Found But Shell Extension Not Found, Aborting Config Installation!', fg='red'))
 
         click.echo(click.style('All Tests Passed!', 'bright_green'))
 
@@ -161,36 +119,31 @@ class Config:
         It will return False if the package name, or any equivalent variation as defined by PEP 503 normalisation
         rules (https://www.python.org/dev/peps/pep-0503/#normalized-names) is not registered in the PyPI registry.
         """
-        extension_url = 'https://pypi.org/project'
-        res = requests.get(f'{extension_url}/{pypi_package_name}/')
-        return res.status_code == 200
+        from validation import exists
+        return exists('pip', pypi_package_name)
 
     @staticmethod
     def check_vscode_name(extension_name):
         """
         Check if an extension exists on vscode.
         """
-        extension_url = 'https://marketplace.visualstudio.com/items?itemName='
-        res = requests.get(f'{extension_url}{extension_name}')
-        return res.status_code == 200
+        from validation import exists
+        return exists('vscode', extension_name)
 
     @staticmethod
     def check_atom_name(extension_name):
-        extension_url = 'https://atom.io/packages/'
-        res = requests.get(f'{extension_url}{extension_name}')
-        return res.status_code == 200
+        from validation import exists
+        return exists('atom', extension_name)
 
     @staticmethod
     def check_sublime_name(extension_name):
-        extension_url = 'https://packagecontrol.io/packages/'
-        res = requests.get(f'{extension_url}{extension_name}')
-        return res.status_code == 200
+        from validation import exists
+        return exists('sublime', extension_name)
 
     @staticmethod
     def check_node_name(extension_name):
-        extension_url = 'https://www.npmjs.com/package/'
-        res = requests.get(f'{extension_url}{extension_name}')
-        return res.status_code == 200
+        from validation import exists
+        return exists('node', extension_name)
 
     # FUTURE Yarn Support
     @staticmethod
@@ -201,61 +154,37 @@ class Config:
 
     @staticmethod
     def generate_configuration(filepath: str, signed=True):
-        import hashlib
-        d = {}
+        from config_parser import ChecksumError, ConfigSyntaxError, parse_file
+
         try:
-            with open(f'{filepath}', 'r') as f:
-                chunks = f.read().split("[")
-
-                for chunk in chunks:
-                    chunk = chunk.replace("=>", ":").split('\n')
-                    header = chunk[0].replace("[", '').replace(']', '').strip()
-                    d[header] = []
-
-                    for line in chunk[1:]:
-                        if line and '#' not in line and line not in tags:
-                            try:
-                                k, v = line.split(":")
-                                k, v = k.strip(), v.strip()
-                                if v == '':
-                                    with open(f'{filepath}', 'r') as f:
-                                        lines = f.readlines()
-                                    ln_number = 0
-                                    idx = 0
-                                    for val in lines:
-                                        if val.strip() == line.replace(':', '=>').strip():
-                                            ln_number = idx
-                                        idx += 1
-                                    click.echo(click.style(
-                                        f'Error On Line {ln_number + 1} At {filepath}', fg='red'))
-                                    message = line.replace(':', '')
-                                    click.echo(click.style(
-                                        f'ValueNotFoundError : No Value Provided For Key :: {colorama.Fore.LIGHTCYAN_EX}{message}', fg='bright_yellow'))
-                                    sys.exit()
-
-                            except ValueError:
-                                if header in ['Packages', 'Pip-Packages', 'Editor-Extensions', 'Node-Packages']:
-                                    k, v = line, "latest"
-                                else:
-                                    with open(f'{filepath}', 'r') as f:
-                                        lines = f.readlines()
-
-                                    ln_number = 0
-                                    idx = 0
-                                    for val in lines:
-                                        if val.strip() == line.replace(':', '=>').strip():
-                                            ln_number = idx
-                                        idx += 1
-
-                                    click.echo(click.style(
-                                        f'Error On Line {ln_number + 1} At {filepath}', fg='red'))
-                                    message = line.replace(':', '')
-                                    click.echo(click.style(
-                                        f'ValueNotFoundError : Expecting A Value Pair With `=>` Operator For Key :: {colorama.Fore.LIGHTCYAN_EX}{message}', fg='bright_yellow'))
-                                    sys.exit()
-
-                            d[header].append({k: v.replace('"', '')})
+            parser = parse_file(filepath)
+            if signed:
+                parser.verify()
+        except FileNotFoundError:
+            click.echo(click.style(
+                f'Could Not Find {Fore.LIGHTCYAN_EX}{filepath}{Fore.RESET}.', fg='red'), err=True)
+            time.sleep(2)
+            sys.exit()
+        except ConfigSyntaxError as err:
+            Config.print_error(filepath, err)
+            sys.exit()
+        except ChecksumError as err:
+            if err.name == 'ChecksumNotFoundError':
+                click.echo(click.style(
+                    f'File Checksum Not Found! Run `electric sign {filepath}` ( Copied To Clipboard ) to sign your .electric configuration.', fg='red'))
+                copy_to_clipboard(f'electric sign {filepath}')
+                sys.exit()
+            Config.print_error(filepath, err)
+            exit(1)
+
+        if signed:
+            click.echo(click.style('Hashes Match!', 'bright_green'))
 
+        d = parser.sections
+        # Tags are replaced with what is installed, which rewrites the file, so it is only read again when there are any
+        tags = [tag for _, tag, _ in parser.tags]
+        if tags:
+            try:
                 if 'Packages' in d:
                     with open(f'{filepath}', 'r') as f:
 
@@ -544,511 +473,189 @@ class Config:
                                 with open(f'{filepath}', 'w') as f:
                                     f.writelines(lines)
 
-                if signed:
-                    with open(f'{filepath}', 'r') as f:
-                        lines = f.readlines()
-
-                    l = [line.strip() for line in lines]
-                    if not '# --------------------Checksum Start-------------------------- #' in l or not '# --------------------Checksum End--------------------------- #' in l:
-                        click.echo(click.style(
-                            f'File Checksum Not Found! Run `electric sign {filepath}` ( Copied To Clipboard ) to sign your .electric configuration.', fg='red'))
-                        copy_to_clipboard(f'electric sign {filepath}')
-                        sys.exit()
-
-                    if lines[-1] != '# --------------------Checksum End--------------------------- #':
-                        click.echo(click.style(
-                            'DataAfterChecksumError : Comments, Code And New lines Are Not Allowed After The Checksum End Header.', 'red'))
-                        sys.exit()
-
-                    if '# --------------------Checksum Start-------------------------- #' in l and '# --------------------Checksum End--------------------------- #' in l:
-                        idx = 0
-                        for item in l:
-                            if item == '# --------------------Checksum Start-------------------------- #':
-                                idx = list.index(l, item)
-
-                        md5 = l[idx + 1].replace('#', '').strip()
-                        sha256 = l[idx + 2].replace('#', '').strip()
-
-                        # Generate Temporary Configuration File
-                        with open(rf'{gettempdir()}\electric\configuration.electric', 'w+') as f:
-                            f.writelines(lines[:-5])
-
-                        md5_checksum = hashlib.md5(open(
-                            rf'{gettempdir()}\electric\configuration.electric', 'rb').read()).hexdigest()
-                        sha256_hash_checksum = hashlib.sha256()
-                        with open(rf'{gettempdir()}\electric\configuration.electric', 'rb') as f:
-                            # Read and update hash string value in blocks of 4K
-                            for byte_block in iter(lambda: f.read(4096), b''):
-                                sha256_hash_checksum.update(byte_block)
-
-                        sha256_checksum = sha256_hash_checksum.hexdigest()
-                        if md5 == md5_checksum and sha256 == sha256_checksum:
-                            click.echo(click.style(
-                                'Hashes Match!', 'bright_green'))
-                        else:
-                            click.echo(click.style(
-                                'Hashes Don\'t Match!', 'red'))
-                            os.remove(
-                                rf'{gettempdir()}\electric\configuration.electric')
-                            exit(1)
-                        os.remove(
-                            rf'{gettempdir()}\electric\configuration.electric')
-        except FileNotFoundError:
-            click.echo(click.style(
-                f'Could Not Find {Fore.LIGHTCYAN_EX}{filepath}{Fore.RESET}.', fg='red'), err=True)
-            time.sleep(2)
-            sys.exit()
-        d.pop('')
+            except FileNotFoundError:
+                click.echo(click.style(
+                    f'Could Not Find {Fore.LIGHTCYAN_EX}{filepath}{Fore.RESET}.', fg='red'), err=True)
+                time.sleep(2)
+                sys.exit()
 
         return Config(d)
 
-    def verify(self):  # sourcery no-metrics
-        config = self.dictionary
+    @staticmethod
+    def print_error(filepath: str, err):
+        """
+        Prints an error in a configuration with the line it is on, ex:
+
+            Error On Line 4, Column 7 At dev.electric
+                git =>
+                      ^
+            ValueNotFoundError : No Value Provided For Key :: git
+        """
+        if err.line:
+            location = f'Line {err.line}, Column {err.column}' if err.column else f'Line {err.line}'
+            click.echo(click.style(f'Error On {location} At {filepath}', fg='red'))
+        if err.text is not None:
+            click.echo(f'    {err.text}')
+            if err.column:
+                click.echo(click.style(f'    {" " * (err.column - 1)}^', fg='red'))
+        click.echo(click.style(
+            f'{err.name} : {colorama.Fore.LIGHTCYAN_EX}{err.message}', fg='bright_yellow'))
 
-        python_packages = config['Pip-Packages'] if 'Pip-Packages' in self.headers else None
-        node_packages = config['Node-Packages'] if 'Node-Packages' in self.headers else None
-        editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-        packages = config['Packages'] if 'Packages' in self.headers else None
-        editor_type = config['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
+    def get_checks(self) -> list:
+        """
+        Gets every name in the configuration which has to exist in a registry
 
-        if packages:
-            click.echo(click.style(
-                '↓ Validating Electric Packages        ↓', 'cyan'))
-
-
-            for package in packages:
-                if isinstance(package, dict):
-                    if package:
-                        proc = Popen(
-                            rf'electric show {list(package.keys())[0]}', stdin=PIPE, stdout=PIPE, stderr=PIPE)
-                        output, err = proc.communicate()
-                        err = 'UnicodeEncodeError' in err.decode()
-
-                        if 'Could Not Find Any Packages' in output.decode() or 'Not Found.' in output.decode() or err:
-                            click.echo(click.style(
-                                f'`{list(package.keys())[0]}` does not exist or has been removed.', 'red'))
-                            sys.exit()
-
-                else:
-                    if package:
-                        proc = Popen(
-                            rf'electric show {package}', stdin=PIPE, stdout=PIPE, stderr=PIPE)
-                        output, err = proc.communicate()
-                        err = 'UnicodeEncodeError' in err.decode()
-
-                        if 'Could Not Find Any Packages' in output.decode() or 'Not Found.' in output.decode() or err:
-                            click.echo(click.style(
-                                f'`{package}` does not exist or has been removed.', 'red'))
-                            sys.exit()
-
-        if node_packages:
+        Returns:
+            list: (kind, name) pairs, see `validation.validate`
+        """
+        from lockfile import get_entries
+
+        editor_type = self.dictionary['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
+        editor_kind = {
+            'Visual Studio Code': 'vscode',
+            'Visual Studio Code Insiders': 'vscode',
+            'Atom': 'atom',
+            'Sublime Text 3': 'sublime',
+        }.get(editor_type)
+
+        checks = [('electric', name) for name, _ in get_entries(self, 'Packages')]
+        checks += [('node', name) for name, _ in get_entries(self, 'Node-Packages')]
+        checks += [('pip', name) for name, _ in get_entries(self, 'Pip-Packages')]
+        if editor_kind:
+            checks += [(editor_kind, name) for name, _ in get_entries(self, 'Editor-Extensions')]
+        return checks
+
+    def verify(self):
+        """
+        Checks every package and extension in the configuration exists, every failure is reported before exiting
+        """
+        import validation
+
+        editor_type = self.dictionary['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
+        if editor_type and editor_type not in ['Visual Studio Code', 'Visual Studio Code Insiders', 'Atom', 'Sublime Text 3']:
             click.echo(click.style(
-                '↓ Validating Node or Npm Modules      ↓', 'cyan'))
-            for package_name in node_packages:
-                if isinstance(package_name, dict):
-                    if package_name:
-                        if not Config.check_node_name(list(package_name.keys())[0]):
-                            click.echo(click.style(
-                                f'The ( npm | node ) module => `{list(package_name.keys())[0]}` does not exist or has been removed.', 'red'))
-                            sys.exit()
-                else:
-                    if package_name:
-                        if not Config.check_node_name(package_name):
-                            click.echo(click.style(
-                                f'The ( npm | node ) module => `{package_name}` does not exist or has been removed.', 'red'))
-                            sys.exit()
+                f'{editor_type} is not supported by electric yet!', 'red'))
 
+        checks = self.get_checks()
         click.echo(click.style(
-            '↓ Validating Python or Pip Modules    ↓', 'cyan'))
-
-        if python_packages:
-            for package in python_packages:
-                if isinstance(package, dict):
-                    if package:
-                        if not Config.check_pypi_name(list(package.keys())[0]):
-                            click.echo(click.style(
-                                f'The ( npm | node ) module => `{list(package.keys()[0])}` does not exist or has been removed.', 'red'))
-                            sys.exit()
-                else:
-                    if package:
-                        if not Config.check_pypi_name(package):
-                            click.echo(click.style(
-                                f'The ( python | pip ) module => `{package}` does not exist or has been removed.', 'red'))
-                            sys.exit()
+            f'↓ Validating {len(checks)} Packages And Extensions ↓', 'cyan'))
 
-        if editor_type:
-            if not editor_type in ['Visual Studio Code', 'Visual Studio Code Insiders', 'Atom', 'Sublime Text 3']:
-                click.echo(click.style(
-                    f'{editor_type} is not supported by electric yet!', 'red'))
-            else:
-                if editor_extensions:
-                    click.echo(click.style(
-                        '↓ Validating Editor Extensions        ↓', 'cyan'))
-                    if editor_type == 'Visual Studio Code' or editor_type == 'Visual Studio Code Insiders':
-                        for package_name in editor_extensions:
-                            if isinstance(package_name, dict):
-                                if package_name:
-                                    if not Config.check_vscode_name(list(package_name.keys())[0]):
-                                        click.echo(click.style(
-                                            f'Invalid Extension Name => {list(package_name.keys())[0]}', 'red'))
-                                        sys.exit()
-                            else:
-                                if package_name:
-                                    if not Config.check_vscode_name(package_name):
-                                        click.echo(click.style(
-                                            f'Invalid Extension Name => {package_name}', 'red'))
-                                        sys.exit()
-
-                    if editor_type == 'Sublime Text 3':
-                        for package_name in editor_extensions:
-                            if isinstance(package_name, dict):
-                                if package_name:
-                                    if not Config.check_sublime_name(list(package_name.keys())[0]):
-                                        click.echo(click.style(
-                                            f'Invalid Extension Name => {list(package_name.keys())[0]}', 'red'))
-                                        sys.exit()
-                            else:
-                                if package_name:
-                                    if not Config.check_sublime_name(package_name):
-                                        click.echo(click.style(
-                                            f'Invalid Extension Name => {package_name}', 'red'))
-
-                    if editor_type == 'Atom':
-                        for package_name in editor_extensions:
-                            if isinstance(package_name, dict):
-                                if package_name:
-                                    if not Config.check_atom_name(list(package_name.keys())[0]):
-                                        click.echo(click.style(
-                                            f'Invalid Extension Name => {list(package_name.keys())[0]}', 'red'))
-                                        sys.exit()
-                            else:
-                                if package_name:
-                                    if not Config.check_atom_name(package_name):
-                                        click.echo(click.style(
-                                            f'Invalid Extension Name => {package_name}', 'red'))
+        failures = validation.validate(checks)
+        for failure in failures:
+            click.echo(click.style(validation.format_failure(*failure), 'red'))
+
+        if failures:
+            click.echo(click.style(
+                f'{len(failures)} Of {len(checks)} Entries Failed Validation', 'red'))
+            sys.exit(1)
+
+    def get_plan(self, include_versions: bool) -> dict:
+        """
+        Resolves the configuration into an install plan, which has the same shape as a lockfile without the hashes
+
+        #### Arguments
+            include_versions (bool): Whether the versions in the configuration are installed instead of the latest ones
+
+        Returns:
+            dict: Packages to install, electric packages are resolved together with their dependencies
+        """
+        from lockfile import get_entries
+        from offline import resolve
+
+        def pinned(header: str) -> list:
+            return [(name, version if include_versions else None) for name, version in get_entries(self, header)]
+
+        packages = pinned('Packages')
+        resolved = resolve([name for name, _ in packages], {
+                           name: version for name, version in packages if version})
+
+        return {
+            'editor': self.dictionary['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None,
+            'packages': [
+                {
+                    'name': manifest['package-name'],
+                    'version': version,
+                    'dependencies': manifest[version].get('dependencies') or [],
+                    'manifest': manifest,
+                }
+                for manifest, version in resolved
+            ],
+            'pip-packages': [{'name': name, 'version': version} for name, version in pinned('Pip-Packages')],
+            'node-packages': [{'name': name, 'version': version} for name, version in pinned('Node-Packages')],
+            'editor-extensions': [{'name': name, 'version': version} for name, version in pinned('Editor-Extensions')
+                                  if name != 'Package Control'],
+        }
 
     def install(self, include_versions: bool, install_directory: str, metadata: Metadata):
-        if is_admin():
-            flags = get_install_flags(install_directory, metadata)
-            config = self.dictionary
-            python_packages = config['Pip-Packages'] if 'Pip-Packages' in self.headers else None
-            node_packages = config['Node-Packages'] if 'Node-Packages' in self.headers else None
-            editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-            packages = config['Packages'] if 'Packages' in self.headers else None
-            editor_type = config['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
-
-            command = ''
-            pip_command = ''
-            idx = 1
-
-            if not include_versions:
-                for package in packages:
-                    if idx == len(packages):
-                        command += list(package.keys())[0]
-                        idx += 1
-                        continue
-                    command += list(package.keys())[0] + ','
-                    idx += 1
-
-                for flag in flags:
-                    command += ' ' + flag
-
-                for pkg in command.split(','):
-                    if pkg:
-                        os.system(f'electric install {pkg}')
-            else:
-                
-                for package in packages:
-                    if package:
-                        if list(package.values())[0] is None or list(package.values())[0] == 'latest':
-                            os.system(f'electric install {list(package.keys())[0]}')
-                        else:  
-                            os.system(f'electric install {list(package.keys())[0]} --version {list(package.values())[0]}')
-            
-            if python_packages:
-                package_versions = []
-                package_names = []
-                for package in python_packages:
-                    if idx == len(packages):
-                        package_versions.append(package[list(package.keys())[0]])
-                        package_names.append(list(package.keys())[0])
-                        pip_command += list(package.keys())[0]
-                        idx += 1
-                        continue
-
-                    package_versions.append(package[list(package.keys())[0]])
-                    package_names.append(list(package.keys())[0])
-                    pip_command += list(package.keys())[0] + ','
-                    idx += 1
-
-                os.system('refreshenv')
-
-                idx = 0
-
-                if include_versions and package_versions:
-                    for package_name in package_names:
-                        os.system(
-                            f'electric install --python {package_name} --version {package_versions[idx]}')
-                        idx += 1                                                                                                                                                                                                              
-                else:
-                    if include_versions:
-                        print('No Versions Specified With This Configuration!')
-                        sys.exit()
-
-                    for package_name in package_names:
-                        os.system(f'electric install --python {package_name}')
-                        idx += 1
-
-
-            if editor_type == 'Visual Studio Code' or editor_type == 'Visual Studio Code Insiders' and editor_extensions != []:
-                editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-                package_versions = []
-                
-                if editor_extensions:
-                    for ext in editor_extensions:
-                        if not isinstance(ext, list):
-                            extension = list(ext.keys())[0]
-                            version = list(ext.values())[0]
-                            command = f'electric install --vscode {extension}'
-
-                            if version != 'latest' and version != None and include_versions:
-                                command = f'electric install --vscode {extension} --version {version}'
-
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-                        else:
-                            command = f'electric install --vscode {extension}'
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-
-
-            if editor_type == 'Sublime Text 3' and editor_extensions:
-                editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-                for extension in editor_extensions:
-                    extension = list(extension.keys())[0]
-
-                    if extension != 'Package Control':
-                        command = f'electric install --sublime \"{extension}\"'
-
-                    try:
-                        os.system(command)
-                    except:
-                        if not confirm('Would you like to continue configuration installation?'):
-                            sys.exit()
-
-
-            if editor_type == 'Atom' and editor_extensions:
-                editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-                if editor_extensions:
-                    for extension in editor_extensions:
-                        if not isinstance(extension, list):
-                            extension = list(extension.keys())[0]
-                            version = list(extension.values())[0]
-
-                            command = f'electric install --atom {extension}'
-                            
-                            if version != 'latest' and version != None and include_versions:
-                                command = f'electric install --atom {extension} --version {version}'
-                            
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-                        else:
-                            command = f'electric install --atom {extension}'
-
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-
-
-            if node_packages:
-                for pkg in node_packages:
-                    if not isinstance(pkg, list):
-                        node_package = list(pkg.keys())[0]
-                        version = list(pkg.values())[0]
-
-                        command = f'electric install --node {node_package}'
-
-                        if version != 'latest' and version != None and include_versions:
-                            command = f'electric install --node {node_package} --version {version}'
-
-                        try:
-                            os.system(command)
-                        except:
-                            if not confirm('Would you like to continue configuration installation?'):
-                                sys.exit()
-                    else:
-                        command = f'electric install --node {node_package}'
-
-                        try:
-                            os.system(command)
-                        except:
-                            if not confirm('Would you like to continue configuration installation?'):
-                                sys.exit()
-        else:
+        """
+        Installs every package in the configuration in this process, electric packages share the concurrent installer
+
+        #### Arguments
+            include_versions (bool): Whether the versions in the configuration are installed instead of the latest ones
+            install_directory (str): Directory packages are installed into
+            metadata (`Metadata`): Metadata for the installation
+        """
+        from lockfile import execute_plan
+
+        if not is_admin():
             click.echo(click.style(
                 'Config installation must be ran as administrator!', fg='red'), err=True)
+            return
 
+        execute_plan(self.get_plan(include_versions), install_directory, metadata)
 
-    def uninstall(self, include_versions: bool):
-        if is_admin():
-            config = self.dictionary
-            python_packages = config['Pip-Packages'] if 'Pip-Packages' in self.headers else None
-            node_packages = config['Node-Packages'] if 'Node-Packages' in self.headers else None
-            editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-            packages = config['Packages'] if 'Packages' in self.headers else None
-            editor_type = config['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
-
-            command = ''
-            pip_command = ''
-            idx = 1
-
-            if not include_versions:
-                for package in packages:
-                    if idx == len(packages):
-                        command += list(package.keys())[0]
-                        idx += 1
-                        continue
-                    command += list(package.keys())[0] + ','
-                    idx += 1
-
-                for pkg in command.split(','):
-                    os.system(f'electric uninstall {pkg}')
-            else:
-                
-                for package in packages:
-                    if list(package.values())[0] is None or list(package.values())[0] == 'latest':
-                        os.system(f'electric uninstall {list(package.keys())[0]}')
-                    else:  
-                        os.system(f'electric uninstall {list(package.keys())[0]}')
-            
-            if python_packages:
-                package_versions = []
-                package_names = []
-                for package in python_packages:
-                    if idx == len(packages):
-                        package_versions.append(package[list(package.keys())[0]])
-                        package_names.append(list(package.keys())[0])
-                        pip_command += list(package.keys())[0]
-                        idx += 1
-                        continue
-
-                    package_versions.append(package[list(package.keys())[0]])
-                    package_names.append(list(package.keys())[0])
-                    pip_command += list(package.keys())[0] + ','
-                    idx += 1
-
-                os.system('refreshenv')
-
-                idx = 0
-
-                if include_versions and package_versions:
-                    for package_name in package_names:
-                        os.system(
-                            f'electric uninstall --python {package_name} --version {package_versions[idx]}')
-                        idx += 1                                                                                                                                                                                                              
-                else:
-                    if include_versions:
-                        print('No Versions Specified With This Configuration!')
-                        sys.exit()
-
-                    for package_name in package_names:
-                        os.system(f'electric uninstall --python {package_name}')
-                        idx += 1
-
-
-            if editor_type == 'Visual Studio Code' or editor_type == 'Visual Studio Code Insiders' and editor_extensions != []:
-                editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-                package_versions = []
-                
-                if editor_extensions:
-                    for ext in editor_extensions:
-                        if not isinstance(ext, list):
-                            extension = list(ext.keys())[0]
-                            version = list(ext.values())[0]
-                            command = f'electric uninstall --vscode {extension}'
-
-                            if version != 'latest' and version != None and include_versions:
-                                command = f'electric uninstall --vscode {extension} --version {version}'
-
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-                        else:
-                            command = f'electric uninstall --vscode {extension}'
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-
-            if editor_type == 'Atom' and editor_extensions:
-                editor_extensions = config['Editor-Extensions'] if 'Editor-Extensions' in self.headers else None
-                if editor_extensions:
-                    for extension in editor_extensions:
-                        if not isinstance(extension, list):
-                            extension = list(extension.keys())[0]
-                            version = list(extension.values())[0]
-
-                            command = f'electric uninstall --atom {extension}'
-                            
-                            if version != 'latest' and version != None and include_versions:
-                                command = f'electric uninstall --atom {extension} --version {version}'
-                            
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-                        else:
-                            command = f'electric uninstall --atom {extension}'
-
-                            try:
-                                os.system(command)
-                            except:
-                                if not confirm('Would you like to continue configuration installation?'):
-                                    sys.exit()
-
-
-            if node_packages:
-                for pkg in node_packages:
-                    if not isinstance(pkg, list):
-                        node_package = list(pkg.keys())[0]
-                        version = list(pkg.values())[0]
-
-                        command = f'electric uninstall --node {node_package}'
-
-                        if version != 'latest' and version != None and include_versions:
-                            command = f'electric uninstall --node {node_package} --version {version}'
-
-                        try:
-                            os.system(command)
-                        except:
-                            if not confirm('Would you like to continue configuration installation?'):
-                                sys.exit()
-                    else:
-                        command = f'electric uninstall --node {node_package}'
-
-                        try:
-                            os.system(command)
-                        except:
-                            if not confirm('Would you like to continue configuration installation?'):
-                                sys.exit()
-        else:
+    def uninstall(self, include_versions: bool, metadata: Metadata):
+        """
+        Uninstalls every package in the configuration in this process, a package which fails to uninstall doesn't stop the rest
+
+        #### Arguments
+            include_versions (bool): Whether the configured versions of pip, npm and editor packages are uninstalled, electric packages are always uninstalled by name
+            metadata (`Metadata`): Metadata for the uninstallation
+        """
+        import external
+        from commands.install import uninstall
+        from lockfile import get_entries
+        from logger import log_info
+
+        if not is_admin():
             click.echo(click.style(
                 'Config installation must be ran as administrator!', fg='red'), err=True)
+            return
+
+        # `electric uninstall` has no version option, whichever version is installed is removed
+        for name, _ in get_entries(self, 'Packages'):
+            # `electric uninstall` ends some uninstallations with sys.exit, each
+            # package is guarded so the rest of the configuration still runs
+            try:
+                click.get_current_context().invoke(
+                    uninstall,
+                    package_name=name,
+                    verbose=metadata.verbose,
+                    debug=metadata.debug,
+                    no_color=metadata.no_color,
+                    logfile=metadata.logfile,
+                    yes=metadata.yes,
+                    silent=metadata.silent,
+                )
+            except SystemExit as err:
+                if err.code:
+                    log_info(f'Uninstallation of {name} exited with code {err.code}', metadata.logfile)
+            except Exception as err:
+                log_info(f'Uninstallation of {name} failed: {err}', metadata.logfile)
+                click.echo(click.style(f'Failed To Uninstall {name}: {err}', fg='red'), err=True)
+
+        for name, version in get_entries(self, 'Pip-Packages'):
+            external.handle_python_package(name, version if include_versions and version else 'latest', 'uninstall', metadata)
+
+        for name, version in get_entries(self, 'Node-Packages'):
+            external.handle_node_package(name, 'uninstall', version if include_versions else None, metadata)
+
+        editor = self.dictionary['Editor-Configuration'][0]['Editor'] if 'Editor-Configuration' in self.headers else None
+        for name, version in get_entries(self, 'Editor-Extensions'):
+            if editor in ['Visual Studio Code', 'Visual Studio Code Insiders']:
+                external.handle_vscode_extension(name, version if include_versions else None, 'uninstall', metadata)
+            elif editor == 'Atom':
+                external.handle_atom_package(name, 'uninstall', version if include_versions else None, metadata)
 
 # TODO: For Installing VISUAL STUDIO EXTENSIONS
 # DOWNLOAD THE VSIX FILE FROM https://marketplace.visualstudio.com/_apis/public/gallery/publishers/JaredParMSFT/vsextensions/VsVim/2.8.0.0/vspackage (example => can be scraped)
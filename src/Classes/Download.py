@@ -6,9 +6,11 @@ class Download:
     """
     Stores data about a download for usage
     """    
-    def __init__(self, url, extension, name, display_name, path):
+    def __init__(self, url, extension, name, display_name, path, size=None, checksum=None):
         self.display_name = display_name
         self.url = url
         self.extension = extension
         self.name = name
-        self.path = path
\ No newline at end of file
+        self.path = path
+        self.size = size
+        self.checksum = checksum
@@ -9,7 +9,7 @@ class Install:
     Stores data about an installation for usage
     """
 
-    def __init__(self, json_name: str, display_name: str, path: str, install_switches, download_type: str, directory: str, custom_install_switch, install_exit_codes, uninstall_exit_codes, metadata: Metadata, version):
+    def __init__(self, json_name: str, display_name: str, path: str, install_switches, download_type: str, directory: str, custom_install_switch, install_exit_codes, uninstall_exit_codes, metadata: Metadata, version, conflicts: list = None, timeout: int = None):
         self.display_name = display_name
         self.json_name = json_name
         self.path = path
@@ -21,3 +21,5 @@ class Install:
         self.install_exit_codes = install_exit_codes
         self.uninstall_exit_codes = uninstall_exit_codes
         self.version = version
+        self.conflicts = conflicts if conflicts != None else []
+        self.timeout = timeout
@@ -0,0 +1,22 @@
+######################################################################
+#                            INSTALL RESULT                          #
+######################################################################
+
+
+class InstallResult:
+    """
+    Stores the outcome of running an installer so it can be reported once every installer has finished
+    """
+
+    def __init__(self, display_name: str, command: str, exit_code: int, duration: float, reason: str = None, error: list = None, timed_out: bool = False):
+        self.display_name = display_name
+        self.command = command
+        self.exit_code = exit_code
+        self.duration = duration
+        self.reason = reason
+        self.error = error
+        self.timed_out = timed_out
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.timed_out and (self.exit_code == 0 or self.error == ['no-error'])
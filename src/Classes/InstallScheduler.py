@@ -0,0 +1,113 @@
+######################################################################
+#                          INSTALL SCHEDULER                         #
+######################################################################
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Condition
+
+
+class InstallScheduler:
+    """
+    Runs installers on a bounded pool of workers, dispatching each one from a ready queue as soon as the resources it needs are free
+
+    The executor is long-lived and can be shared between batches, so the worker threads are only created once per command
+    """
+    # Only one msiexec transaction can hold the Windows Installer mutex (_MSIExecute) at a time
+    MSI_MUTEX = 'windows-installer'
+
+    def __init__(self, runner, max_workers: int = 4, timeout: int = None, executor: ThreadPoolExecutor = None):
+        self.runner = runner
+        self.max_workers = max_workers
+        self.executor = executor if executor else ThreadPoolExecutor(max_workers)
+        self.timeout = timeout
+        self.condition = Condition()
+        self.pending = []
+        self.held = set()
+        self.running = set()
+        self.active = []
+        self.results = {}
+
+    @staticmethod
+    def get_resources(install) -> set:
+        """
+        Gets the exclusive resources an installer has to hold while it runs
+
+        #### Arguments
+            install (Install): Installer to be run
+
+        Returns:
+            set: Names of the resources
+        """
+        if install.download_type == '.msi':
+            return {InstallScheduler.MSI_MUTEX}
+        return set()
+
+    def conflicts(self, install) -> bool:
+        """
+        Checks whether an installer conflicts with any of the installers currently running
+
+        #### Arguments
+            install (Install): Installer to be run
+
+        Returns:
+            bool: True if the installer has to wait
+        """
+        conflicts_with = set(getattr(install, 'conflicts', None) or [])
+        if conflicts_with & self.running:
+            return True
+        return any(install.json_name in (getattr(other, 'conflicts', None) or []) for other in self.active)
+
+    def next_ready(self):
+        for install in self.pending:
+            if self.get_resources(install) & self.held:
+                continue
+            if self.conflicts(install):
+                continue
+            return install
+
+    def execute(self, install):
+        timeout = getattr(install, 'timeout', None) or self.timeout
+        try:
+            result = self.runner(install, timeout)
+        except BaseException as err:
+            # Error handlers can call sys.exit, which must not take the pool down with it
+            result = err
+
+        with self.condition:
+            self.results[install.display_name] = result
+            self.held -= self.get_resources(install)
+            self.running.discard(install.json_name)
+            self.active.remove(install)
+            self.condition.notify_all()
+
+    def run(self, installs: list) -> dict:
+        """
+        Runs every installer, returning once all of them have completed
+
+        #### Arguments
+            installs (list): Installers to run, in order of priority
+
+        Returns:
+            dict: Result of the runner for each installer, keyed by display name
+        """
+        self.pending = list(installs)
+        self.active = []
+        self.results = {}
+
+        with self.condition:
+            while self.pending or self.active:
+                install = None
+                if len(self.active) < self.max_workers:
+                    install = self.next_ready()
+
+                if install is None:
+                    self.condition.wait()
+                    continue
+
+                self.pending.remove(install)
+                self.held |= self.get_resources(install)
+                self.running.add(install.json_name)
+                self.active.append(install)
+                self.executor.submit(self.execute, install)
+
+        return self.results
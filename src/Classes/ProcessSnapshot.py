@@ -0,0 +1,93 @@
+######################################################################
+#                          PROCESS SNAPSHOT                          #
+######################################################################
+
+from difflib import get_close_matches
+
+
+class ProcessSnapshot:
+    """
+    Point-in-time view of the running processes, indexed by image name so that repeated lookups don't need a new scan
+    """
+    def __init__(self, processes):
+        self.processes = processes
+        self.by_image = {}
+        self.by_normalized = {}
+
+        for pid, image_name in processes:
+            image = image_name.lower()
+            self.by_image.setdefault(image, []).append(pid)
+            self.by_normalized.setdefault(
+                ProcessSnapshot.normalize(image_name), []).append(pid)
+
+        self.normalized_names = list(self.by_normalized.keys())
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        """
+        Normalizes an image or display name for approximate matching
+
+        #### Arguments
+            name (str): Image name (`sublime_text.exe`) or display name (`Sublime Text`)
+
+        Returns:
+            str: Lowercased name without the `.exe` extension
+        """
+        name = name.lower()
+        if name.endswith('.exe'):
+            name = name[:-4]
+        return name
+
+    def get_pid(self, exe_name: str):
+        """
+        Finds the PID of a process by its image name
+
+        #### Arguments
+            exe_name (str): Image name of the process (case insensitive)
+
+        Returns:
+            int: PID of the first matching process, None if it isn't running
+        """
+        exe_name = exe_name.lower()
+        pids = self.by_image.get(exe_name)
+        if pids:
+            return pids[0]
+
+        # Installers are sometimes renamed on launch (Setup.exe -> Setup.tmp),
+        # fall back to a partial match on the image names
+        for image, pids in self.by_image.items():
+            if exe_name in image:
+                return pids[0]
+
+    def find_approx_pid(self, display_name: str, cutoff: float = 0.75):
+        """
+        Finds the PID of the process whose image name most closely resembles the display name of a package
+
+        #### Arguments
+            display_name (str): Display name of the package
+            cutoff (float): Minimum similarity ratio for a match
+
+        Returns:
+            int: PID of the matched process, None if nothing is close enough
+        """
+        name = ProcessSnapshot.normalize(display_name)
+        pids = self.by_normalized.get(name)
+        if pids:
+            return pids[0]
+
+        matches = get_close_matches(
+            name, self.normalized_names, n=1, cutoff=cutoff)
+        if matches:
+            return self.by_normalized[matches[0]][0]
+
+    def count(self, *image_names) -> int:
+        """
+        Counts the running processes with any of the given image names
+
+        #### Arguments
+            image_names (str): Image names to count (case insensitive)
+
+        Returns:
+            int: Number of running processes
+        """
+        return sum(len(self.by_image.get(name.lower(), [])) for name in image_names)
@@ -6,26 +6,59 @@
 from logger import log_info, close_log
 from Classes.Download import Download
 from Classes.Install import Install
+from Classes.InstallResult import InstallResult
 from Classes.Packet import Packet
 from extension import write, write_debug, write_verbose
 from colorama import Fore
 import tempfile
+import hashlib
 import click
 import sys
 import os
+import events
+import offline
+import tracing
 import utils
 from zip_utils import set_environment_variable, confirm
 
 
 paths = {}
+executor = None
+
+
+def get_executor():
+    """
+    Gets the worker pool shared by every download and installer run during this command
+
+    Returns:
+        ThreadPoolExecutor: Long-lived pool of worker threads
+    """
+    global executor
+    if executor is None:
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=4)
+    return executor
 
 
 class ThreadedInstaller:
     def __init__(self, packets, metadata):
+        from multiprogress import ProgressRenderer
+
         self.packets = packets
         self.metadata = metadata
+        self.progress = ProgressRenderer(
+            enabled=not metadata.no_progress and not metadata.silent and events.stream is None)
 
-    def download(self, download: Download):
+    def get_packet(self, display_name: str) -> Packet:
+        return next((packet for packet in self.packets if packet.display_name == display_name), None)
+
+    def download(self, download: Download) -> InstallResult:
+        """
+        Downloads the installer of a package on a worker thread
+
+        Returns:
+            InstallResult: Failed result if the installer couldn't be used, None once it is downloaded
+        """
         import cursor
         import requests
 
@@ -34,31 +67,67 @@ class ThreadedInstaller:
             os.mkdir(Rf'{tempfile.gettempdir()}\electric')
 
         path = Rf'{tempfile.gettempdir()}\electric\{download.name}{download.extension}'
-
-        with open(path, 'wb') as f:
-            response = requests.get(download.url, stream=True)
-            total_length = response.headers.get('content-length')
-            if total_length is None:
-                f.write(response.content)
-            else:
-                dl = 0
-                full_length = int(total_length)
-
-                for data in response.iter_content(chunk_size=4096):
-                    dl += len(data)
+        packet = self.get_packet(download.display_name)
+        package = packet.json_name if packet else download.display_name
+
+        if offline.bundle:
+            # Installing from an offline bundle, only this installer is copied out of the archive
+            try:
+                offline.bundle.extract_installer(package, path)
+            except offline.BundleError as err:
+                events.emit('failed', package, reason='bundle')
+                return InstallResult(download.display_name, None, None, 0, reason=str(err))
+            paths.update({
+                download.display_name: {
+                    'path': path,
+                    'display_name': download.display_name
+                }
+            })
+            return
+
+        digest = hashlib.sha256() if download.checksum else None
+        lane = None
+        try:
+            with tracing.span('download', track=package) as span, open(path, 'wb') as f:
+                response = utils.get_session().get(download.url, stream=True)
+                # An error page would otherwise be saved and run as the installer
+                response.raise_for_status()
+                total_length = response.headers.get('content-length')
+                full_length = int(total_length) if total_length else download.size
+
+                if full_length:
+                    # Reserve the whole installer up front so it isn't grown a chunk at a time
+                    f.truncate(full_length)
+
+                # The renderer thread draws the lane, each chunk only bumps its counter
+                lane = self.progress.add(download.display_name, full_length)
+
+                for data in response.iter_content(chunk_size=65536):
+                    lane.downloaded += len(data)
                     f.write(data)
-
-                    if not self.metadata.no_progress and not self.metadata.silent:
-                        complete = int(20 * dl / full_length)
-                        fill_c, unfill_c = '█' * \
-                            complete, ' ' * (20 - complete)
-                        try:
-                            sys.stdout.write(
-                                f"\r({fill_c}{unfill_c}) {round(dl / full_length * 100)} % ")
-                        except UnicodeEncodeError:
-                            pass
-                        sys.stdout.flush()
-
+                    if digest:
+                        digest.update(data)
+                    events.progress(package, lane.downloaded, full_length)
+
+                if lane.downloaded != full_length:
+                    f.truncate(lane.downloaded)
+                lane.done = True
+                span.set(bytes=lane.downloaded)
+        except requests.RequestException as err:
+            if lane:
+                lane.done = True
+            os.remove(path)
+            events.emit('failed', package, reason='download')
+            return InstallResult(download.display_name, None, None, 0,
+                                 reason=f'Failed To Download {download.display_name}: {err}')
+
+        if digest and digest.hexdigest().upper() != download.checksum.upper():
+            events.emit('failed', package, reason='checksum')
+            os.remove(path)
+            return InstallResult(download.display_name, None, None, 0,
+                                 reason=f'Hashes Don\'t Match For {download.display_name}, Aborting Installation')
+
+        events.emit('downloaded', package)
         paths.update({
             download.display_name:
                 {
@@ -68,7 +137,7 @@ class ThreadedInstaller:
         })
         sys.stdout.write('')
 
-    def install_package(self, install: Install) -> str:
+    def install_package(self, install: Install, timeout: int = None) -> InstallResult:
         path = install.path
         switches = install.install_switches
         download_type = install.download_type
@@ -95,9 +164,6 @@ class ThreadedInstaller:
                 click.echo(click.style(
                     f'Installing {install.display_name} To Default Location, Custom Installation Directory Not Supported By This Installer!', fg='bright_yellow'))
 
-            utils.run_cmd(command.replace('<version>', install.version),
-                          self.metadata, 'installation', install)
-
         elif download_type == '.msi':
             command = 'msiexec.exe /i' + path + ' '
             for switch in switches:
@@ -107,13 +173,65 @@ class ThreadedInstaller:
                 command = command + ' ' + \
                     custom_install_switch + rf'"{directory}"'
 
-            utils.run_cmd(command.replace('<version>', install.version),
-                          self.metadata, 'installation', install)
-
-    def calculate_spwn(self, number: int) -> str:
-        if number <= 3:
-            return 'threading'
-        return 'processing'
+        else:
+            return InstallResult(install.display_name, None, None, 0, reason=f'Unsupported Installer Type {download_type}')
+
+        return self.run_command(install, command.replace('<version>', install.version), timeout)
+
+    def run_pipeline(self, install: Install, timeout: int = None) -> InstallResult:
+        from hooks import HookError, HookRunner
+
+        packet = self.get_packet(install.display_name)
+        hooks = HookRunner(packet, self.metadata)
+        tracing.set_track(packet.json_name)
+        events.emit('installing', packet.json_name)
+
+        # Hooks run as stages around the installer on the same worker, so a
+        # package's hooks never wait on another package's installer
+        try:
+            hooks.run('pre-install', install.path)
+            result = self.install_package(install, timeout)
+            if result.exit_code == 0 or result.exit_code in install.install_exit_codes:
+                hooks.run('post-install', install.path)
+        except HookError as err:
+            return InstallResult(install.display_name, None, None, 0, reason=str(err))
+
+        return result
+
+    def run_command(self, install: Install, command: str, timeout: int = None) -> InstallResult:
+        from subprocess import PIPE, CalledProcessError, Popen, TimeoutExpired
+        from time import monotonic
+
+        command = command.replace('\"\"', '\"').replace(
+            '  ', ' ').replace('\\\\', '\\')
+        log_info(f'Running command: {command}', self.metadata.logfile)
+        write_debug(f'{command}', self.metadata)
+
+        start = monotonic()
+        with tracing.span('installer', command=command) as span:
+            try:
+                proc = Popen(command, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+            except (OSError, FileNotFoundError) as err:
+                span.set(outcome=type(err).__name__)
+                return InstallResult(install.display_name, command, None, monotonic() - start, reason=str(err))
+
+            try:
+                proc.communicate(timeout=timeout)
+            except TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                span.set(outcome='timeout')
+                return InstallResult(install.display_name, command, None, monotonic() - start,
+                                     reason=f'{install.display_name} Installer Timed Out After {timeout} Seconds', timed_out=True)
+
+            span.set(exit_code=proc.returncode, outcome='ok' if proc.returncode in [
+                     0, *install.install_exit_codes] else 'failed')
+
+        reason = None
+        if proc.returncode != 0:
+            reason = str(CalledProcessError(proc.returncode, command))
+
+        return InstallResult(install.display_name, command, proc.returncode, monotonic() - start, reason=reason)
 
     def handle_dependencies(self):
         for packet in self.packets:
@@ -122,8 +240,6 @@ class ThreadedInstaller:
                     packet, self.metadata.rate_limit, packet.directory, self.metadata)
 
     def handle_multi_download(self) -> list:
-        from threading import Thread
-
         self.handle_dependencies()
         metadata = self.metadata
         package_list = [packet.display_name for packet in self.packets]
@@ -139,14 +255,16 @@ class ThreadedInstaller:
 
         packets = self.packets
 
+        # Sizes and hashes are only known up front for packages installed from a lockfile
         download_items = []
-        if len(packets) > 1:
-            for idx, packet in enumerate(packets):
-                download_items.append(Download(packet.win64, packet.win64_type,
-                                               f'Setup{idx}', packet.display_name, f"{tempfile.gettempdir()}\\electric\\Setup{idx}{packet.win64_type}"))
-        elif len(packets) == 1:
-            download_items.append(Download(packets[0].win64, packets[0].win64_type, 'Setup0',
-                                           packets[0].display_name, f"{tempfile.gettempdir()}\\electric\\Setup0{packets[0].win64_type}"))
+        for idx, packet in enumerate(packets):
+            download_items.append(Download(packet.win64, packet.win64_type,
+                                           f'Setup{idx}', packet.display_name, f"{tempfile.gettempdir()}\\electric\\Setup{idx}{packet.win64_type}",
+                                           packet.raw.get('size'), packet.raw.get('sha256')))
+
+        # Longest downloads are started first so they don't hold up the end of the
+        # batch, downloads of an unknown size could be the longest of all
+        download_items.sort(key=lambda item: -(item.size or float('inf')))
 
         for item in download_items:
             write_verbose(
@@ -154,30 +272,21 @@ class ThreadedInstaller:
             write_debug(
                 f'Downloading {item.display_name} from {item.url} into {item.name}{item.extension}', self.metadata)
 
-        method = self.calculate_spwn(len(packets))
-
-        if method == 'threading':
-            threads = [
-                Thread(target=self.download, args=(item,))
-                for item in download_items
-            ]
-
-            for thread in threads:
-                thread.start()
-
-            for x in threads:
-                x.join()
-
-        if method == 'processing':
-            from multiprocessing import Process
-            processes = [Process(
-                target=self.download, args=(item,)) for item in download_items]
-
-            for process in processes:
-                process.start()
-
-            for x in processes:
-                x.join()
+        # Downloads share the installer pool, a spawned process would also
+        # never report its path back to the parent
+        with self.progress:
+            futures = [get_executor().submit(self.download, item)
+                       for item in download_items]
+            results = [future.result() for future in futures]
+
+        # Every download has finished by now, so stopping here never cuts off
+        # another installer mid-write
+        failed = [result for result in results if result]
+        if failed:
+            for result in failed:
+                write(f'\n{result.reason}', 'bright_red', metadata)
+                log_info(result.reason, metadata.logfile)
+            sys.exit(1)
 
         for item in download_items:
             if self.metadata.virus_check:
@@ -205,80 +314,62 @@ class ThreadedInstaller:
     def generate_installers(self, paths) -> list:
         install_items = []
 
-        packets = self.packets
-
-        install_items = []
-
-        if len(packets) > 1:
-            for pack in packets:
-                for path in paths.items():
-                    if pack.display_name == path[1]['display_name']:
-                        install_items.append(
-                            Install(
-                                pack.json_name,
-                                pack.display_name, path[1]['path'], pack.install_switches, pack.win64_type, pack.directory, pack.custom_location, pack.install_exit_codes, pack.uninstall_exit_codes, self.metadata, pack.version))
-        else:
-            return Install(packets[0].json_name, packets[0].display_name, paths[0][1]['display_name'], packets[0].install_switches, packets[0].win64_type, packets[0].directory, packets[0].custom_location, packets[0].install_exit_codes, packets[0].uninstall_exit_codes, self.metadata, packets[0].version)
-
-        return self.generate_split(install_items)
-
-    def generate_split(self, install_items) -> list:
-        exe_list = []
-        msi_list = []
-        other_list = []
+        for pack in self.packets:
+            for path in paths.items():
+                if pack.display_name == path[1]['display_name']:
+                    install_items.append(
+                        Install(
+                            pack.json_name,
+                            pack.display_name, path[1]['path'], pack.install_switches, pack.win64_type, pack.directory, pack.custom_location, pack.install_exit_codes, pack.uninstall_exit_codes, self.metadata, pack.version,
+                            pack.raw.get('conflicts-with'), pack.raw.get('install-timeout')))
 
-        for item in install_items:
-            if item.download_type == '.exe':
-                exe_list.append(item)
-            elif item.download_type == '.msi':
-                msi_list.append(item)
-            else:
-                other_list.append(item)
-
-        install_items = [{'exe': exe_list}, {
-            'msi': msi_list}, {'other': other_list}]
         return install_items
 
     def handle_multi_install(self, paths):
 
         from time import strftime
+        from Classes.InstallScheduler import InstallScheduler
 
         write_debug('Initialising Rapid Install Procedure...', self.metadata)
 
-        processes = []
-
         install_items = self.generate_installers(paths)
 
-        idx = 0
-
-        for item in install_items:
-            if 'msi' in list(item.keys()):
-                for val in item['msi']:
-                    self.install_package(val)
-                continue
+        # MSI installers wait on each other for the Windows Installer mutex but
+        # overlap with exe installers, conflicting packages never run together
+        scheduler = InstallScheduler(
+            self.run_pipeline, max_workers=4, timeout=1800, executor=get_executor())
+        results = scheduler.run(install_items)
+
+        # Errors are matched once every installer has exited, on the main thread,
+        # since get_error_cause can prompt the user or elevate
+        failed = []
+        for install in install_items:
+            result = results.get(install.display_name)
+            if not isinstance(result, InstallResult):
+                result = InstallResult(
+                    install.display_name, None, None, 0, reason=str(result))
+                results[install.display_name] = result
 
+            write_debug(
+                f'{install.display_name} Installer Exited With Code {result.exit_code} In {round(result.duration, 2)}s', self.metadata)
+            log_info(
+                f'{install.display_name} Installer Exited With Code {result.exit_code} In {round(result.duration, 2)}s', self.metadata.logfile)
+
+            if result.exit_code != 0 and not result.timed_out and result.reason:
+                result.error = utils.get_error_cause(result.reason, install.install_exit_codes,
+                                                     install.uninstall_exit_codes, 'installation', self.metadata, install)
+            if not result.succeeded:
+                events.emit('failed', self.get_packet(install.display_name).json_name, reason=result.reason,
+                            exit_code=result.exit_code, timed_out=result.timed_out)
+                failed.append(result)
+
+        for result in failed:
+            write(f'Failed To Install {result.display_name}',
+                  'red', self.metadata)
+            if result.timed_out or not result.error:
+                write(result.reason, 'red', self.metadata)
             else:
-                from multiprocessing import Process
-
-                string = ''
-                string = 'other' if 'other' in list(item.keys()) else 'exe'
-                for val in item[string]:
-                    write_debug(
-                        f'Running Installer For <{val.display_name}> On Thread {item[string].index(val)}', self.metadata)
-                    processes.append(
-                        Process(
-                            target=self.install_package, args=(val,))
-                    )
-
-                for process in processes:
-                    process.start()
-
-                for x in processes:
-                    x.join()
-
-                processes.clear()
-
-            idx += 1
+                utils.disp_error_msg(result.error, self.metadata)
 
         if self.metadata.reduce_package:
             for path in paths:
@@ -289,6 +380,9 @@ class ThreadedInstaller:
         for packet in self.packets:
             metadata = self.metadata
 
+            if not results[packet.display_name].succeeded:
+                continue
+
             if packet.add_path:
                 replace_install_dir = ''
 
@@ -0,0 +1,14 @@
+######################################################################
+#                                TOOL                                #
+######################################################################
+
+
+class Tool:
+    """
+    Executable found on the PATH, along with the version it reported
+    """
+    def __init__(self, name, path, version, mtime):
+        self.name = name
+        self.path = path
+        self.version = version
+        self.mtime = mtime
@@ -18,6 +18,8 @@ __version__ = "0.0.3"
 
 _click7 = click.__version__[0] >= '7'
 
+CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help', '-?'])
+
 class DYMMixin(object):  # pylint: disable=too-few-public-methods
     """
     Mixin class for click MultiCommand inherited classes
@@ -153,7 +155,30 @@ class SuperChargeCLI(DYMMixin, click.Group):  # pylint: disable=too-many-public-
     click Group to provide git-like
     *did-you-mean* functionality when a certain
     command is not found in the group.
+
+    Subcommands can be registered lazily through ``lazy_commands``,
+    a mapping of command name to the module defining it and its aliases.
+    The module is only imported once the command is resolved.
     """
+    def __init__(self, *args, **kwargs):
+        self.lazy_commands = kwargs.pop('lazy_commands', {})
+        super(SuperChargeCLI, self).__init__(*args, **kwargs)
+        for name, (_, aliases) in self.lazy_commands.items():
+            if aliases:
+                self._commands[name] = aliases
+                for alias in aliases:
+                    self._aliases[alias] = name
+
+    def list_commands(self, ctx):
+        return sorted(set(super(SuperChargeCLI, self).list_commands(ctx)) | set(self.lazy_commands))
+
+    def get_command(self, ctx, cmd_name):
+        cmd_name = self.resolve_alias(cmd_name)
+        if cmd_name in self.lazy_commands and cmd_name not in self.commands:
+            import importlib
+            module = importlib.import_module(self.lazy_commands[cmd_name][0])
+            self.add_command(getattr(module, cmd_name), cmd_name)
+        return super(SuperChargeCLI, self).get_command(ctx, cmd_name)
     # def format_help(self, ctx, formatter):
     #     # Custom Help Message =>
     #     click.echo(click.style('Commands :', fg='bright_green'))
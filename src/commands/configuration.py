@@ -0,0 +1,251 @@
+######################################################################
+#                       CONFIGURATION COMMANDS                       #
+######################################################################
+
+from Classes.PathManager import PathManager
+from Classes.Setting import Setting
+from colorama import Fore
+from cli import CONTEXT_SETTINGS
+from utils import confirm, generate_metadata, get_configuration_data, is_admin
+import click
+import os
+import sys
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('project_name', required=True)
+def new(
+    project_name: str
+):
+    """
+    Generates a new .electric configuration with a template for ease of development.
+    """
+    project_name = project_name.replace('.electric', '')
+    with open(f'{project_name}.electric', 'w+') as f:
+        f.writelines(
+            [
+                "[ Info ]\n",
+                "# Go To https://www.electric.sh/docs/configurations/create-a-configuration For More Information\n",
+                "Publisher =>\n",
+                "Description =>\n\n",
+                "\n[ Editor-Configuration ]\n",
+                "Editor =>\n",
+                "\n[ Packages ]\n",
+                "\n[ Editor-Extensions ]\n",
+                "\n[ Pip-Packages ]\n",
+                "\n[ Node-Packages ]\n"
+            ]
+        )
+    click.echo(click.style(
+        f'Successfully Created {Fore.LIGHTBLUE_EX}`{project_name}.electric`{Fore.LIGHTGREEN_EX} at {os.getcwd()}\\', 'bright_green'))
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('config_path', required=True)
+@click.option('--uninstall', '-u', is_flag=True, help='Uninstall packages in a config')
+@click.option('--include-versions', '-iv', is_flag=True, help='Include versions for the config installation')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose mode for config installation')
+@click.option('--debug', '-d', is_flag=True, help='Enable debug mode for config installation')
+@click.option('--no-progress', '-np', is_flag=True, default=False, help='Disable progress bar for config installation')
+@click.option('--no-color', '-nc', is_flag=True, help='Disable colored output for config installation')
+@click.option('--log-output', '-l', 'logfile', help='Log output to the specified file')
+@click.option('--install-dir', '-dir', 'install_directory', help='Specify an installation directory for a package')
+@click.option('--virus-check', '-vc', is_flag=True, help='Check for virus before config installation')
+@click.option('-y', '--yes', is_flag=True, help='Accept all prompts during config installation')
+@click.option('--silent', '-s', is_flag=True, help='Completely silent config installation without any output to console')
+@click.option('--sync', '-sc', is_flag=True, help='Force downloads and installations one after another')
+@click.option('--reduce', '-rd', is_flag=True, help='Cleanup all traces of package after config installation')
+@click.option('--rate-limit', '-rl', type=int, default=-1)
+@click.option('--locked', '-lk', is_flag=True, help='Install the exact versions recorded by `electric lock` without resolving anything')
+def config(
+    config_path: str,
+    uninstall: bool,
+    verbose: bool,
+    debug: bool,
+    no_progress: bool,
+    no_color: bool,
+    logfile: str,
+    install_directory: str,
+    virus_check: bool,
+    yes: bool,
+    silent: bool,
+    sync: bool,
+    reduce: bool,
+    rate_limit: bool,
+    include_versions: bool,
+    locked: bool,
+):
+    '''
+    Install or Uninstalls and configures packages from a .electric configuration file.
+    '''
+    from Classes.Config import Config
+
+    if not is_admin():
+        if '.\\' in config_path:
+            config_path = config_path.replace('.\\', '')
+            config_path = os.getcwd() + '\\' + config_path
+
+        if not '\\' in config_path:
+            config_path = os.getcwd() + '\\' + config_path
+        os.system(
+            fr'{PathManager.get_current_directory()}\scripts\context-elevate.cmd {config_path}{" --locked" if locked else ""}')
+
+        sys.exit()
+
+    metadata = generate_metadata(
+        no_progress, silent, verbose, debug, no_color, yes, logfile, virus_check, reduce, rate_limit, Setting.new(), sync)
+
+    if locked and not uninstall:
+        from lockfile import LockError, execute_plan, get_lockfile_path, read_lockfile
+
+        try:
+            lock = read_lockfile(get_lockfile_path(config_path), config_path)
+        except LockError as err:
+            click.echo(click.style(str(err), 'red'), err=True)
+            sys.exit(1)
+
+        execute_plan(lock, install_directory, metadata)
+        return
+
+    config = Config.generate_configuration(config_path)
+    config.check_prerequisites()
+    if uninstall:
+        config.uninstall(include_versions, metadata)
+    else:
+        config.install(include_versions, install_directory, metadata)
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('config_path', required=True)
+@click.option('--output', '-o', 'output', type=click.Path(dir_okay=False), help='Write the lockfile somewhere other than next to the config')
+def lock(
+    config_path: str,
+    output: str,
+):
+    '''
+    Records the exact version, url, size and hash of every entry in a .electric configuration.
+    '''
+    from Classes.Config import Config
+    from halo import Halo
+    from lockfile import LockError, get_lockfile_path, lock_config, write_lockfile
+    import requests
+
+    config = Config.generate_configuration(config_path)
+    output = output or get_lockfile_path(config_path)
+
+    with Halo(f'Locking {os.path.basename(config_path)}', text_color='cyan') as h:
+        try:
+            data = lock_config(config, config_path)
+        except (LockError, requests.RequestException) as err:
+            h.fail(f' Failed To Lock {os.path.basename(config_path)}')
+            click.echo(click.style(str(err), 'red'), err=True)
+            sys.exit(1)
+        h.stop()
+
+    write_lockfile(data, output)
+    count = sum(len(data[key]) for key in ['packages', 'pip-packages', 'node-packages', 'editor-extensions'])
+    click.echo(click.style(
+        f'Successfully Locked {count} Packages To {Fore.LIGHTBLUE_EX}{output}', 'bright_green'))
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('filepath', required=True)
+def sign(
+    filepath: str
+):
+    '''
+    Signs and validates a .electric configuration file.
+    '''
+    from Classes.Config import Config
+    from config_parser import CHECKSUM_END, CHECKSUM_START, parse_file
+
+    config = Config.generate_configuration(filepath, False)
+
+    click.echo(click.style('No syntax errors found!', 'bright_green'))
+
+    # Tags in the configuration may have just been replaced, so the hashes are taken from what is on disk now
+    parser = parse_file(filepath)
+    if parser.signed:
+        click.echo(click.style(
+            'File Already Signed, Aborting Signing!', fg='bright_red'))
+        sys.exit()
+
+    config.verify()
+
+    with open(filepath, 'a') as f:
+        f.writelines([
+            f'\n{CHECKSUM_START}',
+            '\n',
+            f'# {parser.md5.hexdigest()}',
+            '\n',
+            f'# {parser.sha256.hexdigest()}',
+            '\n',
+            CHECKSUM_END
+        ])
+
+    click.echo(click.style(
+        f'Successfully Signed {filepath}', fg='bright_green'))
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('filepath', required=False)
+def generate(
+    filepath: str
+):
+    from subprocess import Popen, PIPE
+    from prompt_toolkit.completion import WordCompleter
+    from prompt_toolkit import prompt
+    editor_completion = WordCompleter(
+        ['Visual Studio Code', 'Visual Studio Code Insiders', 'Sublime Text 3', 'Atom'])
+
+    username = prompt('Enter Publisher Name => ')
+    description = prompt('Enter Configuration Description => ')
+    use_editor = prompt(
+        'Do You Use A Development Text Editor (Example: Visual Studio Code) [y/N]: ')
+    use_editor = use_editor in ('y', 'yes', 'Y', 'YES')
+    include_editor = False
+    editor = ''
+    if use_editor:
+        include_editor = confirm(
+            'Do You Want To Include Your Editor Extensions And Configuration?')
+        if include_editor:
+            editor = prompt('Enter The Development Text Editor You Use => ',
+                            completer=editor_completion, complete_while_typing=True)
+
+    if editor not in ['Visual Studio Code', 'Visual Studio Code Insiders', 'Sublime Text 3', 'Atom']:
+        print(f'{editor} is not a valid editor')
+        sys.exit()
+
+    include_python = None
+    try:
+        proc = Popen('pip --version', stdin=PIPE,
+                     stdout=PIPE, stderr=PIPE, shell=True)
+        _, err = proc.communicate()
+        if not err:
+            include_python = confirm(
+                'Would you like to include your Python Configuration?')
+    except FileNotFoundError:
+        pass
+
+    include_npm = None
+    try:
+        proc = Popen('npm --version', stdin=PIPE,
+                     stdout=PIPE, stderr=PIPE, shell=True)
+        _, err = proc.communicate()
+        if not err:
+            include_npm = confirm(
+                'Would you like to include your Npm Or Node Configuration?')
+    except FileNotFoundError:
+        pass
+
+    if filepath:
+        with open(f'{filepath}', 'w+') as f:
+            f.writelines(get_configuration_data(username, description,
+                                                use_editor, include_editor, editor, include_python, include_npm))
+    else:
+        with open(f'{PathManager.get_desktop_directory()}\electric-configuration.electric', 'w+') as f:
+            f.writelines(get_configuration_data(username, description,
+                                                use_editor, include_editor, editor, include_python, include_npm))
+
+    os.system(
+        f'electric sign {PathManager.get_desktop_directory()}\electric-configuration.electric')
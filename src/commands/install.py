@@ -0,0 +1,1728 @@
+######################################################################
+#                          INSTALL COMMANDS                          #
+######################################################################
+
+from halo import Halo
+import os
+import sys
+import time as tm
+import click
+import halo
+from keyboard import add_hotkey, remove_hotkey
+from colorama import Fore
+from extension import write, write_debug, write_verbose
+from Classes.Packet import Packet
+from Classes.Setting import Setting
+from Classes.ThreadedInstaller import ThreadedInstaller
+from script_host import run_batch, run_powershell
+from state import get_state
+import events
+import tracing
+from cli import CONTEXT_SETTINGS
+from logger import *
+from registry import get_environment_keys, get_uninstall_key, send_query
+from utils import *
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('package_name', required=False, default='test')
+@click.option('--version', '-v', type=str, help='Install a certain version of a package')
+@click.option('--nightly', '--pre-release', is_flag=True, help='Install a nightly or pre-release build of a package')
+@click.option('--portable', '--non-admin', '-p', is_flag=True, help='Install a portable version of a package')
+@click.option('--verbose', '-vb', is_flag=True, help='Enable verbose mode for installation')
+@click.option('--debug', '-d', is_flag=True, help='Enable debug mode for installation')
+@click.option('--no-progress', '-np', is_flag=True, default=False, help='Disable progress bar for installation')
+@click.option('--update', '-up', is_flag=True, default=False, help='Update electric before installation')
+@click.option('--no-color', '-nc', is_flag=True, help='Disable colored output for installation')
+@click.option('--log-output', '-l', 'logfile', help='Log output to the specified file')
+@click.option('--install-dir', '-dir', 'install_directory', help='Specify an installation directory for a package')
+@click.option('--virus-check', '-vc', is_flag=True, help='Check for virus before installation')
+@click.option('-y', '--yes', is_flag=True, help='Accept all prompts during installation')
+@click.option('--silent', '-s', is_flag=True, help='Completely silent installation without any output to console')
+@click.option('--vscode', '-vs', is_flag=True, help='Specify a Visual Studio Code extension to install')
+@click.option('--sublime', '-sb', is_flag=True, help='Specify a Sublime Text 3 extension to install')
+@click.option('--atom', '-ato', is_flag=True, help='Specify an Atom extension to install')
+@click.option('--python', '-py', is_flag=True, help='Specify a Python package to install')
+@click.option('--node', '-npm', is_flag=True, help='Specify a Npm package to install')
+@click.option('--sync', '-sc', is_flag=True, help='Force downloads and installations one after another')
+@click.option('--reduce', '-rd', is_flag=True, help='Cleanup all traces of package after installation')
+@click.option('--rate-limit', '-rl', type=int, default=-1)
+@click.option('--force', '-f', is_flag=True, help='Force install a package, ignoring any existing installations of a package.')
+@click.option('--configuration', '-cf', is_flag=True, help='Specify a config file to install')
+@click.option('--plugin', '-pl', is_flag=True, help='Specify a plugin to install')
+@click.option('--manifest', '-m', 'manifest', help='Read from a manifest file instead of querying from the community repository')
+@click.option('--from', '-fr', 'bundle_path', type=click.Path(exists=True, dir_okay=False), help='Install from an .ebundle created by `electric bundle export` without any network access')
+@click.pass_context
+def install(
+    ctx,
+    package_name: str,
+    verbose: bool,
+    debug: bool,
+    no_progress: bool,
+    no_color: bool,
+    logfile: str,
+    yes: bool,
+    silent: bool,
+    python: bool,
+    update: bool,
+    install_directory: str,
+    virus_check: bool,
+    sync: bool,
+    reduce: bool,
+    rate_limit: int,
+    node: bool,
+    vscode: bool,
+    atom: bool,
+    sublime: bool,
+    force: bool,
+    configuration: bool,
+    version: str,
+    nightly: bool,
+    portable: bool,
+    plugin: bool,
+    manifest: str,
+    bundle_path: str,
+):
+    """
+    Install a package or a list of packages.
+    """
+    start_log()
+    if not manifest and not bundle_path and package_name == 'test':
+        print(f'{Fore.LIGHTRED_EX}A Package Name Must Be Supplied\nUsage: electric install <package-name>\n\nExamples:\nelectric install {Fore.LIGHTGREEN_EX}sublime-text-3{Fore.RESET}\n{Fore.LIGHTRED_EX}electric install {Fore.LIGHTGREEN_EX}sublime-text-3,notepad++{Fore.RESET}')
+        sys.exit()
+
+    if configuration:
+        from commands.configuration import config
+        ctx.invoke(
+            config,
+            config_path=package_name,
+            uninstall=False,
+            verbose=verbose,
+            debug=debug,
+            no_progress=no_progress,
+            logfile=logfile,
+            install_directory=install_directory,
+            virus_check=virus_check,
+            yes=yes,
+            silent=silent,
+            sync=sync,
+            reduce=reduce,
+            rate_limit=rate_limit
+        )
+        sys.exit()
+
+    if logfile:
+        logfile = logfile.replace('=', '')
+        logfile = logfile.replace('.txt', '.log')
+        from logging import INFO
+        create_config(logfile, INFO, 'Install')
+
+    log_info('Generating metadata...', logfile)
+
+    metadata = generate_metadata(
+        no_progress, silent, verbose, debug, no_color, yes, logfile, virus_check, reduce, rate_limit, Setting.new(), sync)
+
+    if update:
+        write('Updating Electric', 'bright_green', metadata)
+        update_package_list()
+
+    if plugin:
+        handle_plugin_installation(package_name, metadata)
+        sys.exit()
+
+    log_info('Successfully generated metadata.', metadata.logfile)
+
+    if bundle_path:
+        import offline
+
+        try:
+            offline.load(bundle_path)
+        except offline.BundleError as err:
+            write(str(err), 'bright_red', metadata)
+            sys.exit(1)
+
+        # Every package the bundle was exported with is installed unless some are named
+        if package_name == 'test':
+            package_name = ','.join(offline.bundle.packages)
+
+    handle_external_installation(
+        python, node, vscode, sublime, atom, version, package_name, metadata)
+
+    log_info('Setting up custom `ctrl+c` shortcut.', metadata.logfile)
+
+    # Split the supplied package_name by ,
+    # For example : 'sublime-text-3,atom' becomes ['sublime-text-3', 'atom']
+    packages = package_name.strip(' ').split(',')
+
+    if len(packages) > 1 and manifest:
+        write('Cannot Install Multiple Packages From A Single Manifest. Make sure you install only 1 package at a time while specifying --manifest', 'bright_red', metadata)
+        sys.exit()
+
+    if bundle_path:
+        # Names are looked up in the bundle, there's no package list to correct them against offline
+        corrected_package_names = list(dict.fromkeys(packages))
+    elif not manifest:
+        # Autocorrect all package names provided
+        corrected_package_names = list(set(get_autocorrections(
+            packages, get_correct_package_names(), metadata)))
+    else:
+        corrected_package_names = ['']
+
+    # Write install headers to debug
+    write_install_headers(metadata)
+
+    # Handle multi-threaded installation (see function for further clarification)
+
+    handle_multithreaded_installation(
+        corrected_package_names, install_directory, metadata, force)
+
+    # normal non-multi-threaded installation
+    for package in corrected_package_names:
+        tracing.set_track(package)
+        configs = {
+            'path': None,
+            'reduce': None,
+            'virus_check': None,
+        }
+
+        log_info('Handling Network Request...', metadata.logfile)
+        status = 'Networking'
+        write_verbose('Sending GET Request To /packages/', metadata)
+        write_debug('Sending GET Request To /packages', metadata)
+        log_info('Sending GET Request To /packages', metadata.logfile)
+        log_info('Updating SuperCache', metadata.logfile)
+        # request the json response of the package
+        from json.decoder import JSONDecodeError
+
+        if not manifest:
+            res = send_req_package(package)
+        else:
+            try:
+                f = open(manifest, 'r')
+                try:
+                    res = json.load(f)
+                except JSONDecodeError as e:
+                    print(
+                        f'Invalid Manifest JSON Syntax : {Fore.LIGHTRED_EX}{e}{Fore.RESET}')
+                    sys.exit()
+                package = res['package-name']
+
+            except FileNotFoundError:
+                write(f'{manifest} Does Not Exist!', 'bright_red', metadata)
+                write_verbose(f'{manifest} File Path Not Found!', metadata)
+                write_debug(
+                    f'{manifest} FileNotFoundError, Specified Manifest Cannot Be Found!', metadata)
+                log_info(
+                    f'{manifest} FileNotFoundError, Specified Manifest Cannot Be Found!', metadata.logfile)
+                sys.exit(1)
+
+        if not metadata.silent:
+            if not metadata.no_color:
+                print('SuperCached [', Fore.LIGHTCYAN_EX +
+                      f'{res["display-name"]}' + Fore.RESET + ' ]')
+            else:
+                print(f'SuperCached [ {res["display-name"]} ]')
+
+        log_info('Successfully Updated SuperCache', metadata.logfile)
+
+        pkg = res
+        log_info('Generating Packet For Further Installation.', metadata.logfile)
+
+        version = get_package_version(
+            pkg, res, version, portable, nightly, metadata)
+
+        pkg = pkg[version]
+
+        handle_portable_installation(version == 'portable', pkg, res, metadata)
+
+        if 'install-override-command' in list(pkg.keys()):
+            for operation in pkg['install-override-command']:
+                if 'admin' in list(operation.keys()):
+                    if operation['admin'] == True:
+                        if not is_admin():
+                            write('Installation Must Be Run As Administrator',
+                                  'bright_red', metadata)
+                            os._exit(1)
+
+                if operation['type'] == 'python':
+                    code = ''''''
+                    for line in operation['code']:
+                        code += line + '\n'
+                    exec(code)
+
+                elif operation['type'] == 'powershell' or operation['type'] == 'ps1':
+                    run_powershell(operation['code'], metadata)
+
+                elif operation['type'] == 'batch' or operation['type'] == 'cmd':
+                    run_batch(operation['code'], metadata)
+            sys.exit()
+
+        install_exit_codes = []
+        uninstall_exit_codes = []
+        if 'valid-install-exit-codes' in list(pkg.keys()):
+            install_exit_codes = pkg['valid-install-exit-codes']
+
+        if 'valid-uninstall-exit-codes' in list(pkg.keys()):
+            uninstall_exit_codes = pkg['valid-uninstall-exit-codes']
+
+        packet = Packet(
+            pkg,
+            package,
+            res['display-name'],
+            pkg['url'],
+            pkg['file-type'],
+            pkg['custom-location'],
+            pkg['install-switches'],
+            pkg['uninstall-switches'],
+            install_directory,
+            pkg['dependencies'],
+            install_exit_codes,
+            uninstall_exit_codes,
+            version,
+            pkg['run-test'] if 'run-test' in list(pkg.keys()) else False,
+            pkg['set-env'] if 'set-env' in list(pkg.keys()) else None,
+            pkg['default-install-dir'].replace('<appdata>', os.environ['APPDATA'].replace(
+                '\\Roaming', '')) if 'default-install-dir' in list(pkg.keys()) else None,
+            pkg['uninstall'] if 'uninstall' in list(pkg.keys()) else [],
+            pkg['add-path'] if 'add-path' in list(pkg.keys()) else None,
+            pkg['checksum'] if 'checksum' in list(pkg.keys()) else None,
+            pkg['bin'] if 'bin' in list(pkg.keys()) else None,
+            pkg['pre-update'] if 'pre-update' in list(pkg.keys()) else None,
+        )
+
+        write_verbose(
+            f'Rapidquery Successfully Received {packet.json_name}.json', metadata)
+        write_debug(
+            f'Rapidquery Successfully Received {packet.json_name}.json', metadata)
+        log_info(
+            f'Rapidquery Successfully Received {packet.json_name}.json', metadata.logfile)
+
+        handle_existing_installation(package, packet, force, metadata)
+
+        if 'add-path' in list(pkg.keys()):
+            if not is_admin():
+                write('Installation Must Be Run As Administrator',
+                      'bright_red', metadata)
+                os._exit(1)
+
+        if packet.dependencies:
+            ThreadedInstaller.install_dependent_packages(
+                packet, rate_limit, install_directory, metadata)
+
+        write_verbose(
+            f'Package to be installed: {packet.json_name}', metadata)
+        log_info(
+            f'Package to be installed: {packet.json_name}', metadata.logfile)
+
+        write_verbose(
+            f'Finding closest match to {packet.json_name}...', metadata)
+        log_info(
+            f'Finding closest match to {packet.json_name}...', metadata.logfile)
+
+        write_verbose('Generating system download path...', metadata)
+        log_info('Generating system download path...', metadata.logfile)
+
+        download_url = packet.win64
+
+        log_info(f'Recieved download path : {download_url}', metadata.logfile)
+        log_info('Initializing Rapid Download...', metadata.logfile)
+
+        # Downloading The File From Source
+        write_debug(
+            f'Downloading {packet.display_name} from => {packet.win64}', metadata)
+        write_verbose(
+            f"Downloading from '{download_url}'", metadata)
+        log_info(f"Downloading from '{download_url}'", metadata.logfile)
+
+        configs['path'] = download_installer(packet, download_url, metadata)
+
+        log_info('Finished Rapid Download', metadata.logfile)
+
+        log_info(
+            f'Installing {packet.display_name} through Setup{packet.win64_type}', metadata.logfile)
+        write_verbose('Creating registry start snapshot', metadata)
+        log_info('Creating start snapshot of registry...', metadata.logfile)
+
+        start_snap = get_environment_keys()
+
+        write_verbose('Checking for pre install code', metadata)
+        log_info('Checking for pre install code', metadata.logfile)
+
+        if 'pre-install' in list(pkg.keys()):
+            if isinstance(pkg['pre-install'], list):
+                write_verbose('Executing Pre-Installation Code', metadata)
+                log_info('Executing Pre-Installation Code', metadata.logfile)
+
+                for proc in pkg['pre-install']:
+                    if 'admin' in list(proc.keys()):
+                        if proc['admin'] == True:
+                            if not is_admin():
+                                write(
+                                    'Installation Must Be Run As Administrator', 'bright_red', metadata)
+                                os._exit(1)
+
+                    if proc['type'] == 'powershell':
+                        run_powershell([
+                            line.replace('<installer>', configs['path']).replace('<package-name>', packet.json_name).replace('<display-name>', packet.display_name).replace(
+                                '<version>', version).replace('<directory>', packet.directory if packet.directory != None else '').replace('<temp>', tempfile.gettempdir())
+                            for line in proc['code']
+                        ], metadata)
+
+                    if proc['type'] == 'cmd':
+                        run_batch([
+                            line.replace('<installer>', configs['path']).replace('<package-name>', packet.json_name).replace('<display-name>', packet.display_name).replace(
+                                '<version>', version).replace('<directory>', packet.directory if packet.directory != None else '').replace('<temp>', tempfile.gettempdir())
+                            for line in proc['code']
+                        ], metadata)
+
+                    if proc['type'] == 'python':
+                        ldict = {}
+                        code = ''''''
+                        for line in proc['code']:
+                            add = line.replace('<installer>', configs['path']).replace('<temp>', tempfile.gettempdir()).replace('<package-name>', packet.json_name).replace(
+                                '<display-name>', packet.display_name).replace('<directory>', packet.directory if packet.directory else '').replace('<version>', version) + '\n'
+
+                            if f'{packet.win64_type}{packet.win64_type}' in add:
+                                add = add.replace(
+                                    f'{packet.win64_type}{packet.win64_type}', f'{packet.win64_type}')
+
+                            code += add
+
+                        exec(code, globals(), ldict)
+                        for k in configs:
+                            if k in ldict:
+                                configs[k] = ldict[k]
+                    if 'override' in list(proc.keys()):
+                        if proc['override'] == True and len(corrected_package_names) == 1:
+                            sys.exit()
+                        elif len(corrected_package_names) > 1 and proc['override'] == True:
+                            continue
+
+        setup_name = configs['path']
+
+        if not 'pre-install' in list(pkg.keys()) or packet.win64_type not in configs['path']:
+            setup_name = configs['path'].split('\\')[-1] + packet.win64_type
+
+        status = 'Installing'
+
+        add_hotkey(
+            'ctrl+c', lambda: handle_exit(status, setup_name, metadata))
+
+        if f'{packet.win64_type}{packet.win64_type}' in configs['path']:
+            configs['path'] = configs['path'].replace(
+                f'{packet.win64_type}{packet.win64_type}', f'{packet.win64_type}')
+
+        if packet.checksum and metadata.settings.checksum:
+            verify_checksum(configs['path'], packet.checksum,
+                            force, metadata, newline=rate_limit != -1)
+
+        if virus_check or metadata.settings.virus_check:
+            log_info('Running requested virus scanning', metadata.logfile)
+            if not metadata.silent:
+                with Halo(text='Scanning File For Viruses ', text_color='cyan' if not metadata.no_color else 'white', color='green' if not metadata.no_color else 'white') as h:
+                    check_virus(configs['path'], metadata, h)
+
+        write_debug(
+            f'Installing {packet.display_name} through Setup{packet.win64_type}', metadata)
+
+        write(f'Installing {packet.display_name}',
+              'bright_cyan', metadata)
+        log_info(
+            'Using Rapid Install To Complete Setup, Accept Prompts Asking For Admin Permission...', metadata.logfile)
+
+        if not get_pid(setup_name):
+            # Running The Installer silently And Completing Setup
+            write_verbose(
+                f'Running {packet.display_name} Installer at {configs["path"]}', metadata)
+            log_info(
+                f'Running {packet.display_name} Installer at {configs["path"]}', metadata.logfile)
+            install_package(configs['path'], packet, metadata)
+        else:
+            disp_error_msg(get_error_message(
+                '1618', 'install', packet.display_name, version, metadata, packet.json_name), metadata)
+
+        log_info('Deregistering ctrl+c abort shortcut', metadata.logfile)
+        write_verbose('Deregistering ctrl+c abort shortcut', metadata)
+        remove_hotkey('ctrl+c')
+        write_verbose('Checking for post install code', metadata)
+        log_info('Checking for post install code', metadata.logfile)
+
+        if 'post-install' in list(pkg.keys()):
+            if isinstance(pkg['post-install'], list):
+                for proc in pkg['post-install']:
+                    if 'admin' in list(proc.keys()):
+                        if proc['admin'] == True:
+                            if not is_admin():
+                                write(
+                                    'Installation Must Be Run As Administrator', 'bright_red', metadata)
+                                os._exit(1)
+                    if proc['type'] == 'powershell':
+                        run_powershell([
+                            line.replace('<installer>', configs['path']).replace('<package-name>', packet.json_name).replace(
+                                '<display-name>', packet.display_name).replace('<version>', version).replace('<temp>', tempfile.gettempdir())
+                            for line in proc['code']
+                        ], metadata)
+
+                    if proc['type'] == 'cmd':
+                        run_batch([
+                            line.replace('<installer>', configs['path']).replace('<package-name>', packet.json_name).replace(
+                                '<display-name>', packet.display_name).replace('<version>', version).replace('<temp>', tempfile.gettempdir())
+                            for line in proc['code']
+                        ], metadata)
+
+                    if proc['type'] == 'python':
+                        ldict = {}
+                        code = ''''''
+                        for line in proc['code']:
+                            code += line.replace('<installer>', configs['path']).replace('<temp>', tempfile.gettempdir()).replace(
+                                '<package-name>', packet.json_name).replace('<display-name>', packet.display_name).replace('<version>', version) + '\n'
+                        exec(code, globals())
+
+        status = 'Installed'
+        write_verbose('Creating registry end snapshot', metadata)
+        log_info('Creating final snapshot of registry', metadata.logfile)
+        changes_environment = False
+
+        if packet.shim:
+            changes_environment = True
+
+            for shim in packet.shim:
+                replace_install_dir = ''
+
+                if packet.directory:
+                    replace_install_dir = packet.directory
+
+                elif packet.default_install_dir:
+                    replace_install_dir = packet.default_install_dir
+
+                shim = shim.replace(
+                    '<install-directory>', replace_install_dir).replace('<version>', packet.version)
+                shim_name = shim.split("\\")[-1].split('.')[0]
+                write(f'Generating Shim For {shim_name}', 'cyan', metadata)
+
+            generate_shim(shim, shim_name.replace(
+                '<version>', packet.version), shim.split('.')[-1])
+
+        final_snap = get_environment_keys()
+
+        if packet.add_path:
+            replace_install_dir = ''
+
+            if packet.directory:
+                replace_install_dir = packet.directory
+
+            elif packet.default_install_dir:
+                replace_install_dir = packet.default_install_dir
+
+            write(
+                f'Appending "{packet.add_path.replace("<install-directory>", replace_install_dir)}" To PATH', 'bright_green', metadata)
+            write_verbose(
+                f'Appending "{packet.add_path.replace("<install-directory>", replace_install_dir)}" To PATH', metadata)
+            log_info(
+                f'Appending "{packet.add_path.replace("<install-directory>", replace_install_dir)}" To PATH', metadata.logfile)
+            append_to_path(packet.add_path.replace(
+                '<install-directory>', replace_install_dir))
+
+        if packet.set_env:
+            if isinstance(packet.set_env, list):
+                for obj in packet.set_env:
+                    name = obj['name']
+                    replace_install_dir = ''
+
+                    if packet.directory:
+                        replace_install_dir = packet.directory
+
+                    elif packet.default_install_dir:
+                        replace_install_dir = packet.default_install_dir
+
+                    write(
+                        f'Setting Environment Variable {name}', 'bright_green', metadata)
+                    write_verbose(
+                        f'Setting Environment Variable {name} to {obj["value"].replace("<install-directory>", replace_install_dir)}', metadata)
+                    log_info(
+                        f'Setting Environment Variable {name} to {obj["value"].replace("<install-directory>", replace_install_dir)}', metadata.logfile)
+
+                    set_environment_variable(
+                        name, obj['value'].replace('<install-directory>', replace_install_dir))
+
+            else:
+                name = packet.set_env['name']
+                replace_install_dir = ''
+
+                if packet.directory:
+                    replace_install_dir = packet.directory
+
+                elif packet.default_install_dir:
+                    replace_install_dir = packet.default_install_dir
+
+                write(
+                    f'Setting Environment Variable {name}', 'bright_green', metadata)
+                write_verbose(
+                    f'Setting Environment Variable {name} to {packet.set_env["value"].replace("<install-directory>", replace_install_dir)}', metadata)
+                log_info(
+                    f'Setting Environment Variable {name} to {packet.set_env["value"].replace("<install-directory>", replace_install_dir)}', metadata.logfile)
+
+                set_environment_variable(
+                    name, packet.set_env['value'].replace('<install-directory>', replace_install_dir))
+
+        if final_snap.env_length > start_snap.env_length or final_snap.sys_length > start_snap.sys_length or changes_environment:
+
+            write('The PATH environment variable has changed. Run `refreshenv` to refresh your environment variables.',
+                  'bright_green', metadata)
+
+        if metadata.reduce_package:
+            write_verbose(
+                f'Deleting installer files at {tempfile.gettempdir()}', metadata)
+            log_info(
+                f'Deleting installer files at {tempfile.gettempdir()}', metadata.logfile)
+            write_debug(
+                f'Deleting installer files at {tempfile.gettempdir()}. Path : ({configs["path"]}{packet.win64_type})', metadata)
+            try:
+                os.remove(f'{configs["path"]}')
+                os.remove(
+                    Rf'{tempfile.gettempdir()}\electric\downloadcache.pickle')
+                os.remove(
+                    Rf'{tempfile.gettempdir()}\electric\unfinishedcache.pickle')
+            except FileNotFoundError:
+                pass
+
+            log_info(
+                'Successfully Cleaned Up Installer From Temporary Directory And DownloadCache', metadata.logfile)
+            write('Successfully Cleaned Up Installer From Temp Directory',
+                  'bright_green', metadata)
+
+        if not packet.run_test:
+            write_verbose(f'Running tests for {packet.display_name}', metadata)
+
+            write_debug(
+                f'No Pre-Defined Tests found for {packet.display_name}', metadata)
+            log_info(
+                f'No Pre-Defined Tests found for {packet.display_name}', metadata.logfile)
+
+            write(
+                f'Running Tests For {packet.display_name}', 'bright_white', metadata)
+
+            write_debug(
+                f'All Pre-Defined checks for {packet.display_name} passed. Registering successful package installation', metadata)
+            write_verbose(
+                f'All Pre-Defined checks for {packet.display_name} passed', metadata)
+            log_info(
+                f'All Pre-Defined checks for {packet.display_name} passed', metadata.logfile)
+            if not metadata.no_color:
+                write(f'[{Fore.LIGHTGREEN_EX} OK {Fore.RESET}] Pre-Defined Checks',
+                      'bright_white', metadata)
+            else:
+                write(f'[ OK ] Pre-Defined Checks', 'bright_white', metadata)
+            register_package_success(packet, install_directory, metadata)
+
+            write(
+                f'Successfully Installed {packet.display_name}', 'bright_magenta', metadata)
+
+            log_info(
+                f'Successfully Installed {packet.display_name}', metadata.logfile)
+        else:
+            write_verbose(f'Running tests for {packet.display_name}', metadata)
+            write_debug(
+                f'Pre-Defined Checks found for {packet.display_name}', metadata)
+            log_info(
+                f'Running pre-defined checks found for {packet.display_name}', metadata.logfile)
+            write(
+                f'Running Tests For {packet.display_name}', 'bright_white', metadata)
+            if find_existing_installation(packet.json_name, packet.display_name):
+                if not metadata.no_color:
+                    write(
+                        f'[ {Fore.LIGHTGREEN_EX}OK{Fore.RESET} ]  Registry Check', 'bright_white', metadata)
+                else:
+                    write(f'[ OK ] Registry Check', 'bright_white', metadata)
+
+                write_debug(
+                    'Passed Registry Check. Registering Package Success', metadata)
+                register_package_success(packet, install_directory, metadata)
+                write(
+                    f'Successfully Installed {packet.display_name}', 'bright_magenta', metadata)
+                log_info(
+                    f'Successfully Installed {packet.display_name}', metadata.logfile)
+            else:
+                write(
+                    f'[ {Fore.LIGHTRED_EX}ERROR{Fore.RESET} ] Registry Check', 'bright_white', metadata)
+                write('Retrying Registry Check In 5 seconds',
+                      'bright_yellow', metadata)
+                tm.sleep(5)
+                if find_existing_installation(packet.json_name, packet.display_name):
+                    write(
+                        f'[ {Fore.LIGHTGREEN_EX}OK{Fore.RESET} ]  Registry Check', 'bright_white', metadata)
+                    register_package_success(
+                        packet, install_directory, metadata)
+                    write(
+                        f'Successfully Installed {packet.display_name}', 'bright_magenta', metadata)
+                    log_info(
+                        f'Successfully Installed {packet.display_name}', metadata.logfile)
+                else:
+                    write(
+                        f'[ {Fore.LIGHTRED_EX}ERROR{Fore.RESET} ] Registry Check', 'bright_white', metadata)
+                    write(
+                        f'Failed To Install {packet.display_name}', 'bright_red', metadata)
+                sys.exit()
+
+        version = ''
+        display_support(metadata)
+        write_verbose(
+            'Installation and setup completed with exit code 0', metadata)
+        write_verbose('Terminating verbose logger', metadata)
+        log_info('Installation and setup completed.', metadata.logfile)
+        write_debug(
+            f'Terminated debugger at {strftime("%H:%M:%S")} on install::completion', metadata)
+        log_info(
+            f'Terminated debugger at {strftime("%H:%M:%S")} on install::completion', metadata.logfile)
+        close_log(metadata.logfile, 'Install')
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('package_name', required=True)
+@click.option('--no-progress', '-np', is_flag=True, default=False, help='Disable progress bar for update')
+@click.option('--no-color', '-nc', is_flag=True, help='Disable colored output for update')
+@click.option('--verbose', '-vb', is_flag=True, help='Enable verbose mode for update')
+@click.option('--log-output', '-l', 'logfile', help='Log output to the specified file')
+@click.option('--debug', '-d', is_flag=True, help='Enable debug mode for update')
+@click.option('--silent', '-s', is_flag=True, help='Completely silent update without any output to console')
+@click.option('--virus-check', '-vc', is_flag=True, help='Check for virus before bundle update')
+@click.option('--rate-limit', '-rl', type=int, default=-1)
+@click.option('-y', '--yes', is_flag=True, help='Accept all prompts during update')
+@click.option('--reduce', '-rd', is_flag=True, help='Cleanup all traces of package after bundle update')
+@click.option('--local', '-ll', is_flag=True, help='')
+@click.option('--portable', '-p', is_flag=True, help='')
+@click.pass_context
+def up(
+    ctx,
+    package_name: str,
+    verbose: bool,
+    debug: bool,
+    no_color: bool,
+    logfile: str,
+    yes: bool,
+    silent: bool,
+    no_progress: bool,
+    rate_limit: int,
+    reduce: bool,
+    virus_check: bool,
+    local: bool,
+    portable: bool,
+):
+    """
+    Updates an existing package
+    """
+    from zip_update import update_portable
+
+    update_package_list()
+    if package_name == 'electric' or package_name == 'self':
+        sys.exit()
+
+    if package_name == 'all':
+        for receipt in get_state().get_receipts():
+            ctx.invoke(
+                up,
+                package_name=receipt['json-name'],
+                verbose=verbose,
+                debug=debug,
+                no_color=no_color,
+                logfile=logfile,
+                yes=yes,
+                silent=silent,
+                no_progress=no_progress,
+                rate_limit=rate_limit,
+                reduce=reduce,
+                virus_check=virus_check,
+                local=local if local else False
+            )
+        sys.exit()
+
+    metadata = generate_metadata(
+        None, None, None, None, None, None, None, None, None, None, Setting.new(), None)
+
+    log_info('Setting up custom `ctrl+c` shortcut.', metadata.logfile)
+    status = 'Initializing'
+    setup_name = ''
+    add_hotkey(
+        'ctrl+c', lambda: handle_exit(status, setup_name, metadata))
+
+    packages = package_name.strip(' ').split(',')
+
+    corrected_package_names = get_autocorrections(
+        packages, get_correct_package_names(), metadata)
+    corrected_package_names = list(set(corrected_package_names))
+
+    write_install_headers(metadata)
+
+    for package in corrected_package_names:
+        tracing.set_track(package)
+        spinner = halo.Halo(color='grey', text='Finding Packages')
+        spinner.start()
+        log_info('Handling Network Request...', metadata.logfile)
+        status = 'Networking'
+        write_verbose('Sending GET Request To /packages/', metadata)
+        write_debug('Sending GET Request To /packages', metadata)
+        log_info('Sending GET Request To /packages', metadata.logfile)
+        log_info('Updating SuperCache', metadata.logfile)
+        res = send_req_package(package)
+        log_info('Successfully Updated SuperCache', metadata.logfile)
+        spinner.stop()
+        pkg = res
+        if portable:
+            pkg = pkg['portable']
+            keys = list(pkg[pkg['latest-version']].keys())
+            data = {
+                'display-name': res['display-name'],
+                'package-name': res['package-name'],
+                'latest-version': res['latest-version'],
+                'url': pkg[pkg['latest-version']]['url'],
+                'file-type': pkg[pkg['latest-version']]['file-type'] if 'file-type' in keys else None,
+                'extract-dir': res['package-name'],
+                'chdir': pkg[pkg['latest-version']]['chdir'] if 'chdir' in keys else [],
+                'bin': pkg[pkg['latest-version']]['bin'] if 'bin' in keys else [],
+                'shortcuts': pkg[pkg['latest-version']]['shortcuts'] if 'shortcuts' in keys else [],
+                'pre-install': pkg[pkg['latest-version']]['pre-install'] if 'pre-install' in keys else [],
+                'post-install': pkg[pkg['latest-version']]['post-install'] if 'post-install' in keys else [],
+                'install-notes': pkg[pkg['latest-version']]['install-notes'] if 'install-notes' in keys else None,
+                'uninstall-notes': pkg[pkg['latest-version']]['uninstall-notes'] if 'uninstall-notes' in keys else None,
+                'set-env': pkg[pkg['latest-version']]['set-env'] if 'set-env' in keys else None,
+                'persist': pkg[pkg['latest-version']]['persist'] if 'persist' in keys else None,
+                'checksum': pkg[pkg['latest-version']]['checksum'] if 'checksum' in keys else None,
+                'dependencies': pkg[pkg['latest-version']]['dependencies'] if 'dependencies' in keys else None,
+            }
+            packet = PortablePacket(data)
+            update_portable(ctx, packet, metadata)
+
+        pkg = res
+        pkg = pkg[pkg['latest-version']]
+
+        packet = Packet(
+            pkg,
+            package,
+            res['display-name'],
+            pkg['url'],
+            pkg['file-type'],
+            pkg['custom-location'],
+            pkg['install-switches'],
+            pkg['uninstall-switches'],
+            None,
+            pkg['dependencies'],
+            None,
+            [],
+            res['latest-version'],
+            pkg['run-check'] if 'run-check' in list(res.keys()) else True,
+            pkg['set-env'] if 'set-env' in list(pkg.keys()) else None,
+            pkg['default-install-dir'].replace('<appdata>', os.environ['APPDATA'].replace(
+                '\\Roaming', '')) if 'default-install-dir' in list(pkg.keys()) else None,
+            pkg['uninstall'] if 'uninstall' in list(pkg.keys()) else [],
+            pkg['add-path'] if 'add-path' in list(pkg.keys()) else None,
+            pkg['checksum'] if 'checksum' in list(pkg.keys()) else None,
+            pkg['bin'] if 'bin' in list(pkg.keys()) else None,
+            pkg['pre-update'] if 'pre-update' in list(pkg.keys()) else None,
+        )
+
+        log_info('Generating Packet For Further Installation.', metadata.logfile)
+        receipt = get_state().get_receipt(package)
+
+        if receipt:
+            if check_newer_version(package, packet):
+                package_name = package
+                installed_version = version = receipt['version']
+                if not yes:
+                    if not local:
+                        continue_update = confirm(
+                            f'{package_name} would be updated from version {installed_version} to {packet.version}')
+                    else:
+                        write(
+                            rf'There is a newer version of {packet.display_name} Availiable ({installed_version}) => ({packet.version})', 'bright_yellow', metadata)
+                        sys.exit()
+                else:
+                    continue_update = True
+
+                if packet.pre_update:
+                    if isinstance(packet.pre_update, list):
+                        write_verbose('Executing Pre-Update Code', metadata)
+                        log_info('Executing Pre-Update Code', metadata.logfile)
+
+                        for proc in packet.pre_update:
+                            if 'admin' in list(proc.keys()):
+                                if proc['admin'] == True:
+                                    if not is_admin():
+                                        write(
+                                            'Installation Must Be Run As Administrator', 'bright_red', metadata)
+                                        os._exit(1)
+
+                            if proc['type'] == 'powershell':
+                                run_powershell([
+                                    line.replace('<package-name>', packet.json_name).replace('<display-name>', packet.display_name).replace(
+                                        '<version>', version).replace('<directory>', packet.directory if packet.directory != None else '').replace('<temp>', tempfile.gettempdir())
+                                    for line in proc['code']
+                                ], metadata)
+
+                            if proc['type'] == 'cmd':
+                                run_batch([
+                                    line.replace('<package-name>', packet.json_name).replace('<display-name>', packet.display_name).replace(
+                                        '<version>', version).replace('<directory>', packet.directory if packet.directory != None else '').replace('<temp>', tempfile.gettempdir())
+                                    for line in proc['code']
+                                ], metadata)
+
+                            if proc['type'] == 'python':
+                                code = ''''''
+                                for line in proc['code']:
+                                    add = line.replace('<temp>', tempfile.gettempdir()).replace('<package-name>', packet.json_name).replace(
+                                        '<display-name>', packet.display_name).replace('<directory>', packet.directory if packet.directory else '').replace('<version>', version) + '\n'
+
+                                    if f'{packet.win64_type}{packet.win64_type}' in add:
+                                        add = add.replace(
+                                            f'{packet.win64_type}{packet.win64_type}', f'{packet.win64_type}')
+
+                                    code += add
+
+                                exec(code)
+
+                if continue_update:
+                    ctx.invoke(
+                        uninstall,
+                        package_name=package,
+                        verbose=verbose,
+                        debug=debug,
+                        no_color=no_color,
+                        logfile=logfile,
+                        yes=yes,
+                        silent=silent,
+                        python=None,
+                    )
+                    ctx.invoke(
+                        install,
+                        package_name=package,
+                        verbose=verbose,
+                        debug=debug,
+                        no_progress=no_progress,
+                        no_color=no_color,
+                        logfile=logfile,
+                        virus_check=virus_check,
+                        yes=yes,
+                        silent=silent,
+                        python=None,
+                        node=None,
+                        reduce=reduce,
+                        rate_limit=rate_limit
+                    )
+                    write(
+                        f'Successfully Updated {package} to latest version.', 'bright_green', metadata)
+
+                    index += 1
+                else:
+                    handle_exit('Error', '', metadata)
+
+            else:
+                print(f'{packet.display_name} Is Already On The Latest Version')
+        else:
+            write(f'{packet.display_name} Is Not Installed',
+                  'bright_red', metadata)
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('package_name', required=True)
+@click.option('--version', '-v', 'version', help='Version to roll back to, defaults to the newest kept version older than the active one')
+@click.option('--no-color', '-nc', is_flag=True, help='Disable colored output for rollback')
+@click.option('--log-output', '-l', 'logfile', help='Log output to the specified file')
+@click.option('--silent', '-s', is_flag=True, help='Completely silent rollback without any output to console')
+def rollback(package_name: str, version: str, no_color: bool, logfile: str, silent: bool):
+    """
+    Switches a portable package back to a version kept from an earlier install
+    """
+    from zip_versions import rollback_portable
+
+    metadata = generate_metadata(
+        None, silent, None, None, no_color, None, logfile, None, None, None, Setting.new(), None)
+
+    rollback_portable(package_name, version, metadata)
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('package_name', required=False, default='test')
+@click.option('--manifest', '-m', 'manifest', help='Read from a manifest file instead of querying from the community repository')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose mode for uninstallation')
+@click.option('--debug', '-d', is_flag=True, help='Enable debug mode for uninstallation')
+@click.option('--no-color', '-nc', is_flag=True, help='Disable colored output for uninstallation')
+@click.option('--log-output', '-l', 'logfile', help='Log output to the specified file')
+@click.option('-y', '--yes', is_flag=True, help='Accept all prompts during uninstallation')
+@click.option('--silent', '-s', is_flag=True, help='Completely silent uninstallation without any output to console')
+@click.option('--python', '-py', is_flag=True, help='Specify a Python package to uninstall')
+@click.option('--atom', '-ato', is_flag=True, help='Specify an Atom extension to uninstall')
+@click.option('--vscode', '-vs', is_flag=True, help='Specify a Visual Studio Code extension to uninstall')
+@click.option('--nightly', '--pre-release', is_flag=True, help='Specify a Visual Studio Code extension to uninstall')
+@click.option('--node', '-npm', is_flag=True, help='Specify a Python package to uninstall')
+@click.option('--portable', '--non-admin', '-p', is_flag=True, help='Uninstall a portable version of a package')
+@click.option('--plugin', '-pg', is_flag=True, help='Uninstall a plugin of a package')
+@click.option('--configuration', '-cf', is_flag=True, help='Specify a config file to uninstall')
+@click.option('--ae', is_flag=True)
+@click.option('--skp', is_flag=True)
+@click.pass_context
+def uninstall(
+    ctx,
+    package_name: str,
+    verbose: bool,
+    debug: bool,
+    no_color: bool,
+    logfile: str,
+    yes: bool,
+    silent: bool,
+    python: bool,
+    vscode: bool,
+    node: bool,
+    atom: bool,
+    plugin: bool,
+    configuration: bool,
+    portable: bool,
+    ae: bool,
+    nightly: bool,
+    skp: bool,
+    manifest: str
+):
+    """
+    Uninstall a package or a list of packages.
+    """
+
+    from timeit import default_timer as timer
+
+    if not manifest and package_name == 'test':
+        print(f'{Fore.LIGHTRED_EX}A Package Name Must Be Supplied\nUsage: electric uninstall <package-name>\n\nExamples:\nelectric uninstall {Fore.LIGHTGREEN_EX}sublime-text-3{Fore.RESET}\n{Fore.LIGHTRED_EX}electric uninstall {Fore.LIGHTGREEN_EX}sublime-text-3,notepad++{Fore.RESET}')
+        sys.exit()
+
+    start_log()
+    if configuration:
+        from commands.configuration import config
+        ctx.invoke(
+            config,
+            config_path=package_name,
+            remove=True,
+            verbose=verbose,
+            debug=debug,
+            no_progress=None,
+            logfile=logfile,
+            install_directory=None,
+            virus_check=None,
+            yes=yes,
+            silent=silent,
+            sync=None,
+            reduce=None,
+            rate_limit=None
+        )
+        sys.exit()
+
+    if logfile:
+        logfile = logfile.replace('.txt', '.log')
+        from logging import INFO
+        create_config(logfile, INFO, 'Install')
+
+    log_info('Generating metadata...', logfile)
+
+    metadata = generate_metadata(
+        None, silent, verbose, debug, no_color, yes, logfile, None, None, None, Setting.new(), None)
+
+    if plugin:
+        handle_plugin_uninstallation(package_name, metadata)
+
+    log_info('Successfully generated metadata.', logfile)
+
+    log_info('Checking if supercache exists...', metadata.logfile)
+
+    handle_external_uninstallation(
+        python, node, vscode, False, atom, package_name, metadata)
+
+    log_info('Setting up custom `ctrl+c` shortcut.', metadata.logfile)
+
+    status = 'Initializing'
+    setup_name = ''
+    add_hotkey(
+        'ctrl+c', lambda: handle_exit(status, setup_name, metadata))
+
+    packages = package_name.split(',')
+
+    if len(packages) > 1 and manifest:
+        write('Cannot Install Multiple Packages From A Single Manifest. Make sure you install only 1 package at a time while specifying --manifest', 'bright_red', metadata)
+        sys.exit()
+
+    if not manifest:
+        corrected_package_names = get_autocorrections(
+            packages, get_correct_package_names(), metadata)
+        corrected_package_names = list(set(corrected_package_names))
+    else:
+        corrected_package_names = ['']
+
+    write_uninstall_headers(metadata)
+
+    index = 0
+
+    for package in corrected_package_names:
+        tracing.set_track(package)
+        installed_packages = [receipt['json-name'] for receipt in get_state().get_receipts()]
+        portable_installed_packages = [''.join(
+            f.split('@')[:1]) for f in os.listdir(os.path.expanduser('~') + r'\electric')]
+        installed_packages += portable_installed_packages
+
+        from json.decoder import JSONDecodeError
+        if not manifest:
+            res = send_req_package(package)
+        else:
+            try:
+                f = open(manifest, 'r')
+                try:
+                    res = json.load(f)
+                except JSONDecodeError as e:
+                    print('Invalid Manifest JSON Syntax : ', e.msg)
+                    sys.exit()
+
+                package = res['package-name']
+
+            except FileNotFoundError:
+                write(f'{manifest} Does Not Exist!', 'bright_red', metadata)
+                write_verbose(f'{manifest} File Path Not Found!', metadata)
+                write_debug(
+                    f'{manifest} FileNotFoundError, Specified Manifest Cannot Be Found!', metadata)
+                log_info(
+                    f'{manifest} FileNotFoundError, Specified Manifest Cannot Be Found!', metadata.logfile)
+                sys.exit(1)
+
+        if not metadata.no_color:
+            write(
+                f'SuperCached [ {Fore.LIGHTCYAN_EX}{res["display-name"]}{Fore.RESET} ]', 'bright_white', metadata)
+        else:
+            write(f'SuperCached [ {res["display-name"]} ]',
+                  'bright_white', metadata)
+
+        if 'is-portable' in list(res.keys()):
+            if res['is-portable'] == True:
+                portable = True
+
+        if portable:
+            version = 'portable'
+        else:
+            version = res['latest-version']
+        pkg = res[version]
+
+        if 'uninstall-override-command' in list(pkg.keys()):
+            for operation in pkg['uninstall-override-command']:
+                if 'admin' in list(operation.keys()):
+                    if operation['admin'] == True:
+                        if not is_admin():
+                            write(
+                                'Uninstallation Must Be Run As Administrator', 'bright_red', metadata)
+                            os._exit(1)
+
+                if operation['type'] == 'python':
+                    code = ''''''
+                    for line in operation['code']:
+                        code += line.replace('<display-name>', res['display-name']).replace(
+                            '<package-name>', res['package-name']).replace('<version>', version) + '\n'
+                    exec(code)
+
+                elif operation['type'] == 'powershell' or operation['type'] == 'ps1':
+                    run_powershell(operation['code'], metadata)
+
+                elif operation['type'] == 'batch' or operation['type'] == 'cmd':
+                    run_batch(operation['code'], metadata)
+            sys.exit()
+
+        # If the package is not installed, let the user know
+        if not skp:
+            if package not in installed_packages:
+                pkg = res
+                if 'is-portable' in list(pkg.keys()):
+                    if pkg['is-portable'] == True:
+                        portable = True
+
+                if portable:
+                    version = 'portable'
+                else:
+                    version = pkg['latest-version']
+
+                uninstall_exit_codes = []
+                if 'valid-uninstall-exit-codes' in list(pkg.keys()):
+                    uninstall_exit_codes = pkg['valid-install-exit-codes']
+
+                pkg = pkg[version]
+                display_name = res['display-name']
+                write(
+                    f'Could not find any existing installations of {display_name}', 'bright_red', metadata)
+                events.emit('failed', package, reason='not-installed')
+                get_state().remove_receipt(package)
+                close_log(metadata.logfile, 'Uninstall')
+                continue
+
+        # Continue with normal installation because the package has not been installed yet
+        pkg = res
+        if 'is-portable' in list(pkg.keys()):
+            if pkg['is-portable'] == True:
+                portable = True
+
+        if portable:
+            version = 'portable'
+        else:
+            version = pkg['latest-version']
+
+        name = pkg['display-name']
+        pkg = pkg[version]
+        #
+        override_uninstall_switches = pkg['override-default-uninstall-switches'] if 'override-default-uninstall-switches' in list(
+            pkg.keys()) else False
+        log_info('Generating Packet For Further Installation.', metadata.logfile)
+
+        handle_portable_uninstallation(
+            version == 'portable', res, pkg, metadata)
+
+        install_exit_codes = []
+        uninstall_exit_codes = []
+
+        if 'valid-install-exit-codes' in list(pkg.keys()):
+            install_exit_codes = pkg['valid-install-exit-codes']
+
+        if 'valid-uninstall-exit-codes' in list(pkg.keys()):
+            uninstall_exit_codes = pkg['valid-uninstall-exit-codes']
+
+        packet = Packet(
+            pkg,
+            package,
+            name,
+            pkg['url'],
+            pkg['file-type'],
+            pkg['custom-location'],
+            pkg['install-switches'],
+            pkg['uninstall-switches'],
+            None,
+            pkg['dependencies'],
+            install_exit_codes,
+            uninstall_exit_codes,
+            version,
+            pkg['run-check'] if 'run-check' in list(pkg.keys()) else False,
+            pkg['set-env'] if 'set-env' in list(pkg.keys()) else None,
+            pkg['default-install-dir'].replace('<appdata>', os.environ['APPDATA'].replace(
+                '\\Roaming', '')) if 'default-install-dir' in list(pkg.keys()) else None,
+            pkg['uninstall'] if 'uninstall' in list(pkg.keys()) else [],
+            pkg['add-path'] if 'add-path' in list(pkg.keys()) else None,
+            pkg['checksum'] if 'checksum' in list(pkg.keys()) else None,
+            pkg['bin'] if 'bin' in list(pkg.keys()) else None,
+            pkg['pre-update'] if 'pre-update' in list(pkg.keys()) else None,
+        )
+
+        proc = None
+        ftp = ['.msix', '.msixbundle', '.appxbundle', '.appx']
+
+        if packet.dependencies:
+            handle_uninstall_dependencies(packet, metadata)
+
+        if packet.win64_type in ftp:
+            if find_msix_installation(pkg['uninstall-bundle-identifier']):
+                if uninstall_msix(pkg['uninstall-bundle-identifier']) == 0:
+                    events.emit('uninstalled', package)
+                    write(
+                        f'Successfully Uninstalled {packet.display_name}', 'bright_green', metadata)
+                    close_log(metadata.logfile, 'Uninstall')
+                    sys.exit()
+
+        add_hotkey(
+            'ctrl+c', lambda: kill_proc(proc, metadata))
+
+        log_info(
+            f'Rapidquery Successfully Received {packet.json_name}.json', metadata.logfile)
+
+        # Getting UninstallString or QuietUninstallString From The Registry Search Algorithm
+        write_verbose(
+            'Fetching uninstall key from the registry...', metadata)
+        write_debug('Sending query (uninstall-string) to Registry', metadata)
+        log_info('Fetching uninstall key from the registry...', metadata.logfile)
+
+        start = timer()
+        key = get_uninstall_key(packet.json_name, packet.display_name)
+        end = timer()
+
+        if not key:
+            log_info(
+                f'electric didn\'t detect any existing installations of => {packet.display_name}', metadata.logfile)
+
+            pkg = res
+            version = pkg['latest-version']
+            name = pkg['display-name']
+            pkg = pkg[version]
+            log_info('Generating Packet For Further Installation.',
+                     metadata.logfile)
+
+            uninstall_exit_codes = []
+
+            packet = Packet(
+                pkg,
+                package,
+                name,
+                pkg['url'],
+                pkg['file-type'],
+                pkg['custom-location'],
+                pkg['install-switches'],
+                pkg['uninstall-switches'],
+                None,
+                pkg['dependencies'],
+                None,
+                uninstall_exit_codes,
+                version,
+                pkg['run-check'] if 'run-check' in list(res.keys()) else True,
+                pkg['set-env'] if 'set-env' in list(pkg.keys()) else None,
+                pkg['default-install-dir'].replace('<appdata>', os.environ['APPDATA'].replace(
+                    '\\Roaming', '')) if 'default-install-dir' in list(pkg.keys()) else None,
+                pkg['uninstall'] if 'uninstall' in list(pkg.keys()) else [],
+                pkg['add-path'] if 'add-path' in list(pkg.keys()) else None,
+                pkg['checksum'] if 'checksum' in list(pkg.keys()) else None,
+                pkg['bin'] if 'bin' in list(pkg.keys()) else None,
+                pkg['pre-update'] if 'pre-update' in list(
+                    pkg.keys()) else None,
+            )
+
+            write(
+                f'Could not find any existing installations of {packet.display_name}', 'bright_red', metadata)
+            events.emit('failed', package, reason='not-installed')
+            get_state().remove_receipt(package, packet.version)
+            close_log(metadata.logfile, 'Uninstall')
+            index += 1
+            continue
+
+        kill_running_proc(packet.json_name, packet.display_name, metadata)
+
+        if not ae:
+            write_verbose('Uninstall key found.', metadata)
+            log_info('Uninstall key found.', metadata.logfile)
+            log_info(key, metadata.logfile)
+            write_debug(
+                'Successfully Recieved UninstallString from Windows Registry', metadata)
+
+            write(
+                f'Successfully Retrieved Uninstall Key In {round(end - start, 4)}s', 'bright_green', metadata)
+            log_info(
+                f'Successfully Retrieved Uninstall Key In {round(end - start, 4)}s', metadata.logfile)
+
+        command = ''
+
+        # Key Can Be A List Or A Dictionary Based On Results
+
+        if isinstance(key, list):
+            if key:
+                key = key[0]
+
+        if not metadata.no_color:
+            write(
+                f'{Fore.LIGHTCYAN_EX}Uninstalling {packet.display_name}{Fore.RESET}', 'bright_white', metadata)
+        else:
+            write(
+                f'Uninstalling {packet.display_name}', 'bright_white', metadata)
+
+        if 'QuietUninstallString' in key:
+
+            command = key['QuietUninstallString']
+            if command.startswith("msiexec.exe") or command.startswith("MSIEXEC.EXE"):
+                command = command.replace('/I', '/X')
+                command = command.replace('/quiet', '/qn')
+
+            if override_uninstall_switches:
+                if '--' in command:
+                    command = command.split('--')[0:1][0].strip()
+                if '/' in command:
+                    command = command.split('/')[0:1][0].strip()
+
+            additional_switches = None
+            if packet.uninstall_switches:
+                if packet.uninstall_switches != []:
+                    write_verbose(
+                        'Adding additional uninstall switches', metadata)
+                    write_debug(
+                        'Appending additional uninstallation switches', metadata)
+                    log_info('Adding additional uninstall switches',
+                             metadata.logfile)
+                    additional_switches = packet.uninstall_switches
+
+            if additional_switches:
+                for switch in additional_switches:
+                    command += ' ' + switch
+
+            write_verbose('Executing the quiet uninstall command', metadata)
+            log_info(
+                f'Executing the quiet uninstall command => {command}', metadata.logfile)
+            write_debug('Running silent uninstallation command', metadata)
+            run_test = run_cmd(command.replace(
+                '<version>', packet.version), metadata, 'uninstallation', packet)
+
+            if not packet.run_test:
+                packet.run_test = run_test
+
+            if packet.set_env:
+                if isinstance(packet.set_env, list):
+                    for obj in packet.set_env:
+                        delete_environment_variable(obj['name'])
+
+                else:
+                    delete_environment_variable(packet.set_env['name'])
+
+            if packet.shim:
+                home = os.path.expanduser('~')
+
+                for shim in packet.shim:
+                    replace_install_dir = ''
+
+                    if packet.directory:
+                        replace_install_dir = packet.directory
+
+                    elif packet.default_install_dir:
+                        replace_install_dir = packet.default_install_dir
+
+                    shim = shim.replace(
+                        '<install-directory>', replace_install_dir).replace('<version>', packet.version)
+                    shim_name = shim.split(
+                        "\\")[-1].split('.')[0].replace('<version>', packet.version)
+                    write(
+                        f'Deleting Shims For {packet.display_name}', 'cyan', metadata)
+                    try:
+                        os.remove(
+                            f'{home}\\electric\\shims\\{shim_name.split(".")[0]}.bat')
+                    except:
+                        pass
+
+            write_verbose('Uninstallation completed.', metadata)
+            log_info('Uninstallation completed.', metadata.logfile)
+
+            index += 1
+
+        # If Only UninstallString Exists (Not Preferable)
+        elif 'UninstallString' in key:
+            command = key['UninstallString']
+            command = command.replace('/I', '/X')
+            if 'msiexec.exe' in command.lower():
+                command += ' /quiet'
+            # command = f'"{command}"'
+            if override_uninstall_switches:
+                if '--' in command:
+                    command = command.split('--')[0:1][0].strip()
+                if '/' in command:
+                    command = command.split('/')[0:1][0].strip()
+
+            if not 'msiexec.exe' in command.lower():
+                for switch in packet.uninstall_switches:
+                    command += f' {switch.replace("<version>", packet.version)}'
+
+            # Run The UninstallString
+            write_verbose('Executing the Uninstall Command', metadata)
+            log_info('Executing the silent Uninstall Command', metadata.logfile)
+
+            run_test = run_cmd(command.replace(
+                '<version>', packet.version), metadata, 'uninstallation', packet)
+
+            if not packet.run_test:
+                packet.run_test = run_test
+
+            write_verbose('Uninstallation completed.', metadata)
+            log_info('Uninstallation completed.', metadata.logfile)
+            index += 1
+
+            if packet.set_env:
+                if isinstance(packet.set_env, list):
+                    for obj in packet.set_env:
+                        delete_environment_variable(obj['name'])
+
+                else:
+                    delete_environment_variable(packet.set_env['name'])
+
+            if packet.shim:
+                home = os.path.expanduser('~')
+
+                for shim in packet.shim:
+                    replace_install_dir = ''
+
+                    if packet.directory:
+                        replace_install_dir = packet.directory
+
+                    elif packet.default_install_dir:
+                        replace_install_dir = packet.default_install_dir
+
+                    shim = shim.replace(
+                        '<install-directory>', replace_install_dir).replace('<version>', packet.version)
+                    shim_name = shim.split(
+                        "\\")[-1].split('.')[0].replace('<version>', packet.version)
+                    write(
+                        f'Deleting Shims For {packet.display_name}', 'cyan', metadata)
+                    try:
+                        os.remove(
+                            f'{home}\\electric\\shims\\{shim_name.split(".")[0]}.bat')
+                    except:
+                        pass
+
+        if packet.uninstall:
+            for pkg in packet.uninstall:
+                ctx.invoke(
+                    uninstall,
+                    package_name=pkg,
+                    verbose=metadata.verbose,
+                    debug=metadata.debug,
+                    no_color=metadata.no_color,
+                    logfile=metadata.logfile,
+                    yes=metadata.yes,
+                    silent=metadata.silent,
+                    python=False,
+                    vscode=False,
+                    node=False,
+                    atom=False,
+                    configuration=False,
+                    portable=False,
+                    ae=False,
+                    nightly=nightly,
+                    skp=True
+                )
+
+        if packet.run_test:
+            write(
+                f'Running Tests For {packet.display_name}', 'bright_white', metadata)
+            if not find_existing_installation(packet.json_name, packet.display_name):
+                if nightly:
+                    get_state().remove_receipt(package, 'nightly')
+                else:
+                    get_state().remove_receipt(package, packet.version)
+                if not metadata.no_color:
+                    write(
+                        f'[ {Fore.LIGHTGREEN_EX}OK{Fore.RESET} ] Registry Check', 'bright_white', metadata)
+                else:
+                    write(f'[ OK ] Registry Check', 'bright_white', metadata)
+
+                events.emit('uninstalled', package)
+                write(
+                    f'Successfully Uninstalled {packet.display_name}', 'bright_magenta', metadata)
+            else:
+                print(f'[ {Fore.LIGHTRED_EX}ERROR{Fore.RESET} ] Registry Check')
+                write(f'Failed: Registry Check', 'bright_red', metadata)
+                write('Retrying Registry Check In 7.5 seconds',
+                      'bright_yellow', metadata)
+                tm.sleep(7.5)
+                if not find_existing_installation(packet.json_name, packet.display_name):
+                    write(
+                        f'[ {Fore.LIGHTGREEN_EX}OK{Fore.RESET} ]  Registry Check', 'bright_white', metadata)
+                    get_state().remove_receipt(package, packet.version)
+                    events.emit('uninstalled', package)
+                    write(
+                        f'Successfully Uninstalled {packet.display_name}', 'bright_magenta', metadata)
+                    log_info(
+                        f'Successfully Uninstalled {packet.display_name}', metadata.logfile)
+                    write_debug(
+                        f'Terminated debugger at {strftime("%H:%M:%S")} on uninstall::completion', metadata)
+                    log_info(
+                        f'Terminated debugger at {strftime("%H:%M:%S")} on uninstall::completion', metadata.logfile)
+                    close_log(metadata.logfile, 'Uninstall')
+                else:
+                    events.emit('failed', package, reason='still-installed')
+                    write(
+                        f'Failed To Uninstall {packet.display_name}', 'bright_magenta', metadata)
+                    log_error(
+                        f'Failed To Uninstall {packet.display_name}', metadata.logfile)
+        else:
+            if nightly:
+                packet.version = 'nightly'
+            write(
+                f'Running Tests For {packet.display_name}', 'bright_white', metadata)
+            if not skp:
+                get_state().remove_receipt(package, packet.version)
+
+            if not metadata.no_color:
+                write(f'[ {Fore.LIGHTGREEN_EX}OK{Fore.RESET} ] Registry Check',
+                      'bright_white', metadata)
+            else:
+                write(f'[ OK ] Registry Check', 'bright_white', metadata)
+
+            events.emit('uninstalled', package)
+            write(
+                f'Successfully Uninstalled {packet.display_name}', 'bright_magenta', metadata)
+            log_info(
+                f'Succesfully Uninstalled {packet.display_name}', metadata.logfile)
+            write_debug(
+                f'Terminated debugger at {strftime("%H:%M:%S")} on uninstall::completion', metadata)
+            log_info(
+                f'Terminated debugger at {strftime("%H:%M:%S")} on uninstall::completion', metadata.logfile)
+            close_log(metadata.logfile, 'Uninstall')
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('bundle_name', required=True)
+@click.argument('source', required=False)
+@click.option('--output', '-o', 'output', type=click.Path(dir_okay=False), help='File to write with `electric bundle export`')
+@click.option('--remove', '-uninst', is_flag=True, help='Uninstall packages in a bundle installed')
+@click.option('--verbose', '-v', is_flag=True, help='Enable verbose mode for bundle installation')
+@click.option('--debug', '-d', is_flag=True, help='Enable debug mode for bundle installation')
+@click.option('--no-progress', '-np', is_flag=True, default=False, help='Disable progress bar for bundle installation')
+@click.option('--no-color', '-nc', is_flag=True, help='Disable colored output for bundle installation')
+@click.option('--log-output', '-l', 'logfile', help='Log output to the specified file')
+@click.option('--install-dir', '-dir', 'install_directory', help='Specify an installation directory for a package')
+@click.option('--virus-check', '-vc', is_flag=True, help='Check for virus before bundle installation')
+@click.option('-y', '--yes', is_flag=True, help='Accept all prompts during bundle installation')
+@click.option('--silent', '-s', is_flag=True, help='Completely silent bundle installation without any output to console')
+@click.option('--sync', '-sc', is_flag=True, help='Force downloads and installations one after another')
+@click.option('--reduce', '-rd', is_flag=True, help='Cleanup all traces of package after bundle installation')
+@click.option('--exclude', '-ex', 'exclude', help='Exclude a package from bundle installation')
+@click.option('--rate-limit', '-rl', type=int, default=-1)
+@click.pass_context
+def bundle(
+    ctx,
+    bundle_name: str,
+    remove: bool,
+    verbose: bool,
+    debug: bool,
+    no_progress: bool,
+    no_color: bool,
+    logfile: str,
+    install_directory: str,
+    virus_check: bool,
+    yes: bool,
+    silent: bool,
+    sync: bool,
+    reduce: bool,
+    rate_limit: bool,
+    exclude: str,
+    source: str,
+    output: str,
+):
+    """
+    Installs a bundle of packages from the official electric repository.
+
+    `electric bundle export <bundle-name|config> -o <file>.ebundle` writes the packages of a bundle or
+    configuration with their installers to a single file, which `electric install --from` installs offline.
+    """
+
+    metadata = generate_metadata(
+        no_progress, silent, verbose, debug, no_color, yes, logfile, virus_check, reduce, rate_limit, Setting.new(), sync)
+
+    if bundle_name == 'export':
+        export_bundle(source, output, exclude, metadata)
+        return
+
+    if is_admin():
+        if logfile:
+            logfile = logfile.replace('=', '')
+            logfile = logfile.replace('.txt', '.log')
+            from logging import INFO
+            create_config(logfile, INFO, 'Install')
+
+        log_info('Setting up custom `ctrl+c` shortcut.', metadata.logfile)
+        status = 'Initializing'
+        setup_name = ''
+        add_hotkey(
+            'ctrl+c', lambda: handle_exit(status, setup_name, metadata))
+
+        log_info('Handling Network Request...', metadata.logfile)
+        status = 'Networking'
+        write_verbose('Sending GET Request To /bundles', metadata)
+        write_debug('Sending GET Request To /bundles', metadata)
+        log_info('Sending GET Request To /bundles', metadata.logfile)
+        res = send_req_bundle(bundle_name)
+
+        if not metadata.silent:
+            if not metadata.no_color:
+                print(
+                    f'SuperCached [{Fore.LIGHTCYAN_EX} {res["display-name"]} {Fore.RESET}]')
+            else:
+                print(f'SuperCached {res["display-name"]}')
+
+        package_names = ''
+        idx = 0
+
+        for value in res['dependencies']:
+            if idx == 0:
+                package_names += value
+                idx += 1
+                continue
+
+            package_names += f',{value}'
+
+        if exclude:
+            package_names = package_names.replace(exclude, '')
+            if package_names[0] == ',':
+                package_names = package_names[1:]
+        if remove:
+            ctx.invoke(
+                uninstall,
+                package_name=package_names,
+                verbose=verbose,
+                debug=debug,
+                no_color=no_color,
+                logfile=logfile,
+                yes=yes,
+                silent=silent,
+                python=None,
+            )
+
+        else:
+            ctx.invoke(
+                install,
+                package_name=package_names,
+                verbose=verbose,
+                debug=debug,
+                no_progress=no_progress,
+                no_color=no_color,
+                logfile=logfile,
+                install_directory=install_directory,
+                virus_check=virus_check,
+                yes=yes,
+                silent=silent,
+                python=None,
+                node=None,
+                sync=sync,
+                reduce=reduce,
+                rate_limit=rate_limit
+            )
+
+    else:
+        click.echo(click.style(
+            '\nAdministrator Elevation Required For Bundle Installation. Exit Code [0001]', 'bright_red'), err=True)
+        disp_error_msg(get_error_message(
+            '0001', 'installation', 'None', None, metadata, ''), metadata)
+
+
+def export_bundle(source: str, output: str, exclude: str, metadata: Metadata):
+    """
+    Exports a bundle or the packages of a configuration to an .ebundle archive
+
+    #### Arguments
+        source (str): Name of a bundle in the registry or path to a .electric configuration
+        output (str): Path of the archive, defaults to the name of the source
+        exclude (str): Package to leave out of the archive
+        metadata (`Metadata`): Metadata for the export
+    """
+    import offline
+    import requests
+
+    if not source:
+        write('A Bundle Name Or Configuration Must Be Supplied\nUsage: electric bundle export <bundle-name|config> -o <file>.ebundle',
+              'bright_red', metadata)
+        sys.exit(1)
+
+    versions = {}
+    if os.path.isfile(source):
+        from Classes.Config import Config
+        import lockfile
+
+        name = os.path.splitext(os.path.basename(source))[0]
+        packages = []
+        for package, version in lockfile.get_entries(Config.generate_configuration(source), 'Packages'):
+            packages.append(package)
+            if version:
+                versions[package] = version
+    else:
+        res = send_req_bundle(source)
+        name = source
+        packages = res['dependencies']
+
+    packages = [package for package in packages if package != exclude]
+    output = output or f'{name}.ebundle'
+
+    write(f'Exporting {len(packages)} Packages To {output}', 'bright_cyan', metadata)
+    try:
+        index = offline.export_bundle(name, packages, output, versions)
+    except (offline.BundleError, requests.RequestException) as err:
+        if os.path.isfile(output):
+            os.remove(output)
+        write(f'Failed To Export {name}: {err}', 'bright_red', metadata)
+        sys.exit(1)
+
+    size = sum(entry['size'] for entry in index['packages'].values())
+    write(f'Successfully Exported {len(index["packages"])} Packages ({round(size / 1000000, 1)} MB) To {output}',
+          'bright_green', metadata)
@@ -0,0 +1,282 @@
+######################################################################
+#                        MANAGEMENT COMMANDS                         #
+######################################################################
+
+from Classes.PathManager import PathManager
+from Classes.Setting import Setting
+from colorama import Fore
+from cli import CONTEXT_SETTINGS
+import click
+import json
+import os
+import sys
+import tempfile
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+def cleanup():
+    '''
+    Clean up all temporary files generated by electric.
+    '''
+    from progress.bar import Bar
+    from halo import Halo
+
+    with Halo('Cleaning Up ', text_color='green') as h:
+        try:
+            files = os.listdir(rf'{tempfile.gettempdir()}\electric')
+        except:
+            os.mkdir(rf'{tempfile.gettempdir()}\electric')
+            h.stop()
+            click.echo(click.style('Nothing To Cleanup!', 'bright_cyan'))
+            sys.exit()
+
+        if 'configurations' in files:
+            if len(files) == 1:
+                h.stop()
+                click.echo(click.style('Nothing To Cleanup!', 'bright_cyan'))
+        elif len(files) == 0:
+            h.stop()
+            click.echo(click.style('Nothing To Cleanup!', 'bright_cyan'))
+            sys.exit()
+
+        sub = 0
+        if 'configurations' in files:
+            sub = 1
+
+        h.stop()
+        with Bar(f'{Fore.LIGHTCYAN_EX}Deleting Temporary Files{Fore.RESET}', max=len(files) - sub, bar_prefix=' [ ', bar_suffix=' ] ', fill=f'{Fore.LIGHTGREEN_EX}={Fore.RESET}', empty_fill=f'{Fore.LIGHTBLACK_EX}-{Fore.RESET}') as b:
+            for f in files:
+                if f != 'configurations':
+                    try:
+                        os.remove(rf'{tempfile.gettempdir()}\electric\{f}')
+                    except:
+                        pass
+                    b.next()
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+def settings():
+    from settings import initialize_settings, open_settings
+    from cursor import hide, show
+    from halo import Halo
+
+    if not os.path.isfile(rf'{PathManager.get_appdata_directory()}\\settings.json'):
+        click.echo(click.style(
+            f'Creating settings.json at {Fore.LIGHTCYAN_EX}{PathManager.get_appdata_directory()}{Fore.RESET}', fg='bright_green'))
+        initialize_settings()
+    hide()
+    with Halo('Opening Settings... ', text_color='cyan'):
+        open_settings()
+    show()
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.pass_context
+def autoupdate(
+    ctx,
+):
+    from pygments import highlight, lexers, formatters
+    from bs4 import BeautifulSoup
+    from utils import swc
+
+    message = '''AU - The Official Electric Auto-Update CLI For Generating Automatically Updating Manifests.
+    '''
+    print(message)
+
+    print('Enter the path to the manifest / json file: ')
+    fp = input(F'>{Fore.LIGHTYELLOW_EX} ').replace('\"', '')
+
+    with open(fp, 'r') as f:
+        data = json.load(f)
+
+    package_name = data['package-name']
+
+    latest_version = data['latest-version']
+
+    # url = data[data['latest-version']]['url']
+
+    webpage = data['auto-update']['vercheck']['webpage']
+
+    print(f'{Fore.LIGHTGREEN_EX}Sending Request To {webpage}{Fore.RESET}')
+
+    html = swc(webpage.strip())
+    show_html = input(
+        'Would you like to see the response of the request? [Y/n]: ')
+    if show_html == 'y' or show_html == 'Y' or show_html == 'yes' or show_html == 'YES' or show_html == 'Yes':
+        print(html)
+
+    soup = BeautifulSoup(html, features="html.parser")
+
+    version_list = {}
+
+    for tag in soup.find_all('h4', class_='flex-auto min-width-0 pr-2 pb-1 commit-title'):
+        if tag:
+            try:
+                version_list[tag.find('a').text.strip().replace('v', '').replace('V', '')] = int(
+                    tag.find('a').text.strip().replace('.', '').replace('v', '').replace('V', ''))
+            except:
+                pass
+
+    print(f'Detected Versions On Webpage:', list(version_list.keys()))
+
+    try:
+        web_version = max(version_list, key=version_list.get)
+    except:
+        print(f'{Fore.LIGHTRED_EX}No Versions Detected On Webpage!{Fore.RESET}')
+        sys.exit()
+
+    print(f'{Fore.LIGHTGREEN_EX}Latest Version Detected:{Fore.RESET} {web_version}')
+
+    int_web_version = int(web_version.strip().replace(
+        'v', '').replace('V', '').replace('.', ''))
+
+    try:
+        int_current_version = int(latest_version.strip().replace(
+            'v', '').replace('V', '').replace('.', ''))
+    except:
+        print(f'{Fore.LIGHTRED_EX}The Current Version Must Not Contain Any Characters')
+
+    if int_current_version < int_web_version:
+        print(
+            f'A Newer Version Of {package_name} Is Availiable! Updating Manifest')
+
+        old_latest = latest_version
+        data['latest-version'] = web_version
+        data[web_version] = data[old_latest]
+        data[web_version]['url'] = data['auto-update']['url'].replace(
+            '<version>', web_version)
+        colorful_json = json.dumps(
+            data, indent=4)
+        print(colorful_json)
+
+
+@click.command()
+@click.argument('method', nargs=1, required=True)
+@click.argument('feature', nargs=1, required=False)
+def feature(method: str, feature: str):
+    if method in ['enable', 'disable', 'list']:
+        if method == 'list':
+            setting = Setting.new()
+            message = f'''
+[{Fore.LIGHTGREEN_EX if setting.show_support_message else Fore.LIGHTYELLOW_EX}{'X' if setting.show_support_message == True else ' '}{Fore.RESET}] Support Message {Fore.LIGHTMAGENTA_EX}-{Fore.RESET} Send a weekly developers note to request support for electric.
+Command: electric feature [enable|disable] support-message
+
+[{Fore.LIGHTGREEN_EX if setting.checksum else Fore.LIGHTYELLOW_EX}{'X' if setting.checksum == True else ' '}{Fore.RESET}] Checksum Verification {Fore.LIGHTMAGENTA_EX}-{Fore.RESET} Verify the checksum of installers downloaded from the internet.
+Command: electric feature [enable|disable] checksum
+
+[{Fore.LIGHTGREEN_EX if setting.virus_check else Fore.LIGHTYELLOW_EX}{'X' if setting.virus_check == True else ' '}{Fore.RESET}] Runtime Malware Protection {Fore.LIGHTMAGENTA_EX}-{Fore.RESET} Scan downloaded files for viruses before running the installers.
+Command: electric feature [enable|disable] virus-check
+
+[{Fore.LIGHTGREEN_EX if setting.install_metrics else Fore.LIGHTYELLOW_EX}{'X' if setting.install_metrics == True else ' '}{Fore.RESET}] Install Metrics {Fore.LIGHTMAGENTA_EX}-{Fore.RESET} Increment a global counter for the number of installations for a certain package.
+Command: electric feature [enable|disable] install-metrics
+
+[{Fore.LIGHTGREEN_EX if setting.show_progress_bar else Fore.LIGHTYELLOW_EX}{'X' if setting.show_progress_bar == True else ' '}{Fore.RESET}] Progress Bar {Fore.LIGHTMAGENTA_EX}-{Fore.RESET} Show a progress while downloading files (shows basic percentage counter if disabled).
+Command: electric feature [enable|disable] show-progress-bar
+
+[{Fore.LIGHTGREEN_EX if setting.electrify_progress_bar else Fore.LIGHTYELLOW_EX}{'X' if setting.electrify_progress_bar == True else ' '}{Fore.RESET}] Electrify Progress Bar {Fore.LIGHTMAGENTA_EX}-{Fore.RESET} Add the thunder emoji to the progress bar. Only supported on terminals with emoji support.
+Command: electric feature [enable|disable] electric-progress-bar
+            '''
+
+            print(message)
+
+        if feature in ['support-message', 'checksum', 'virus-check', 'install-metrics', 'progress-bar', 'electric-progress-bar']:
+
+            if feature == 'support-message' and method == 'disable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['supportMessage'] = False
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Disabled Support Message{Fore.RESET}')
+
+            elif feature == 'support-message' and method == 'enable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['supportMessage'] = True
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Enabled Support Message{Fore.RESET}')
+
+            if feature == 'checksum' and method == 'enable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['checksumInstallers'] = True
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Enabled Installer Checksum Verification{Fore.RESET}')
+
+            if feature == 'checksum' and method == 'disable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['checksumInstallers'] = False
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Disabled Installer Checksum Verification{Fore.RESET}')
+
+            if feature == 'virus-check' and method == 'enable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['virusCheck'] = True
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Enabled Runtime Malware Protection{Fore.RESET}')
+
+            if feature == 'virus-check' and method == 'disable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['virusCheck'] = False
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Disabled Runtime Malware Protection{Fore.RESET}')
+
+            if feature == 'install-metrics' and method == 'enable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['installMetrics'] = True
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Enabled Install Metrics{Fore.RESET}')
+
+            if feature == 'install-metrics' and method == 'disable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['installMetrics'] = False
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Disabled Install Metrics{Fore.RESET}')
+
+            if feature == 'progress-bar' and method == 'enable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['showProgressBar'] = True
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Enabled Progress Bar{Fore.RESET}')
+
+            if feature == 'progress-bar' and method == 'disable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['showProgressBar'] = False
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Disabled Progress Bar{Fore.RESET}')
+
+            if feature == 'electric-progress-bar' and method == 'enable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['electrifyProgressBar'] = True
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Enabled Electric Progress Bar{Fore.RESET}')
+
+            if feature == 'electric-progress-bar' and method == 'disable':
+                current_settings = Setting.new()
+                current_settings.raw_dictionary['electrifyProgressBar'] = False
+                with open(rf'{PathManager.get_appdata_directory()}\settings.json', 'w+') as f:
+                    f.write(json.dumps(current_settings.raw_dictionary, indent=4))
+                print(
+                    f'{Fore.LIGHTGREEN_EX}Successfully Disabled Electric Progress Bar{Fore.RESET}')
+
+    else:
+        print(f'{Fore.LIGHTRED_EX}Method Must Be Specified As `enable` or `disable`')
+    pass
@@ -0,0 +1,165 @@
+######################################################################
+#                          PACKAGE COMMANDS                          #
+######################################################################
+
+from colorama import Fore
+from cli import CONTEXT_SETTINGS
+import click
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('approx_name', required=True)
+@click.option('--starts-with', '-sw', is_flag=True, help='Find packages which start with the specified literal')
+@click.option('--exact', '-e', is_flag=True, help='Find packages which exactly match the specified literal')
+def search(
+    approx_name: str,
+    starts_with: str,
+    exact: str,
+):  # pylint: disable=function-redefined
+    """
+    Searches for a package in the official electric package repository.
+    """
+    from utils import confirm, get_correct_package_names, send_package_request
+
+    correct_names = get_correct_package_names(all=True)
+
+    matches = []
+    if exact:
+        for name in correct_names:
+            if name == approx_name:
+                matches.append(name)
+    if starts_with:
+        for name in correct_names:
+            if name.startswith(approx_name):
+                matches.append(name)
+    elif not exact and not starts_with:
+        from difflib import get_close_matches
+        matches = get_close_matches(
+            approx_name, correct_names, cutoff=0.7)
+
+    if len(matches) > 0:
+        idx = 0
+        for match in matches:
+            if idx == 0:
+                click.echo(click.style(f'{match}', fg='bright_magenta'))
+                idx += 1
+                continue
+            else:
+                print(match)
+        if len(matches) != 1:
+            click.echo(click.style(
+                f'{len(matches)} packages found.', fg='bright_green'))
+        else:
+            click.echo(click.style('1 package found.', fg='bright_yellow'))
+
+    else:
+        click.echo(click.style('0 Packages Found!', fg='bright_red'))
+        upload = confirm(
+            'Would you like to request this package to be added to electric?')
+        from halo import Halo
+        with Halo(text='Uploading Package Request') as h:
+            if upload:
+                send_package_request(approx_name)
+            h.stop()
+            print(
+                f'{Fore.GREEN}Successfully Uploaded Package Request For {approx_name}{Fore.RESET}')
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--nightly', '--pre-release', is_flag=True, help='Show a nightly or pre-release build of a package')
+@click.argument('package_name', required=True)
+def show(package_name: str, nightly: bool):
+    '''
+    Displays information about the specified package.
+    '''
+    from utils import display_info, send_req_package
+
+    res = send_req_package(package_name)
+    click.echo(click.style(display_info(
+        res, nightly=nightly), fg='bright_green'))
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.option('--installed', '-i', is_flag=True, help='List all installed packages')
+@click.option('--versions', '-v', is_flag=True, help='List all installed packages')
+@click.pass_context
+def ls(_, installed: bool, versions: bool):
+    '''
+    Lists top packages which can be installed.
+    If --installed is passed in, lists all installed packages
+    '''
+    import winreg
+
+    if installed:
+        from state import get_state
+
+        receipts = get_state().get_receipts()
+        if not receipts:
+            print(
+                f'{Fore.LIGHTYELLOW_EX}No installed packages found{Fore.RESET}')
+        for receipt in receipts:
+            if versions:
+                print(f'{receipt["json-name"]}@{receipt["version"]}')
+            else:
+                print(receipt['json-name'])
+    else:
+        from registry import send_query
+
+        installed_software = send_query(winreg.HKEY_LOCAL_MACHINE, winreg.KEY_WOW64_32KEY) + send_query(
+            winreg.HKEY_LOCAL_MACHINE, winreg.KEY_WOW64_64KEY) + send_query(winreg.HKEY_CURRENT_USER, 0)
+
+        max_length = 80
+        names = [software['DisplayName'] for software in installed_software]
+
+        versions = []
+        for software in installed_software:
+            # id = re.findall(r'{[A-Z\d-]{36}\}', software['UninstallString'])
+
+            version = software['Version']
+            versions.append(version)
+
+        print('Name', ' ' * 76, 'Version')
+        print('-' * 105)
+
+        idx = 0
+        for name in names:
+            length = len(name)
+            print(name.strip(), ' ' * (max_length - length), versions[idx])
+            idx += 1
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('package_name', required=True)
+@click.option('--version', '-v', 'version', help='Register a specific version')
+@click.option('--install-dir', '-id', 'install_dir', help='Register a specific installation directory')
+def register(
+    package_name: str,
+    version: str,
+    install_dir: str
+):
+    from utils import send_req_package
+    from state import get_state
+
+    res = send_req_package(package_name)
+    display_name = res['display-name']
+    package_name = res['package-name']
+    if 'is-portable' in list(res.keys()):
+        latest_version = res['portable']['latest-version']
+    if not version and not 'is-portable' in list(res.keys()):
+        latest_version = res['latest-version']
+    else:
+        latest_version = version
+
+    get_state().add_receipt(package_name, latest_version,
+                            display_name, install_dir=install_dir or '')
+
+
+@click.command(context_settings=CONTEXT_SETTINGS)
+@click.argument('package_name', required=True)
+@click.option('--version', '-v', 'version', help='Deregister a specific version')
+def deregister(package_name: str, version: str):
+    from utils import send_req_package
+    from state import get_state
+
+    res = send_req_package(package_name)
+    get_state().remove_receipt(res['package-name'], version)
@@ -0,0 +1,238 @@
+######################################################################
+#                           CONFIG PARSER                            #
+######################################################################
+
+import hashlib
+
+CHECKSUM_START = '# --------------------Checksum Start-------------------------- #'
+CHECKSUM_END = '# --------------------Checksum End--------------------------- #'
+
+# Sections where a bare name means the latest version of it
+PACKAGE_SECTIONS = ['Packages', 'Pip-Packages', 'Editor-Extensions', 'Node-Packages']
+
+# Lines which are replaced with what is installed on the machine, see `Config.generate_configuration`
+TAGS = [
+    '<pip>',
+    '<pip:name>',
+    '<pip:name,version>',
+    '<python>',
+    '<python:name>',
+    '<python:name,version>',
+    '<npm>',
+    '<npm:name>',
+    '<npm:name,version>',
+    '<node:name>',
+    '<node>',
+    '<node:name,version>',
+    '<vscode>',
+    '<vscode:name>',
+    '<vscode:name,version>',
+    '<vscode-insiders>',
+    '<vscode-insiders:name>',
+    '<vscode-insiders:name,version>',
+    '<atom>',
+    '<atom:name>',
+    '<atom:name,version>',
+    '<apm>',
+    '<apm:name>',
+    '<apm:name,version>',
+    '<sublime>',
+    '<sublime:name>',
+    '<electric>',
+    '<electric:name>',
+    '<electric:name,version>'
+]
+
+
+class ConfigError(Exception):
+    """
+    Error in a configuration, `line` and `column` start at 1 and are None when the error isn't on a line
+    """
+
+    def __init__(self, name: str, message: str, line: int = None, column: int = None, text: str = None):
+        super().__init__(f'{name} : {message}')
+        self.name = name
+        self.message = message
+        self.line = line
+        self.column = column
+        self.text = text
+
+
+class ConfigSyntaxError(ConfigError):
+    pass
+
+
+class ChecksumError(ConfigError):
+    pass
+
+
+class ConfigParser:
+    """
+    Parses a .electric configuration one line at a time, the md5 and sha256 of the signed part are computed as it goes
+
+    The signed part is everything before the `Checksum Start` line, without the newline `electric sign` adds before it
+    """
+
+    def __init__(self):
+        self.sections = {}
+        self.tags = []
+        self.header = None
+        self.line = 0
+
+        self.md5 = hashlib.md5()
+        self.sha256 = hashlib.sha256()
+        # The newline of the last line is only hashed once the next line shows it isn't the one before the checksum
+        self.newline = b''
+
+        # Digests written between the checksum headers, None until `Checksum Start` is found
+        self.checksum = None
+        self.checksum_line = None
+        self.checksum_closed = False
+        self.trailing = None
+
+    def feed(self, raw: bytes):
+        """
+        Parses the next line of the configuration
+
+        #### Arguments
+            raw (bytes): Line including its newline, as read from the file in binary mode
+        """
+        self.line += 1
+        content = raw.rstrip(b'\r\n')
+        try:
+            text = content.decode('utf-8')
+        except UnicodeDecodeError as err:
+            raise ConfigSyntaxError('EncodingError', 'Configurations Must Be Saved As UTF-8',
+                                    self.line, err.start + 1, content.decode('utf-8', 'replace'))
+        if self.line == 1:
+            text = text.lstrip('\ufeff')
+
+        stripped = text.strip()
+        if self.checksum is None:
+            if stripped == CHECKSUM_START:
+                self.checksum = []
+                self.checksum_line = self.line
+                return
+            self.md5.update(self.newline + content)
+            self.sha256.update(self.newline + content)
+            self.newline = raw[len(content):]
+        elif not self.checksum_closed:
+            if stripped == CHECKSUM_END:
+                self.checksum_closed = True
+            elif stripped:
+                self.checksum.append(stripped.lstrip('#').strip())
+            return
+        elif stripped and self.trailing is None:
+            self.trailing = (self.line, len(text) - len(text.lstrip()) + 1, text)
+
+        self.parse_line(text)
+
+    def parse_line(self, text: str):
+        comment = text.find('#')
+        if comment != -1:
+            text = text[:comment]
+
+        stripped = text.strip()
+        if not stripped:
+            return
+        column = len(text) - len(text.lstrip()) + 1
+
+        if stripped in TAGS:
+            self.tags.append((self.header, stripped, self.line))
+            return
+
+        if stripped.startswith('['):
+            end = text.find(']')
+            if end == -1:
+                raise ConfigSyntaxError('SectionError', 'Expecting `]` To Close The Section Header',
+                                        self.line, len(text.rstrip()) + 1, text)
+            if text[end + 1:].strip():
+                raise ConfigSyntaxError('SectionError', 'Unexpected Text After The Section Header',
+                                        self.line, end + 2 + len(text[end + 1:]) - len(text[end + 1:].lstrip()), text)
+            header = text[column:end].strip()
+            if not header:
+                raise ConfigSyntaxError('SectionError', 'Section Header Has No Name', self.line, column, text)
+            self.header = header
+            self.sections.setdefault(header, [])
+            return
+
+        if self.header is None:
+            raise ConfigSyntaxError('SectionError', f'Expecting A Section Header Before :: {stripped}',
+                                    self.line, column, text)
+
+        operator, width = text.find('=>'), 2
+        if operator == -1 and text.count(':') == 1:
+            # Older configurations separate keys and values with `:`
+            operator, width = text.find(':'), 1
+
+        if operator == -1:
+            if self.header in PACKAGE_SECTIONS:
+                self.sections[self.header].append({stripped: 'latest'})
+                return
+            raise ConfigSyntaxError('ValueNotFoundError', f'Expecting A Value Pair With `=>` Operator For Key :: {stripped}',
+                                    self.line, column, text)
+
+        key = text[:operator].strip()
+        value = text[operator + width:].strip().replace('"', '')
+        if not key:
+            raise ConfigSyntaxError('KeyNotFoundError', 'No Key Provided Before `=>`', self.line, operator + 1, text)
+        if not value:
+            raise ConfigSyntaxError('ValueNotFoundError', f'No Value Provided For Key :: {key}',
+                                    self.line, operator + width + 1, text)
+
+        self.sections[self.header].append({key: value})
+
+    def close(self) -> dict:
+        """
+        Finishes parsing once every line has been fed
+
+        Returns:
+            dict: Entries of each section, ex: `{'Packages': [{'git': 'latest'}]}`
+        """
+        if self.checksum is None:
+            # Unsigned, the whole file is hashed
+            self.md5.update(self.newline)
+            self.sha256.update(self.newline)
+            self.newline = b''
+        return self.sections
+
+    @property
+    def signed(self) -> bool:
+        return self.checksum is not None
+
+    def verify(self):
+        """
+        Checks the checksum written by `electric sign` matches the configuration, call after `close`
+        """
+        if self.checksum is None:
+            raise ChecksumError('ChecksumNotFoundError', 'File Checksum Not Found')
+        if not self.checksum_closed:
+            raise ChecksumError('ChecksumError', 'Checksum Start Header Has No Matching Checksum End Header', self.checksum_line)
+        if self.trailing:
+            raise ChecksumError('DataAfterChecksumError', 'Comments And Code Are Not Allowed After The Checksum End Header',
+                                *self.trailing)
+        if len(self.checksum) != 2:
+            raise ChecksumError('ChecksumError', 'Expecting An md5 And A sha256 Hash Between The Checksum Headers',
+                                self.checksum_line)
+
+        md5, sha256 = self.checksum
+        if md5.lower() != self.md5.hexdigest() or sha256.lower() != self.sha256.hexdigest():
+            raise ChecksumError('ChecksumMismatchError', 'Hashes Don\'t Match!', self.checksum_line)
+
+
+def parse_file(path: str) -> ConfigParser:
+    """
+    Parses a configuration, reading it once
+
+    #### Arguments
+        path (str): Path to the .electric configuration
+
+    Returns:
+        ConfigParser: Parser holding the sections, tags and hashes of the configuration
+    """
+    parser = ConfigParser()
+    with open(path, 'rb') as f:
+        for raw in f:
+            parser.feed(raw)
+    parser.close()
+    return parser
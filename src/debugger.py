@@ -9,8 +9,8 @@ class Debugger:
     @staticmethod
     def ping_github():
         try:
-            res = requests.get(
-                'https://raw.githubusercontent.com/XtremeDevX/electric-packages/master/package-list.json')
+            from info import __package_list__
+            res = requests.get(__package_list__)
         except:
             res = requests.Response()
             res.status_code = 404
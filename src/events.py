@@ -0,0 +1,91 @@
+######################################################################
+#                               EVENTS                               #
+######################################################################
+
+from threading import Lock
+from time import monotonic, time
+import json
+import re
+import sys
+
+# Set by `electric --output json`, while it is None every emit is a no-op
+stream = None
+lock = Lock()
+
+# Download progress is emitted at most once per interval for each package
+PROGRESS_INTERVAL = 0.25
+last_progress = {}
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+
+def enable(output=None):
+    """
+    Starts emitting events as newline delimited json
+
+    #### Arguments
+        output: Stream events are written to, defaults to stdout
+    """
+    global stream
+    stream = output or sys.stdout
+    # Spinners, progress bars and any stray print are moved to stderr so
+    # stdout only ever carries one json event per line
+    if stream is sys.stdout:
+        sys.stdout = sys.stderr
+
+
+def get_package() -> str:
+    from tracing import get_track
+
+    track = get_track()
+    return None if track == 'electric' else track
+
+
+def emit(event: str, package: str = None, **fields):
+    """
+    Emits a single event
+
+    #### Arguments
+        event (str): Name of the state transition, ex: `resolved`, `installing`, `failed`
+        package (str): Package the event is about, defaults to the package being handled on this thread
+        fields: Values sent with the event
+    """
+    if stream is None:
+        return
+
+    line = json.dumps({
+        'event': event,
+        'time': round(time(), 3),
+        'package': package or get_package(),
+        **fields,
+    }) + '\n'
+
+    with lock:
+        stream.write(line)
+        stream.flush()
+
+
+def progress(package: str, downloaded: int, total: int = None):
+    """
+    Emits download progress, dropping updates which arrive faster than PROGRESS_INTERVAL
+
+    #### Arguments
+        package (str): Package being downloaded
+        downloaded (int): Bytes downloaded so far
+        total (int): Size of the download if known
+    """
+    if stream is None:
+        return
+
+    now = monotonic()
+    if downloaded != total and now - last_progress.get(package, 0) < PROGRESS_INTERVAL:
+        return
+    last_progress[package] = now
+    emit('download-progress', package, downloaded=downloaded, total=total)
+
+
+def message(text: str, level: str):
+    """
+    Emits text which would otherwise have been printed, without any color escapes
+    """
+    emit('message', level=level, text=ANSI_ESCAPE.sub('', str(text)).strip('\n'))
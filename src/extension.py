@@ -5,6 +5,7 @@
 
 from Classes.Metadata import Metadata
 import click
+import events
 
 def write(text: str, color: str, metadata: Metadata):
     """
@@ -19,6 +20,11 @@ def write(text: str, color: str, metadata: Metadata):
         metadata (`Metadata`): Metadata for the method
     """
     
+    if events.stream is not None:
+        if not metadata.silent:
+            events.message(text, 'info')
+        return
+
     if not metadata.silent:
         if not metadata.no_color:
             if color:
@@ -48,6 +54,10 @@ def write_verbose(log: str, metadata: Metadata):
     """
 
     if metadata.verbose and not metadata.silent:
+        if events.stream is not None:
+            events.message(log, 'verbose')
+            return
+
         HEADER = "VERBOSE: "
         
         if not metadata.no_color:
@@ -76,6 +86,10 @@ def write_debug(log: str, metadata: Metadata, newline=False):
         if isinstance(log, list):
             log = "\nDEBUG: ".join(log)
 
+        if events.stream is not None:
+            events.message(log, 'debug')
+            return
+
         HEADER = "DEBUG: " if not newline else "\nDEBUG: "
         if not metadata.no_color:
             click.echo(click.style(HEADER + log, fg="bright_yellow"))
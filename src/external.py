@@ -2,21 +2,72 @@
 #                              EXTERNAL                              #
 ######################################################################
 
+import toolchain
 import utils
 from Classes.PathManager import PathManager
 from urllib.request import urlretrieve
 from Classes.Metadata import Metadata
-from subprocess import PIPE, Popen
+from subprocess import PIPE, STDOUT, Popen
+from urllib.parse import unquote
 from extension import write
 from halo import Halo
 from colorama import Fore
 import json as js
+import re
 import mslex
 import sys
 import os
 import click
 
 
+def check_pip(package_name: str, metadata: Metadata):
+    if not toolchain.find('pip'):
+        click.echo(click.style(
+            'Python Is Not Installed. Exit Code [0011]', fg='red'))
+        utils.disp_error_msg(utils.get_error_message(
+            '0011', 'install', package_name, None, metadata, package_name), metadata)
+        utils.handle_exit('ERROR', None, metadata)
+
+
+def get_npm_version(package_name: str, metadata: Metadata) -> str:
+    tool = toolchain.find('npm')
+
+    if not tool:
+        click.echo(click.style(
+            'npm Or node Is Not Installed. Exit Code [0011]', fg='bright_yellow'))
+        utils.disp_error_msg(utils.get_error_message(
+            '0011', 'install', package_name, None, metadata, package_name), metadata)
+        utils.handle_exit('ERROR', None, metadata)
+
+    return tool.version
+
+
+def get_code(package_name: str, metadata: Metadata) -> tuple:
+    """
+    Finds the visual studio code command line, falling back to insiders
+
+    Returns:
+        tuple: (command, version) of visual studio code
+    """
+    tool = toolchain.find_any('code', 'code-insiders')
+
+    if not tool:
+        click.echo(click.style(
+            'Visual Studio Code Or vscode Is Not Installed. Exit Code [0111]', fg='bright_yellow'))
+        utils.disp_error_msg(utils.get_error_message(
+            '0111', 'install', package_name, None, metadata, package_name), metadata)
+        utils.handle_exit('error', '', metadata)
+
+    return tool.name, tool.version
+
+
+def check_apm(package_name: str, metadata: Metadata):
+    if not toolchain.find('apm'):
+        click.echo(click.style('Atom Is Not Installed. Exit Code [0113]', fg='bright_yellow'))
+        utils.disp_error_msg(utils.get_error_message('0113', 'install', package_name, None, metadata, package_name), metadata)
+        utils.handle_exit('error', '', metadata)
+
+
 def handle_python_package(package_name: str, version: str, mode: str, metadata: Metadata):
     """
     Installs a python package handling metadata for the method
@@ -29,16 +80,7 @@ def handle_python_package(package_name: str, version: str, mode: str, metadata:
     """
     command = ''
 
-    valid = Popen(mslex.split('pip --version'),
-                  stdin=PIPE, stdout=PIPE, stderr=PIPE)
-    _, err = valid.communicate()
-
-    if err:
-        click.echo(click.style(
-            'Python Is Not Installed. Exit Code [0011]', fg='red'))
-        utils.disp_error_msg(utils.get_error_message(
-            '0011', 'install', package_name, None, metadata, package_name), metadata)
-        utils.handle_exit('ERROR', None, metadata)
+    check_pip(package_name, metadata)
 
     if mode == 'install':
         command = 'python -m pip install --upgrade --no-input'
@@ -124,17 +166,7 @@ def handle_node_package(package_name: str, mode: str, requested_version: str, me
         mode (`str`): The method (installation/uninstallation)
         metadata (`Metadata`): Metadata for the method
     """
-    version_proc = Popen(mslex.split('npm --version'),
-                         stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
-    version, err = version_proc.communicate()
-    version = version.decode().strip()
-
-    if err:
-        click.echo(click.style(
-            'npm Or node Is Not Installed. Exit Code [0011]', fg='bright_yellow'))
-        utils.disp_error_msg(utils.get_error_message(
-            '0011', 'install', package_name, None, metadata, package_name), metadata)
-        utils.handle_exit('ERROR', None, metadata)
+    version = get_npm_version(package_name, metadata)
 
     if mode == 'install':
         add_str = f"@{requested_version}" if requested_version else ""
@@ -204,28 +236,7 @@ def handle_vscode_extension(package_name: str, requested_version: str, mode: str
         mode (str): The method (installation/uninstallation)
         metadata (`Metadata`): Metadata for the method
     """
-    
-    base_c = 'code'
-
-    output = Popen(mslex.split('code --version'), stdin=PIPE,
-                   stdout=PIPE, stderr=PIPE, shell=True)
-    version, _ = output.communicate()
-    version = version.decode()
-    if output.returncode != 0:
-        output = Popen(mslex.split('code-insiders --version'),
-                       stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
-        version, _ = output.communicate()
-        version = version.decode()
-        base_c = 'code-insiders'
-
-    if output.returncode != 0:
-        click.echo(click.style(
-            'Visual Studio Code Or vscode Is Not Installed. Exit Code [0111]', fg='bright_yellow'))
-        utils.disp_error_msg(utils.get_error_message(
-            '0111', 'install', package_name, None, metadata, package_name), metadata)
-        utils.handle_exit('error', '', metadata)
-
-    version = version.strip().split('\n')[0]
+    base_c, version = get_code(package_name, metadata)
 
     if mode == 'install':
         add_str = f"@{requested_version}" if requested_version else ""
@@ -394,15 +405,7 @@ def handle_atom_package(package_name: str, mode: str, requested_version: str, me
     """
     if mode == 'install':
 
-        proc = Popen('apm'.split(),
-                        stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
-        proc.communicate()
-
-        if proc.returncode != 0:
-            click.echo(click.style('Atom Is Not Installed. Exit Code [0113]', fg='bright_yellow'))
-            utils.disp_error_msg(utils.get_error_message('0113', 'install', package_name, None, metadata, package_name), metadata)
-            utils.handle_exit('error', '', metadata)
-
+        check_apm(package_name, metadata)
 
         with Halo(f'apm :: Installing {package_name}', text_color='cyan') as h:
             add_str = f"@{requested_version}" if requested_version else ""
@@ -423,15 +426,7 @@ def handle_atom_package(package_name: str, mode: str, requested_version: str, me
                         f' Successfully Installed {package_name} to <=> {line.split()[3]}', 'bright_green'))
 
     if mode == 'uninstall':
-        proc = Popen('apm'.split(),
-                        stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
-        proc.communicate()
-
-        if proc.returncode != 0:
-            click.echo(click.style('Atom Is Not Installed. Exit Code [0113]', fg='bright_yellow'))
-            utils.disp_error_msg(utils.get_error_message('0113', 'install', package_name, None, metadata, package_name), metadata)
-            utils.handle_exit('error', '', metadata)
-
+        check_apm(package_name, metadata)
 
         with Halo(f'apm :: Uninstalling {package_name}', text_color='cyan') as h:
             add_str = f"@{requested_version}" if requested_version else ""
@@ -449,3 +444,306 @@ def handle_atom_package(package_name: str, mode: str, requested_version: str, me
                     h.stop()
                     click.echo(click.style(
                         f' Successfully Uninstalled {package_name}', 'bright_green'))
+
+
+# Results of a package in a batch, anything else means the tool hasn't finished with it yet
+FINISHED = ['installed', 'satisfied', 'failed']
+
+
+def canonicalize(name: str) -> str:
+    # pip treats `-`, `_` and `.` the same and ignores case, the other tools only ignore case
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+
+def split_spec(spec: str) -> tuple:
+    """
+    Splits `name@version` into its parts, keeping the `@` of scoped npm packages
+
+    Returns:
+        tuple: (name, version), version is None if there isn't one
+    """
+    index = spec.rfind('@')
+    if index > 0:
+        return spec[:index], spec[index + 1:]
+    return spec, None
+
+
+def parse_pip_line(line: str, requested: dict) -> list:
+    """
+    Attributes a line of `pip install` output to the requested packages it is about
+
+    #### Arguments
+        line (str): Line written by pip
+        requested (dict): Canonical name => name of each requested package
+
+    Returns:
+        list: (name, status, detail) of every requested package the line is about
+    """
+    def lookup(requirement: str):
+        return requested.get(canonicalize(re.split(r'[<>=!~;\[\s(@]', requirement.strip(), 1)[0]))
+
+    line = line.strip()
+    events = []
+
+    if line.startswith('Collecting '):
+        name = lookup(line[len('Collecting '):])
+        if name:
+            events.append((name, 'collecting', None))
+
+    elif line.startswith('Downloading ') or line.startswith('Using cached '):
+        # Files are named after the distribution, ex: `requests-2.26.0-py2.py3-none-any.whl`
+        filename = line.split()[1 if line.startswith('Downloading ') else 2].rsplit('/', 1)[-1]
+        name = requested.get(canonicalize(filename.split('-')[0]))
+        if name:
+            events.append((name, 'downloading', None))
+
+    elif line.startswith('Requirement already satisfied: ') and '(from ' not in line:
+        name = lookup(line[len('Requirement already satisfied: '):])
+        if name:
+            version = line.rsplit('(', 1)[-1].rstrip(')') if line.endswith(')') else None
+            events.append((name, 'satisfied', version))
+
+    elif line.startswith('Successfully installed '):
+        for spec in line.split()[2:]:
+            distribution, _, version = spec.rpartition('-')
+            name = requested.get(canonicalize(distribution))
+            if name:
+                events.append((name, 'installed', version))
+
+    elif line.startswith('ERROR: '):
+        match = re.search(r'(?:satisfies the requirement|distribution found for|Could not build wheels for) ([^\s,]+)', line)
+        name = lookup(match.group(1)) if match else None
+        if name:
+            events.append((name, 'failed', line[len('ERROR: '):]))
+
+    return events
+
+
+def parse_npm_line(line: str, requested: dict) -> list:
+    """
+    Attributes a line of `npm install --global` output to the requested packages it is about, see `parse_pip_line`
+    """
+    line = line.strip()
+
+    if line.startswith('+ '):
+        # npm 6 lists every package it installed
+        name, version = split_spec(line[2:].strip())
+        name = requested.get(name.lower())
+        return [(name, 'installed', version)] if name else []
+
+    if line.startswith('npm ERR!'):
+        match = re.search(r"'(\S+)' is not in (?:this|the npm) registry", line) \
+            or re.search(r'No matching version found for (\S+?)\.?$', line) \
+            or re.search(r'Not Found - GET \S+/(\S+) - ', line)
+        if match:
+            name, _ = split_spec(unquote(match.group(1)))
+            name = requested.get(name.lower())
+            if name:
+                return [(name, 'failed', line[len('npm ERR!'):].strip())]
+
+    return []
+
+
+def parse_code_line(line: str, requested: dict) -> list:
+    """
+    Attributes a line of `code --install-extension` output to the requested extensions it is about, see `parse_pip_line`
+    """
+    match = re.search(r"[Ee]xtension '([^']+)'(?: v(\S+))?[ .]*(was successfully installed|is already installed|not found|\.\.\.)", line)
+    if match:
+        extension, version, result = match.groups()
+        name = requested.get(extension.lower())
+        if name:
+            status = {'was successfully installed': 'installed', 'is already installed': 'satisfied', 'not found': 'failed'}.get(result, 'installing')
+            return [(name, status, version if status != 'failed' else line.strip())]
+
+    match = re.search(r'Failed Installing Extensions: (.+)', line)
+    if match:
+        return [(requested[extension.strip().lower()], 'failed', line.strip())
+                for extension in match.group(1).split(',') if extension.strip().lower() in requested]
+
+    return []
+
+
+def parse_apm_line(line: str, requested: dict) -> list:
+    """
+    Attributes a line of `apm install` output to the requested packages it is about, see `parse_pip_line`
+    """
+    match = re.search(r'Installing (\S+) to (\S+) (.*)', line)
+    if match:
+        spec, location, result = match.groups()
+        package, version = split_spec(spec)
+        name = requested.get(package.lower())
+        if name:
+            if 'done' in result or '✓' in result:
+                return [(name, 'installed', location)]
+            if 'failed' in result or '✗' in result:
+                return [(name, 'failed', line.strip())]
+
+    return []
+
+
+def run_batch(build, packages: list, parse, report, canonical=str.lower, shell: bool = False) -> dict:
+    """
+    Installs packages with a single run of a package manager, its output is parsed as it is written
+
+    pip and npm refuse to install anything once a single package can't be resolved, so packages the output
+    names as failed are dropped and whatever hasn't finished is installed again with another run
+
+    #### Arguments
+        build (function): Gets the command which installs a list of (name, version) pairs
+        packages (list): (name, version) pairs to install, version is None for the latest version
+        parse (function): Attributes a line of output to packages, see `parse_pip_line`
+        report (function): Called with (name, status, detail) each time a package changes status
+        canonical (function): Normalizes a name the way the package manager compares them
+        shell (bool): Run the command in a shell, needed for the `.cmd` shims of npm, code and apm
+
+    Returns:
+        dict: Name => (status, detail) of every package which got a result
+    """
+    results = {}
+    remaining = list(dict.fromkeys(packages))
+
+    while remaining:
+        requested = {canonical(name): name for name, _ in remaining}
+        proc = Popen(build(remaining), stdin=PIPE, stdout=PIPE, stderr=STDOUT, shell=shell)
+        for line in proc.stdout:
+            for name, status, detail in parse(line.decode('utf-8', 'replace'), requested):
+                if results.get(name, (None, None))[0] != status:
+                    report(name, status, detail)
+                results[name] = (status, detail)
+        proc.wait()
+
+        failed = [package for package in remaining if results.get(package[0], (None, None))[0] == 'failed']
+        remaining = [package for package in remaining
+                     if results.get(package[0], (None, None))[0] not in FINISHED]
+        if proc.returncode == 0:
+            break
+        if not failed:
+            # The run failed without blaming a package, so none of the rest can be trusted
+            for name, _ in remaining:
+                results[name] = ('failed', f'Exited With Code {proc.returncode}')
+                report(name, 'failed', results[name][1])
+            break
+
+    return results
+
+
+def handle_python_packages(packages: list, metadata: Metadata) -> dict:
+    """
+    Installs python packages with a single run of pip, which resolves their dependencies together
+
+    #### Arguments
+        packages (list): (name, version) pairs to install, version is None or `latest` for the latest version
+        metadata (`Metadata`): Metadata for the method
+
+    Returns:
+        dict: Name => (status, detail) of every package, see `run_batch`
+    """
+    if not packages:
+        return {}
+    check_pip(packages[0][0], metadata)
+    py_version = sys.version.split()[0]
+
+    def build(remaining: list) -> list:
+        return mslex.split('python -m pip install --upgrade --no-input') + \
+            [name if version in [None, 'latest'] else f'{name}=={version}' for name, version in remaining]
+
+    def report(name: str, status: str, detail: str):
+        if status == 'collecting':
+            write(f'Python v{py_version} :: Collecting {name}', 'bright_green', metadata)
+        elif status == 'downloading':
+            write(f'Python v{py_version} :: Downloading {name}', 'bright_green', metadata)
+        elif status == 'satisfied':
+            write(f'Python v{py_version} :: {name} Is Already Installed And On The Latest Version ==> {detail}', 'bright_yellow', metadata)
+        elif status == 'installed':
+            write(f'Python v{py_version} :: Successfully Installed {name} {detail}', 'bright_green', metadata)
+        elif status == 'failed':
+            write(f'Python v{py_version} :: Failed To Install {name} => {detail}', 'red', metadata)
+
+    return run_batch(build, [(name, version) for name, version in packages], parse_pip_line, report, canonicalize)
+
+
+def handle_node_packages(packages: list, metadata: Metadata) -> dict:
+    """
+    Installs global npm packages with a single run of npm, see `handle_python_packages`
+    """
+    if not packages:
+        return {}
+    version = get_npm_version(packages[0][0], metadata)
+
+    def build(remaining: list) -> list:
+        return ['npm', 'install', '--global'] + \
+            [f'{name}@{requested}' if requested else name for name, requested in remaining]
+
+    def report(name: str, status: str, detail: str):
+        if status == 'installed':
+            write(f'npm v{version} :: Successfully Installed {name}@{detail}', 'bright_green', metadata)
+        elif status == 'failed':
+            write(f'npm v{version} :: Failed To Install {name} => {detail}', 'red', metadata)
+
+    write(f'npm v{version} :: Collecting {", ".join(name for name, _ in packages)}', 'bright_green', metadata)
+    results = run_batch(build, packages, parse_npm_line, report, shell=True)
+
+    if any(name not in results for name, _ in packages):
+        # npm 7 and later only print a summary, the installed versions are read back in one go
+        proc = Popen(mslex.split('npm ls --global --depth=0 --json'), stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
+        output, _ = proc.communicate()
+        try:
+            dependencies = js.loads(output.decode()).get('dependencies', {})
+        except ValueError:
+            dependencies = {}
+
+        for name, _ in packages:
+            if name not in results and name in dependencies:
+                results[name] = ('installed', dependencies[name].get('version'))
+                report(name, *results[name])
+
+    return results
+
+
+def handle_vscode_extensions(packages: list, metadata: Metadata) -> dict:
+    """
+    Installs visual studio code extensions with a single run of `code`, see `handle_python_packages`
+    """
+    if not packages:
+        return {}
+    base_c, version = get_code(packages[0][0], metadata)
+
+    def build(remaining: list) -> list:
+        command = [base_c]
+        for name, requested in remaining:
+            command += ['--install-extension', f'{name}@{requested}' if requested else name]
+        return command + ['--force']
+
+    def report(name: str, status: str, detail: str):
+        highlighted = name if metadata.no_color else f'{Fore.LIGHTMAGENTA_EX}{name}{Fore.RESET}'
+        if status == 'installing':
+            write(f'Code v{version} :: Installing {highlighted}', 'white' if metadata.no_color else 'bright_green', metadata)
+        elif status == 'satisfied':
+            write(f'Code v{version} :: {highlighted} Is Already Installed!', 'white' if metadata.no_color else 'bright_yellow', metadata)
+        elif status == 'installed':
+            write(f'Code v{version} :: Successfully Installed {highlighted}', 'white' if metadata.no_color else 'bright_green', metadata)
+        elif status == 'failed':
+            write(f'Code v{version} :: Failed To Install {name} => {detail}', 'red', metadata)
+
+    return run_batch(build, packages, parse_code_line, report, shell=True)
+
+
+def handle_atom_packages(packages: list, metadata: Metadata) -> dict:
+    """
+    Installs atom packages with a single run of apm, see `handle_python_packages`
+    """
+    if not packages:
+        return {}
+    check_apm(packages[0][0], metadata)
+
+    def build(remaining: list) -> list:
+        return ['apm', 'install'] + [f'{name}@{requested}' if requested else name for name, requested in remaining]
+
+    def report(name: str, status: str, detail: str):
+        if status == 'installed':
+            click.echo(click.style(f' Successfully Installed {name} to <=> {detail}', 'bright_green'))
+        elif status == 'failed':
+            click.echo(click.style(f' Failed to Install {name} => {detail}', 'red'))
+
+    return run_batch(build, packages, parse_apm_line, report, shell=True)
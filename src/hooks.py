@@ -0,0 +1,129 @@
+######################################################################
+#                               HOOKS                                #
+######################################################################
+
+from script_host import get_powershell_host, run_batch
+import tempfile
+import tracing
+
+
+class HookError(Exception):
+    """
+    Raised when a hook can't be run, ex: it needs an elevated prompt, the package isn't installed past that stage
+    """
+
+
+def get_placeholders(packet, installer: str = '') -> dict:
+    """
+    Gets the values substituted into the code of a package's hooks
+
+    #### Arguments
+        packet (Packet): Packet of the package being installed
+        installer (str): Path to the downloaded installer
+
+    Returns:
+        dict: Values keyed by placeholder
+    """
+    return {
+        '<installer>': installer if installer else '',
+        '<package-name>': packet.json_name,
+        '<display-name>': packet.display_name,
+        '<version>': packet.version,
+        '<directory>': packet.directory if packet.directory else '',
+        '<temp>': tempfile.gettempdir(),
+    }
+
+
+def substitute(code: list, placeholders: dict) -> list:
+    """
+    Substitutes placeholders into every line of a hook
+
+    #### Arguments
+        code (list): Lines of the hook
+        placeholders (dict): Values keyed by placeholder
+
+    Returns:
+        list: Lines with every placeholder replaced
+    """
+    lines = []
+    for line in code:
+        for placeholder, value in placeholders.items():
+            line = line.replace(placeholder, value)
+        lines.append(line)
+    return lines
+
+
+class HookRunner:
+    """
+    Runs the hooks of a single package, PowerShell hooks go through the host shared by the whole command and each one
+    runs in a scope of its own
+    """
+
+    def __init__(self, packet, metadata):
+        self.packet = packet
+        self.metadata = metadata
+
+    def run(self, stage: str, installer: str = '') -> list:
+        """
+        Runs every hook of a stage in order
+
+        #### Arguments
+            stage (str): Name of the stage (`pre-install` or `post-install`)
+            installer (str): Path to the downloaded installer
+
+        Returns:
+            list: Exit code of each hook
+
+        Raises:
+            HookError: If a hook needs administrator rights electric wasn't run with, later hooks of the stage don't run
+        """
+        from logger import log_info
+
+        hooks = self.packet.raw.get(stage)
+        if not isinstance(hooks, list):
+            return []
+
+        log_info(f'Executing {stage} code for {self.packet.display_name}', self.metadata.logfile)
+        placeholders = get_placeholders(self.packet, installer)
+        exit_codes = []
+
+        with tracing.span(stage) as span:
+            for hook in hooks:
+                exit_code = self.run_hook(stage, hook, placeholders)
+                if exit_code is not None:
+                    exit_codes.append(exit_code)
+            span.set(outcome='ok' if not any(exit_codes) else 'failed')
+
+        return exit_codes
+
+    def run_hook(self, stage: str, hook: dict, placeholders: dict) -> int:
+        """
+        Runs a single hook
+
+        Returns:
+            int: Exit code of the hook, None if its type isn't supported
+        """
+        from logger import log_info
+
+        if hook.get('admin') == True:
+            from utils import is_admin
+
+            if not is_admin():
+                log_info(f'{stage} code for {self.packet.display_name} must be run as administrator', self.metadata.logfile)
+                raise HookError(f'{self.packet.display_name} Installation Must Be Run As Administrator')
+
+        code = substitute(hook['code'], placeholders)
+
+        if hook['type'] in ['powershell', 'ps1']:
+            return get_powershell_host().run(code)
+
+        if hook['type'] in ['cmd', 'batch', 'bat']:
+            return run_batch(code, self.metadata)
+
+        if hook['type'] == 'python':
+            try:
+                exec('\n'.join(code) + '\n', {'__name__': f'electric-{stage}'})
+                return 0
+            except Exception as err:
+                log_info(f'{stage} code for {self.packet.display_name} failed: {err}', self.metadata.logfile)
+                return 1
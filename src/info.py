@@ -2,6 +2,7 @@
 #                                INFO                                #
 ######################################################################
 
+import os
 
 __title__ = 'electric'
 __description__ = 'A package manager for Windows, MacOS And Linux!'
@@ -11,6 +12,13 @@ __version__ = '1.0.0'
 __author__ = 'XtremeDevX'
 __credits__ = ''
 
+# Base url of the package registry, ELECTRIC_REGISTRY points electric at a
+# mirror or at the local stand-in registry used by the benchmarks
+__registry__ = os.environ.get(
+    'ELECTRIC_REGISTRY', 'https://raw.githubusercontent.com/electric-package-manager/electric-packages/master').rstrip('/')
+__package_list__ = os.environ.get(
+    'ELECTRIC_REGISTRY', 'https://raw.githubusercontent.com/XtremeDevX/electric-packages/master').rstrip('/') + '/package-list.json'
+
 __license__ = """Apache License 2.0
 A permissive license whose main conditions require preservation
 of copyright and license notices. Contributors provide an express
@@ -0,0 +1,346 @@
+######################################################################
+#                              LOCKFILE                              #
+######################################################################
+
+from datetime import datetime
+from Classes.Metadata import Metadata
+from extension import write
+import hashlib
+import json
+import os
+
+# Version of the lockfile layout, bumped whenever an entry changes shape
+FORMAT = 1
+CHUNK_SIZE = 1024 * 1024
+
+PYPI = 'https://pypi.org/pypi'
+NPM = 'https://registry.npmjs.org'
+VSCODE = 'https://marketplace.visualstudio.com/_apis/public/gallery'
+ATOM = 'https://atom.io/api/packages'
+
+
+class LockError(Exception):
+    pass
+
+
+def get_lockfile_path(config_path: str) -> str:
+    """
+    Gets the lockfile which belongs to a configuration, ex: `dev.electric` => `dev.electric.lock`
+    """
+    return config_path if config_path.endswith('.lock') else f'{config_path}.lock'
+
+
+def hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest().upper()
+
+
+def hash_url(session, url: str) -> tuple:
+    """
+    Streams a file and hashes it without keeping it
+
+    Returns:
+        tuple: (size, sha256) of the file
+    """
+    digest = hashlib.sha256()
+    size = 0
+    with session.get(url, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    return size, digest.hexdigest().upper()
+
+
+def lock_package(session, name: str, version: str) -> list:
+    """
+    Locks an electric package and every package it depends on
+
+    Returns:
+        list: Entries of the package followed by its dependencies
+    """
+    from offline import BundleError, resolve, trim_manifest
+    from utils import get_hash_algorithm
+
+    try:
+        packages = resolve([name], {name: version} if version else None)
+    except BundleError as err:
+        raise LockError(str(err))
+
+    entries = []
+    for manifest, resolved in packages:
+        pkg = manifest[resolved]
+        checksum = pkg.get('checksum')
+
+        if checksum and get_hash_algorithm(checksum) == 'sha256':
+            # The registry already publishes the hash, only the size is needed
+            response = session.head(pkg['url'], allow_redirects=True, timeout=15)
+            size = int(response.headers['content-length']) if 'content-length' in response.headers else None
+            sha256 = checksum.strip().upper()
+        else:
+            size, sha256 = hash_url(session, pkg['url'])
+
+        locked = trim_manifest(manifest, resolved)
+        locked[resolved].update({'size': size, 'sha256': sha256})
+        entries.append({
+            'name': manifest['package-name'],
+            'version': resolved,
+            'url': pkg['url'],
+            'size': size,
+            'sha256': sha256,
+            'dependencies': pkg.get('dependencies') or [],
+            'manifest': locked,
+        })
+
+    return entries
+
+
+# pip, npm and the editors install these by (name, version) and resolve their
+# dependencies themselves, so only the exact version is recorded. Unlike
+# electric packages there is no file whose hash would be checked on install
+def lock_pip_package(session, name: str, version: str) -> dict:
+    response = session.get(f'{PYPI}/{name}/{version}/json' if version else f'{PYPI}/{name}/json', timeout=15)
+    if response.status_code != 200:
+        raise LockError(f'Could Not Find {name} On PyPI')
+    return {'name': name, 'version': response.json()['info']['version']}
+
+
+def lock_node_package(session, name: str, version: str) -> dict:
+    response = session.get(f'{NPM}/{name}/{version or "latest"}', timeout=15)
+    if response.status_code != 200:
+        raise LockError(f'Could Not Find {name} On npm')
+    return {'name': name, 'version': response.json()['version']}
+
+
+def lock_vscode_extension(session, name: str, version: str) -> dict:
+    if not version:
+        response = session.post(f'{VSCODE}/extensionquery', json={
+            'filters': [{'criteria': [{'filterType': 7, 'value': name}]}],
+            'flags': 0x1,
+        }, headers={'Accept': 'application/json;api-version=3.0-preview.1'}, timeout=15)
+        try:
+            version = response.json()['results'][0]['extensions'][0]['versions'][0]['version']
+        except (ValueError, KeyError, IndexError):
+            raise LockError(f'Could Not Find {name} On The Visual Studio Marketplace')
+    return {'name': name, 'version': version}
+
+
+def lock_atom_package(session, name: str, version: str) -> dict:
+    response = session.get(f'{ATOM}/{name}', timeout=15)
+    if response.status_code != 200:
+        raise LockError(f'Could Not Find {name} On atom.io')
+    return {'name': name, 'version': version or response.json()['releases']['latest']}
+
+
+def get_entries(config, header: str) -> list:
+    """
+    Gets the (name, version) pairs of a section of a configuration, version is None for the latest version
+    """
+    entries = []
+    for entry in config.dictionary.get(header) or []:
+        if isinstance(entry, str):
+            # Sections filled in from `electric list --installed` are plain names
+            entry = {entry.strip(): None}
+        if not isinstance(entry, dict):
+            continue
+        for name, version in entry.items():
+            if name:
+                entries.append((name, None if version in [None, '', 'latest'] else version))
+    return entries
+
+
+def lock_config(config, config_path: str) -> dict:
+    """
+    Resolves every entry of a configuration to an exact version, electric packages also record the url, size and sha256
+    of their installer, which is checked when they are installed
+
+    #### Arguments
+        config (`Config`): Configuration to lock
+        config_path (str): Path to the configuration, its hash is recorded so a stale lockfile is detected
+
+    Returns:
+        dict: Contents of the lockfile
+    """
+    from utils import get_session
+
+    session = get_session()
+    packages = []
+    for name, version in get_entries(config, 'Packages'):
+        for entry in lock_package(session, name, version):
+            if all(entry['name'] != locked['name'] for locked in packages):
+                packages.append(entry)
+
+    editor = config.dictionary['Editor-Configuration'][0]['Editor'] \
+        if config.dictionary.get('Editor-Configuration') else None
+    extensions = []
+    for name, version in get_entries(config, 'Editor-Extensions'):
+        if editor in ['Visual Studio Code', 'Visual Studio Code Insiders']:
+            extensions.append(lock_vscode_extension(session, name, version))
+        elif editor == 'Atom':
+            extensions.append(lock_atom_package(session, name, version))
+        else:
+            # Package Control doesn't version packages, they can only be recorded by name
+            extensions.append({'name': name, 'version': None})
+
+    return {
+        'lockfile-version': FORMAT,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'config': os.path.basename(config_path),
+        'config-sha256': hash_file(config_path),
+        'editor': editor,
+        'packages': packages,
+        'pip-packages': [lock_pip_package(session, name, version) for name, version in get_entries(config, 'Pip-Packages')],
+        'node-packages': [lock_node_package(session, name, version) for name, version in get_entries(config, 'Node-Packages')],
+        'editor-extensions': extensions,
+    }
+
+
+def write_lockfile(lock: dict, path: str):
+    with open(path, 'w') as f:
+        json.dump(lock, f, indent=4)
+        f.write('\n')
+
+
+def read_lockfile(path: str, config_path: str = None) -> dict:
+    """
+    Reads a lockfile, checking it was generated from the current version of its configuration
+
+    #### Arguments
+        path (str): Path to the lockfile
+        config_path (str): Path to the configuration the lockfile belongs to, if it is available
+
+    Returns:
+        dict: Contents of the lockfile
+    """
+    try:
+        with open(path, 'r') as f:
+            lock = json.load(f)
+    except FileNotFoundError:
+        raise LockError(f'Could Not Find {path}, Run `electric lock` To Generate It')
+    except ValueError as err:
+        raise LockError(f'{path} Is Not A Valid Lockfile: {err}')
+
+    if lock.get('lockfile-version') != FORMAT:
+        raise LockError(f'{path} Was Generated By An Incompatible Version Of Electric')
+
+    if config_path and os.path.isfile(config_path) and hash_file(config_path) != lock['config-sha256']:
+        raise LockError(f'{os.path.basename(config_path)} Has Changed Since {path} Was Generated, Run `electric lock` Again')
+
+    return lock
+
+
+def get_install_order(packages: list) -> list:
+    """
+    Groups locked packages into batches which only depend on packages in earlier batches
+
+    Returns:
+        list: Batches of entries, each one can be installed concurrently
+    """
+    remaining = {entry['name']: entry for entry in packages}
+    installed = set()
+    batches = []
+
+    while remaining:
+        batch = [entry for entry in remaining.values()
+                 if all(dependency in installed or dependency not in remaining for dependency in entry['dependencies'])]
+        if not batch:
+            # A dependency cycle, whatever is left is installed together
+            batch = list(remaining.values())
+        for entry in batch:
+            del remaining[entry['name']]
+            installed.add(entry['name'])
+        batches.append(batch)
+
+    return batches
+
+
+def merge_path(current: str, values: list) -> str:
+    """
+    Appends the entries of PATH values read from the registry which aren't already in a PATH
+
+    #### Arguments
+        current (str): PATH of this process
+        values (list): Raw PATH values, REG_EXPAND_SZ entries like `%SystemRoot%\\system32` are expanded
+
+    Returns:
+        str: The current PATH followed by every new entry
+    """
+    entries = [entry for entry in current.split(os.pathsep) if entry]
+    seen = {os.path.normcase(entry.rstrip('\\/')) for entry in entries}
+    for value in values:
+        for entry in os.path.expandvars(value).split(os.pathsep):
+            key = os.path.normcase(entry.rstrip('\\/'))
+            if entry and key not in seen:
+                seen.add(key)
+                entries.append(entry)
+    return os.pathsep.join(entries)
+
+
+def refresh_path():
+    """
+    Adds the PATH entries written to the registry since electric started, so tools installed by earlier packages of a
+    plan can be found
+    """
+    import winreg
+
+    values = []
+    for root, key in [(winreg.HKEY_LOCAL_MACHINE, r'SYSTEM\CurrentControlSet\Control\Session Manager\Environment'),
+                      (winreg.HKEY_CURRENT_USER, 'Environment')]:
+        try:
+            with winreg.OpenKey(root, key, 0, winreg.KEY_READ) as handle:
+                values.append(str(winreg.QueryValueEx(handle, 'Path')[0]))
+        except OSError:
+            # A user without a Path of their own
+            continue
+    os.environ['PATH'] = merge_path(os.environ.get('PATH', ''), values)
+
+
+def execute_plan(plan: dict, install_directory: str, metadata: Metadata):
+    """
+    Installs an install plan in this process, either read from a lockfile or resolved from a configuration
+
+    #### Arguments
+        plan (dict): Packages to install, shaped like a lockfile
+        install_directory (str): Directory packages are installed into
+        metadata (`Metadata`): Metadata for the installation
+    """
+    import external
+    from Classes.ThreadedInstaller import ThreadedInstaller
+    from state import get_state
+    from utils import generate_packet
+
+    for batch in get_install_order(plan['packages']):
+        packets = []
+        for entry in batch:
+            if get_state().get_receipt(entry['name'], entry['version']):
+                write(f'{entry["manifest"]["display-name"]} {entry["version"]} Is Already Installed', 'yellow', metadata)
+                continue
+
+            packet = generate_packet(entry['manifest'], entry['version'], install_directory)
+            # Dependencies are planned as packages of their own and installed in an earlier batch
+            packet.dependencies = None
+            packets.append(packet)
+
+        if packets:
+            manager = ThreadedInstaller(packets, metadata)
+            manager.handle_multi_install(manager.handle_multi_download())
+
+    if plan['packages']:
+        # Python, node or an editor may have just been installed by the plan
+        refresh_path()
+
+    # Every package of a kind is installed by a single run of its package manager
+    external.handle_python_packages([(entry['name'], entry['version']) for entry in plan['pip-packages']], metadata)
+    external.handle_node_packages([(entry['name'], entry['version']) for entry in plan['node-packages']], metadata)
+
+    extensions = [(entry['name'], entry['version']) for entry in plan['editor-extensions']]
+    if plan['editor'] in ['Visual Studio Code', 'Visual Studio Code Insiders']:
+        external.handle_vscode_extensions(extensions, metadata)
+    elif plan['editor'] == 'Atom':
+        external.handle_atom_packages(extensions, metadata)
+    elif plan['editor'] == 'Sublime Text 3':
+        for name, _ in extensions:
+            external.handle_sublime_extension(name, 'install', metadata)
@@ -3,23 +3,217 @@
 ######################################################################
 
 from Classes.PathManager import PathManager
-from os.path import isfile, isdir
+from datetime import date
+from queue import Empty, SimpleQueue
+from threading import Event, Lock, Thread
 from time import strftime
-from os import mkdir
-import logging
+import atexit
+import os
 
 appdata_dir = PathManager.get_appdata_directory()
+appdata_log = f'{appdata_dir}\\electric-log.log'
+
+# The appdata log is rotated once it grows past MAX_BYTES or was last written
+# on a previous day, keeping BACKUPS older logs as electric-log.log.1, .2 ...
+MAX_BYTES = 5 * 1024 * 1024
+BACKUPS = 3
+
+SEPARATOR = '-' * 75 + '\n'
+
+
+def lock_file(fd: int):
+    """
+    Blocks until this process holds the lock on an open file
+    """
+    if os.name == 'nt':
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                # LK_LOCK only retries for 10 seconds before giving up
+                msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+    else:
+        import fcntl
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def unlock_file(fd: int):
+    if os.name == 'nt':
+        import msvcrt
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class LogWriter:
+    """
+    Appends log lines from a background thread, callers only pay for putting the line on a queue
+    """
+
+    def __init__(self, rotating: list = None, max_bytes: int = MAX_BYTES, backups: int = BACKUPS):
+        self.queue = SimpleQueue()
+        self.rotating = set(rotating or [])
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.closed = False
+        self.thread = Thread(target=self.run, name='electric-log-writer', daemon=True)
+        self.thread.start()
+
+    def write(self, path: str, text: str):
+        """
+        Queues text to be appended to a file
+
+        #### Arguments
+            path (str): File to append to
+            text (str): Text to append
+        """
+        self.queue.put((path, text))
+
+    def run(self):
+        while True:
+            batches = {}
+            waiters = []
+            stop = False
+
+            # Block for the first item, then take everything else that is
+            # already queued so each file is opened once per batch
+            item = self.queue.get()
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, Event):
+                    waiters.append(item)
+                else:
+                    path, text = item
+                    batches.setdefault(path, []).append(text)
+                try:
+                    item = self.queue.get_nowait()
+                except Empty:
+                    break
+
+            for path, lines in batches.items():
+                try:
+                    self.append(path, ''.join(lines))
+                except OSError:
+                    # Logging must never take down the command being logged
+                    pass
+
+            for waiter in waiters:
+                waiter.set()
+
+            if stop:
+                return
+
+    def append(self, path: str, text: str):
+        """
+        Appends text to a file, holding a lock file so concurrent electric processes never interleave or rotate mid-write
+        """
+        data = text.encode('utf-8')
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        lock = os.open(f'{path}.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            lock_file(lock)
+            try:
+                if path in self.rotating:
+                    self.rotate(path, len(data))
+
+                fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+            finally:
+                unlock_file(lock)
+        finally:
+            os.close(lock)
+
+    def rotate(self, path: str, incoming: int):
+        """
+        Moves a log out of the way if it is too large or from a previous day
+
+        #### Arguments
+            path (str): Path to the log
+            incoming (int): Number of bytes about to be appended
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return
+
+        if stat.st_size + incoming <= self.max_bytes and date.fromtimestamp(stat.st_mtime) == date.today():
+            return
+
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.isfile(f'{path}.{index}'):
+                os.replace(f'{path}.{index}', f'{path}.{index + 1}')
+        os.replace(path, f'{path}.1')
+
+    def flush(self, timeout: float = 5):
+        """
+        Waits for every line queued so far to be written
+        """
+        if self.closed:
+            return
+        done = Event()
+        self.queue.put(done)
+        done.wait(timeout)
+
+    def close(self, timeout: float = 5):
+        """
+        Writes the remaining lines and stops the writer thread
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.queue.put(None)
+        self.thread.join(timeout)
+
+
+writer = None
+writer_lock = Lock()
+
+
+def get_writer() -> LogWriter:
+    """
+    Gets the log writer for this process, starting it on first use
+
+    Returns:
+        LogWriter: Writer rotating the appdata log
+    """
+    global writer
+    if writer is None:
+        with writer_lock:
+            if writer is None:
+                writer = LogWriter([appdata_log])
+                atexit.register(writer.close)
+    return writer
+
+
+def flush_log():
+    """
+    Waits for queued log lines to reach disk, used before exiting without running atexit handlers
+    """
+    if writer is not None:
+        writer.flush()
+
 
 def start_log():
     """
     Register a new command start in the appdata electric logfile
-    """    
-    mode = 'a+' if isfile(f'{appdata_dir}\\electric-log.log') else 'w+'
-    with open(f'{appdata_dir}\\electric-log.log', mode) as f:
-        f.write('-' * 75)
-        
+    """
+    get_writer().write(appdata_log, SEPARATOR)
+
+
 # Create Log File At A Certain Directory (logfile)
-def create_config(logfile : str, level, process : str):
+def create_config(logfile: str, level, process: str):
     """
     Initializes a logger and handles logging to a specific file if told to do so
 
@@ -28,68 +222,50 @@ def create_config(logfile : str, level, process : str):
         level ([type]): The level of the logging (defaults to info)
         process (str): The method (installation / uninstallation)
     """
-    if not isdir(appdata_dir):
-        mkdir(appdata_dir)
-
-    mode = None
-    mode = 'a+' if isfile(logfile) else 'w+'
-    file = open(logfile, mode)
-    try:
-        file.write('-' * 75)
-        file.write('\n')
-    finally:
-        file.close()
+    get_writer().write(logfile, SEPARATOR +
+                       f'INFO:root:Initialising RapidLogger With {process} at {strftime("%H:%M:%S")}\n')
 
-    logging.basicConfig(filename=logfile, level=logging.DEBUG, encoding='utf-8')
-    logging.info(f'Initialising RapidLogger With {process} at {strftime("%H:%M:%S")}')
 
-def close_log(logfile : str, process : str):
+def close_log(logfile: str, process: str):
     """
     Marks a completed log into the specified logfile and the appdata electric logs
 
     #### Arguments
         logfile (str): The file to log to
         process (str): The method (installation / uninstallation)
-    """    
-    with open(f'{appdata_dir}\\electric-log.log', 'a+') as f:
-        f.write('-' * 75)
-        f.write('\n')
+    """
+    log_writer = get_writer()
+    log_writer.write(appdata_log, SEPARATOR)
 
     if logfile:
-        logging.info(f'Terminating RapidLogger On {process} at {strftime("%H:%M:%S")}')
-        file = open(logfile, 'a+')
-        try:
-            file.write('-' * 75)
-            file.write('\n')
-        finally:
-            file.close()
+        log_writer.write(logfile, f'INFO:root:Terminating RapidLogger On {process} at {strftime("%H:%M:%S")}\n' + SEPARATOR)
 
 
-def log_info(text : str, logfile : str):
+def log_info(text: str, logfile: str):
     """
     Logs with a level of `info` to a logfile
 
     #### Arguments
         text (str): The text to log / write to the file
         logfile (str): The file to write logs to
-    """    
-    mode = 'a+'
-
-    with open(f'{appdata_dir}\\electric-log.log', mode) as f:
-        f.write(f'\nINFO:root:{text}')
+    """
+    line = f'INFO:root:{text}\n'
+    log_writer = writer or get_writer()
+    log_writer.write(appdata_log, line)
     if logfile:
-        logging.info(text)
+        log_writer.write(logfile, line)
 
 
-def log_error(text : str, logfile : str):
+def log_error(text: str, logfile: str):
     """
     Logs with a level of `error` to a logfile
 
     #### Arguments
         text (str): Text to log / write to the file
         logfile (str): The file to write logs to
-    """    
-    with open(f'\n{appdata_dir}\\electric-log.log', 'a+') as f:
-        f.write(f'INFO:root:{text}')
+    """
+    line = f'ERROR:root:{text}\n'
+    log_writer = writer or get_writer()
+    log_writer.write(appdata_log, line)
     if logfile:
-        logging.error(text)
+        log_writer.write(logfile, line)
@@ -0,0 +1,165 @@
+######################################################################
+#                         MULTI-LANE PROGRESS                        #
+######################################################################
+
+from threading import Event, Thread
+from time import monotonic
+import sys
+
+
+class Lane:
+    """
+    Progress of a single download, only the thread running the download writes to it
+    """
+    __slots__ = ['name', 'total', 'downloaded', 'done']
+
+    def __init__(self, name: str, total: int = None):
+        self.name = name
+        self.total = total
+        self.downloaded = 0
+        self.done = False
+
+
+def format_size(size: float) -> str:
+    return f'{size / 1000000:.1f}'
+
+
+def format_eta(seconds: float) -> str:
+    if seconds is None:
+        return '--:--'
+    minutes, seconds = divmod(int(seconds), 60)
+    return f'{minutes}:{seconds:02d}'
+
+
+class ProgressRenderer:
+    """
+    Draws one lane per active download and an aggregate line from a single thread.
+    Downloads only bump the counters of their lane, so a chunk costs an attribute update no matter how many lanes are drawn.
+
+    #### Arguments
+        enabled (bool): Whether anything is drawn, lanes are still counted when disabled
+        stream: Terminal to draw on, defaults to stdout
+        interval (float): Seconds between frames
+        width (int): Width of each progress bar
+    """
+
+    def __init__(self, enabled: bool = True, stream=None, interval: float = 0.1, width: int = 20):
+        self.enabled = enabled
+        self.stream = stream or sys.stdout
+        self.interval = interval
+        self.width = width
+        self.lanes = []
+        self.drawn = 0
+        self.samples = []
+        self.stopped = Event()
+        self.thread = None
+
+    def add(self, name: str, total: int = None) -> Lane:
+        """
+        Adds a lane for a download which is starting
+
+        #### Arguments
+            name (str): Name shown for the lane
+            total (int): Size of the download, None if the server didn't send it
+
+        Returns:
+            Lane: Counters the download should update
+        """
+        lane = Lane(name, total)
+        self.lanes.append(lane)
+        return lane
+
+    def throughput(self, downloaded: int, now: float) -> float:
+        """
+        Gets the aggregate throughput over roughly the last 3 seconds
+        """
+        self.samples.append((now, downloaded))
+        while len(self.samples) > 2 and now - self.samples[0][0] > 3:
+            self.samples.pop(0)
+
+        start, initial = self.samples[0]
+        if now - start <= 0:
+            return 0
+        return (downloaded - initial) / (now - start)
+
+    def render(self, now: float = None) -> list:
+        """
+        Renders the current frame
+
+        Returns:
+            list: Lines of the frame, one for each active download followed by the aggregate
+        """
+        lanes = list(self.lanes)
+        lines = []
+
+        for lane in lanes:
+            if lane.done:
+                continue
+            if lane.total:
+                complete = min(int(self.width * lane.downloaded / lane.total), self.width)
+                percentage = round(lane.downloaded / lane.total * 100)
+                lines.append(
+                    f'{lane.name[:24]:<24} ({"█" * complete}{" " * (self.width - complete)}) {percentage:>3} %  {format_size(lane.downloaded)} / {format_size(lane.total)} MB')
+            else:
+                lines.append(f'{lane.name[:24]:<24} {format_size(lane.downloaded)} MB')
+
+        downloaded = sum(lane.downloaded for lane in lanes)
+        total = sum(lane.total or lane.downloaded for lane in lanes)
+        speed = self.throughput(downloaded, now if now is not None else monotonic())
+        if downloaded >= total:
+            eta = 0
+        else:
+            eta = (total - downloaded) / speed if speed else None
+        done = sum(lane.done for lane in lanes)
+
+        lines.append(
+            f'{done}/{len(lanes)} Downloaded  {format_size(downloaded)} / {format_size(total)} MB  {format_size(speed)} MB/s  ETA {format_eta(eta)}')
+        return lines
+
+    def draw(self):
+        lines = self.render()
+        frame = ''
+        if self.drawn:
+            # Move back to the first line of the previous frame
+            frame += f'\x1b[{self.drawn}F'
+        frame += ''.join(f'\x1b[K{line}\n' for line in lines)
+        # Clear lanes left over from a previous, taller frame and move back up
+        extra = self.drawn - len(lines)
+        if extra > 0:
+            frame += '\x1b[K\n' * extra + f'\x1b[{extra}F'
+
+        try:
+            self.stream.write(frame)
+        except UnicodeEncodeError:
+            self.stream.write(frame.encode('ascii', 'replace').decode())
+        self.stream.flush()
+        self.drawn = len(lines)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.draw()
+        self.draw()
+
+    def start(self):
+        if not self.enabled or self.thread:
+            return
+        self.thread = Thread(target=self.run, name='electric-progress', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Draws the final frame and stops the renderer
+        """
+        if not self.thread:
+            return
+        self.stopped.set()
+        self.thread.join()
+        self.thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+        return False
@@ -0,0 +1,294 @@
+######################################################################
+#                            OBJECT STORE                            #
+######################################################################
+
+from threading import Lock
+from uuid import uuid4
+import hashlib
+import os
+import shutil
+import zipfile
+import zlib
+
+CHUNK_SIZE = 1024 * 1024
+
+home = os.path.expanduser('~')
+
+
+def get_member_path(destination: str, filename: str) -> str:
+    """
+    Gets where a member of an archive is extracted to, dropping drives, `..` and absolute paths like `zipfile` does
+    """
+    filename = os.path.splitdrive(filename.replace('\\', '/'))[1]
+    parts = [part for part in filename.split('/') if part not in ['', '.', '..']]
+    return os.path.join(destination, *parts)
+
+
+def is_excluded(relative: str, exclude: list) -> bool:
+    relative = relative.replace('\\', '/')
+    return any(relative == path or relative.startswith(path.rstrip('/') + '/')
+               for path in (path.replace('\\', '/') for path in exclude))
+
+
+class ObjectStore:
+    """
+    Content addressed store of the files of portable packages, installed versions are trees of hardlinks into it so
+    files shared between versions or packages are only kept and written once
+
+    Objects are named after their sha256 and kept on the same volume as the packages, so linking one into a tree never
+    copies it. Trees on another volume, or on a filesystem without hardlinks, get copies instead
+    """
+
+    def __init__(self, root: str, state):
+        self.root = root
+        self.objects = os.path.join(root, 'objects')
+        self.temp = os.path.join(root, 'tmp')
+        self.state = state
+        os.makedirs(self.objects, exist_ok=True)
+        os.makedirs(self.temp, exist_ok=True)
+
+    def get_path(self, hash: str) -> str:
+        return os.path.join(self.objects, hash[:2], hash)
+
+    def is_intact(self, entry: dict) -> bool:
+        """
+        Checks an object wasn't changed through one of its links, an application writing to its own files would do so
+        """
+        try:
+            stat = os.stat(self.get_path(entry['hash']))
+        except FileNotFoundError:
+            return False
+        return stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime']
+
+    def add(self, path: str, hash: str, crc: int) -> str:
+        """
+        Moves a file into the store, dropping it if the store already has its contents
+
+        Returns:
+            str: Path to the object
+        """
+        target = self.get_path(hash)
+        entry = self.state.get_object(hash)
+        if entry and self.is_intact(entry):
+            os.remove(path)
+            return target
+
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(path, target)
+        stat = os.stat(target)
+        self.state.add_object(hash, stat.st_size, crc, stat.st_mtime_ns)
+        return target
+
+    def link(self, hash: str, destination: str) -> bool:
+        """
+        Links an object into a tree
+
+        Returns:
+            bool: Whether the object had to be copied because it couldn't be linked
+        """
+        if os.path.lexists(destination):
+            os.remove(destination)
+        try:
+            os.link(self.get_path(hash), destination)
+            return False
+        except OSError:
+            # Another volume, a filesystem without hardlinks or too many links to the object
+            shutil.copyfile(self.get_path(hash), destination)
+            return True
+
+    def write_member(self, archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> str:
+        """
+        Extracts a member of a zip archive into the store, hashing it as it is written
+
+        Returns:
+            str: Hash of the member
+        """
+        digest = hashlib.sha256()
+        temp = os.path.join(self.temp, uuid4().hex)
+        with archive.open(member) as source, open(temp, 'wb') as f:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                f.write(chunk)
+        hash = digest.hexdigest()
+        self.add(temp, hash, member.CRC)
+        return hash
+
+    def find_member(self, archive: zipfile.ZipFile, member: zipfile.ZipInfo) -> str:
+        """
+        Finds an object with the same contents as a member of a zip archive, the member is read but never written
+
+        Returns:
+            str: Hash of the object, None if the store doesn't have the member
+        """
+        candidates = [entry for entry in self.state.find_objects(member.CRC, member.file_size) if self.is_intact(entry)]
+        if not candidates:
+            return None
+
+        # A crc32 is too weak to trust on its own
+        digest = hashlib.sha256()
+        with archive.open(member) as source:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+        hash = digest.hexdigest()
+        return hash if any(entry['hash'] == hash for entry in candidates) else None
+
+    def find_installed_member(self, package: str, relative: str, member: zipfile.ZipInfo) -> str:
+        """
+        Finds the object an installed version of a package keeps at the path of a zip member, matched on the crc32 and
+        size of the member without reading it. Used while streaming, where reading a member means downloading it
+
+        Returns:
+            str: Hash of the object, None if no version has the member or the match is ambiguous
+        """
+        # A crc32 and size alone could match an unrelated file, a file the same package keeps at the same path can't
+        candidates = [entry for entry in self.state.find_tree_objects(package, relative, member.CRC, member.file_size)
+                      if self.is_intact(entry)]
+        return candidates[0]['hash'] if len(candidates) == 1 else None
+
+    def extract_zip(self, archive: zipfile.ZipFile, destination: str, package: str, version: str,
+                    exclude: list = None, progress=None, workers: int = None) -> dict:
+        """
+        Extracts a zip archive as a tree of links, members the store already has aren't written again
+
+        #### Arguments
+            archive (`zipfile.ZipFile`): Archive to extract
+            destination (str): Directory the version is extracted into
+            package (str): Json name of the package
+            version (str): Version of the package
+            exclude (list): Paths extracted as plain files, ex: the `persist` paths the application writes to
+            progress (function): Called after each file is extracted, from the thread which extracted it
+            workers (int): Threads to extract on, each opens the archive again. Archives opened from a file object are
+                extracted on one
+
+        Returns:
+            dict: Number of files which were `written`, `linked` to existing objects or `copied`
+        """
+        from zip_extract import WORKERS, partition, precreate_directories, run
+
+        stats = {'written': 0, 'linked': 0, 'copied': 0}
+        files = {}
+        lock = Lock()
+
+        members = archive.infolist()
+        precreate_directories(destination, [member.filename for member in members])
+        members = sorted([member for member in members if not member.is_dir()], key=lambda member: member.header_offset)
+        parts = partition(members, (workers or WORKERS) if archive.filename else 1, lambda member: member.compress_size)
+
+        def extract(part: list):
+            handle = zipfile.ZipFile(archive.filename) if len(parts) > 1 else archive
+            try:
+                for member in part:
+                    target = get_member_path(destination, member.filename)
+                    relative = os.path.relpath(target, destination)
+                    hash = None
+                    if exclude and is_excluded(relative, exclude):
+                        handle.extract(member, destination)
+                        kind = 'written'
+                    else:
+                        hash = self.find_member(handle, member)
+                        kind = 'linked' if hash else 'written'
+                        hash = hash or self.write_member(handle, member)
+                    copied = hash is not None and self.link(hash, target)
+
+                    with lock:
+                        stats[kind] += 1
+                        stats['copied'] += copied
+                        if hash:
+                            files[relative] = hash
+                    if progress:
+                        progress(member)
+            finally:
+                if handle is not archive:
+                    handle.close()
+
+        run(parts, extract)
+        self.state.add_tree(package, version, files)
+        return stats
+
+    def import_tree(self, directory: str, package: str, version: str, exclude: list = None, linked: dict = None) -> dict:
+        """
+        Moves the files of an extracted version into the store and replaces them with links, for formats which can't be
+        extracted straight into the store
+
+        #### Arguments
+            directory (str): Directory the version was extracted into
+            package (str): Json name of the package
+            version (str): Version of the package
+            exclude (list): Paths left as plain files
+            linked (dict): Path relative to the directory => hash of the files already linked to objects, they aren't read
+
+        Returns:
+            dict: Number of files which were `written` to the store, `linked` to existing objects or `copied`
+        """
+        stats = {'written': 0, 'linked': len(linked or {}), 'copied': 0}
+        files = dict(linked or {})
+        for root, _, names in os.walk(directory):
+            for name in names:
+                path = os.path.join(root, name)
+                relative = os.path.relpath(path, directory)
+                if relative in files or os.path.islink(path) or (exclude and is_excluded(relative, exclude)):
+                    continue
+
+                # The crc32 lets members of zip archives be matched against the file later
+                digest = hashlib.sha256()
+                crc = 0
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+                        crc = zlib.crc32(chunk, crc)
+                hash = digest.hexdigest()
+
+                entry = self.state.get_object(hash)
+                stats['linked' if entry and self.is_intact(entry) else 'written'] += 1
+                try:
+                    self.add(path, hash, crc)
+                except OSError:
+                    # The version is on another volume than the store, its files are copied in
+                    temp = os.path.join(self.temp, uuid4().hex)
+                    shutil.copyfile(path, temp)
+                    self.add(temp, hash, crc)
+                if self.link(hash, path):
+                    stats['copied'] += 1
+                files[relative] = hash
+
+        self.state.add_tree(package, version, files)
+        return stats
+
+    def release(self, package: str, version: str):
+        """
+        Drops the references of an uninstalled version, its objects are deleted by `collect` once nothing else uses them
+        """
+        self.state.remove_tree(package, version)
+
+    def collect(self) -> tuple:
+        """
+        Deletes every object no installed version references
+
+        Returns:
+            tuple: (objects, bytes) which were deleted
+        """
+        unreferenced = self.state.get_unreferenced_objects()
+        freed = 0
+        for hash, size in unreferenced:
+            try:
+                os.remove(self.get_path(hash))
+                freed += size
+            except FileNotFoundError:
+                pass
+        self.state.remove_objects([hash for hash, _ in unreferenced])
+        return len(unreferenced), freed
+
+
+store = None
+
+
+def get_store() -> ObjectStore:
+    """
+    Gets the object store for this process, kept in `~/electric/.store` so it is on the same volume as the packages
+    """
+    from state import get_state
+
+    global store
+    if store is None:
+        store = ObjectStore(os.path.join(home, 'electric', '.store'), get_state())
+    return store
@@ -0,0 +1,265 @@
+######################################################################
+#                           OFFLINE BUNDLES                          #
+######################################################################
+
+from datetime import datetime
+import hashlib
+import json
+import os
+import zipfile
+import events
+import tracing
+
+# Version of the .ebundle layout, bumped whenever the index changes shape
+FORMAT = 1
+INDEX = 'bundle.json'
+CHUNK_SIZE = 1024 * 1024
+
+# Set by `electric install --from`, manifests and installers are then read from it instead of the registry
+bundle = None
+
+
+class BundleError(Exception):
+    pass
+
+
+def trim_manifest(manifest: dict, version: str) -> dict:
+    """
+    Drops every version of a manifest except the one being bundled, which becomes its latest version
+
+    #### Arguments
+        manifest (dict): Manifest from the registry
+        version (str): Version which is bundled
+
+    Returns:
+        dict: Manifest which only resolves to the bundled installer
+    """
+    trimmed = {key: value for key, value in manifest.items()
+               if not isinstance(value, dict)}
+    trimmed[version] = manifest[version]
+    trimmed['latest-version'] = version
+    return trimmed
+
+
+def write_bundle(path: str, name: str, entries, requested: list) -> dict:
+    """
+    Writes an .ebundle archive, installers are streamed into the archive chunk by chunk
+
+    #### Arguments
+        path (str): Path of the archive to write
+        name (str): Name of the bundle or configuration being exported
+        entries: Iterable of (manifest, version, chunks) where chunks yields the bytes of the installer
+        requested (list): Packages which were asked for, as opposed to their dependencies
+
+    Returns:
+        dict: Index written to the archive
+    """
+    index = {
+        'format': FORMAT,
+        'name': name,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'requested': requested,
+        'packages': {},
+    }
+
+    # Installers are stored rather than deflated, they are almost always
+    # compressed already and stored members can be streamed back out as is
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+        for manifest, version, chunks in entries:
+            package = manifest['package-name']
+            file_type = manifest[version]['file-type']
+            member = f'installers/{package}@{version}{file_type}'
+
+            digest = hashlib.sha256()
+            size = 0
+            with tracing.span('bundle-write', track=package) as span:
+                with archive.open(member, 'w', force_zip64=True) as f:
+                    for chunk in chunks:
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+                span.set(bytes=size)
+
+            checksum = digest.hexdigest().upper()
+            expected = manifest[version].get('checksum')
+            if expected and expected.strip().upper() != checksum:
+                raise BundleError(
+                    f'Checksum of the {package} installer does not match its manifest')
+
+            archive.writestr(f'manifests/{package}.json', json.dumps(
+                trim_manifest(manifest, version), indent=4), zipfile.ZIP_DEFLATED)
+            index['packages'][package] = {
+                'version': version,
+                'file-type': file_type,
+                'installer': member,
+                'size': size,
+                'sha256': checksum,
+            }
+            events.emit('bundled', package, version=version, size=size)
+
+        archive.writestr(INDEX, json.dumps(index, indent=4), zipfile.ZIP_DEFLATED)
+
+    return index
+
+
+def resolve(packages: list, versions: dict = None) -> list:
+    """
+    Resolves packages and all of their dependencies against the registry
+
+    #### Arguments
+        packages (list): Names of the packages to resolve
+        versions (dict): Pinned version of a package, the latest version is used otherwise
+
+    Returns:
+        list: (manifest, version) of every package, dependencies are included once
+
+    Raises:
+        BundleError: If a package has no such version or is only published as a portable package
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from utils import send_req_package
+
+    versions = versions or {}
+    resolved = {}
+    pending = list(dict.fromkeys(packages))
+
+    # Manifests are fetched a level of the dependency tree at a time, every
+    # manifest of a level is requested at once
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        while pending:
+            for package, manifest in zip(pending, pool.map(send_req_package, pending)):
+                if 'latest-version' not in manifest:
+                    # Portable packages are extracted from archives rather than run as installers
+                    raise BundleError(f'{package} Is Only Available As A Portable Package, Which Can\'t Be Bundled Or Locked')
+                version = versions.get(package) or manifest['latest-version']
+                if version not in manifest:
+                    raise BundleError(f'{package} has no version {version}')
+                resolved[package] = (manifest, version)
+
+            dependencies = [dependency for package in pending
+                            for dependency in resolved[package][0][resolved[package][1]].get('dependencies') or []]
+            pending = [dependency for dependency in dict.fromkeys(dependencies) if dependency not in resolved]
+
+    return list(resolved.values())
+
+
+def export_bundle(name: str, packages: list, output: str, versions: dict = None) -> dict:
+    """
+    Resolves packages, downloads their installers and writes them to an .ebundle archive
+
+    #### Arguments
+        name (str): Name of the bundle or configuration being exported
+        packages (list): Packages to export
+        output (str): Path of the archive
+        versions (dict): Pinned versions of packages
+
+    Returns:
+        dict: Index written to the archive
+    """
+    import requests
+
+    def entries():
+        for manifest, version in resolve(packages, versions):
+            with requests.get(manifest[version]['url'], stream=True) as response:
+                response.raise_for_status()
+                yield manifest, version, response.iter_content(chunk_size=CHUNK_SIZE)
+
+    return write_bundle(output, name, entries(), packages)
+
+
+class OfflineBundle:
+    """
+    Reads manifests and installers from an .ebundle archive without extracting it
+
+    #### Arguments
+        path (str): Path to the archive
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            self.archive = zipfile.ZipFile(path, 'r')
+            self.index = json.loads(self.archive.read(INDEX))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as err:
+            raise BundleError(f'{path} is not a valid electric bundle: {err}')
+
+        if self.index.get('format') != FORMAT:
+            raise BundleError(
+                f'{path} was written by an incompatible version of electric')
+
+    @property
+    def packages(self) -> list:
+        return self.index['requested']
+
+    def get_manifest(self, package: str) -> dict:
+        """
+        Gets the manifest of a package in the bundle, None if the bundle doesn't contain it
+        """
+        if package not in self.index['packages']:
+            return None
+        return json.loads(self.archive.read(f'manifests/{package}.json'))
+
+    @tracing.traced('bundle-extract')
+    def extract_installer(self, package: str, path: str) -> str:
+        """
+        Copies the installer of a single package out of the archive, checking its hash while it is copied
+
+        #### Arguments
+            package (str): Package whose installer is needed
+            path (str): Where the installer is written
+
+        Returns:
+            str: Path to the installer
+        """
+        entry = self.index['packages'].get(package)
+        if not entry:
+            raise BundleError(f'{package} is not in {self.path}')
+
+        digest = hashlib.sha256()
+        with self.archive.open(entry['installer']) as source, open(path, 'wb') as f:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+        tracing.record(bytes=entry['size'])
+
+        if digest.hexdigest().upper() != entry['sha256']:
+            os.remove(path)
+            raise BundleError(f'The {package} installer in {self.path} is corrupt')
+
+        events.emit('downloaded', package, bundled=True)
+        return path
+
+    def close(self):
+        self.archive.close()
+
+
+def load(path: str) -> OfflineBundle:
+    """
+    Installs every following package from an .ebundle archive instead of the registry
+    """
+    global bundle
+    bundle = OfflineBundle(path)
+    return bundle
+
+
+def get_installer_directory() -> str:
+    import tempfile
+
+    directory = os.path.join(tempfile.gettempdir(), 'electric')
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def copy_installer(package: str) -> str:
+    """
+    Gets the installer of a package from the loaded bundle into the temp directory
+
+    Returns:
+        str: Path to the installer
+    """
+    file_type = bundle.index['packages'][package]['file-type'] if package in bundle.index['packages'] else ''
+    path = os.path.join(get_installer_directory(), f'{package}{file_type}')
+    return bundle.extract_installer(package, path)
@@ -0,0 +1,133 @@
+######################################################################
+#                             PROCESSES                              #
+######################################################################
+
+from Classes.ProcessSnapshot import ProcessSnapshot
+import os
+
+
+class ToolhelpBackend:
+    """
+    Enumerates processes through the Toolhelp32 API without spawning tasklist
+    """
+    def processes(self) -> list:
+        import ctypes
+        from ctypes import wintypes
+
+        TH32CS_SNAPPROCESS = 0x00000002
+        INVALID_HANDLE_VALUE = ctypes.c_void_p(-1).value
+
+        class PROCESSENTRY32W(ctypes.Structure):
+            _fields_ = [
+                ('dwSize', wintypes.DWORD),
+                ('cntUsage', wintypes.DWORD),
+                ('th32ProcessID', wintypes.DWORD),
+                ('th32DefaultHeapID', ctypes.c_void_p),
+                ('th32ModuleID', wintypes.DWORD),
+                ('cntThreads', wintypes.DWORD),
+                ('th32ParentProcessID', wintypes.DWORD),
+                ('pcPriClassBase', ctypes.c_long),
+                ('dwFlags', wintypes.DWORD),
+                ('szExeFile', ctypes.c_wchar * 260),
+            ]
+
+        kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+        kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+        kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+        kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
+        handle = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+        if handle == INVALID_HANDLE_VALUE:
+            raise ctypes.WinError(ctypes.get_last_error())
+
+        entries = []
+        try:
+            entry = PROCESSENTRY32W()
+            entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+            found = kernel32.Process32FirstW(handle, ctypes.byref(entry))
+            while found:
+                entries.append((entry.th32ProcessID, entry.szExeFile))
+                found = kernel32.Process32NextW(handle, ctypes.byref(entry))
+        finally:
+            kernel32.CloseHandle(handle)
+
+        return entries
+
+
+class ProcBackend:
+    """
+    Enumerates processes from a procfs mount, used when testing on Linux
+    """
+    def __init__(self, root: str = '/proc'):
+        self.root = root
+
+    def processes(self) -> list:
+        entries = []
+        for name in os.listdir(self.root):
+            if not name.isdigit():
+                continue
+            try:
+                with open(os.path.join(self.root, name, 'comm'), 'r') as f:
+                    entries.append((int(name), f.read().strip()))
+            except OSError:
+                # The process exited between the listdir and the read
+                continue
+        return entries
+
+
+class StaticBackend:
+    """
+    Serves a fixed list of `(pid, image_name)` pairs, used to fake the process table in tests
+    """
+    def __init__(self, processes: list):
+        self.entries = list(processes)
+
+    def processes(self) -> list:
+        return list(self.entries)
+
+
+backend = None
+snapshot = None
+
+
+def get_backend():
+    """
+    Gets the backend used to enumerate processes, choosing one for the current platform on first use
+
+    Returns:
+        Backend exposing a `processes()` method
+    """
+    global backend
+    if backend is None:
+        backend = ToolhelpBackend() if os.name == 'nt' else ProcBackend()
+    return backend
+
+
+def set_backend(new_backend):
+    """
+    Replaces the process enumeration backend and drops any cached snapshot
+
+    #### Arguments
+        new_backend: Backend exposing a `processes()` method
+    """
+    global backend, snapshot
+    backend = new_backend
+    snapshot = None
+
+
+def get_snapshot(refresh: bool = False) -> ProcessSnapshot:
+    """
+    Gets the process snapshot for the current command, the process table is only read once unless a refresh is requested
+
+    #### Arguments
+        refresh (bool): Take a new snapshot even if one is cached
+
+    Returns:
+        ProcessSnapshot: Snapshot of the running processes
+    """
+    global snapshot
+    if snapshot is None or refresh:
+        snapshot = ProcessSnapshot(get_backend().processes())
+    return snapshot
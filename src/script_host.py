@@ -0,0 +1,194 @@
+######################################################################
+#                            SCRIPT HOST                             #
+######################################################################
+
+from subprocess import PIPE, Popen
+from threading import Lock
+from uuid import uuid4
+import base64
+import os
+import sys
+import tempfile
+
+
+# Script blocks are framed on stdin, every block gets its own id so that a
+# stray line of output can never be mistaken for the end of another block:
+#
+#   <<<electric:begin ID>>>
+#   ...script...
+#   <<<electric:end ID>>>
+#
+# The host runs the block in a child scope, streams its output back and then
+# reports the exit code on a line of its own:
+#
+#   <<<electric:exit ID CODE>>>
+BEGIN = '<<<electric:begin {}>>>'
+END = '<<<electric:end {}>>>'
+EXIT = '<<<electric:exit '
+
+POWERSHELL_HOST = r'''
+$ErrorActionPreference = 'Continue'
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($line -eq $null) { break }
+    if ($line -notmatch '^<<<electric:begin (\S+)>>>$') { continue }
+    $id = $Matches[1]
+    $lines = New-Object System.Collections.Generic.List[string]
+    while ($true) {
+        $line = [Console]::In.ReadLine()
+        if ($line -eq $null -or $line -eq "<<<electric:end $id>>>") { break }
+        $lines.Add($line)
+    }
+    $code = 0
+    try {
+        $global:LASTEXITCODE = 0
+        & ([ScriptBlock]::Create($lines -join "`n")) *>&1 | Out-String -Stream | ForEach-Object { [Console]::Out.WriteLine($_) }
+        if (-not $?) { $code = 1 }
+        if ($global:LASTEXITCODE) { $code = $global:LASTEXITCODE }
+    } catch {
+        [Console]::Out.WriteLine($_.ToString())
+        $code = 1
+    }
+    [Console]::Out.WriteLine("<<<electric:exit $id $code>>>")
+    [Console]::Out.Flush()
+}
+'''
+
+
+class ScriptHost:
+    """
+    Keeps one interpreter alive for the duration of a command and runs script blocks through it over stdin
+    """
+
+    def __init__(self, command: list = None):
+        self.command = command
+        self.proc = None
+        self.lock = Lock()
+
+    @staticmethod
+    def get_powershell_command() -> list:
+        """
+        Gets the command line for a PowerShell process running the host loop
+
+        Returns:
+            list: Arguments to start the host with
+        """
+        encoded = base64.b64encode(POWERSHELL_HOST.encode('utf-16-le')).decode()
+        return ['powershell.exe', '-NoProfile', '-NoLogo', '-NonInteractive', '-ExecutionPolicy', 'Bypass', '-EncodedCommand', encoded]
+
+    def start(self):
+        if self.proc and self.proc.poll() is None:
+            return
+        self.proc = Popen(self.command if self.command else ScriptHost.get_powershell_command(),
+                          stdin=PIPE, stdout=PIPE, stderr=None, text=True, encoding='utf-8', bufsize=1)
+
+    def run(self, code: list, output=None) -> int:
+        """
+        Runs a script block in a fresh scope of the host interpreter
+
+        #### Arguments
+            code (list): Lines of the script block
+            output (file): Stream the output of the script is written to, stdout by default
+
+        Returns:
+            int: Exit code of the script block
+        """
+        output = output if output else sys.stdout
+        step = uuid4().hex
+
+        with self.lock:
+            self.start()
+            self.proc.stdin.write(BEGIN.format(step) + '\n')
+            for line in code:
+                for part in line.splitlines() or ['']:
+                    self.proc.stdin.write(part + '\n')
+            self.proc.stdin.write(END.format(step) + '\n')
+            self.proc.stdin.flush()
+
+            for line in self.proc.stdout:
+                if line.startswith(f'{EXIT}{step} '):
+                    return int(line[len(EXIT) + len(step) + 1:].strip().rstrip('>'))
+                output.write(line)
+
+            # The block called exit and took the host down with it, a new host
+            # is started for the next block
+            self.proc.wait()
+            return self.proc.returncode
+
+    def close(self):
+        if self.proc and self.proc.poll() is None:
+            self.proc.stdin.close()
+            try:
+                self.proc.wait(timeout=5)
+            except Exception:
+                self.proc.kill()
+        self.proc = None
+
+
+host = None
+
+
+def get_powershell_host() -> ScriptHost:
+    """
+    Gets the PowerShell host for the current command, starting it on first use
+
+    Returns:
+        ScriptHost: Shared PowerShell host
+    """
+    global host
+    if host is None:
+        import atexit
+        host = ScriptHost()
+        atexit.register(host.close)
+    return host
+
+
+def run_powershell(code: list, metadata=None) -> int:
+    """
+    Runs a PowerShell step through the shared host
+
+    #### Arguments
+        code (list): Lines of PowerShell, with placeholders already substituted
+        metadata (`Metadata`): Metadata for the method
+
+    Returns:
+        int: Exit code of the step
+    """
+    exit_code = get_powershell_host().run(code)
+    if exit_code and metadata:
+        from extension import write_verbose
+        from logger import log_info
+        write_verbose(f'PowerShell Step Exited With Code {exit_code}', metadata)
+        log_info(f'PowerShell Step Exited With Code {exit_code}', metadata.logfile)
+    return exit_code
+
+
+def run_batch(code: list, metadata=None) -> int:
+    """
+    Runs a batch step from its own script file so that concurrent steps never share a file
+
+    #### Arguments
+        code (list): Lines of the batch script, with placeholders already substituted
+        metadata (`Metadata`): Metadata for the method
+
+    Returns:
+        int: Exit code of the step
+    """
+    directory = os.path.join(tempfile.gettempdir(), 'electric')
+    os.makedirs(directory, exist_ok=True)
+    descriptor, path = tempfile.mkstemp(suffix='.bat', dir=directory)
+    try:
+        with os.fdopen(descriptor, 'w') as f:
+            for line in code:
+                f.write(line + '\n')
+        proc = Popen(['cmd.exe', '/c', path])
+        exit_code = proc.wait()
+    finally:
+        os.remove(path)
+
+    if exit_code and metadata:
+        from extension import write_verbose
+        from logger import log_info
+        write_verbose(f'Batch Step Exited With Code {exit_code}', metadata)
+        log_info(f'Batch Step Exited With Code {exit_code}', metadata.logfile)
+    return exit_code
@@ -29,4 +29,4 @@ if '%errorlevel%' NEQ '0' (
     CD /D "%~dp0"
 :--------------------------------------
 
-powershell electric config %1
\ No newline at end of file
+powershell electric config %*
\ No newline at end of file
@@ -0,0 +1,470 @@
+######################################################################
+#                               STATE                                #
+######################################################################
+
+from Classes.PathManager import PathManager
+from contextlib import contextmanager
+from datetime import date, datetime
+from threading import RLock
+from time import time
+import json
+import os
+import sqlite3
+
+
+def migrate_meta(connection: sqlite3.Connection, directory: str) -> list:
+    """
+    Creates the key value table and imports the timestamps kept in superlog.txt and support.txt
+
+    Returns:
+        list: Legacy files which were imported, deleted once the migration is committed
+    """
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    imported = []
+    for key, name in [('last-refresh', 'superlog.txt'), ('last-support-message', 'support.txt')]:
+        legacy = os.path.join(directory, name)
+        try:
+            with open(legacy, 'r') as f:
+                year, month, day = f.read().split(' ')
+        except (OSError, ValueError):
+            continue
+        connection.execute('INSERT INTO meta VALUES (?, ?)', (key, json.dumps(
+            date(int(year), int(month), int(day)).isoformat())))
+        imported.append(legacy)
+    return imported
+
+
+def migrate_receipts(connection: sqlite3.Connection, directory: str) -> list:
+    """
+    Creates the table of installed packages and imports the receipts kept as json files in Current
+
+    Returns:
+        list: Receipts which were imported, deleted once the migration is committed
+    """
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS receipts (package TEXT NOT NULL, version TEXT NOT NULL, display_name TEXT NOT NULL, '
+        'custom_location_switch TEXT, install_dir TEXT NOT NULL, flags TEXT NOT NULL, registry_key TEXT, '
+        'installed_at TEXT NOT NULL, PRIMARY KEY (package, version))')
+
+    current = os.path.join(directory, 'Current')
+    if not os.path.isdir(current):
+        return []
+
+    imported = []
+    for name in os.listdir(current):
+        if not name.endswith('.json') or '@' not in name:
+            continue
+        legacy = os.path.join(current, name)
+        package, version = name[:-len('.json')].split('@', 1)
+        try:
+            with open(legacy, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        connection.execute('INSERT OR REPLACE INTO receipts VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (
+            package,
+            data.get('version', version),
+            data.get('display-name', package),
+            data.get('custom-location-switch'),
+            data.get('custom-install-directory') or '',
+            json.dumps(data.get('flags', [])),
+            None,
+            datetime.fromtimestamp(os.path.getmtime(legacy)).isoformat(timespec='seconds'),
+        ))
+        imported.append(legacy)
+    return imported
+
+
+def migrate_validations(connection: sqlite3.Connection, directory: str):
+    """
+    Creates the cache of names checked against the registries when a configuration is validated
+    """
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS validations (kind TEXT NOT NULL, name TEXT NOT NULL, valid INTEGER NOT NULL, '
+        'checked_at REAL NOT NULL, PRIMARY KEY (kind, name))')
+
+
+def migrate_tools(connection: sqlite3.Connection, directory: str):
+    """
+    Creates the cache of executables found on the PATH and the versions they reported
+    """
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS tools (name TEXT PRIMARY KEY, path TEXT NOT NULL, version TEXT NOT NULL, mtime REAL NOT NULL)')
+
+
+def migrate_objects(connection: sqlite3.Connection, directory: str):
+    """
+    Creates the index of the object store portable packages are extracted into and the files of each installed version
+    """
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS objects (hash TEXT PRIMARY KEY, size INTEGER NOT NULL, crc INTEGER NOT NULL, '
+        'mtime INTEGER NOT NULL, refs INTEGER NOT NULL)')
+    connection.execute('CREATE INDEX IF NOT EXISTS objects_crc ON objects (crc, size)')
+    connection.execute(
+        'CREATE TABLE IF NOT EXISTS trees (package TEXT NOT NULL, version TEXT NOT NULL, path TEXT NOT NULL, '
+        'hash TEXT NOT NULL, PRIMARY KEY (package, version, path))')
+
+
+# Each migration brings the store up to the version of its index + 1, the
+# version reached is recorded in the user_version pragma of the database.
+# A migration may return the legacy files it imported, they are only
+# deleted once its transaction is committed
+migrations = [
+    migrate_meta,
+    migrate_receipts,
+    migrate_validations,
+    migrate_tools,
+    migrate_objects,
+]
+
+RECEIPT_COLUMNS = 'package, version, display_name, custom_location_switch, install_dir, flags, registry_key, installed_at'
+
+
+def to_receipt(row: tuple) -> dict:
+    """
+    Converts a row of the receipts table into the format of the json receipts it replaces
+    """
+    package, version, display_name, custom_location_switch, install_dir, flags, registry_key, installed_at = row
+    return {
+        'display-name': display_name,
+        'json-name': package,
+        'version': version,
+        'custom-location-switch': custom_location_switch,
+        'custom-install-directory': install_dir,
+        'flags': json.loads(flags),
+        'registry-key': registry_key,
+        'installed-at': installed_at,
+    }
+
+
+def delete_tree(connection: sqlite3.Connection, package: str, version: str):
+    """
+    Removes the files recorded for a version and the references they held, part of the caller's transaction
+    """
+    connection.execute(
+        'UPDATE objects SET refs = refs - (SELECT COUNT(*) FROM trees WHERE package = ? AND version = ? AND hash = objects.hash) '
+        'WHERE hash IN (SELECT hash FROM trees WHERE package = ? AND version = ?)', (package, version, package, version))
+    connection.execute(
+        'DELETE FROM trees WHERE package = ? AND version = ?', (package, version))
+
+
+class StateStore:
+    """
+    Versioned SQLite store for the state electric keeps in the appdata directory, every write is a transaction
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.directory = os.path.dirname(path)
+        self.created = not os.path.isfile(path)
+        if self.created:
+            os.makedirs(self.directory, exist_ok=True)
+
+        self.lock = RLock()
+        # Transactions are started explicitly, sqlite3 would otherwise commit before every CREATE statement
+        self.connection = sqlite3.connect(
+            path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.migrate()
+
+    @property
+    def version(self) -> int:
+        return self.connection.execute('PRAGMA user_version').fetchone()[0]
+
+    @contextmanager
+    def transaction(self):
+        """
+        Runs the statements of a block in a single write transaction, the database is locked from its first statement so
+        another process can't write in between, and everything is rolled back if the block raises
+        """
+        with self.lock:
+            self.connection.execute('BEGIN IMMEDIATE')
+            try:
+                yield self.connection
+            except BaseException:
+                self.connection.execute('ROLLBACK')
+                raise
+            self.connection.execute('COMMIT')
+
+    def migrate(self):
+        """
+        Runs the migrations the store hasn't seen yet, each one in its own transaction
+        """
+        while self.version < len(migrations):
+            imported = []
+            with self.transaction():
+                # Another process may have migrated the store while this one waited for the lock
+                index = self.version
+                if index < len(migrations):
+                    imported = migrations[index](self.connection, self.directory) or []
+                    self.connection.execute(f'PRAGMA user_version = {index + 1}')
+
+            for legacy in imported:
+                try:
+                    os.remove(legacy)
+                except OSError:
+                    pass
+
+    def get(self, key: str, default=None):
+        """
+        Gets a value from the store
+
+        #### Arguments
+            key (str): Key of the value
+            default: Value returned if the key isn't set
+
+        Returns:
+            The decoded value
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value):
+        """
+        Sets a value in the store
+
+        #### Arguments
+            key (str): Key of the value
+            value: Any json serializable value
+        """
+        with self.transaction():
+            self.connection.execute(
+                'INSERT OR REPLACE INTO meta VALUES (?, ?)', (key, json.dumps(value)))
+
+    def days_since(self, key: str) -> int:
+        """
+        Gets the number of days since the date stored under a key
+
+        #### Arguments
+            key (str): Key of a date set through `touch`
+
+        Returns:
+            int: Days since the date, None if it was never set
+        """
+        value = self.get(key)
+        if value is None:
+            return None
+        return (date.today() - date.fromisoformat(value)).days
+
+    def touch(self, key: str):
+        """
+        Stores today's date under a key
+        """
+        self.set(key, date.today().isoformat())
+
+    def add_receipt(self, package: str, version: str, display_name: str, install_dir: str = '', flags: list = None,
+                    custom_location_switch=None, registry_key: str = None):
+        """
+        Records a successful installation, replacing any receipt of the same package and version
+
+        #### Arguments
+            package (str): Json name of the package
+            version (str): Version that was installed
+            display_name (str): Display name of the package
+            install_dir (str): Custom installation directory
+            flags (list): Flags the package was installed with
+            custom_location_switch: Switch used to pass the custom installation directory
+            registry_key (str): Name of the uninstall key the installation was matched to
+        """
+        with self.transaction():
+            self.connection.execute(f'INSERT OR REPLACE INTO receipts ({RECEIPT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (
+                package, version, display_name, custom_location_switch, install_dir or '',
+                json.dumps(flags or []), registry_key, datetime.now().isoformat(timespec='seconds'),
+            ))
+
+    def get_receipt(self, package: str, version: str = None) -> dict:
+        """
+        Gets the receipt of an installed package
+
+        #### Arguments
+            package (str): Json name of the package
+            version (str): Only match this version of the package
+
+        Returns:
+            dict: Most recent receipt of the package, None if it isn't installed
+        """
+        query = f'SELECT {RECEIPT_COLUMNS} FROM receipts WHERE package = ?'
+        params = (package,)
+        if version:
+            query += ' AND version = ?'
+            params += (version,)
+
+        with self.lock:
+            row = self.connection.execute(
+                query + ' ORDER BY installed_at DESC LIMIT 1', params).fetchone()
+        return to_receipt(row) if row else None
+
+    def get_receipts(self) -> list:
+        """
+        Gets the receipts of every installed package
+
+        Returns:
+            list: Receipts ordered by package name
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                f'SELECT {RECEIPT_COLUMNS} FROM receipts ORDER BY package').fetchall()
+        return [to_receipt(row) for row in rows]
+
+    def is_installed(self, package: str) -> bool:
+        return self.get_receipt(package) is not None
+
+    def remove_receipt(self, package: str, version: str = None):
+        """
+        Removes the receipts of a package
+
+        #### Arguments
+            package (str): Json name of the package
+            version (str): Only remove this version of the package
+        """
+        query = 'DELETE FROM receipts WHERE package = ?'
+        params = (package,)
+        if version:
+            query += ' AND version = ?'
+            params += (version,)
+
+        with self.transaction():
+            self.connection.execute(query, params)
+
+    def get_validation(self, kind: str, name: str, ttl: float) -> bool:
+        """
+        Gets the cached result of checking whether a name exists in a registry
+
+        #### Arguments
+            kind (str): Registry the name was checked against, ex: `pip`, `vscode`
+            name (str): Name which was checked
+            ttl (float): Seconds a result stays valid for
+
+        Returns:
+            bool: Whether the name exists, None if it wasn't checked within the ttl
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT valid FROM validations WHERE kind = ? AND name = ? AND checked_at > ?',
+                (kind, name, time() - ttl)).fetchone()
+        return bool(row[0]) if row else None
+
+    def set_validations(self, results: list):
+        """
+        Caches the results of checking names against registries
+
+        #### Arguments
+            results (list): (kind, name, valid) of every name checked
+        """
+        now = time()
+        with self.transaction():
+            self.connection.executemany('INSERT OR REPLACE INTO validations VALUES (?, ?, ?, ?)', [
+                (kind, name, int(valid), now) for kind, name, valid in results])
+
+    def get_tool(self, name: str) -> dict:
+        """
+        Gets the cached location and version of an executable
+
+        Returns:
+            dict: `path`, `version` and `mtime` of the executable, None if it isn't cached
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT path, version, mtime FROM tools WHERE name = ?', (name,)).fetchone()
+        return dict(zip(['path', 'version', 'mtime'], row)) if row else None
+
+    def set_tool(self, name: str, path: str, version: str, mtime: float):
+        with self.transaction():
+            self.connection.execute(
+                'INSERT OR REPLACE INTO tools VALUES (?, ?, ?, ?)', (name, path, version, mtime))
+
+    def get_object(self, hash: str) -> dict:
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT hash, size, crc, mtime, refs FROM objects WHERE hash = ?', (hash,)).fetchone()
+        return dict(zip(['hash', 'size', 'crc', 'mtime', 'refs'], row)) if row else None
+
+    def find_objects(self, crc: int, size: int) -> list:
+        """
+        Gets the objects whose contents could match a zip member, members only record a crc32 and size
+
+        Returns:
+            list: `hash`, `size`, `crc`, `mtime` and `refs` of each object
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT hash, size, crc, mtime, refs FROM objects WHERE crc = ? AND size = ?', (crc, size)).fetchall()
+        return [dict(zip(['hash', 'size', 'crc', 'mtime', 'refs'], row)) for row in rows]
+
+    def find_tree_objects(self, package: str, path: str, crc: int, size: int) -> list:
+        """
+        Gets the objects an installed version of a package keeps at a path whose contents could match a zip member
+
+        Returns:
+            list: `hash`, `size`, `crc`, `mtime` and `refs` of each object
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT DISTINCT objects.hash, size, crc, mtime, refs FROM trees JOIN objects ON objects.hash = trees.hash '
+                'WHERE package = ? AND path = ? AND crc = ? AND size = ?', (package, path, crc, size)).fetchall()
+        return [dict(zip(['hash', 'size', 'crc', 'mtime', 'refs'], row)) for row in rows]
+
+    def add_object(self, hash: str, size: int, crc: int, mtime: int):
+        with self.transaction():
+            # An object replaced on disk keeps its references
+            self.connection.execute(
+                'INSERT OR IGNORE INTO objects VALUES (?, ?, ?, ?, 0)', (hash, size, crc, mtime))
+            self.connection.execute(
+                'UPDATE objects SET size = ?, crc = ?, mtime = ? WHERE hash = ?', (size, crc, mtime, hash))
+
+    def add_tree(self, package: str, version: str, files: dict):
+        """
+        Records the files of an installed version, every object they use gains a reference
+
+        #### Arguments
+            package (str): Json name of the package
+            version (str): Version which was installed
+            files (dict): Path relative to the install directory => hash of its object
+        """
+        with self.transaction():
+            delete_tree(self.connection, package, version)
+            self.connection.executemany('INSERT INTO trees VALUES (?, ?, ?, ?)', [
+                (package, version, path, hash) for path, hash in files.items()])
+            self.connection.executemany('UPDATE objects SET refs = refs + 1 WHERE hash = ?', [
+                (hash,) for hash in files.values()])
+
+    def remove_tree(self, package: str, version: str):
+        """
+        Forgets the files of an installed version, every object they used loses a reference
+        """
+        with self.transaction():
+            delete_tree(self.connection, package, version)
+
+    def get_unreferenced_objects(self) -> list:
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT hash, size FROM objects WHERE refs <= 0').fetchall()
+        return rows
+
+    def remove_objects(self, hashes: list):
+        with self.transaction():
+            self.connection.executemany('DELETE FROM objects WHERE hash = ?', [(hash,) for hash in hashes])
+
+    def close(self):
+        self.connection.close()
+
+
+state = None
+
+
+def get_state() -> StateStore:
+    """
+    Gets the state store for this process, opening it on first use
+
+    Returns:
+        StateStore: Store backed by state.db in the appdata directory
+    """
+    global state
+    if state is None:
+        state = StateStore(os.path.join(
+            PathManager.get_appdata_directory(), 'state.db'))
+    return state
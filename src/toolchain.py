@@ -0,0 +1,87 @@
+######################################################################
+#                             TOOLCHAIN                              #
+######################################################################
+
+from Classes.Tool import Tool
+from subprocess import PIPE, Popen, TimeoutExpired
+from threading import Lock
+import os
+import re
+import shutil
+
+# Seconds an executable gets to print its version
+VERSION_TIMEOUT = 30
+
+# (name, PATH) => `Tool` found this session, None if it isn't installed
+tools = {}
+tools_lock = Lock()
+
+
+def read_version(path: str) -> str:
+    """
+    Runs an executable with `--version`
+
+    Returns:
+        str: First version number it printed, None if it failed to run
+    """
+    try:
+        proc = Popen([path, '--version'], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        output, _ = proc.communicate(timeout=VERSION_TIMEOUT)
+    except TimeoutExpired:
+        proc.kill()
+        return None
+    except OSError:
+        return None
+
+    # ex: `pip 21.2.4 from ...`, `7.20.3`, `apm  2.6.2`
+    match = re.search(r'\d+(?:\.\d+)+', output.decode('utf-8', 'replace'))
+    return match.group(0) if proc.returncode == 0 and match else None
+
+
+def find(name: str) -> Tool:
+    """
+    Finds an executable on the PATH without running it, the version is only read the first time it is seen
+
+    Results are kept for the rest of the session and in the state store, the stored version is reused
+    until the executable found on the PATH or its modification time changes
+
+    #### Arguments
+        name (str): Name of the executable, ex: `pip`, `npm`, `code`
+
+    Returns:
+        `Tool`: The executable and its version, None if it isn't installed or doesn't run
+    """
+    from state import get_state
+
+    search_path = os.environ.get('PATH', '')
+    with tools_lock:
+        if (name, search_path) in tools:
+            return tools[(name, search_path)]
+
+    tool = None
+    path = shutil.which(name, path=search_path)
+    if path:
+        mtime = os.path.getmtime(path)
+        cached = get_state().get_tool(name)
+        if cached and cached['path'] == path and cached['mtime'] == mtime:
+            tool = Tool(name, path, cached['version'], mtime)
+        else:
+            version = read_version(path)
+            if version:
+                tool = Tool(name, path, version, mtime)
+                get_state().set_tool(name, path, version, mtime)
+
+    with tools_lock:
+        tools[(name, search_path)] = tool
+    return tool
+
+
+def find_any(*names: str) -> Tool:
+    """
+    Finds the first of several executables which is installed, ex: `code` then `code-insiders`
+    """
+    for name in names:
+        tool = find(name)
+        if tool:
+            return tool
+    return None
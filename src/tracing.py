@@ -0,0 +1,233 @@
+######################################################################
+#                               TRACING                              #
+######################################################################
+
+from functools import wraps
+from threading import Lock, local
+from time import perf_counter
+import json
+import os
+
+# Enabled through `electric --profile`, while it is None every span is the
+# shared no-op span so instrumented code costs a single global lookup
+tracer = None
+context = local()
+
+
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        return False
+
+    def set(self, **_):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    """
+    Times a single phase on a track, the outcome is taken from the exception leaving the span unless set explicitly
+    """
+
+    def __init__(self, tracer, name: str, track: str, args: dict):
+        self.tracer = tracer
+        self.name = name
+        self.track = track
+        self.args = args
+        self.start = None
+
+    def __enter__(self):
+        stack = get_stack()
+        if self.track is None:
+            self.track = stack[-1].track if stack else get_track()
+        stack.append(self)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, _):
+        end = perf_counter()
+        get_stack().remove(self)
+        if 'outcome' not in self.args:
+            if exc_type is None:
+                self.args['outcome'] = 'ok'
+            elif issubclass(exc_type, SystemExit) and exc.code in [None, 0]:
+                self.args['outcome'] = 'exit'
+            else:
+                self.args['outcome'] = exc_type.__name__
+        self.tracer.add(self, end)
+        return False
+
+    def set(self, **args):
+        """
+        Attaches values such as `bytes` or `outcome` to the span
+        """
+        for key, value in args.items():
+            if key == 'bytes':
+                value += self.args.get('bytes', 0)
+            self.args[key] = value
+
+
+class Tracer:
+    """
+    Collects the spans recorded by every thread during a command
+    """
+
+    def __init__(self):
+        self.lock = Lock()
+        self.origin = perf_counter()
+        self.spans = []
+
+    def add(self, span: Span, end: float):
+        with self.lock:
+            self.spans.append(
+                (span.name, span.track, span.start - self.origin, end - span.start, dict(span.args)))
+
+    def chrome_trace(self) -> dict:
+        """
+        Converts the recorded spans to the Chrome trace event format, each track becomes a thread
+
+        Returns:
+            dict: Trace which can be loaded by chrome://tracing or Perfetto
+        """
+        tracks = {}
+        events = []
+        with self.lock:
+            spans = list(self.spans)
+
+        for name, track, start, duration, args in spans:
+            if track not in tracks:
+                tracks[track] = len(tracks) + 1
+                events.append({'name': 'thread_name', 'ph': 'M', 'pid': os.getpid(),
+                               'tid': tracks[track], 'args': {'name': track}})
+            events.append({
+                'name': name,
+                'cat': 'electric',
+                'ph': 'X',
+                'ts': round(start * 1e6, 3),
+                'dur': round(duration * 1e6, 3),
+                'pid': os.getpid(),
+                'tid': tracks[track],
+                'args': args,
+            })
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, path: str):
+        """
+        Writes the Chrome trace of the recorded spans to a file
+        """
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+    def summary(self) -> list:
+        """
+        Aggregates the recorded spans by phase
+
+        Returns:
+            list: Rows of (phase, count, total seconds, max seconds, bytes, failures) ordered by total time
+        """
+        phases = {}
+        with self.lock:
+            spans = list(self.spans)
+
+        for name, _, _, duration, args in spans:
+            count, total, longest, transferred, failures = phases.get(name, (0, 0, 0, 0, 0))
+            phases[name] = (
+                count + 1,
+                total + duration,
+                max(longest, duration),
+                transferred + args.get('bytes', 0),
+                failures + (args.get('outcome') not in ['ok', 'exit']),
+            )
+
+        return sorted([(name, *values) for name, values in phases.items()], key=lambda row: row[2], reverse=True)
+
+    def format_summary(self) -> str:
+        """
+        Formats the summary as a table for the terminal
+        """
+        lines = [f'{"Phase":<24}{"Count":>7}{"Total (s)":>12}{"Max (s)":>10}{"MB":>10}{"Failed":>8}', '-' * 71]
+        for name, count, total, longest, transferred, failures in self.summary():
+            lines.append(
+                f'{name:<24}{count:>7}{total:>12.3f}{longest:>10.3f}{transferred / 1000000:>10.1f}{failures:>8}')
+        return '\n'.join(lines)
+
+
+def get_stack() -> list:
+    if not hasattr(context, 'stack'):
+        context.stack = []
+    return context.stack
+
+
+def get_track() -> str:
+    return getattr(context, 'track', 'electric')
+
+
+def set_track(name: str):
+    """
+    Sets the track spans started on this thread are recorded on, usually the package being handled
+
+    #### Arguments
+        name (str): Name of the track
+    """
+    context.track = name
+
+
+def enable() -> Tracer:
+    """
+    Starts recording spans for the rest of the process
+
+    Returns:
+        Tracer: Tracer collecting the spans
+    """
+    global tracer
+    if tracer is None:
+        tracer = Tracer()
+    return tracer
+
+
+def span(name: str, track: str = None, **args):
+    """
+    Times a phase, used as a context manager
+
+    #### Arguments
+        name (str): Name of the phase
+        track (str): Track to record the span on, defaults to the track of the enclosing span or thread
+        args: Values recorded with the span
+
+    Returns:
+        Span: The span, or a no-op span if tracing is disabled
+    """
+    if tracer is None:
+        return NULL_SPAN
+    return Span(tracer, name, track, args)
+
+
+def record(**args):
+    """
+    Attaches values to the innermost span open on this thread
+    """
+    if tracer is None:
+        return
+    stack = get_stack()
+    if stack:
+        stack[-1].set(**args)
+
+
+def traced(name: str):
+    """
+    Decorator recording every call to a function as a span
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if tracer is None:
+                return function(*args, **kwargs)
+            with Span(tracer, name, None, {}):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
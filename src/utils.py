@@ -7,34 +7,61 @@ import tempfile
 from subprocess import PIPE, CalledProcessError, Popen, check_call
 
 import click
-import requests
 from colorama import Fore, Style
-from halo import Halo
 from Classes.PortablePacket import PortablePacket
 from Classes.Metadata import Metadata
 from Classes.Packet import Packet
 from Classes.PathManager import PathManager
 from extension import write, write_debug, write_verbose, write_all
 from logger import *
+import events
+import tracing
 
 index = 0
 final_value = None
 path = ''
 
+# Package => name of the uninstall key its installation was last matched to
+matched_keys = {}
+
+# Shared by every request of the command, see get_session
+session = None
+
 appdata_dir = PathManager.get_appdata_directory()
 
 
+def get_session():
+    """
+    Gets the HTTP session shared by every request made during this command, so connections to the registry are reused
+
+    Returns:
+        requests.Session: Session with a connection pool large enough for every worker thread
+    """
+    global session
+    if session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+    return session
+
+
 def confirm(prompt: str):
     value = input(f'{prompt} (Y/n): ')
     return value in ['y', 'yes', 'Y', 'YES', 'Yes']
 
 
+@tracing.traced('env-update')
 def append_to_path(input_dir: str):
     proc = Popen(f'setx /M path "%PATH%;{input_dir}"', stdin=PIPE,
                  stdout=PIPE, stderr=PIPE, shell=True)
     _, _ = proc.communicate()
 
 
+@tracing.traced('env-update')
 def set_environment_variable(name: str, value: str):
     if value.endswith('\\'):
         value += '\\'
@@ -114,12 +141,19 @@ def is_admin() -> bool:
 def verify_checksum(path: str, checksum: str, force: bool, metadata: Metadata, newline=False):
     import hashlib
 
-    if hashlib.sha256(open(path, 'rb').read()).hexdigest().upper().strip() == checksum.strip():
+    with tracing.span('checksum') as span:
+        with open(path, 'rb') as f:
+            data = f.read()
+        span.set(bytes=len(data))
+        digest = hashlib.sha256(data).hexdigest().upper().strip()
+
+    events.emit('verified', path=path, match=digest == checksum.strip())
+    if digest == checksum.strip():
         if not newline:
             write('Verified Installer Hash', 'bright_green', metadata)
         else:
             write('\nVerified Installer Hash', 'bright_green', metadata)
-    elif not hashlib.sha256(open(path, 'rb').read()).hexdigest().upper().strip() == checksum.strip():
+    else:
         write('Hashes Don\'t Match!', 'bright_green', metadata)
 
         if not metadata.yes or not force:
@@ -132,6 +166,7 @@ def verify_checksum(path: str, checksum: str, force: bool, metadata: Metadata, n
 
 
 def swc(url: str):
+    import requests
     res = requests.get(url)
     return res.text
 
@@ -155,8 +190,9 @@ def generate_dict(path: str, package_name: str) -> dict:
 def download_installer(packet: Packet, download_url: str, metadata: Metadata):
     from urllib.request import urlretrieve
     from limit import TokenBucket, Limiter
+    import offline
 
-    if metadata.rate_limit == -1:
+    if metadata.rate_limit == -1 or offline.bundle:
         return download(download_url, packet.json_name,
                         metadata, packet.win64_type)
     log_info(
@@ -272,6 +308,7 @@ def check_resume_download(package_name: str, download_url: str, metadata: Metada
         return (None, None)
 
 
+@tracing.traced('env-update')
 def refresh_environment_variables():
     """
     Refreshes the environment variables on the current Powershell session.
@@ -289,7 +326,9 @@ def send_req_bundle(bundle_name: str) -> dict:
     Returns:
         dict: The json response from the network request
     """
-    REQA = 'https://raw.githubusercontent.com/electric-package-manager/electric-packages/master/bundles/'
+    import requests
+    from info import __registry__
+    REQA = f'{__registry__}/bundles/'
 
     response = requests.get(REQA + bundle_name + '.json', timeout=15)
     if response.status_code != 200:
@@ -335,6 +374,7 @@ def get_character_color(fill, metadata):
         return f'Fore.{unfill_char_color.upper()}' if unfill_char_color else 'Fore.RESET'
 
 
+@tracing.traced('download')
 def download(url: str, package_name: str, metadata: Metadata, download_type: str):
     """
     Official electric downloader, uses requests to download files from a url.
@@ -347,7 +387,17 @@ def download(url: str, package_name: str, metadata: Metadata, download_type: str
     Returns:
         str: Path to the downloaded installer
     """
+    import requests
     import random
+    import offline
+
+    # Installing from an offline bundle, the installer is copied out of the archive
+    if offline.bundle:
+        try:
+            return offline.copy_installer(package_name)
+        except offline.BundleError as err:
+            write(str(err), 'bright_red', metadata)
+            sys.exit(1)
 
     # Send install metrics
     if metadata.settings.install_metrics == True:
@@ -382,6 +432,7 @@ def download(url: str, package_name: str, metadata: Metadata, download_type: str
         write_debug(
             f'Requested file has already been downloaded at {path}', metadata)
 
+        events.emit('downloaded', package_name, cached=True)
         return path + download_type
 
     # Find a random name for the installer
@@ -417,6 +468,7 @@ def download(url: str, package_name: str, metadata: Metadata, download_type: str
 
         if not total_length:
             f.write(response.content)
+            tracing.record(bytes=len(response.content))
 
         else:
 
@@ -427,6 +479,7 @@ def download(url: str, package_name: str, metadata: Metadata, download_type: str
             for data in response.iter_content(chunk_size=chunk_size):
                 dl += len(data)
                 f.write(data)
+                events.progress(package_name, dl, full_length)
 
                 # if no_progress is True or show_progress_bar (user settings) is false
                 if metadata.no_progress == True or metadata.settings.show_progress_bar == False:
@@ -467,6 +520,10 @@ def download(url: str, package_name: str, metadata: Metadata, download_type: str
 
                     sys.stdout.flush()
 
+            tracing.record(bytes=dl)
+
+    events.emit('downloaded', package_name)
+
     try:
         os.remove(Rf"{tempfile.gettempdir()}\electric\unfinishedcache.pickle")
     except FileNotFoundError:
@@ -545,6 +602,7 @@ def handle_portable_installation(portable: bool, pkg, res, metadata: Metadata):
 
 
 def handle_plugin_uninstallation(name: str, metadata: Metadata):
+    import requests
     import yaml
 
     res = requests.get(
@@ -561,6 +619,7 @@ def handle_plugin_uninstallation(name: str, metadata: Metadata):
 
 
 def handle_plugin_installation(name: str, metadata: Metadata):
+    import requests
     import yaml
     import cursor
     cursor.hide()
@@ -695,7 +754,47 @@ def handle_portable_uninstallation(portable: bool, res: dict, pkg: dict, metadat
         sys.exit()
 
 
+def generate_packet(res: dict, version: str, install_directory: str = None) -> Packet:
+    """
+    Generates the packet for a version of a package from its manifest
+
+    #### Arguments
+        res (dict): Manifest of the package
+        version (str): Version to install
+        install_directory (str): Directory packages are installed into, each package gets its own folder
+
+    Returns:
+        Packet: Packet for the installation
+    """
+    pkg = res[version]
+
+    return Packet(
+        pkg,
+        res['package-name'],
+        res['display-name'],
+        pkg['url'],
+        pkg['file-type'],
+        pkg['custom-location'],
+        pkg['install-switches'],
+        pkg['uninstall-switches'],
+        install_directory + f'\\{res["package-name"]}' if install_directory else install_directory,
+        pkg.get('dependencies'),
+        pkg.get('valid-install-exit-codes'),
+        pkg.get('valid-uninstall-exit-codes'),
+        version,
+        res.get('run-check', True),
+        pkg.get('set-env'),
+        pkg.get('default-install-dir'),
+        pkg.get('uninstall', []),
+        pkg.get('add-path'),
+        pkg.get('checksum'),
+        pkg.get('bin'),
+        pkg.get('pre-update'),
+    )
+
+
 def handle_multithreaded_installation(corrected_package_names: list, install_directory, metadata: Metadata, force: bool):
+    from halo import Halo
     import Classes.ThreadedInstaller as ti
 
     completed = False
@@ -738,11 +837,6 @@ def handle_multithreaded_installation(corrected_package_names: list, install_dir
                 if 'valid-install-exit-codes' in list(pkg.keys()):
                     install_exit_codes = pkg['valid-install-exit-codes']
 
-                if 'pre-install' in list(pkg.keys()) or 'post-install' in list(pkg.keys()):
-                    write('Pre Or Post Install Multi-Threaded Implementation Is Still In Development, Forcing Sync Installation',
-                          'bright_yellow', metadata)
-                    return
-
                 packet = Packet(
                     pkg,
                     package,
@@ -840,7 +934,8 @@ def handle_multithreaded_installation(corrected_package_names: list, install_dir
                         version = res['latest-version']
                         pkg = pkg[version]
 
-                        if os.path.isdir(f'{PathManager.get_appdata_directory()}\Current\{package}@{version}.json'):
+                        from state import get_state
+                        if get_state().get_receipt(package, version):
                             write(
                                 f'{res["display-name"]} Is Already Installed!', 'yellow', metadata)
                             sys.exit()
@@ -913,29 +1008,20 @@ def handle_multithreaded_installation(corrected_package_names: list, install_dir
 def handle_external_installation(python: bool, node: bool, vscode: bool, sublime: bool, atom: bool, version: str, package_name: str, metadata: Metadata):
     import external
     if python:
-        if not version:
-            version = 'latest'
-        package_names = package_name.split(',')
-
-        for name in package_names:
-            if name:
-                external.handle_python_package(
-                    name, version, 'install', metadata)
+        external.handle_python_packages(
+            [(name, version) for name in package_name.split(',') if name], metadata)
 
         sys.exit()
 
     if node:
-        package_names = package_name.split(',')
-        for name in package_names:
-            external.handle_node_package(name, 'install', version, metadata)
+        external.handle_node_packages(
+            [(name, version) for name in package_name.split(',') if name], metadata)
 
         sys.exit()
 
     if vscode:
-        package_names = package_name.split(',')
-        for name in package_names:
-            external.handle_vscode_extension(
-                name, version, 'install', metadata)
+        external.handle_vscode_extensions(
+            [(name, version) for name in package_name.split(',') if name], metadata)
 
         sys.exit()
 
@@ -946,9 +1032,8 @@ def handle_external_installation(python: bool, node: bool, vscode: bool, sublime
         sys.exit()
 
     if atom:
-        package_names = package_name.split(',')
-        for name in package_names:
-            external.handle_atom_package(name, 'install', version, metadata)
+        external.handle_atom_packages(
+            [(name, version) for name in package_name.split(',') if name], metadata)
 
         sys.exit()
 
@@ -1100,8 +1185,9 @@ def get_error_cause(error: str, install_exit_codes: list, uninstall_exit_codes:
 
     from headers import valid_install_exit_codes, valid_uninstall_exit_codes
 
-    valid_i_exit_codes = valid_install_exit_codes
-    valid_u_exit_codes = valid_uninstall_exit_codes
+    # Copied so a package's own exit codes don't leak into the shared defaults
+    valid_i_exit_codes = list(valid_install_exit_codes)
+    valid_u_exit_codes = list(valid_uninstall_exit_codes)
 
     if install_exit_codes:
         for i in install_exit_codes:
@@ -1262,12 +1348,19 @@ def run_cmd(command: str, metadata: Metadata, method: str, packet: Packet) -> bo
         '  ', ' ').replace('\\\\', '\\')
     log_info(f'Running command: {command}', metadata.logfile)
     write_debug(f'{command}', metadata)
+    events.emit('uninstalling' if method == 'uninstallation' else 'installing', packet.json_name)
     try:
-        exit_code = check_call(command, stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        with tracing.span('uninstaller' if method == 'uninstallation' else 'installer', command=command):
+            exit_code = check_call(command, stdin=PIPE, stdout=PIPE, stderr=PIPE)
         return exit_code != 0
     except (CalledProcessError, OSError, FileNotFoundError) as err:
-        disp_error_msg(get_error_cause(str(err), packet.install_exit_codes,
-                                       packet.uninstall_exit_codes, method, metadata, packet), metadata)
+        cause = get_error_cause(str(err), packet.install_exit_codes,
+                                packet.uninstall_exit_codes, method, metadata, packet)
+        # Exit codes like 3010 or the ones a package lists as valid aren't failures
+        if cause != ['no-error']:
+            events.emit('failed', packet.json_name, reason=str(err),
+                        exit_code=err.returncode if isinstance(err, CalledProcessError) else None)
+        disp_error_msg(cause, metadata)
 
 
 def display_support(metadata: Metadata):
@@ -1280,19 +1373,13 @@ If you like electric would like to support it, it would be absolutely incredible
 Additionally, would be out of this world if you could rate this a 5 star project on G2Crowd! Thanks!
 This message can be disabled by running `electric feature disable support-message`.
     '''
-        from datetime import date
+        from state import get_state
 
-        if not os.path.isfile(rf'{PathManager.get_appdata_directory()}\support.txt'):
-            with open(rf'{PathManager.get_appdata_directory()}\support.txt', 'w+') as f:
-                f.write(
-                    f'{date.today().year} {date.today().month} {date.today().day}')
+        state = get_state()
+        days = state.days_since('last-support-message')
+        if days is None or days >= 7:
             write(message, 'white', metadata)
-        else:
-            if get_day_diff(f'{PathManager.get_appdata_directory()}\support.txt') >= 7:
-                write(message, 'white', metadata)
-                with open(f'{PathManager.get_appdata_directory()}\support.txt', 'w+') as f:
-                    f.write(
-                        f'{date.today().year} {date.today().month} {date.today().day}')
+            state.touch('last-support-message')
 
 
 def install_package(path, packet: Packet, metadata: Metadata) -> str:
@@ -1431,25 +1518,8 @@ def get_hash_algorithm(checksum: str):
     return hashes[len(checksum)] if len(checksum) in hashes else None
 
 
-def get_day_diff(path: str) -> int:
-    from datetime import date
-
-    with open(path, 'r') as f:
-        file_date = f.read()
-
-    current_date = date.today()
-    data = date(int(file_date.split(' ')[0]), int(
-        file_date.split(' ')[1]), int(file_date.split(' ')[2]))
-    delta = current_date - data
-    return delta.days
-
-
-def update_electric():
-    if get_day_diff(f'{PathManager.get_appdata_directory()}\superlog.txt') >= 1:
-        update_package_list()
-
-
 def send_package_request(package_name: str):
+    import requests
     # Request A Package To Be Added To Electric From The Command Line
     URL = 'https://electric-package-manager-api.herokuapp.com/submit-package-request/'
     try:
@@ -1458,6 +1528,7 @@ def send_package_request(package_name: str):
         pass
 
 
+@tracing.traced('registry-fetch')
 def send_req_package(package_name: str) -> dict:
     """
     Send a request for an electric package from the official package registry on github
@@ -1466,12 +1537,25 @@ def send_req_package(package_name: str) -> dict:
     Returns:
         dict: Decoded JSON from the github registry response
     """
+    import requests
     from json.decoder import JSONDecodeError
+    import offline
+
+    if offline.bundle:
+        res = offline.bundle.get_manifest(package_name)
+        if not res:
+            events.emit('failed', package_name, reason='not-found')
+            click.echo(click.style(
+                f'{package_name} Not Found In {offline.bundle.path}', 'red'))
+            sys.exit(1)
+        events.emit('resolved', package_name, version=res.get('latest-version'))
+        return res
 
-    REQA = 'https://raw.githubusercontent.com/electric-package-manager/electric-packages/master/packages/'
+    from info import __registry__
+    REQA = f'{__registry__}/packages/'
 
     try:
-        response = requests.get(REQA + package_name + '.json', timeout=5)
+        response = get_session().get(REQA + package_name + '.json', timeout=5)
     except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
         click.echo(click.style(
             f'Failed to request {package_name}.json from raw.githubusercontent.com', 'red'))
@@ -1509,6 +1593,7 @@ def send_req_package(package_name: str) -> dict:
             click.echo(click.style(f'{package_name} Not Found.', 'red'))
             sys.exit()
     else:
+        events.emit('failed', package_name, reason='not-found', status=response.status_code)
         click.echo(click.style(
             f'Failed to request {package_name}.json from raw.githubusercontent.com', 'red'))
         run_internet_test = confirm(
@@ -1537,62 +1622,35 @@ def send_req_package(package_name: str) -> dict:
             Debugger.test_internet()
         sys.exit()
 
+    events.emit('resolved', package_name, version=res.get('latest-version'))
     return res
 
 
-def get_pid(exe_name):
+def get_pid(exe_name, refresh: bool = False):
     """
-    Gets the running process PID from the tasklist command to quit installers
+    Gets the running process PID from the process snapshot to quit installers
     #### Arguments
         exe_name (str): Name of the installer being run
+        refresh (bool): Re-read the process table instead of using the snapshot for this command
     Returns:
-        str: PID
+        int: PID, None if the process isn't running
     """
-    proc = Popen('tasklist', stdin=PIPE, stdout=PIPE, stderr=PIPE)
-    output, _ = proc.communicate()
-    output = output.decode('utf-8')
-    lines = output.splitlines()
-    for line in lines:
-        if exe_name in line:
-            try:
-                return line.split()[1]
-            except:
-                pass
+    from processes import get_snapshot
+    return get_snapshot(refresh).get_pid(exe_name)
 
 
-def find_approx_pid(display_name) -> str:
+def find_approx_pid(display_name, refresh: bool = False) -> int:
     """
     Gets the approximate PID of an application that has to be terminated before uninstallation
     #### Arguments
         display_name (str): The display name of the package
+        refresh (bool): Re-read the process table instead of using the snapshot for this command
     Returns:
-        str: PID
+        int: PID, 1 if no running process matches
     """
-    proc = Popen('tasklist /FI "Status eq RUNNING"',
-                 stdin=PIPE, stdout=PIPE, stderr=PIPE)
-    output, _ = proc.communicate()
-    output = output.decode('utf-8')
-    lines = output.splitlines()
-
-    cleaned_up_names = []
-    for line in lines:
-        try:
-            cleaned_up_names.append(
-                line.split()[0].replace('.exe', '').lower())
-        except IndexError:
-            continue
-
-    matches = get_close_matches(
-        display_name.lower(), cleaned_up_names, n=1, cutoff=0.75)
-
-    try:
-        if matches != []:
-            for line in lines:
-                if matches[0] in line.lower():
-                    return line.split()[1]
-    except KeyError:
-        return 1
-    return 1
+    from processes import get_snapshot
+    pid = get_snapshot(refresh).find_approx_pid(display_name)
+    return pid if pid else 1
 
 
 def handle_exit(status: str, setup_name: str, metadata: Metadata):
@@ -1611,7 +1669,7 @@ def handle_exit(status: str, setup_name: str, metadata: Metadata):
         exe_name = setup_name.split(
             '\\')[-1].replace('.exe.exe', '').replace('.msi.msi', '')
 
-        pid = get_pid(exe_name)
+        pid = get_pid(exe_name, refresh=True)
         try:
             pid = int(pid)
             os.kill(pid, SIGTERM)
@@ -1622,6 +1680,7 @@ def handle_exit(status: str, setup_name: str, metadata: Metadata):
         write('RapidExit Successfully Exited With Code 0',
               'bright_green', metadata)
 
+        flush_log()
         os._exit(1)
 
     else:
@@ -1642,23 +1701,33 @@ def kill_running_proc(package_name: str, display_name: str, metadata: Metadata):
     """
     parts = package_name.split('-')
     name = ' '.join(p.capitalize() for p in parts)
-    pid = int(find_approx_pid(display_name))
+    # Configurations uninstall several packages in one process, the snapshot
+    # taken for an earlier package can list processes which have since exited
+    pid = int(find_approx_pid(display_name, refresh=True))
     if pid == 1:
         return
     if pid:
         from signal import SIGTERM
+
+        def terminate_process():
+            try:
+                os.kill(pid, SIGTERM)
+            except OSError:
+                # The process exited on its own in the meantime
+                pass
+
         if metadata.yes:
             write(f'Terminating {name}.', 'bright_green', metadata)
-            os.kill(pid, SIGTERM)
+            terminate_process()
             return
         if metadata.silent:
-            os.kill(pid, SIGTERM)
+            terminate_process()
             return
         terminate = confirm(
             f'Electric Detected {name} Running In The Background. Would You Like To Terminate It?')
         if terminate:
             write(f'Terminating {name}.', 'bright_green', metadata)
-            os.kill(pid, SIGTERM)
+            terminate_process()
         else:
             write('Aborting Installation!', 'red', metadata)
             write_verbose(
@@ -1685,6 +1754,7 @@ def kill_proc(proc, metadata: Metadata):
         write('\nRapidExit Successfully Exited With Code 0',
               'bright_green', metadata)
 
+    flush_log()
     os._exit(0)
 
 
@@ -1707,6 +1777,7 @@ def find_msix_installation(bundle_id: str):
     return bool(output.decode() and not err.decode())
 
 
+@tracing.traced('registry-check')
 def find_existing_installation(package_name: str, display_name: str, test=True):
     """
     Finds an existing installation of a package in the windows registry given the package name and display name
@@ -1718,14 +1789,15 @@ def find_existing_installation(package_name: str, display_name: str, test=True):
         [type]: [description]
     """
     import registry
+    from state import get_state
     key = registry.get_uninstall_key(package_name, display_name)
 
-    installed_packages = [''.join(f.replace('.json', '').split(
-        '@')[:1]) for f in os.listdir(PathManager.get_appdata_directory() + r'\Current')]
-
     if key:
+        # Remember which uninstall key matched so it can be recorded in the receipt
+        matched = key[0] if isinstance(key, list) else key
+        matched_keys[package_name] = matched.get('KeyName')
         if not test:
-            return package_name in installed_packages
+            return get_state().is_installed(package_name)
         return True
     return False
 
@@ -1766,7 +1838,7 @@ def get_install_flags(install_dir: str, metadata: Metadata):
     return flags
 
 
-def check_virus(path: str, metadata: Metadata, h: Halo):
+def check_virus(path: str, metadata: Metadata, h: 'Halo'):
     """
     Checks for a virus given the path of the executable / file
     #### Arguments
@@ -1774,7 +1846,8 @@ def check_virus(path: str, metadata: Metadata, h: Halo):
         metadata (`Metadata`): Metadata for the installation
     """
     from viruscheck import virus_check
-    detected = virus_check(path)
+    with tracing.span('virus-scan'):
+        detected = virus_check(path)
 
     if h:
         h.stop()
@@ -1800,7 +1873,7 @@ def check_virus(path: str, metadata: Metadata, h: Halo):
         click.echo(click.style('No Viruses Detected!', fg='bright_green'))
 
 
-def check_newer_version(package_name: str, packet: Packet, installed_packages: list) -> bool:
+def check_newer_version(package_name: str, packet: Packet) -> bool:
     """
     Checks if a newer version of a package exists, used for updating packages
     #### Arguments
@@ -1809,19 +1882,10 @@ def check_newer_version(package_name: str, packet: Packet, installed_packages: l
     Returns:
         bool: If there is a newer version of the package
     """
+    from state import get_state
 
-    install_dir = PathManager.get_appdata_directory() + r'\Current'
-    version = ''
-
-    for package in installed_packages:
-        if list(package.keys())[0] == package_name:
-            version = package[list(package.keys())[0]].replace('.json', '')
-
-    with open(rf'{install_dir}\{package_name}@{version}.json', 'r') as f:
-        data = json.load(f)
-
-    installed_version = data['version']
-    return installed_version != packet.version
+    receipt = get_state().get_receipt(package_name)
+    return receipt is not None and receipt['version'] != packet.version
 
 
 def check_newer_version_local(new_version) -> bool:
@@ -1844,6 +1908,7 @@ def check_for_updates():
     """
     Checks if there is a newer version of electric is availiable and automatically updates electric
     """
+    import requests
     import ctypes
     res = requests.get(
         'https://electric-package-manager.herokuapp.com/version/windows', timeout=10)
@@ -1903,6 +1968,7 @@ def generate_metadata(no_progress, silent, verbose, debug, no_color, yes, logfil
 
 
 def send_install_metrics(package_name: str):
+    import requests
     URL = 'https://electric-package-manager-api.herokuapp.com/increment/'
 
     try:
@@ -1919,6 +1985,8 @@ def f_and_f(package_name: str):
 
 
 def disp_error_msg(messages: list, metadata: Metadata):
+    import requests
+    from halo import Halo
     import re
 
     if messages:
@@ -2146,6 +2214,7 @@ def get_error_message(code: str, method: str, display_name: str, version: str, m
 
 
 def handle_unknown_error(err: str, package_name: str, method: str):
+    from halo import Halo
     method = method.replace("ation", "")
     print(f"{Fore.RED}An Error Occured While {method.capitalize()}ing {package_name}\n")
     error_msg = confirm('Would You Like To See The Error Message?')
@@ -2166,19 +2235,8 @@ def handle_unknown_error(err: str, package_name: str, method: str):
 
         print(f'These automatically generated links may help:{results}')
 
-    proc = Popen('tasklist', stdin=PIPE, stdout=PIPE, stderr=PIPE)
-    output, err = proc.communicate()
-    output = output.decode('utf-8')
-    lines = output.splitlines()
-
-    cleaned_up_names = []
-    for line in lines:
-        try:
-            cleaned_up_names.append(line.split()[0].strip('.exe'))
-        except IndexError:
-            continue
-
-    count = sum(name in ['powershell', 'cmd'] for name in cleaned_up_names)
+    from processes import get_snapshot
+    count = get_snapshot(refresh=True).count('powershell.exe', 'cmd.exe')
     return count >= 2
 
 
@@ -2213,15 +2271,15 @@ def display_info(res: dict, nightly: bool = False, version: str = '') -> str:
 
 
 def update_package_list():
-    from datetime import date
+    import requests
+    from halo import Halo
+    from info import __package_list__
+    from state import get_state
 
     with Halo('Updating Electric') as h:
-        with open(rf'{PathManager.get_appdata_directory()}\superlog.txt', 'w+') as f:
-            f.write(
-                f'{date.today().year} {date.today().month} {date.today().day}')
+        get_state().touch('last-refresh')
         try:
-            res = requests.get(
-                'https://raw.githubusercontent.com/XtremeDevX/electric-packages/master/package-list.json', timeout=5)
+            res = requests.get(__package_list__, timeout=5)
         except requests.exceptions.ConnectionError:
             h.fail()
             click.echo(click.style(
@@ -2257,13 +2315,23 @@ def update_package_list():
 
 
 def get_correct_package_names(all=False) -> list:
+    import requests
     if not all:
+        from state import get_state
+
+        # The package list is refreshed here rather than on startup, so only
+        # commands which read it (never an install from an offline bundle)
+        # touch the network when it is missing or more than a day old
+        days = get_state().days_since('last-refresh')
+        if days is None or days >= 1 or not os.path.isfile(rf'{PathManager.get_appdata_directory()}\packages.json'):
+            update_package_list()
+
         with open(rf'{PathManager.get_appdata_directory()}\packages.json', 'r') as f:
             dictionary = json.load(f)
             packages = dictionary['packages']
     else:
-        req = requests.get(
-            'https://raw.githubusercontent.com/XtremeDevX/electric-packages/master/package-list.json')
+        from info import __package_list__
+        req = requests.get(__package_list__)
         res = json.loads(req.text)
         packages = res['packages']
 
@@ -2271,20 +2339,21 @@ def get_correct_package_names(all=False) -> list:
 
 
 def register_package_success(packet: Packet, install_dir: str, metadata: Metadata):
-    data = {
-        'display-name': packet.display_name,
-        'json-name': packet.json_name,
-        'version': packet.version,
-        'custom-location-switch': packet.custom_location,
-        'custom-install-directory': packet.directory or '',
-        'flags': get_install_flags(install_dir, metadata),
-    }
-
-    pkg_dir = PathManager.get_appdata_directory() + r'\Current'
-    with open(rf'{pkg_dir}\{packet.json_name}@{packet.version}.json', 'w+') as f:
-        f.write(json.dumps(data, indent=4))
+    from state import get_state
+
+    get_state().add_receipt(
+        packet.json_name,
+        packet.version,
+        packet.display_name,
+        install_dir=packet.directory or '',
+        flags=get_install_flags(install_dir, metadata),
+        custom_location_switch=packet.custom_location,
+        registry_key=matched_keys.get(packet.json_name),
+    )
+    events.emit('installed', packet.json_name, version=packet.version)
 
 
+@tracing.traced('autocorrect')
 def get_autocorrections(package_names: list, corrected_package_names: list, metadata: Metadata) -> list:
     """
     Display autocorrects for the package names
@@ -2295,6 +2364,7 @@ def get_autocorrections(package_names: list, corrected_package_names: list, meta
     Returns:
         list: Autocorrected packages names
     """
+    import requests
     corrected_names = []
 
     for name in package_names:
@@ -0,0 +1,143 @@
+######################################################################
+#                             VALIDATION                             #
+######################################################################
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from urllib.parse import quote, urlparse
+
+# Seconds a name found in a registry is trusted for, names which weren't found are always checked again
+CACHE_TTL = 24 * 60 * 60
+
+MAX_WORKERS = 16
+# Requests in flight to a single host, registries throttle clients which open too many connections
+HOST_LIMIT = 4
+
+# Kind => url which answers 200 for names that exist
+URLS = {
+    'pip': 'https://pypi.org/pypi/{}/json',
+    'node': 'https://registry.npmjs.org/{}',
+    'vscode': 'https://marketplace.visualstudio.com/items?itemName={}',
+    'atom': 'https://atom.io/api/packages/{}',
+    'sublime': 'https://packagecontrol.io/packages/{}',
+}
+
+NAMES = {
+    'electric': 'Electric Package',
+    'pip': '( python | pip ) Module',
+    'node': '( npm | node ) Module',
+    'vscode': 'Visual Studio Code Extension',
+    'atom': 'Atom Package',
+    'sublime': 'Sublime Text Package',
+}
+
+semaphores = {}
+semaphores_lock = Lock()
+
+
+def get_semaphore(url: str) -> BoundedSemaphore:
+    host = urlparse(url).netloc
+    with semaphores_lock:
+        if host not in semaphores:
+            semaphores[host] = BoundedSemaphore(HOST_LIMIT)
+        return semaphores[host]
+
+
+def get_url(kind: str, name: str) -> str:
+    if kind == 'electric':
+        from info import __registry__
+        return f'{__registry__}/packages/{quote(name)}.json'
+    return URLS[kind].format(quote(name, safe='@/.'))
+
+
+def exists(kind: str, name: str) -> bool:
+    """
+    Checks whether a name exists in a registry, only the status of the response is read
+
+    #### Arguments
+        kind (str): Registry to check, ex: `pip`, `node`, `vscode`
+        name (str): Name of the package or extension
+
+    Returns:
+        bool: Whether the registry knows the name
+    """
+    from utils import get_session
+
+    url = get_url(kind, name)
+    with get_semaphore(url):
+        with get_session().get(url, stream=True, timeout=15) as response:
+            return response.status_code == 200
+
+
+def get_local_index() -> set:
+    """
+    Gets the names in the package list electric refreshes daily, None if it hasn't been downloaded yet
+    """
+    from utils import get_correct_package_names
+
+    try:
+        return set(get_correct_package_names())
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def validate(checks: list, ttl: float = CACHE_TTL) -> list:
+    """
+    Checks every name concurrently, electric packages are looked up in the local package list
+
+    #### Arguments
+        checks (list): (kind, name) pairs to check
+        ttl (float): Seconds a cached result is trusted for, 0 to check everything again
+
+    Returns:
+        list: (kind, name, reason) of every check which failed, in the order they were given
+    """
+    from state import get_state
+
+    state = get_state()
+    results = {}
+    pending = []
+
+    index = get_local_index() if any(kind == 'electric' for kind, _ in checks) else None
+    for check in dict.fromkeys(checks):
+        kind, name = check
+        if kind == 'electric' and index is not None:
+            results[check] = name in index
+            continue
+
+        cached = state.get_validation(kind, name, ttl) if ttl else None
+        if cached is not None:
+            results[check] = cached
+        else:
+            pending.append(check)
+
+    errors = {}
+    if pending:
+        def run(check):
+            try:
+                return exists(*check)
+            except Exception as err:
+                # Network errors are reported with the rest instead of aborting the whole run
+                errors[check] = str(err)
+                return None
+
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending))) as pool:
+            for check, valid in zip(pending, pool.map(run, pending)):
+                results[check] = valid
+
+        # Only names which exist are cached, a package published after a failed
+        # check would otherwise be reported missing until the cache expires
+        state.set_validations([(kind, name, valid) for (kind, name), valid in results.items()
+                               if (kind, name) in pending and valid])
+
+    failures = []
+    for check in dict.fromkeys(checks):
+        if results[check] is None:
+            failures.append((*check, f'Could not be checked: {errors[check]}'))
+        elif not results[check]:
+            failures.append((*check, 'Does not exist or has been removed'))
+    return failures
+
+
+def format_failure(kind: str, name: str, reason: str) -> str:
+    return f'{NAMES[kind]} `{name}` => {reason}'
@@ -0,0 +1,147 @@
+from concurrent.futures import ThreadPoolExecutor
+from object_store import get_member_path
+import os
+import shutil
+import tarfile
+import zipfile
+
+# Members are extracted on at most this many threads, decompressing and writing files both release the GIL
+WORKERS = min(8, os.cpu_count() or 1)
+
+# Write buffer of every extracted file, most members of portable packages are written in a single call
+BUFFER_SIZE = 1024 * 1024
+
+
+def precreate_directories(destination: str, names: list):
+    """
+    Creates every directory an archive extracts into in a single pass, rather than checking for it before each file
+    """
+    directories = {destination}
+    for name in names:
+        path = get_member_path(destination, name)
+        directories.add(path if name.endswith('/') else os.path.dirname(path))
+    for directory in sorted(directories):
+        os.makedirs(directory, exist_ok=True)
+
+
+def partition(members: list, workers: int, size) -> list:
+    """
+    Splits the members of an archive into runs of about the same size, members are kept in the order they are stored so
+    each worker reads its part of the archive sequentially
+
+    #### Arguments
+        members (list): Members in the order they are stored
+        workers (int): Number of parts
+        size (function): Gets the number of bytes a member takes up in the archive
+
+    Returns:
+        list: Lists of members, at most `workers` of them
+    """
+    target = sum(size(member) for member in members) / max(workers, 1)
+    parts = []
+    current = []
+    current_size = 0
+    for member in members:
+        current.append(member)
+        current_size += size(member)
+        if current_size >= target and len(parts) < workers - 1:
+            parts.append(current)
+            current = []
+            current_size = 0
+    if current:
+        parts.append(current)
+    return parts
+
+
+def run(parts: list, function):
+    """
+    Calls a function with each part on its own thread, an exception in any of them is raised once they all finish
+    """
+    if len(parts) <= 1:
+        for part in parts:
+            function(part)
+        return
+
+    with ThreadPoolExecutor(max_workers=len(parts)) as executor:
+        for _ in executor.map(function, parts):
+            pass
+
+
+def write_member(source, target: str):
+    with open(target, 'wb', buffering=BUFFER_SIZE) as f:
+        shutil.copyfileobj(source, f, BUFFER_SIZE)
+
+
+def extract_zip(path: str, destination: str, workers: int = None, progress=None) -> int:
+    """
+    Extracts a zip archive on several threads, each with its own `zipfile.ZipFile` handle
+
+    #### Arguments
+        path (str): Path to the archive
+        destination (str): Directory to extract into
+        workers (int): Threads to extract on, defaults to `WORKERS`
+        progress (function): Called with each member once it is extracted, from the thread which extracted it
+
+    Returns:
+        int: Number of files extracted
+    """
+    with zipfile.ZipFile(path) as archive:
+        members = archive.infolist()
+    precreate_directories(destination, [member.filename for member in members])
+    members = sorted([member for member in members if not member.is_dir()], key=lambda member: member.header_offset)
+
+    def extract(part: list):
+        with zipfile.ZipFile(path) as archive:
+            for member in part:
+                with archive.open(member) as source:
+                    write_member(source, get_member_path(destination, member.filename))
+                if progress:
+                    progress(member)
+
+    run(partition(members, workers or WORKERS, lambda member: member.compress_size), extract)
+    return len(members)
+
+
+def extract_tar(path: str, destination: str, workers: int = None, progress=None) -> int:
+    """
+    Extracts an uncompressed tar archive on several threads, regular files are copied straight from their offset in the
+    archive and everything else, ex: links, is extracted by `tarfile` once they are written
+
+    Returns:
+        int: Number of members extracted
+    """
+    with tarfile.open(path, 'r:') as tar:
+        if hasattr(tarfile, 'data_filter'):
+            tar.extraction_filter = tarfile.data_filter
+        members = tar.getmembers()
+        precreate_directories(destination, [f'{member.name}/' if member.isdir() else member.name for member in members])
+        regular = [member for member in members if member.isreg() and not member.issparse()]
+
+        def extract(part: list):
+            with open(path, 'rb') as archive:
+                for member in part:
+                    target = get_member_path(destination, member.name)
+                    archive.seek(member.offset_data)
+                    with open(target, 'wb', buffering=BUFFER_SIZE) as f:
+                        remaining = member.size
+                        while remaining:
+                            chunk = archive.read(min(BUFFER_SIZE, remaining))
+                            if not chunk:
+                                raise tarfile.ReadError(f'Unexpected end of archive in {member.name}')
+                            f.write(chunk)
+                            remaining -= len(chunk)
+                    os.chmod(target, member.mode & 0o777)
+                    os.utime(target, (member.mtime, member.mtime))
+                    if progress:
+                        progress(member)
+
+        run(partition(regular, workers or WORKERS, lambda member: member.size), extract)
+
+        # Hard links need the files they point to, so the rest is extracted after them
+        extracted = set(map(id, regular))
+        for member in members:
+            if id(member) not in extracted and not member.isdir():
+                tar.extract(member, destination)
+                if progress:
+                    progress(member)
+    return len(members)
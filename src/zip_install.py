@@ -2,16 +2,77 @@ from logger import log_info
 from Classes.Metadata import Metadata
 from Classes.PortablePacket import PortablePacket
 from timeit import default_timer as timer
+from copy import copy
 from extension import write, write_debug
 from colorama import Fore
 from zip_utils import *
+import events
 import os
+import tracing
 import sys
 
 home = os.path.expanduser('~')
 
 
-def install_portable(packet: PortablePacket, metadata: Metadata):
+def create_portable_links(packet: PortablePacket, install_directory: str, metadata: Metadata) -> bool:
+    """
+    Creates the Start Menu shortcuts and sets the environment variables of a portable package
+
+    #### Arguments
+        packet (`PortablePacket`): Version of the package
+        install_directory (str): Directory the shortcuts and `<install-directory>` point to
+        metadata (`Metadata`): Metadata for the installation
+
+    Returns:
+        bool: Whether an environment variable was set
+    """
+    changes_environment = False
+
+    if packet.shortcuts:
+        for shortcut in packet.shortcuts:
+            shortcut_name = shortcut['shortcut-name']
+            file_name = shortcut['file-name']
+            log_info(
+                f'Creating shortcuts for {packet.display_name}', metadata.logfile)
+            create_start_menu_shortcut(install_directory, file_name, shortcut_name)
+
+    if packet.set_env:
+        if isinstance(packet.set_env, list):
+            changes_environment = True
+            for obj in packet.set_env:
+                log_info(
+                    f'Setting environment variables for {packet.display_name}', metadata.logfile)
+                write(
+                    f'Setting Environment Variable {obj["name"]}', 'bright_green', metadata)
+                set_environment_variable(obj['name'], obj['value'].replace(
+                    '<install-directory>', install_directory).replace('\\\\', '\\'))
+        else:
+            changes_environment = True
+
+            log_info(
+                f'Setting environment variables for {packet.display_name}', metadata.logfile)
+            write(
+                f'Setting Environment Variable {packet.set_env["name"]}', 'bright_green', metadata)
+
+            set_environment_variable(packet.set_env['name'], packet.set_env['value'].replace(
+                '<install-directory>', install_directory).replace('\\\\', '\\'))
+
+    if changes_environment:
+        log_info(
+            'Detected change in PATH variable. Requesting `refreshenv` to be run', metadata.logfile)
+        write(
+            f'{Fore.LIGHTGREEN_EX}The PATH environment variable has changed. Run `refreshenv` to refresh your environment variables.{Fore.RESET}', 'white', metadata)
+
+    return changes_environment
+
+
+def install_portable(packet: PortablePacket, metadata: Metadata, previous: PortablePacket = None):
+    from zip_update import find_installed_version, switch_version
+    from zip_versions import get_current_directory, get_keep_versions, get_shims, prune_versions, write_shims
+
+    tracing.set_track(packet.json_name)
+    # The installed version stays active until this one is extracted next to it
+    current_version = find_installed_version(packet.extract_dir)
     if find_existing_installation(f'{packet.extract_dir}@{packet.latest_version}'):
         log_info(
             f'Detected an existing installation of {packet.display_name}', metadata.logfile)
@@ -27,8 +88,6 @@ def install_portable(packet: PortablePacket, metadata: Metadata):
             f'Installing dependencies for {packet.display_name}', metadata.logfile)
         install_dependencies(packet, metadata)
 
-    changes_environment = False
-    shortcuts = packet.shortcuts
     extract_dir = packet.extract_dir
     write_debug(
         f'Downloading {packet.json_name}{packet.file_type} from {packet.url}', metadata)
@@ -37,15 +96,26 @@ def install_portable(packet: PortablePacket, metadata: Metadata):
     show_progress_bar = not metadata.silent and not metadata.no_progress
 
     if isinstance(packet.url, str):
-        download(packet, packet.url, packet.file_type, rf'{home}\electric\\' + f'{packet.extract_dir}@{packet.latest_version}',
-                 metadata, show_progress_bar=show_progress_bar, is_zip=True)
-
-        if packet.checksum:
-            verify_checksum(
-                rf'{home}\electric\\' + f'{packet.extract_dir}@{packet.latest_version}{packet.file_type}', packet.checksum, metadata)
-
-        unzip_dir = unzip_file(f'{packet.extract_dir}@{packet.latest_version}' +
-                               packet.file_type, f'{extract_dir}@{packet.latest_version}', packet.file_type, metadata)
+        # Persisted paths are written to by the application, they are extracted as plain files rather than links into the store
+        from zip_update import get_persisted_paths
+        from zip_stream import StreamError
+        chdir = packet.chdir.replace('<version>', packet.latest_version) if packet.chdir else ''
+        persisted = [os.path.join(chdir, path) for path in get_persisted_paths(packet)]
+
+        try:
+            unzip_dir = stream_file(packet, metadata, persisted)
+        except StreamError as err:
+            # Network and archive errors are raised as a StreamError too, an existing install is left as it was
+            log_info(f'Downloading {packet.display_name} before extracting it: {err}', metadata.logfile)
+            download(packet, packet.url, packet.file_type, rf'{home}\electric\\' + f'{packet.extract_dir}@{packet.latest_version}',
+                     metadata, show_progress_bar=show_progress_bar, is_zip=True)
+
+            if packet.checksum:
+                verify_checksum(
+                    rf'{home}\electric\\' + f'{packet.extract_dir}@{packet.latest_version}{packet.file_type}', packet.checksum, metadata)
+
+            unzip_dir = unzip_file(f'{packet.extract_dir}@{packet.latest_version}' +
+                                   packet.file_type, f'{extract_dir}@{packet.latest_version}', packet.file_type, metadata, persisted)
 
     elif isinstance(packet.url, list):
         for idx, url in enumerate(packet.url):
@@ -70,20 +140,8 @@ def install_portable(packet: PortablePacket, metadata: Metadata):
             packet.pre_install['code'] = [l.replace('<extras>', rf'{home}\electric\extras\{packet.extract_dir}@{packet.latest_version}'.replace(
                 '\\\\', '\\')) for l in packet.pre_install['code']]
 
-            if not os.path.isdir(rf'{home}\electric\temp\Scripts'):
-                try:
-                    os.mkdir(rf'{home}\electric\temp')
-                except:
-                    # temp directory already exists
-                    pass
-
-                os.mkdir(rf'{home}\electric\temp\Scripts')
-
-            with open(rf'{home}\electric\temp\Scripts\temp.ps1', 'w+') as f:
-                for line in packet.pre_install['code']:
-                    f.write(f'\n{line}')
-            os.system(
-                rf'powershell -executionpolicy bypass -File {home}\electric\temp\Scripts\temp.ps1')
+            from script_host import run_powershell
+            run_powershell(packet.pre_install['code'], metadata)
             write('Successfully Executed Pre-Install Code',
                   'bright_green', metadata)
 
@@ -94,20 +152,8 @@ def install_portable(packet: PortablePacket, metadata: Metadata):
             packet.pre_install['code'] = [l.replace('<extras>', rf'{home}\electric\extras\{packet.extract_dir}@{packet.latest_version}'.replace(
                 '\\\\', '\\')) for l in packet.pre_install['code']]
 
-            if not os.path.isdir(rf'{home}\electric\temp\Scripts'):
-                try:
-                    os.mkdir(rf'{home}\electric\temp')
-                except:
-                    # temp directory already exists
-                    pass
-
-                os.mkdir(rf'{home}\electric\temp\Scripts')
-
-            with open(rf'{home}\electric\temp\Scripts\temp.bat', 'w+') as f:
-                for line in packet.pre_install['code']:
-                    f.write(f'\n{line}')
-            os.system(
-                rf'{home}\electric\temp\Scripts\temp.bat')
+            from script_host import run_batch
+            run_batch(packet.pre_install['code'], metadata)
             write('Successfully Executed Pre-Install Code',
                   'bright_green', metadata)
 
@@ -120,85 +166,42 @@ def install_portable(packet: PortablePacket, metadata: Metadata):
         dir = packet.chdir.replace('<version>', packet.latest_version)
         unzip_dir += f'\\{dir}\\'
 
-    if packet.bin and isinstance(packet.bin, list):
-        for binary in packet.bin:
-            if isinstance(binary, str):
-                shim_dir = unzip_dir
-                shim = ''.join(binary.split('.')[:-1])
-                shim_ext = binary.split('.')[-1]
-                if '\\' in binary:
-                    shim = ''.join(binary.split('\\')[-1])
-                    shim = ''.join(shim.split('.')[:-1])
-                    shim_ext = binary.split('.')[-1]
-                    shim_dir += ' '.join(binary.split('\\')
-                                         [:-1]).replace(' ', '\\')
-
-                shim = shim.replace('<version>', packet.latest_version)
-                shim_dir = shim_dir.replace('<version>', packet.latest_version)
-
-                start = timer()
-                generate_shim(f'{shim_dir}', shim, shim_ext)
-                end = timer()
-                write(
-                    f'{Fore.LIGHTCYAN_EX}Successfully Generated {shim} Shim In {round(end - start, 5)} seconds{Fore.RESET}', 'white', metadata)
-            else:
-                val = binary['file-name']
-                shim_dir = unzip_dir
-                shim = ''.join(val.split('.')[:-1])
-                shim_ext = val.split('.')[-1]
-
-                if '\\' in val:
-                    shim = ''.join(val.split('\\')[-1])
-                    shim = ''.join(shim.split('.')[:-1])
-                    shim_ext = val.split('.')[-1]
-                    shim_dir += ' '.join(val.split('\\')
-                                         [:-1]).replace(' ', '\\')
-
-                shim = shim.replace('<version>', packet.latest_version)
-                shim_dir = shim_dir.replace('<version>', packet.latest_version)
-                val = val.replace('<version>', packet.latest_version)
-
-                start = timer()
-                generate_shim(f'{shim_dir}', val.split(
-                    '\\')[-1].split('.')[0], shim_ext, overridefilename=binary['shim-name'])
-                end = timer()
-                write(
-                    f'{Fore.LIGHTCYAN_EX}Successfully Generated {binary["shim-name"]} Shim In {round(end - start, 5)} seconds{Fore.RESET}', 'white', metadata)
-
-    if shortcuts:
-        for shortcut in shortcuts:
-            shortcut_name = shortcut['shortcut-name']
-            file_name = shortcut['file-name']
-            log_info(
-                f'Creating shortcuts for {packet.display_name}', metadata.logfile)
-            create_start_menu_shortcut(unzip_dir, file_name, shortcut_name)
-
-    if packet.set_env:
-        if isinstance(packet.set_env, list):
-            changes_environment = True
-            for obj in packet.set_env:
-                log_info(
-                    f'Setting environment variables for {packet.display_name}', metadata.logfile)
-                write(
-                    f'Setting Environment Variable {obj["name"]}', 'bright_green', metadata)
-                set_environment_variable(obj['name'], obj['value'].replace(
-                    '<install-directory>', unzip_dir).replace('\\\\', '\\'))
+    if isinstance(packet.url, str):
+        if current_version and current_version != packet.latest_version:
+            if not previous:
+                # Without the manifest of the installed version its layout is assumed to match this one
+                previous = copy(packet)
+                previous.latest_version = current_version
         else:
-            changes_environment = True
-
-            log_info(
-                f'Setting environment variables for {packet.display_name}', metadata.logfile)
-            write(
-                f'Setting Environment Variable {packet.set_env["name"]}', 'bright_green', metadata)
-
-            set_environment_variable(packet.set_env['name'], packet.set_env['value'].replace(
-                '<install-directory>', unzip_dir).replace('\\\\', '\\'))
-
-    if changes_environment:
-        log_info(
-            'Detected change in PATH variable. Requesting `refreshenv` to be run', metadata.logfile)
+            previous = None
+
+        start = timer()
+        # Persisted data only leaves the active version once this one is extracted, and goes back if the switch fails
+        try:
+            moved, shims = switch_version(previous, packet)
+        except OSError as err:
+            log_info(f'Switching {packet.display_name} to {packet.latest_version} failed: {err}', metadata.logfile)
+            write(f'Failed To Switch {packet.display_name} To {packet.latest_version}, {err.filename or err} Is In Use. Close {packet.display_name} And Try Again', 'red', metadata)
+            sys.exit(1)
+        end = timer()
+        if moved:
+            write('Moved Old Files And Data', 'green', metadata)
+            log_info(f'Moved {len(moved)} persisted paths of {packet.display_name} from {current_version}', metadata.logfile)
+        log_info(f'Switched {packet.display_name} to {packet.latest_version}', metadata.logfile)
+        # Shortcuts and environment variables follow the `current` link, a later switch or rollback doesn't rewrite them
+        active_dir = get_current_directory(packet)
+    else:
+        start = timer()
+        shims = get_shims(packet, unzip_dir)
+        write_shims(shims)
+        end = timer()
+        active_dir = unzip_dir
+
+    for shim, _ in shims:
         write(
-            f'{Fore.LIGHTGREEN_EX}The PATH environment variable has changed. Run `refreshenv` to refresh your environment variables.{Fore.RESET}', 'white', metadata)
+            f'{Fore.LIGHTCYAN_EX}Successfully Generated {shim} Shim In {round(end - start, 5)} seconds{Fore.RESET}', 'white', metadata)
+
+    create_portable_links(packet, active_dir, metadata)
 
     if packet.post_install:
         log_info('Executing post installation code', metadata.logfile)
@@ -212,5 +215,11 @@ def install_portable(packet: PortablePacket, metadata: Metadata):
                  metadata.logfile)
         display_notes(packet, unzip_dir, metadata)
 
+    if isinstance(packet.url, str):
+        removed = prune_versions(packet.extract_dir, get_keep_versions(metadata))
+        if removed:
+            log_info(f'Deleted old versions of {packet.display_name}: {", ".join(removed)}', metadata.logfile)
+
+    events.emit('installed', packet.json_name, version=packet.latest_version, portable=True)
     write(
         f'Successfully Installed {packet.display_name}', 'bright_magenta', metadata)
@@ -0,0 +1,367 @@
+from concurrent.futures import ThreadPoolExecutor
+from object_store import get_member_path
+from zip_extract import BUFFER_SIZE, precreate_directories
+from threading import Lock
+from uuid import uuid4
+import hashlib
+import io
+import os
+import requests
+import shutil
+import tarfile
+import tracing
+import urllib3
+import zipfile
+import zlib
+
+# Archives which are extracted while they download, anything else is downloaded first
+STREAMABLE = ['.zip', '.tar', '.tar.gz']
+
+# Bytes at the end of a zip archive fetched to read its central directory, enough for most archives in one request
+TAIL_SIZE = 256 * 1024
+
+# Members of a zip archive are downloaded in spans of about this many bytes, one ranged request each
+SPAN_SIZE = 8 * 1024 * 1024
+
+# Spans downloaded and extracted at once
+WORKERS = 8
+
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+LOCAL_HEADER_SIZE = 30
+
+
+# Failures of the connection or the archive which are raised as a `StreamError`, urllib3 errors are raised while the body
+# of a response is read
+DOWNLOAD_ERRORS = (requests.RequestException, urllib3.exceptions.HTTPError, zipfile.BadZipFile, tarfile.TarError,
+                   zlib.error, EOFError)
+
+
+class StreamError(Exception):
+    """
+    Raised when an archive can't be extracted while it downloads, ex: the server ignores Range requests or the connection
+    drops. Whatever was extracted is discarded, so the archive can still be downloaded and extracted the usual way
+    """
+
+
+class StreamReader:
+    """
+    Reads the body of a response in order, counting and hashing the bytes as they are read
+    """
+
+    def __init__(self, raw, position: int = 0, digest=None, progress=None):
+        self.raw = raw
+        self.position = position
+        self.digest = digest
+        self.progress = progress
+
+    def seekable(self) -> bool:
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size) if size is not None and size >= 0 else self.raw.read()
+        self.position += len(data)
+        if self.digest:
+            self.digest.update(data)
+        if self.progress and data:
+            self.progress(len(data))
+        return data
+
+    def skip(self, position: int):
+        """
+        Reads up to a position, ex: the gaps between the members of a zip archive
+        """
+        while self.position < position:
+            if not self.read(min(BUFFER_SIZE, position - self.position)):
+                raise EOFError(f'Response ended at byte {self.position}, expected {position}')
+
+    def drain(self):
+        while self.read(BUFFER_SIZE):
+            pass
+
+
+class Progress:
+    """
+    Counts the bytes of an archive downloaded by every worker
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.downloaded = 0
+        self.total = None
+        self.lock = Lock()
+
+    def __call__(self, size: int):
+        with self.lock:
+            self.downloaded += size
+            if self.callback:
+                self.callback(self.downloaded, self.total)
+
+
+class RemoteFile(io.RawIOBase):
+    """
+    Seekable file over a url which is read through Range requests, only the parts read are downloaded
+
+    Used to read the central directory of a zip archive, which is at its end
+    """
+
+    def __init__(self, session, url: str, size: int, blocks: list):
+        self.session = session
+        self.url = url
+        self.size = size
+        self.position = 0
+        # (offset, data) of every range downloaded so far
+        self.blocks = blocks
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence]
+        self.position = min(max(base + offset, 0), self.size)
+        return self.position
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self.size - self.position
+        size = min(size, self.size - self.position)
+        if size <= 0:
+            return b''
+
+        for offset, data in self.blocks:
+            if offset <= self.position and self.position + size <= offset + len(data):
+                break
+        else:
+            offset = self.position
+            data = get_range(self.session, self.url, offset, min(offset + max(size, TAIL_SIZE), self.size)).content
+            self.blocks.append((offset, data))
+
+        chunk = data[self.position - offset:self.position - offset + size]
+        self.position += len(chunk)
+        return chunk
+
+
+def get_range(session, url: str, start: int, end: int, stream: bool = False):
+    """
+    Requests the bytes in [start, end) of a url
+
+    Raises:
+        StreamError: If the server answers with anything but the range
+    """
+    response = session.get(url, headers={'Range': f'bytes={start}-{end - 1}'}, stream=stream)
+    if response.status_code != 206:
+        response.close()
+        raise StreamError(f'Server answered a Range request with {response.status_code}')
+    response.raw.decode_content = True
+    return response
+
+
+def open_remote_zip(session, url: str) -> zipfile.ZipFile:
+    """
+    Reads the central directory of a zip archive without downloading its members
+
+    Raises:
+        StreamError: If the server doesn't support Range requests or the archive can't be read
+    """
+    response = session.get(url, headers={'Range': f'bytes=-{TAIL_SIZE}'}, stream=True)
+    content_range = response.headers.get('Content-Range', '')
+    if response.status_code != 206 or '/' not in content_range or content_range.endswith('/*'):
+        response.close()
+        raise StreamError(f'Server answered a Range request with {response.status_code}')
+
+    size = int(content_range.rsplit('/', 1)[1])
+    tail = response.content
+    try:
+        return zipfile.ZipFile(RemoteFile(session, url, size, [(size - len(tail), tail)]))
+    except zipfile.BadZipFile as err:
+        raise StreamError(str(err))
+
+
+def get_spans(members: list, end: int, span_size: int = None, skip: set = None) -> list:
+    """
+    Splits the members of a zip archive into contiguous byte ranges of about `span_size` bytes
+
+    #### Arguments
+        members (list): `zipfile.ZipInfo` of the files in the archive
+        end (int): Offset the member data ends at, the start of the central directory
+        span_size (int): Size a span is closed at, defaults to `SPAN_SIZE`. A member larger than it gets a span of its own
+        skip (set): Names of members which aren't downloaded, no span covers them
+
+    Returns:
+        list: (start, end, members) of each span
+    """
+    span_size = span_size or SPAN_SIZE
+    skip = skip or set()
+    members = sorted(members, key=lambda member: member.header_offset)
+    spans = []
+    current = []
+    start = 0
+    for index, member in enumerate(members):
+        member_end = members[index + 1].header_offset if index + 1 < len(members) else end
+        if member.filename in skip:
+            if current:
+                spans.append((start, member.header_offset, current))
+                current = []
+            continue
+        if current and member_end - start > span_size:
+            spans.append((start, member.header_offset, current))
+            current = []
+        if not current:
+            start = member.header_offset
+        current.append(member)
+    if current:
+        spans.append((start, end, current))
+    return spans
+
+
+def extract_members(reader: StreamReader, members: list, destination: str):
+    """
+    Extracts members of a zip archive from a response as their bytes arrive, in the order they are stored
+    """
+    for member in sorted(members, key=lambda member: member.header_offset):
+        reader.skip(member.header_offset)
+        header = reader.read(LOCAL_HEADER_SIZE)
+        if len(header) != LOCAL_HEADER_SIZE or header[:4] != LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f'Bad local header for {member.filename}')
+        reader.skip(reader.position + int.from_bytes(header[26:28], 'little') + int.from_bytes(header[28:30], 'little'))
+
+        with zipfile.ZipExtFile(reader, 'r', member) as source, \
+                open(get_member_path(destination, member.filename), 'wb', buffering=BUFFER_SIZE) as f:
+            shutil.copyfileobj(source, f, BUFFER_SIZE)
+
+
+def stream_zip(session, url: str, destination: str, progress: Progress, digest=None, workers: int = WORKERS,
+               resolve=None):
+    archive = open_remote_zip(session, url)
+    progress.total = archive.fp.size
+    members = [member for member in archive.infolist() if not member.is_dir()]
+    if any(member.flag_bits & 0x1 for member in members):
+        raise StreamError('Archive is encrypted')
+    precreate_directories(destination, [member.filename for member in archive.infolist()])
+
+    # Members the caller already has, ex: files unchanged since the installed version, are never downloaded or written
+    skip = {member.filename for member in members if resolve and resolve(member, destination)}
+
+    if digest:
+        # The checksum covers the whole archive in order, so it is read in one response rather than in parallel spans
+        response = session.get(url, stream=True)
+        response.raise_for_status()
+        response.raw.decode_content = True
+        with response:
+            reader = StreamReader(response.raw, digest=digest, progress=progress)
+            extract_members(reader, [member for member in members if member.filename not in skip], destination)
+            reader.drain()
+        return
+
+    def extract_span(span: tuple):
+        start, end, span_members = span
+        with get_range(session, url, start, end, stream=True) as response:
+            extract_members(StreamReader(response.raw, start, progress=progress), span_members, destination)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(extract_span, get_spans(members, archive.start_dir, skip=skip)):
+            pass
+
+
+def stream_tar(session, url: str, destination: str, compression: str, progress: Progress, digest=None):
+    response = session.get(url, stream=True)
+    response.raise_for_status()
+    length = response.headers.get('Content-Length')
+    progress.total = int(length) if length and not response.headers.get('Content-Encoding') else None
+    response.raw.decode_content = True
+    with response:
+        reader = StreamReader(response.raw, digest=digest, progress=progress)
+        # `r|` reads the archive as a stream, each member is extracted as soon as it has arrived
+        with tarfile.open(fileobj=reader, mode=f'r|{compression}', bufsize=BUFFER_SIZE) as tar:
+            if hasattr(tarfile, 'data_filter'):
+                tar.extraction_filter = tarfile.data_filter
+            tar.extractall(destination)
+        # Anything after the end of the archive still counts towards the checksum
+        reader.drain()
+
+
+def replace_directory(source: str, destination: str):
+    """
+    Moves a directory into place, a directory already there is moved aside first and deleted once it has been replaced
+    """
+    if not os.path.isdir(destination) or os.path.islink(destination):
+        os.rename(source, destination)
+        return
+
+    old = f'{source}.old'
+    os.rename(destination, old)
+    try:
+        os.rename(source, destination)
+    except OSError:
+        os.rename(old, destination)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+
+
+@tracing.traced('download')
+def stream_archive(url: str, file_type: str, destination: str, checksum: bool = False, session=None, progress=None,
+                   workers: int = WORKERS, accept=None, resolve=None) -> dict:
+    """
+    Downloads and extracts an archive at once, it is never written to disk. The archive is extracted into a staging
+    directory next to the destination, which is only replaced once the archive has been extracted and accepted
+
+    #### Arguments
+        url (str): Url of the archive
+        file_type (str): One of `STREAMABLE`
+        destination (str): Directory the archive is extracted into
+        checksum (bool): Whether to compute the sha256 of the archive, zip members are then read in one response
+        session (`requests.Session`): Session to download with, defaults to the shared one
+        progress (function): Called with (downloaded, total) bytes as the archive arrives, total is None for tar archives
+        workers (int): Spans of a zip archive downloaded at once
+        accept (function): Called with the result before the destination is replaced, returning False discards the
+            extracted archive, ex: when its checksum doesn't match
+        resolve (function): Called with each member of a zip archive and the directory it is extracted into before
+            anything is downloaded, returning True means the caller has put the member in place itself
+
+    Returns:
+        dict: Bytes `downloaded`, the `checksum` of the archive if it was computed and whether it was `accepted`
+
+    Raises:
+        StreamError: If the archive can't be streamed or the download fails, the destination is left untouched
+    """
+    if session is None:
+        from utils import get_session
+        session = get_session()
+
+    if file_type not in STREAMABLE:
+        raise StreamError(f'{file_type} archives are downloaded before they are extracted')
+
+    digest = hashlib.sha256() if checksum else None
+    counter = Progress(progress)
+    staging = os.path.join(os.path.dirname(destination), f'.{os.path.basename(destination)}.{uuid4().hex[:8]}')
+    try:
+        if file_type == '.zip':
+            stream_zip(session, url, staging, counter, digest, workers, resolve)
+        else:
+            os.makedirs(staging, exist_ok=True)
+            stream_tar(session, url, staging, 'gz' if file_type == '.tar.gz' else '', counter, digest)
+    except DOWNLOAD_ERRORS as err:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise StreamError(f'{type(err).__name__}: {err}') from err
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    tracing.record(bytes=counter.downloaded)
+    result = {'downloaded': counter.downloaded, 'checksum': digest.hexdigest().upper() if digest else None}
+    result['accepted'] = accept(result) if accept else True
+    if not result['accepted']:
+        shutil.rmtree(staging, ignore_errors=True)
+        return result
+
+    try:
+        replace_directory(staging, destination)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return result
@@ -4,11 +4,16 @@ from zip_utils import delete_environment_variable, delete_start_menu_shortcut, f
 from Classes.Metadata import Metadata
 from subprocess import Popen, PIPE
 from logger import log_info
+from object_store import get_store
+from zip_versions import get_current_link, prune_versions, remove_link
+import events
 import os
+import tracing
 
 home = os.path.expanduser('~')
 
 def uninstall_portable(packet: PortablePacket, metadata: Metadata):
+    tracing.set_track(packet.json_name)
     if find_existing_installation(f'{packet.extract_dir}@{packet.latest_version}'):
 
         loc = rf'{home}\electric\\'
@@ -53,11 +58,27 @@ def uninstall_portable(packet: PortablePacket, metadata: Metadata):
         write(f'Uninstalling {packet.display_name}', 'bright_green', metadata)
         package_directory = loc + f'{packet.extract_dir}@{packet.latest_version}'
 
+        # The link goes first so nothing deletes through it
+        current_link = get_current_link(packet.extract_dir)
+        if os.path.lexists(current_link):
+            remove_link(current_link)
+
         proc = Popen(f'del /f/s/q {package_directory} > nul'.split(), stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
         proc.communicate()
 
         proc = Popen(f'rmdir /s/q {package_directory}'.split(), stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
         proc.communicate()
+
+        # Versions kept for rollbacks go with it, along with the objects nothing else links to
+        store = get_store()
+        store.release(packet.extract_dir, packet.latest_version)
+        removed = prune_versions(packet.extract_dir, 0)
+        if removed:
+            log_info(f'Deleted kept versions of {packet.display_name}: {", ".join(removed)}', metadata.logfile)
+        objects, freed = store.collect()
+        if objects:
+            log_info(f'Deleted {objects} unused objects ({freed} bytes) from the object store', metadata.logfile)
+
         loc = rf'{home}\electric\shims'
 
         if packet.set_env:
@@ -78,6 +99,8 @@ def uninstall_portable(packet: PortablePacket, metadata: Metadata):
         if packet.uninstall_notes:
             display_notes(packet, '', metadata, uninstall=True)
 
+        events.emit('uninstalled', packet.json_name, portable=True)
         write(f'Successfully Uninstalled {packet.display_name}', 'bright_magenta', metadata)
     else:
+        events.emit('failed', packet.json_name, reason='not-installed')
         write(f'Could Not Find Any Existing Installations Of {packet.display_name}', 'bright_yellow', metadata)
@@ -1,130 +1,212 @@
-import json
-from json.decoder import JSONDecodeError
-
-import requests
 from Classes.Metadata import Metadata
 from Classes.PortablePacket import PortablePacket
 from extension import write
 from colorama import Fore
-from zip_utils import *
+from logger import log_info
+import errno
 import os
+import re
+import shutil
 import sys
 
 home = os.path.expanduser('~')
 
 
+def get_portable_data(res: dict, version: str) -> dict:
+    """
+    Gets the data of a portable package needed to create a `PortablePacket` for one of its versions
+    """
+    pkg = res['portable'][version]
+    return {
+        'display-name': res['display-name'],
+        'package-name': res['package-name'],
+        'latest-version': version,
+        'url': pkg['url'],
+        'file-type': pkg.get('file-type'),
+        'extract-dir': res['package-name'],
+        'chdir': pkg.get('chdir', []),
+        'bin': pkg.get('bin', []),
+        'shortcuts': pkg.get('shortcuts', []),
+        'pre-install': pkg.get('pre-install', []),
+        'post-install': pkg.get('post-install', []),
+        'install-notes': pkg.get('install-notes'),
+        'uninstall-notes': pkg.get('uninstall-notes'),
+        'set-env': pkg.get('set-env'),
+        'persist': pkg.get('persist'),
+        'checksum': pkg.get('checksum'),
+        'dependencies': pkg.get('dependencies'),
+    }
+
+
+def version_key(version: str) -> tuple:
+    # Numeric parts compare as numbers, so 1.10.0 sorts after 1.9.0
+    return tuple((0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'[.\-+]', version))
+
+
+def find_installed_version(json_name: str, directory: str = None) -> str:
+    """
+    Finds the version of a portable package which is installed, the active one if several versions are kept
+
+    #### Arguments
+        json_name (str): Name of the package
+        directory (str): Directory portable packages are extracted into, defaults to `~/electric`
+
+    Returns:
+        str: Version of the package which is active, None if it isn't installed
+    """
+    from zip_versions import get_current_version, get_installed_versions
+
+    # Installs from before versions were kept side by side have no `current` link
+    versions = get_installed_versions(json_name, directory)
+    return get_current_version(json_name, directory) or (versions[-1] if versions else None)
+
+
+def get_install_directory(packet: PortablePacket, directory: str = None) -> str:
+    """
+    Gets the directory persisted paths of a portable package are relative to
+    """
+    install_directory = os.path.join(directory or os.path.join(home, 'electric'), f'{packet.json_name}@{packet.latest_version}')
+    if packet.chdir:
+        install_directory = os.path.join(install_directory, packet.chdir.replace('<version>', packet.latest_version))
+    return install_directory
+
+
+def get_persisted_paths(packet: PortablePacket) -> list:
+    if not packet.persist:
+        return []
+    return packet.persist if isinstance(packet.persist, list) else [packet.persist]
+
+
+def move_tree(source: str, destination: str) -> bool:
+    """
+    Moves a file or directory, replacing the destination. On the same volume it is renamed, its contents are only copied when
+    the destination is on another volume
+
+    Returns:
+        bool: Whether the contents had to be copied
+    """
+    os.makedirs(os.path.dirname(destination), exist_ok=True)
+    if os.path.isdir(destination) and not os.path.islink(destination):
+        shutil.rmtree(destination)
+    elif os.path.lexists(destination):
+        os.remove(destination)
+
+    try:
+        os.rename(source, destination)
+        return False
+    except OSError as err:
+        if err.errno != errno.EXDEV:
+            raise
+
+    if os.path.isdir(source):
+        shutil.copytree(source, destination, symlinks=True)
+        shutil.rmtree(source)
+    else:
+        shutil.copy2(source, destination)
+        os.remove(source)
+    return True
+
+
+def move_persisted(source: PortablePacket, destination: PortablePacket, directory: str = None, paths: list = None) -> list:
+    """
+    Moves the persisted paths of one installed version of a portable package into another, replacing the defaults it ships with.
+    If a path can't be moved the ones already moved are put back, so the source version keeps all of its files and data
+
+    #### Arguments
+        source (`PortablePacket`): Version the files and data are moved out of
+        destination (`PortablePacket`): Version the files and data are moved into
+        directory (str): Directory portable packages are extracted into
+        paths (list): Persisted paths to move, all of the source version's if None
+
+    Raises:
+        OSError: A path couldn't be moved, ex: the application is running and has it open. `filename` is the path
+
+    Returns:
+        list: Persisted paths which existed and were moved
+    """
+    source_directory = get_install_directory(source, directory)
+    destination_directory = get_install_directory(destination, directory)
+    moved = []
+    for path in get_persisted_paths(source) if paths is None else paths:
+        if not os.path.lexists(os.path.join(source_directory, path)):
+            continue
+        try:
+            move_tree(os.path.join(source_directory, path), os.path.join(destination_directory, path))
+        except OSError as err:
+            for done in reversed(moved):
+                move_tree(os.path.join(destination_directory, done), os.path.join(source_directory, done))
+            raise OSError(err.errno, err.strerror, os.path.join(source_directory, path)) from err
+        moved.append(path)
+    return moved
+
+
+def switch_version(source: PortablePacket, destination: PortablePacket, directory: str = None) -> tuple:
+    """
+    Moves the persisted paths of the active version of a portable package into an installed version and makes that one
+    active. If the switch fails the persisted paths are moved back, the version which was active is left as it was
+
+    #### Arguments
+        source (`PortablePacket`): Active version, None if there isn't one to move files and data out of
+        destination (`PortablePacket`): Version to switch to, it must already be extracted
+        directory (str): Directory portable packages are extracted into
+
+    Raises:
+        OSError: A path couldn't be moved or written, ex: the application is running and has it open
+
+    Returns:
+        tuple: (persisted paths which were moved, (name, command) of the shims which were written)
+    """
+    from zip_versions import activate
+
+    moved = move_persisted(source, destination, directory) if source else []
+    try:
+        shims = activate(destination, directory)
+    except Exception:
+        if moved:
+            move_persisted(destination, source, directory, moved)
+        raise
+    return moved, shims
+
+
+def get_version_packet(res: dict, version: str) -> PortablePacket:
+    """
+    Creates a `PortablePacket` for an installed version of a portable package
+    """
+    if version in res['portable']:
+        return PortablePacket(get_portable_data(res, version))
+    # The version is no longer published, its layout is assumed to match the latest one
+    return PortablePacket({**get_portable_data(res, res['portable']['latest-version']), 'latest-version': version})
+
+
 def update_portable(ctx, packet: PortablePacket, metadata: Metadata):
-    import shutil
-    import click
-    from difflib import get_close_matches
-    
-    write(f'Updating [ {Fore.LIGHTCYAN_EX}{packet.display_name}{Fore.RESET} ]', 'white', metadata)
-    
-    options = os.listdir(rf'{home}\electric')
-    matches = get_close_matches(rf'{home}\electric\{packet.json_name}@{packet.latest_version}', options)
-    if len(matches) == 1:
-        # similar package exists and we need to get the version of the currently installed package.
-        current_version = matches[0].split('@')[-1].replace('.json', '')
-        
-        if current_version != packet.latest_version:
-            write(f'{packet.display_name} Will Be Updated From ({current_version}) => ({packet.latest_version})', 'green', metadata)
-            write('Requesting Currently Installed Version', 'yellow', metadata)
-  
-        REQA = 'https://raw.githubusercontent.com/electric-package-manager/electric-packages/master/packages/'
+    """
+    Updates a portable package in this process, the new version is installed next to the installed one and only replaces it
+    once it is ready, along with the persisted files and data
+
+    #### Arguments
+        ctx (`click.Context`): Context of the update command
+        packet (`PortablePacket`): Latest version of the package
+        metadata (`Metadata`): Metadata for the update
+    """
+    from utils import send_req_package
+    from zip_install import install_portable
 
-        try:
-            response = requests.get(REQA + packet.json_name + '.json', timeout=5)
-        except (requests.exceptions.ConnectionError, requests.exceptions.ReadTimeout):
-            click.echo(click.style(
-                f'Failed to request {packet.json_name}.json from raw.githubusercontent.com', 'red'))
-            sys.exit()
-       
-        try:
-            res = json.loads(response.text)
-        except JSONDecodeError:
-            click.echo(click.style(f'{packet.json_name} not found!', 'red'))
-            sys.exit()
-        
-        pkg = res
-
-        pkg = pkg['portable']
-
-        keys = list(pkg[current_version].keys())
-        data = {
-            'display-name': res['display-name'],
-            'package-name': res['package-name'],
-            'latest-version': res['latest-version'],
-            'url': pkg[current_version]['url'],
-            'file-type': pkg[current_version]['file-type'] if 'file-type' in keys else None,
-            'extract-dir': res['package-name'],
-            'chdir': pkg[current_version]['chdir'] if 'chdir' in keys else [],
-            'bin': pkg[current_version]['bin'] if 'bin' in keys else [],
-            'shortcuts': pkg[current_version]['shortcuts'] if 'shortcuts' in keys else [],
-            'pre-install': pkg[current_version]['pre-install'] if 'pre-install' in keys else [],
-            'post-install': pkg[current_version]['post-install'] if 'post-install' in keys else [],
-            'install-notes': pkg[current_version]['install-notes'] if 'install-notes' in keys else None,
-            'uninstall-notes': pkg[current_version]['uninstall-notes'] if 'uninstall-notes' in keys else None,
-            'set-env': pkg[current_version]['set-env'] if 'set-env' in keys else None,
-            'persist': pkg[current_version]['persist'] if 'persist' in keys else None,
-            'checksum': pkg[current_version]['checksum'] if 'checksum' in keys else None,
-            'dependencies': pkg[current_version]['dependencies'] if 'dependencies' in keys else None,
-        }
-
-        old_packet = PortablePacket(data)
-
-        # continue updating the package
-        # if a directory has to be saved before uninstallation and installation of the portable
-        
-
-        if old_packet.persist:
-            install_directory = rf'{home}\electric\{old_packet.json_name}@{current_version}\\'
-    
-            if old_packet.chdir:
-                install_directory += old_packet.chdir + '\\'
-                install_directory = install_directory.replace('\\\\', '\\')
-            
-            if isinstance(old_packet.persist, list):
-                for path in old_packet.persist:
-                    # multiple directories to backup
-                    try:
-                        shutil.copytree(install_directory + path, rf'{home}\electric\Persist\{old_packet.json_name}@{current_version}\{path}')
-                    except FileExistsError:
-                        pass
-
-            else:
-                # only 1 directory to backup
-                if old_packet.persist:
-                    try:
-                        shutil.copytree(install_directory + old_packet.persist, rf'{home}\electric\Persist\{old_packet.json_name}@{current_version}\{old_packet.persist}')
-                    except FileExistsError:
-                        pass
-
-        os.system(f'electric uninstall {packet.json_name} --portable')
-        os.system(f'electric install {packet.json_name} --portable')
-
-        new_install_dir = rf'{home}\electric\{packet.json_name}@{packet.latest_version}\\'
-        if packet.chdir:
-            new_install_dir += packet.chdir + '\\'
-        
-        new_install_dir = new_install_dir.replace('\\\\', '\\')
-        
-        if old_packet.persist:
-            write('Restoring Old Files And Data', 'green', metadata)
-
-            if isinstance(old_packet.persist, list):
-                for path in old_packet.persist:
-                    shutil.rmtree(new_install_dir + path)
-                    shutil.copytree(rf'{home}\electric\Persist\{old_packet.json_name}@{current_version}\{path}', new_install_dir + path)
-            else:
-                shutil.rmtree(new_install_dir.replace('\\\\', '\\') + old_packet.persist.replace('\\\\', '\\'))
-                shutil.copytree(rf'{home}\electric\Persist\{old_packet.json_name}@{current_version}\{old_packet.persist}', new_install_dir + old_packet.persist)
-
-        # completed backup of files to backups directory
-        write(rf'Successfully Completed Backup Of Required Data To {home}\electric\Persist', 'cyan', metadata)
+    write(f'Updating [ {Fore.LIGHTCYAN_EX}{packet.display_name}{Fore.RESET} ]', 'white', metadata)
 
-    else:
+    current_version = find_installed_version(packet.json_name)
+    if not current_version:
         write(f'Could not find any existing installations of {packet.display_name}', 'red', metadata)
+        sys.exit()
+
+    if current_version == packet.latest_version:
+        write(f'{packet.display_name} Is Already On The Latest Version ({current_version})', 'bright_yellow', metadata)
+        sys.exit()
+
+    write(f'{packet.display_name} Will Be Updated From ({current_version}) => ({packet.latest_version})', 'green', metadata)
 
+    old_packet = get_version_packet(send_req_package(packet.json_name), current_version)
+    log_info(f'Installing {packet.display_name}@{packet.latest_version} next to {current_version}', metadata.logfile)
+    install_portable(packet, metadata, previous=old_packet)
 
     write(f'Successfully Updated {packet.display_name}', 'bright_magenta', metadata)
-    sys.exit()
\ No newline at end of file
+    sys.exit()
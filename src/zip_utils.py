@@ -4,7 +4,9 @@ import os
 import winreg
 from Classes.Metadata import Metadata
 from Classes.PortablePacket import PortablePacket
-from extension import write
+from extension import write, write_verbose
+import events
+import tracing
 
 
 home = os.path.expanduser('~')
@@ -25,9 +27,35 @@ def verify_checksum(path: str, checksum: str):
         print('Hashes Don\'t Match!')
 
 
-def unzip_file(download_dir: str, unzip_dir_name: str, file_type: str, metadata: Metadata):
+def create_extract_progress(total: int, metadata: Metadata) -> tuple:
+    """
+    Creates the bar shown while an archive is extracted, it is updated from every thread extracting the archive
+
+    Returns:
+        tuple: (function called with each extracted member, bar to close once the archive is extracted), both None when silent
+    """
+    if metadata.silent:
+        return None, None
+
+    from threading import Lock
+    from tqdm import tqdm
+
+    bar = tqdm(total=total, desc='Extracting ', bar_format='{l_bar}{bar:13}{r_bar}{bar:-13b}', smoothing=0.0, unit='files')
+    lock = Lock()
+
+    def progress(_):
+        with lock:
+            bar.update()
+
+    return progress, bar
+
+
+@tracing.traced('extract')
+def unzip_file(download_dir: str, unzip_dir_name: str, file_type: str, metadata: Metadata, exclude: list = None):
     import zipfile
     import tarfile
+    from object_store import get_store
+    from zip_extract import extract_tar, extract_zip
 
     if not unzip_dir_name:
         unzip_dir_name = download_dir.replace('.zip', '')
@@ -38,26 +66,31 @@ def unzip_file(download_dir: str, unzip_dir_name: str, file_type: str, metadata:
 
     os.chdir(rf'{home}\electric')
 
-    if metadata.silent and file_type == '.zip':
-        with zipfile.ZipFile(download_dir, 'r') as zf:
-            try:
-                zf.extractall(download_dir.replace('.zip', ''))
-            except:
-                pass
+    # Versions of a package are extracted through the object store, so files an earlier version already has aren't kept twice
+    package, _, version = unzip_dir_name.partition('@')
 
-    if not metadata.silent and file_type == '.zip':
-        from tqdm import tqdm
+    if file_type == '.zip':
+        destination = download_dir.replace('.zip', '')
         with zipfile.ZipFile(download_dir, 'r') as zf:
-            for member in tqdm(zf.infolist(), desc='Extracting ', bar_format='{l_bar}{bar:13}{r_bar}{bar:-13b}', smoothing=0.0, unit='files'):
-                try:
-                    zf.extract(member, download_dir.replace('.zip', ''))
-                except zipfile.error:
-                    pass
+            progress, bar = create_extract_progress(sum(not member.is_dir() for member in zf.infolist()), metadata)
+            try:
+                if version:
+                    stats = get_store().extract_zip(zf, destination, package, version, exclude, progress)
+                    write_verbose(f'Extracted {stats["written"]} New Files, Linked {stats["linked"]} Unchanged Files', metadata)
+                else:
+                    extract_zip(download_dir, destination, progress=progress)
+            finally:
+                if bar:
+                    bar.close()
 
     if file_type == '.tar':
-        tar = tarfile.open(download_dir, 'r:')
-        tar.extractall(unzip_dir_name)
-        tar.close()
+        with tarfile.open(download_dir, 'r:') as tar:
+            progress, bar = create_extract_progress(sum(not member.isdir() for member in tar.getmembers()), metadata)
+        try:
+            extract_tar(download_dir, unzip_dir_name, progress=progress)
+        finally:
+            if bar:
+                bar.close()
 
     if file_type == '.tar.gz':
         tar = tarfile.open(download_dir, 'r:gz')
@@ -66,6 +99,7 @@ def unzip_file(download_dir: str, unzip_dir_name: str, file_type: str, metadata:
 
     import py7zr
     if file_type == '.7z':
+        # py7zr decodes each independent folder of the archive on its own thread when it is opened from a path
         with py7zr.SevenZipFile(download_dir) as z:
             z.extractall(unzip_dir_name)
 
@@ -74,10 +108,95 @@ def unzip_file(download_dir: str, unzip_dir_name: str, file_type: str, metadata:
     if file_type == '.rar':
         patoolib.extract_archive(download_dir, outdir=unzip_dir_name)
 
+    if file_type != '.zip' and version:
+        # These formats can't be read member by member cheaply, the extracted files are moved into the store instead
+        stats = get_store().import_tree(unzip_dir_name, package, version, exclude)
+        write_verbose(f'Stored {stats["written"]} New Files, Linked {stats["linked"]} Unchanged Files', metadata)
+
     os.remove(download_dir)
     return rf'{home}\electric\\' + download_dir.replace(file_type, '')
 
 
+def stream_file(packet: PortablePacket, metadata: Metadata, exclude: list = None) -> str:
+    """
+    Downloads and extracts a portable package at once, so files are usable before the download ends and the archive is never
+    written to disk
+
+    #### Arguments
+        packet (`PortablePacket`): Package to install
+        metadata (`Metadata`): Metadata for the installation
+        exclude (list): Paths extracted as plain files rather than links into the object store
+
+    Returns:
+        str: Directory the package was extracted into
+
+    Raises:
+        StreamError: If the archive can't be streamed, it should be downloaded with `download` instead
+    """
+    from object_store import get_member_path, get_store, is_excluded
+    from zip_stream import stream_archive
+
+    name = f'{packet.extract_dir}@{packet.latest_version}'
+    destination = rf'{home}\electric\{name}'
+
+    # Created on the first bytes, a server which can't stream the archive never shows an empty bar
+    bars = []
+
+    def progress(downloaded: int, total: int):
+        events.progress(packet.json_name, downloaded, total)
+        if metadata.silent or metadata.no_progress:
+            return
+        if not bars:
+            from tqdm import tqdm
+            bars.append(tqdm(total=total, desc='Downloading ', bar_format='{l_bar}{bar:13}{r_bar}{bar:-13b}', unit='B',
+                             unit_scale=True, smoothing=0.0))
+        bars[0].update(downloaded - bars[0].n)
+
+    def accept(result: dict) -> bool:
+        for bar in bars:
+            bar.close()
+        events.emit('downloaded', packet.json_name)
+        if not packet.checksum:
+            return True
+
+        events.emit('verified', path=packet.url, match=result['checksum'] == packet.checksum)
+        if result['checksum'] == packet.checksum:
+            write('Verified Installer Hash', 'bright_green', metadata)
+            return True
+        write('Hashes Don\'t Match!', 'bright_green', metadata)
+        return metadata.yes or confirm('Would you like to continue with installation?')
+
+    store = get_store()
+    linked = {}
+
+    def resolve(member, directory: str) -> bool:
+        # Files unchanged since an installed version are linked to the store rather than downloaded again
+        target = get_member_path(directory, member.filename)
+        relative = os.path.relpath(target, directory)
+        if exclude and is_excluded(relative, exclude):
+            return False
+        hash = store.find_installed_member(packet.extract_dir, relative, member)
+        if not hash:
+            return False
+        store.link(hash, target)
+        linked[relative] = hash
+        return True
+
+    try:
+        # An existing install of the same version is only replaced once the archive is extracted and verified
+        result = stream_archive(packet.url, packet.file_type, destination, checksum=bool(packet.checksum),
+                                progress=progress, accept=accept, resolve=resolve)
+    finally:
+        for bar in bars:
+            bar.close()
+    if not result['accepted']:
+        os._exit(1)
+
+    stats = store.import_tree(destination, packet.extract_dir, packet.latest_version, exclude, linked)
+    write_verbose(f'Stored {stats["written"]} New Files, Linked {stats["linked"]} Unchanged Files', metadata)
+    return rf'{home}\electric\\' + name
+
+
 def install_font(src_path: str):
     from ctypes import wintypes
     import ctypes
@@ -201,6 +320,7 @@ def get_init_char(start, metadata) -> str:
     return ''
 
 
+@tracing.traced('download')
 def download(packet, url: str, download_extension: str, file_path: str, metadata: Metadata, show_progress_bar=True, is_zip=False):
     '''
     Downloads A File from a URL And Saves It To A location
@@ -240,6 +360,7 @@ def download(packet, url: str, download_extension: str, file_path: str, metadata
 
             if total_length is None:
                 f.write(response.content)
+                tracing.record(bytes=len(response.content))
             else:
                 dl = 0
                 full_length = int(total_length)
@@ -249,6 +370,7 @@ def download(packet, url: str, download_extension: str, file_path: str, metadata
                 for data in response.iter_content(chunk_size=chunk_size):
                     dl += len(data)
                     f.write(data)
+                    events.progress(packet.json_name, dl, full_length)
                     # if no_progress is True or show_progress_bar (user settings) is false
                     if metadata.no_progress == True or metadata.settings.show_progress_bar == False:
                         sys.stdout.write(
@@ -290,6 +412,9 @@ def download(packet, url: str, download_extension: str, file_path: str, metadata
                                     f'\r{get_init_char(True, metadata)}{fill_c}{unfill_c}{get_init_char(False, metadata)} {Fore.RESET + Style.DIM} {round(dl / 1000000, 1)} / {round(full_length / 1000000, 1)} MB {Fore.RESET}')
                             sys.stdout.flush()
 
+                tracing.record(bytes=dl)
+
+        events.emit('downloaded', packet.json_name)
         if is_zip:
             write(f'\n{Fore.LIGHTGREEN_EX}Initializing Unzipper{Fore.RESET}',
                   'white', metadata)
@@ -303,7 +428,14 @@ def download(packet, url: str, download_extension: str, file_path: str, metadata
 def verify_checksum(path: str, checksum: str, metadata: Metadata, newline=False):
     import hashlib
 
-    if hashlib.sha256(open(path, 'rb').read()).hexdigest().upper() == checksum:
+    with tracing.span('checksum') as span:
+        with open(path, 'rb') as f:
+            data = f.read()
+        span.set(bytes=len(data))
+        digest = hashlib.sha256(data).hexdigest().upper()
+
+    events.emit('verified', path=path, match=digest == checksum)
+    if digest == checksum:
         if not newline:
             write('Verified Installer Hash', 'bright_green', metadata)
         else:
@@ -398,6 +530,7 @@ def create_folder_backup(packet: PortablePacket, folder: str):
                  rf'{home}\electric\Backup\{packet.extract_dir}@{packet.latest_version}\{folder}.zip')
 
 
+@tracing.traced('env-update')
 def set_environment_variable(name: str, value: str):
     if value.endswith('\\'):
         value += '\\'
@@ -447,6 +580,7 @@ def delete_environment_variable(name: str):
           stdout=PIPE, stderr=PIPE, shell=True)
 
 
+@tracing.traced('env-update')
 def append_to_path(input_dir: str):
     proc = Popen(f'setx /M path "%PATH%;{input_dir}"', stdin=PIPE,
                  stdout=PIPE, stderr=PIPE, shell=True)
@@ -0,0 +1,281 @@
+from Classes.Metadata import Metadata
+from Classes.PortablePacket import PortablePacket
+from extension import write
+from colorama import Fore
+from logger import log_info
+from subprocess import PIPE, Popen
+from uuid import uuid4
+import os
+import shutil
+import sys
+
+home = os.path.expanduser('~')
+
+# Name of the link to the active version of a portable package, ex: `~/electric/ffmpeg@current`
+CURRENT = 'current'
+
+# Versions kept besides the active one so they can be rolled back to, `keepPortableVersions` in settings.json overrides it
+KEEP_VERSIONS = 2
+
+
+def get_directory(directory: str = None) -> str:
+    return directory or os.path.join(home, 'electric')
+
+
+def get_current_link(json_name: str, directory: str = None) -> str:
+    return os.path.join(get_directory(directory), f'{json_name}@{CURRENT}')
+
+
+def get_current_directory(packet: PortablePacket, directory: str = None) -> str:
+    """
+    Gets the install directory of a portable package through its `current` link, shims, environment variables and
+    shortcuts point here so switching the link is all it takes to change versions
+    """
+    current = get_current_link(packet.extract_dir, directory)
+    if packet.chdir:
+        current = os.path.join(current, packet.chdir.replace('<version>', packet.latest_version))
+    return current
+
+
+def get_current_version(json_name: str, directory: str = None) -> str:
+    """
+    Reads which version of a portable package the `current` link points to
+
+    Returns:
+        str: Active version, None if the package has no `current` link
+    """
+    try:
+        target = os.readlink(get_current_link(json_name, directory))
+    except (OSError, ValueError):
+        return None
+    return os.path.basename(os.path.normpath(target)).partition('@')[2] or None
+
+
+def get_installed_versions(json_name: str, directory: str = None) -> list:
+    """
+    Finds every version of a portable package which is kept in the electric directory
+
+    Returns:
+        list: Versions from oldest to newest
+    """
+    from zip_update import version_key
+
+    prefix = f'{json_name}@'
+    try:
+        versions = [entry.name[len(prefix):] for entry in os.scandir(get_directory(directory))
+                    if entry.name.startswith(prefix) and entry.name != f'{prefix}{CURRENT}'
+                    and entry.is_dir(follow_symlinks=False)]
+    except FileNotFoundError:
+        return []
+    return sorted(versions, key=version_key)
+
+
+def get_keep_versions(metadata: Metadata) -> int:
+    try:
+        return int(metadata.settings.raw_dictionary.get('keepPortableVersions', KEEP_VERSIONS))
+    except (AttributeError, TypeError, ValueError):
+        return KEEP_VERSIONS
+
+
+def create_link(target: str, link: str):
+    """
+    Creates a link to a directory, a junction on Windows when symlinks aren't allowed
+    """
+    try:
+        os.symlink(target, link, target_is_directory=True)
+    except OSError:
+        if sys.platform != 'win32':
+            raise
+        # Symlinks need developer mode or an elevated prompt, junctions don't
+        proc = Popen(f'mklink /J "{link}" "{target}"', stdin=PIPE, stdout=PIPE, stderr=PIPE, shell=True)
+        _, err = proc.communicate()
+        if proc.returncode != 0:
+            raise OSError(err.decode('utf-8', 'replace').strip())
+
+
+def remove_link(link: str):
+    # Removing a junction or directory symlink with rmdir never touches what it points to
+    if sys.platform == 'win32':
+        os.rmdir(link)
+    else:
+        os.unlink(link)
+
+
+def switch_current(json_name: str, version: str, directory: str = None):
+    """
+    Points the `current` link of a portable package at one of its versions, the link is created next to the old one and
+    renamed over it in a single step
+
+    Windows can't rename a link over another one, there the old link is moved aside before the new one takes its place.
+    Between those two renames the package has no active version, a crash in that window leaves the old link next to it
+    as `.{json_name}@current.*.old`
+    """
+    directory = get_directory(directory)
+    link = get_current_link(json_name, directory)
+    temp = os.path.join(directory, f'.{json_name}@{CURRENT}.{uuid4().hex[:8]}')
+    create_link(os.path.join(directory, f'{json_name}@{version}'), temp)
+    try:
+        os.replace(temp, link)
+    except OSError:
+        # Windows can't rename a link over another directory link, the old one is moved aside first
+        old = f'{temp}.old'
+        os.rename(link, old)
+        os.rename(temp, link)
+        remove_link(old)
+
+
+def get_shims(packet: PortablePacket, install_directory: str) -> list:
+    """
+    Gets the shims a version of a portable package needs
+
+    #### Arguments
+        packet (`PortablePacket`): Version of the package
+        install_directory (str): Directory the `bin` paths are relative to
+
+    Returns:
+        list: (name, command) of each shim, ex: `('ffmpeg', '...\\ffmpeg@4.4\\bin\\ffmpeg.exe')`
+    """
+    shims = []
+    for binary in packet.bin if isinstance(packet.bin, list) else []:
+        path = binary if isinstance(binary, str) else binary['file-name']
+        path = path.replace('<version>', packet.latest_version)
+        parts = path.split('\\')
+        stem, _, extension = parts[-1].rpartition('.')
+        name = stem if isinstance(binary, str) else binary['shim-name']
+        shims.append((name, os.path.join(install_directory, *parts[:-1], f'{stem}.{extension}')))
+    return shims
+
+
+def write_shims(shims: list, shims_directory: str = None):
+    """
+    Writes shims, each one replaces the old shim in a single rename so a shim is never seen half written
+    """
+    shims_directory = shims_directory or os.path.join(home, 'electric', 'shims')
+    os.makedirs(shims_directory, exist_ok=True)
+    for name, command in shims:
+        path = os.path.join(shims_directory, f'{name}.bat')
+        with open(f'{path}.tmp', 'w') as f:
+            f.write(f'@echo off\n"{command}" %*')
+        os.replace(f'{path}.tmp', path)
+
+
+def activate(packet: PortablePacket, directory: str = None) -> list:
+    """
+    Makes an installed version of a portable package the active one, its shims are written and the `current` link is
+    switched to it. Shims run the package through the `current` link, so until the switch they keep running the version
+    which was active
+
+    Returns:
+        list: (name, command) of the shims which were written
+    """
+    shims = get_shims(packet, get_current_directory(packet, directory))
+    write_shims(shims, os.path.join(get_directory(directory), 'shims'))
+    switch_current(packet.extract_dir, packet.latest_version, directory)
+    return shims
+
+
+def remove_version(json_name: str, version: str, directory: str = None) -> bool:
+    """
+    Deletes a kept version of a portable package and drops its references to the object store
+
+    Returns:
+        bool: Whether the version was deleted
+    """
+    from object_store import get_store
+
+    directory = get_directory(directory)
+    path = os.path.join(directory, f'{json_name}@{version}')
+    shutil.rmtree(path, ignore_errors=True)
+    shutil.rmtree(os.path.join(directory, 'extras', f'{json_name}@{version}'), ignore_errors=True)
+    if os.path.exists(path):
+        return False
+    get_store().release(json_name, version)
+    return True
+
+
+def prune_versions(json_name: str, keep: int, directory: str = None) -> list:
+    """
+    Deletes the oldest versions of a portable package which aren't active, keeping the newest `keep` of them for rollbacks
+
+    Returns:
+        list: Versions which were deleted
+    """
+    from object_store import get_store
+
+    current = get_current_version(json_name, directory)
+    versions = [version for version in get_installed_versions(json_name, directory) if version != current]
+    removed = [version for version in versions[:max(len(versions) - keep, 0)]
+               if remove_version(json_name, version, directory)]
+    if removed:
+        get_store().collect()
+    return removed
+
+
+def get_previous_version(json_name: str, directory: str = None) -> str:
+    """
+    Finds the newest kept version of a portable package which is older than the active one
+    """
+    from zip_update import version_key
+
+    current = get_current_version(json_name, directory)
+    if not current:
+        return None
+    older = [version for version in get_installed_versions(json_name, directory) if version_key(version) < version_key(current)]
+    return older[-1] if older else None
+
+
+def rollback_portable(json_name: str, version: str, metadata: Metadata):
+    """
+    Switches a portable package back to a version kept from an earlier install, nothing is downloaded
+
+    #### Arguments
+        json_name (str): Name of the package
+        version (str): Version to switch to, the newest one older than the active version if None
+        metadata (`Metadata`): Metadata for the rollback
+    """
+    from utils import send_req_package
+    from zip_update import get_version_packet, switch_version
+
+    current = get_current_version(json_name)
+    if not current:
+        write(f'Could Not Find An Active Version Of {json_name}', 'bright_yellow', metadata)
+        sys.exit()
+
+    version = version or get_previous_version(json_name)
+    if not version:
+        write(f'No Earlier Versions Of {json_name} Are Kept', 'bright_yellow', metadata)
+        sys.exit()
+
+    if version == current:
+        write(f'{json_name} Is Already On Version {version}', 'bright_yellow', metadata)
+        sys.exit()
+
+    if version not in get_installed_versions(json_name):
+        write(f'Version {version} Of {json_name} Is Not Kept, Kept Versions: {", ".join(get_installed_versions(json_name))}', 'red', metadata)
+        sys.exit()
+
+    res = send_req_package(json_name)
+    source = get_version_packet(res, current)
+    packet = get_version_packet(res, version)
+
+    try:
+        moved, shims = switch_version(source, packet)
+    except OSError as err:
+        log_info(f'Rolling back {packet.display_name} to {version} failed: {err}', metadata.logfile)
+        write(f'Failed To Roll Back {packet.display_name} To {version}, {err.filename or err} Is In Use. Close {packet.display_name} And Try Again', 'red', metadata)
+        sys.exit(1)
+
+    if moved:
+        log_info(f'Moved {len(moved)} persisted paths of {packet.display_name} from {current} to {version}', metadata.logfile)
+
+    for name, _ in shims:
+        write(f'{Fore.LIGHTCYAN_EX}Successfully Generated {name} Shim{Fore.RESET}', 'white', metadata)
+
+    # Environment variables and shortcuts go through the `current` link, they only change when the directory inside it
+    # is named after the version
+    if packet.chdir and '<version>' in packet.chdir:
+        from zip_install import create_portable_links
+
+        create_portable_links(packet, get_current_directory(packet), metadata)
+
+    write(f'Rolled Back {packet.display_name} From ({current}) => ({version})', 'bright_magenta', metadata)
@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from registry_server import Registry, RegistryServer  # noqa: E402
+
+
+class TestRegistryServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = Registry(packages=30, blob_size=100000, archive_files=5)
+        cls.server = RegistryServer(cls.registry)
+        cls.server.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def test_manifest_points_at_server(self):
+        name = self.registry.names[0]
+        res = requests.get(f'{self.server.url}/packages/{name}.json').json()
+        self.assertEqual(res['package-name'], name)
+        self.assertTrue(res['1.0.0']['url'].startswith(self.server.url))
+        self.assertEqual(requests.get(f'{self.server.url}/packages/missing.json').status_code, 404)
+
+    def test_range_requests(self):
+        name = self.registry.names[0]
+        blob = self.registry.files[f'/blobs/{name}.exe']
+
+        res = requests.get(f'{self.server.url}/blobs/{name}.exe', headers={'Range': 'bytes=100-'})
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(res.content, blob[100:])
+
+        res = requests.get(f'{self.server.url}/blobs/{name}.exe', headers={'Range': 'bytes=-10'})
+        self.assertEqual(res.headers['Content-Range'], f'bytes {len(blob) - 10}-{len(blob) - 1}/{len(blob)}')
+
+        res = requests.get(f'{self.server.url}/blobs/{name}.exe', headers={'Range': f'bytes={len(blob)}-'})
+        self.assertEqual(res.status_code, 416)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+from unittest import mock
+from Classes.Config import Config
+
+MANIFESTS = {
+    'atom': {'package-name': 'atom', 'display-name': 'Atom', 'latest-version': '1.58.0',
+             '1.58.0': {'dependencies': ['git']}, '1.57.0': {'dependencies': ['git']}},
+    'git': {'package-name': 'git', 'display-name': 'Git', 'latest-version': '2.33.0',
+            '2.33.0': {'dependencies': None}},
+}
+
+
+def config() -> Config:
+    return Config({
+        'Info': [{'Publisher': 'electric'}, {'Description': 'Development'}],
+        'Packages': [{'atom': '1.57.0'}, {'git': 'latest'}],
+        'Pip-Packages': [{'requests': '2.26.0'}],
+        'Editor-Configuration': [{'Editor': 'Visual Studio Code'}],
+        'Editor-Extensions': [{'ms-python.python': 'latest'}],
+    })
+
+
+class TestConfigPlan(unittest.TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('utils.send_req_package', side_effect=lambda name: MANIFESTS[name])
+        self.send_req_package = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_plan_resolves_each_package_once(self):
+        plan = config().get_plan(False)
+        self.assertEqual([(entry['name'], entry['version']) for entry in plan['packages']],
+                         [('atom', '1.58.0'), ('git', '2.33.0')])
+        self.assertEqual(self.send_req_package.call_count, 2)
+        self.assertEqual(plan['pip-packages'], [{'name': 'requests', 'version': None}])
+        self.assertEqual(plan['editor'], 'Visual Studio Code')
+
+    def test_plan_includes_versions(self):
+        plan = config().get_plan(True)
+        self.assertEqual(plan['packages'][0]['version'], '1.57.0')
+        self.assertEqual(plan['packages'][0]['dependencies'], ['git'])
+        self.assertEqual(plan['pip-packages'], [{'name': 'requests', 'version': '2.26.0'}])
+        self.assertEqual(plan['editor-extensions'], [{'name': 'ms-python.python', 'version': None}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from config_parser import ChecksumError, ConfigError, ConfigParser, ConfigSyntaxError, parse_file
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from corpus import generate_config, mutate  # noqa: E402
+
+
+def parse(content: bytes) -> ConfigParser:
+    parser = ConfigParser()
+    # Split the same way iterating over a file opened in binary mode does
+    for raw in io.BytesIO(content):
+        parser.feed(raw)
+    parser.close()
+    return parser
+
+
+class TestConfigParser(unittest.TestCase):
+
+    def test_sections(self):
+        parser = parse(
+            b'[ Info ]\n'
+            b'Publisher => "electric"\n'
+            b'Description => Development # inline comment\n'
+            b'\n'
+            b'[ Packages ]\n'
+            b'git\n'
+            b'nodejs => 14.0.0\n'
+            b'<electric:name>\n'
+        )
+        self.assertEqual(parser.sections, {
+            'Info': [{'Publisher': 'electric'}, {'Description': 'Development'}],
+            'Packages': [{'git': 'latest'}, {'nodejs': '14.0.0'}],
+        })
+        self.assertEqual(parser.tags, [('Packages', '<electric:name>', 8)])
+        self.assertFalse(parser.signed)
+
+    def test_errors_have_line_and_column(self):
+        with self.assertRaises(ConfigSyntaxError) as context:
+            parse(b'[ Info ]\nPublisher => electric\n  Description =>\n')
+        self.assertEqual(context.exception.name, 'ValueNotFoundError')
+        self.assertEqual((context.exception.line, context.exception.column), (3, 17))
+        self.assertEqual(context.exception.text, '  Description =>')
+
+        with self.assertRaises(ConfigSyntaxError) as context:
+            parse(b'[ Info ]\nPublisher\n')
+        self.assertEqual((context.exception.line, context.exception.column), (2, 1))
+
+        with self.assertRaises(ConfigSyntaxError) as context:
+            parse(b'[ Info\n')
+        self.assertEqual((context.exception.line, context.exception.column), (1, 7))
+
+        with self.assertRaises(ConfigSyntaxError) as context:
+            parse(b'git\n')
+        self.assertEqual(context.exception.name, 'SectionError')
+
+    def test_signature(self):
+        for newline in ['\n', '\r\n']:
+            content = generate_config(40, signed=True, newline=newline)
+            parser = parse(content)
+            self.assertTrue(parser.signed)
+            parser.verify()
+            self.assertEqual(sum(len(parser.sections[section]) for section in parser.sections), 43)
+
+            # Blank lines after the checksum are fine, anything else isn't
+            parse(content + newline.encode()).verify()
+            with self.assertRaises(ChecksumError) as context:
+                parse(content + b'\n# comment').verify()
+            self.assertEqual(context.exception.name, 'DataAfterChecksumError')
+
+            with self.assertRaises(ChecksumError) as context:
+                parse(content.replace(b'Benchmark', b'Tampered')).verify()
+            self.assertEqual(context.exception.name, 'ChecksumMismatchError')
+
+        with self.assertRaises(ChecksumError) as context:
+            parse(generate_config(4)).verify()
+        self.assertEqual(context.exception.name, 'ChecksumNotFoundError')
+
+    def test_unsigned_hash_covers_whole_file(self):
+        import hashlib
+
+        content = generate_config(10) + b'\n'
+        parser = parse(content)
+        self.assertEqual(parser.sha256.hexdigest(), hashlib.sha256(content).hexdigest())
+
+    def test_parse_file(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, 'large.electric')
+        with open(path, 'wb') as f:
+            f.write(generate_config(20000, signed=True))
+
+        parser = parse_file(path)
+        parser.verify()
+        self.assertEqual(len(parser.sections['Packages']), 5000)
+        self.assertEqual(parser.line, 20019)
+
+    def test_fuzz(self):
+        rng = random.Random(1)
+        base = generate_config(30, signed=True)
+        for _ in range(2000):
+            content = mutate(base, rng)
+            try:
+                parser = parse(content)
+                parser.verify()
+            except ConfigError as err:
+                lines = list(io.BytesIO(content))
+                if err.line is not None:
+                    self.assertTrue(1 <= err.line <= len(lines), err)
+                if err.column is not None:
+                    self.assertTrue(1 <= err.column <= len(err.text) + 1, err)
+
+
+if __name__ == "__main__":
+    unittest.main()
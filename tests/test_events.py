@@ -0,0 +1,47 @@
+import io
+import json
+import unittest
+import events
+from Classes.Metadata import Metadata
+from extension import write, write_debug
+
+
+class TestEvents(unittest.TestCase):
+
+    def setUp(self):
+        self.stream = io.StringIO()
+        events.enable(self.stream)
+
+    def tearDown(self):
+        events.stream = None
+        events.last_progress.clear()
+
+    def read(self) -> list:
+        return [json.loads(line) for line in self.stream.getvalue().splitlines()]
+
+    def test_writers_emit_messages(self):
+        metadata = Metadata(False, False, True, False, False, True, None, False, False, -1, None, False)
+        write('\x1b[92mSuccessfully Installed Atom\x1b[0m', 'bright_green', metadata)
+        write_debug('Running command', metadata)
+
+        messages = self.read()
+        self.assertEqual([(m['level'], m['text']) for m in messages],
+                         [('info', 'Successfully Installed Atom'), ('debug', 'Running command')])
+
+    def test_progress_is_rate_limited(self):
+        for downloaded in range(0, 1001, 10):
+            events.progress('atom', downloaded, 1000)
+
+        progress = self.read()
+        self.assertLess(len(progress), 5)
+        self.assertEqual(progress[-1]['downloaded'], 1000)
+        self.assertEqual(progress[0]['package'], 'atom')
+
+    def test_disabled_emits_nothing(self):
+        events.stream = None
+        events.emit('installed', 'atom')
+        self.assertEqual(self.stream.getvalue(), '')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import io
+import unittest
+from unittest import mock
+import external
+
+PIP_OUTPUT = '''Collecting requests==2.26.0
+  Downloading requests-2.26.0-py2.py3-none-any.whl (62 kB)
+Requirement already satisfied: PyYAML in c:\\python39\\lib\\site-packages (6.0)
+Collecting typing-extensions
+  Using cached typing_extensions-4.0.1-py3-none-any.whl (22 kB)
+Requirement already satisfied: idna<4,>=2.5 in c:\\python39\\lib\\site-packages (from requests==2.26.0) (3.3)
+Installing collected packages: typing-extensions, requests
+Successfully installed requests-2.26.0 typing_extensions-4.0.1
+'''
+
+
+class FakeProcess:
+    def __init__(self, output: str, returncode: int):
+        self.stdout = io.BytesIO(output.encode())
+        self.returncode = returncode
+
+    def wait(self):
+        return self.returncode
+
+
+class TestExternal(unittest.TestCase):
+
+    def parse(self, parse, output: str, names: list, canonical=str.lower) -> list:
+        requested = {canonical(name): name for name in names}
+        return [event for line in output.splitlines() for event in parse(line, requested)]
+
+    def test_pip_output(self):
+        events = self.parse(external.parse_pip_line, PIP_OUTPUT, ['requests', 'pyyaml', 'typing_extensions'], external.canonicalize)
+        self.assertEqual(events, [
+            ('requests', 'collecting', None),
+            ('requests', 'downloading', None),
+            ('pyyaml', 'satisfied', '6.0'),
+            ('typing_extensions', 'collecting', None),
+            ('typing_extensions', 'downloading', None),
+            ('requests', 'installed', '2.26.0'),
+            ('typing_extensions', 'installed', '4.0.1'),
+        ])
+
+        events = self.parse(external.parse_pip_line, 'ERROR: No matching distribution found for missing==1.0', ['missing'])
+        self.assertEqual(events[0][:2], ('missing', 'failed'))
+
+    def test_npm_output(self):
+        output = ("+ typescript@4.4.3\n+ @angular/cli@12.2.0\n"
+                  "npm ERR! 404  'missing-package@latest' is not in this registry.\n")
+        events = self.parse(external.parse_npm_line, output, ['typescript', '@angular/cli', 'missing-package'])
+        self.assertEqual([event[:2] for event in events],
+                         [('typescript', 'installed'), ('@angular/cli', 'installed'), ('missing-package', 'failed')])
+        self.assertEqual(events[1][2], '12.2.0')
+
+    def test_code_output(self):
+        output = ("Installing extensions...\n"
+                  "Extension 'ms-python.python' v2021.10.0 was successfully installed.\n"
+                  "Extension 'esbenp.prettier-vscode' v9.0.0 is already installed.\n"
+                  "Extension 'missing.extension' not found.\n")
+        events = self.parse(external.parse_code_line, output, ['MS-Python.python', 'esbenp.prettier-vscode', 'missing.extension'])
+        self.assertEqual([event[:2] for event in events],
+                         [('MS-Python.python', 'installed'), ('esbenp.prettier-vscode', 'satisfied'), ('missing.extension', 'failed')])
+
+    def test_apm_output(self):
+        output = 'Installing minimap@4.39.14 to C:\\Users\\electric\\.atom\\packages done\nInstalling missing to C:\\Users\\electric\\.atom\\packages failed\n'
+        events = self.parse(external.parse_apm_line, output, ['minimap', 'missing'])
+        self.assertEqual([event[:2] for event in events], [('minimap', 'installed'), ('missing', 'failed')])
+
+    def test_batch_retries_without_failed_packages(self):
+        outputs = [
+            FakeProcess('Collecting requests\nCollecting missing\nERROR: No matching distribution found for missing\n', 1),
+            FakeProcess('Collecting requests\nSuccessfully installed requests-2.26.0\n', 0),
+        ]
+        commands = []
+
+        def popen(command, **_):
+            commands.append(command)
+            return outputs.pop(0)
+
+        reported = []
+        with mock.patch('external.Popen', side_effect=popen):
+            results = external.run_batch(lambda remaining: [name for name, _ in remaining], [('requests', None), ('missing', None)],
+                                         external.parse_pip_line, lambda *event: reported.append(event[:2]), external.canonicalize)
+
+        self.assertEqual(commands, [['requests', 'missing'], ['requests']])
+        self.assertEqual(results['requests'], ('installed', '2.26.0'))
+        self.assertEqual(results['missing'][0], 'failed')
+        # A status is only reported when it changes
+        self.assertEqual(reported.count(('requests', 'collecting')), 1)
+
+    def test_batch_failure_without_culprit(self):
+        with mock.patch('external.Popen', return_value=FakeProcess('Collecting requests\n', 2)):
+            results = external.run_batch(lambda remaining: [], [('requests', None)], external.parse_pip_line, lambda *_: None)
+        self.assertEqual(results['requests'], ('failed', 'Exited With Code 2'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import hooks
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from Classes.Packet import Packet
+from hooks import HookError, HookRunner, get_placeholders, substitute
+from types import SimpleNamespace
+from unittest import mock
+
+
+def get_packet(raw: dict, directory: str = None) -> Packet:
+    return Packet(raw, 'ffmpeg', 'FFmpeg', None, '.exe', None, [], [], directory, None, None, None, '4.4',
+                  None, None, None, None, None, None, None, None)
+
+
+class TestHooks(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.metadata = SimpleNamespace(logfile=None)
+        self.order = os.path.join(self.directory, 'order.txt')
+
+    def get_hook(self, name: str, **kwargs) -> dict:
+        return {'type': 'python', 'code': [f"open(r'<directory>' + '/order.txt', 'a').write('{name}\\n')"], **kwargs}
+
+    def read_order(self) -> list:
+        if not os.path.isfile(self.order):
+            return []
+        with open(self.order) as f:
+            return f.read().split()
+
+    def test_substitutes_placeholders(self):
+        placeholders = get_placeholders(get_packet({}, self.directory), r'C:\Temp\ffmpeg.exe')
+        self.assertEqual(substitute(['<installer> /D=<directory>', 'echo <display-name> <version>', '<package-name>'],
+                                    placeholders),
+                         [rf'C:\Temp\ffmpeg.exe /D={self.directory}', 'echo FFmpeg 4.4', 'ffmpeg'])
+        self.assertEqual(get_placeholders(get_packet({}))['<directory>'], '')
+        self.assertEqual(placeholders['<temp>'], tempfile.gettempdir())
+
+    def test_runs_stage_in_order(self):
+        packet = get_packet({
+            'pre-install': [self.get_hook('first'), {'type': 'powershell', 'code': ['Write-Host <version>']},
+                            self.get_hook('second')],
+            'post-install': [self.get_hook('post')],
+        }, self.directory)
+        host = mock.Mock()
+        host.run.return_value = 0
+
+        with mock.patch.object(hooks, 'get_powershell_host', return_value=host):
+            self.assertEqual(HookRunner(packet, self.metadata).run('pre-install'), [0, 0, 0])
+        self.assertEqual(self.read_order(), ['first', 'second'])
+        host.run.assert_called_once_with(['Write-Host 4.4'])
+
+        self.assertEqual(HookRunner(packet, self.metadata).run('post-install'), [0])
+        self.assertEqual(self.read_order(), ['first', 'second', 'post'])
+        self.assertEqual(HookRunner(packet, self.metadata).run('pre-uninstall'), [])
+
+    def test_shares_powershell_host(self):
+        hook = {'type': 'ps1', 'code': ['exit 0']}
+        first = get_packet({'pre-install': [hook]}, self.directory)
+        second = get_packet({'pre-install': [hook, hook]}, self.directory)
+        host = mock.Mock()
+        host.run.return_value = 0
+
+        with mock.patch.object(hooks, 'get_powershell_host', return_value=host):
+            HookRunner(first, self.metadata).run('pre-install')
+            HookRunner(second, self.metadata).run('pre-install')
+        self.assertEqual(host.run.call_count, 3)
+
+    def test_admin_hooks_need_elevation(self):
+        packet = get_packet({'pre-install': [self.get_hook('first'), self.get_hook('admin', admin=True),
+                                             self.get_hook('after')]}, self.directory)
+
+        with mock.patch.dict(sys.modules, {'utils': SimpleNamespace(is_admin=lambda: False)}):
+            with self.assertRaises(HookError):
+                HookRunner(packet, self.metadata).run('pre-install')
+        self.assertEqual(self.read_order(), ['first'])
+
+        with mock.patch.dict(sys.modules, {'utils': SimpleNamespace(is_admin=lambda: True)}):
+            self.assertEqual(HookRunner(packet, self.metadata).run('pre-install'), [0, 0, 0])
+        self.assertEqual(self.read_order(), ['first', 'first', 'admin', 'after'])
+
+
+if __name__ == "__main__":
+    unittest.main()
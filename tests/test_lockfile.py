@@ -0,0 +1,75 @@
+import os
+import shutil
+import tempfile
+import unittest
+import lockfile
+from unittest import mock
+
+
+class FakeConfig:
+    def __init__(self, dictionary):
+        self.dictionary = dictionary
+
+
+def entry(name: str, dependencies: list = None) -> dict:
+    return {'name': name, 'version': '1.0.0', 'dependencies': dependencies or []}
+
+
+class TestLockfile(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.config = os.path.join(self.directory, 'dev.electric')
+        with open(self.config, 'w') as f:
+            f.write('[ Packages ]\ngit\n')
+
+    def test_entries(self):
+        config = FakeConfig({'Packages': [{'git': 'latest'}, {'nodejs': '14.0.0'}, {'': 'latest'}]})
+        self.assertEqual(lockfile.get_entries(config, 'Packages'), [('git', None), ('nodejs', '14.0.0')])
+        self.assertEqual(lockfile.get_entries(config, 'Pip-Packages'), [])
+
+    def test_install_order(self):
+        batches = lockfile.get_install_order([
+            entry('atom', ['git']), entry('git', ['vcredist']), entry('vcredist'), entry('nodejs'),
+        ])
+        self.assertEqual([sorted(e['name'] for e in batch) for batch in batches],
+                         [['nodejs', 'vcredist'], ['git'], ['atom']])
+
+    def test_cycle_is_installed_together(self):
+        batches = lockfile.get_install_order([entry('a', ['b']), entry('b', ['a'])])
+        self.assertEqual(len(batches), 1)
+
+    def test_merge_path(self):
+        local = os.pathsep.join([os.path.join('tools', 'local'), os.path.join('usr', 'bin')])
+        values = [os.pathsep.join([os.path.join('$ELECTRIC_ROOT', 'system32'), os.path.join('usr', 'bin') + os.sep]),
+                  os.path.join('python', 'Scripts')]
+        with mock.patch.dict(os.environ, {'ELECTRIC_ROOT': 'root'}):
+            merged = lockfile.merge_path(local, values)
+        # Entries only this process had are kept, registry entries are expanded and only added once
+        self.assertEqual(merged.split(os.pathsep), [os.path.join('tools', 'local'), os.path.join('usr', 'bin'),
+                                                    os.path.join('root', 'system32'), os.path.join('python', 'Scripts')])
+
+    def test_stale_lockfile(self):
+        path = lockfile.get_lockfile_path(self.config)
+        self.assertEqual(path, self.config + '.lock')
+
+        lockfile.write_lockfile({
+            'lockfile-version': lockfile.FORMAT,
+            'config-sha256': lockfile.hash_file(self.config),
+            'packages': [],
+        }, path)
+        self.assertEqual(lockfile.read_lockfile(path, self.config)['packages'], [])
+
+        with open(self.config, 'a') as f:
+            f.write('nodejs\n')
+        with self.assertRaises(lockfile.LockError):
+            lockfile.read_lockfile(path, self.config)
+
+    def test_missing_lockfile(self):
+        with self.assertRaises(lockfile.LockError):
+            lockfile.read_lockfile(os.path.join(self.directory, 'missing.lock'))
+
+
+if __name__ == "__main__":
+    unittest.main()
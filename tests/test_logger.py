@@ -0,0 +1,58 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from logger import LogWriter
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+WRITER = "import sys\nfrom logger import LogWriter\nwriter = LogWriter()\nfor i in range(500):\n    writer.write(sys.argv[1], f'{sys.argv[2]}:{i}:' + 'x' * 200 + '\\n')\nwriter.close()\n"
+
+
+class TestLogWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'electric-log.log')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_writes_in_order(self):
+        writer = LogWriter()
+        for i in range(1000):
+            writer.write(self.path, f'INFO:root:{i}\n')
+        writer.flush()
+
+        with open(self.path) as f:
+            self.assertEqual(f.read().splitlines(), [f'INFO:root:{i}' for i in range(1000)])
+        writer.close()
+
+    def test_rotates_by_size(self):
+        writer = LogWriter([self.path], max_bytes=100, backups=2)
+        for i in range(3):
+            writer.write(self.path, 'x' * 80 + '\n')
+            writer.flush()
+        writer.close()
+
+        self.assertTrue(os.path.isfile(self.path + '.1'))
+        self.assertTrue(os.path.isfile(self.path + '.2'))
+        self.assertFalse(os.path.isfile(self.path + '.3'))
+
+    def test_processes_never_interleave(self):
+        procs = [subprocess.Popen([sys.executable, '-c', WRITER, self.path, str(n)], cwd=SRC,
+                                  env=dict(os.environ, PYTHONPATH=SRC, APPDATA=self.directory)) for n in range(4)]
+        for proc in procs:
+            self.assertEqual(proc.wait(), 0)
+
+        with open(self.path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2000)
+        for line in lines:
+            self.assertRegex(line, r'^\d:\d+:x{200}$')
+
+
+if __name__ == "__main__":
+    unittest.main()
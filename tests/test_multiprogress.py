@@ -0,0 +1,44 @@
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from multiprogress import ProgressRenderer
+
+
+class TestProgressRenderer(unittest.TestCase):
+
+    def test_render_lanes(self):
+        renderer = ProgressRenderer(enabled=False)
+        git = renderer.add('Git', 1000000)
+        node = renderer.add('Node.js', 4000000)
+        git.downloaded = 500000
+        renderer.render(now=0)
+        node.downloaded = 2000000
+        node.done = True
+
+        lines = renderer.render(now=1)
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('Git'))
+        self.assertIn(' 50 %', lines[0])
+        self.assertIn('1/2 Downloaded', lines[1])
+        self.assertIn('2.0 MB/s', lines[1])
+
+    def test_concurrent_downloads(self):
+        stream = io.StringIO()
+        renderer = ProgressRenderer(stream=stream, interval=0.001)
+
+        def download(index):
+            lane = renderer.add(f'Package {index}', 100000)
+            for _ in range(100):
+                lane.downloaded += 1000
+            lane.done = True
+
+        with renderer:
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(download, range(32)))
+
+        self.assertIn('32/32 Downloaded', stream.getvalue().split('\x1b[K')[-1])
+        self.assertIn('32/32 Downloaded  3.2 / 3.2 MB', renderer.render()[-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from object_store import ObjectStore
+from state import StateStore
+
+
+def make_zip(path: str, files: dict) -> str:
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return path
+
+
+def read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+class TestObjectStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.state = StateStore(os.path.join(self.directory, 'state.db'))
+        self.addCleanup(self.state.close)
+        self.store = ObjectStore(os.path.join(self.directory, '.store'), self.state)
+
+        self.v1 = {'app/app.exe': b'exe' * 1000, 'app/lib/core.dll': b'core' * 1000, 'app/data/settings.ini': b'[app]'}
+        self.v2 = {**self.v1, 'app/app.exe': b'exe 2' * 1000}
+
+    def extract(self, files: dict, version: str, exclude: list = None) -> tuple:
+        destination = os.path.join(self.directory, f'app@{version}')
+        with zipfile.ZipFile(make_zip(destination + '.zip', files)) as zf:
+            return destination, self.store.extract_zip(zf, destination, 'app', version, exclude)
+
+    def test_unchanged_files_are_linked(self):
+        first, stats = self.extract(self.v1, '1.0.0', exclude=['app/data'])
+        self.assertEqual(stats, {'written': 3, 'linked': 0, 'copied': 0})
+        second, stats = self.extract(self.v2, '2.0.0', exclude=['app/data'])
+        self.assertEqual(stats, {'written': 2, 'linked': 1, 'copied': 0})
+
+        for name, content in self.v2.items():
+            self.assertEqual(read(os.path.join(second, name)), content)
+        core = os.path.join('app', 'lib', 'core.dll')
+        self.assertTrue(os.path.samefile(os.path.join(first, core), os.path.join(second, core)))
+        # Persisted paths stay plain files
+        self.assertEqual(os.stat(os.path.join(second, 'app', 'data', 'settings.ini')).st_nlink, 1)
+
+    def test_release_collects_unused_objects(self):
+        first, _ = self.extract(self.v1, '1.0.0')
+        self.extract(self.v2, '2.0.0')
+
+        self.store.release('app', '1.0.0')
+        objects, freed = self.store.collect()
+        self.assertEqual((objects, freed), (1, len(self.v1['app/app.exe'])))
+        self.assertEqual(self.store.collect(), (0, 0))
+
+        self.store.release('app', '2.0.0')
+        self.assertEqual(self.store.collect()[0], 3)
+        self.assertEqual([names for _, _, names in os.walk(self.store.objects) if names], [])
+
+    def test_modified_object_is_not_reused(self):
+        first, _ = self.extract(self.v1, '1.0.0')
+        with open(os.path.join(first, 'app', 'lib', 'core.dll'), 'ab') as f:
+            f.write(b'patched')
+
+        second, stats = self.extract(self.v1, '2.0.0')
+        self.assertEqual(stats['linked'], 2)
+        self.assertEqual(read(os.path.join(second, 'app', 'lib', 'core.dll')), self.v1['app/lib/core.dll'])
+
+    def test_import_tree(self):
+        first, _ = self.extract(self.v1, '1.0.0')
+
+        extracted = os.path.join(self.directory, 'app@2.0.0')
+        for name, content in self.v2.items():
+            path = os.path.join(extracted, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(content)
+
+        stats = self.store.import_tree(extracted, 'app', '2.0.0')
+        self.assertEqual(stats, {'written': 1, 'linked': 2, 'copied': 0})
+        core = os.path.join('app', 'lib', 'core.dll')
+        self.assertTrue(os.path.samefile(os.path.join(first, core), os.path.join(extracted, core)))
+
+        # Zip members are matched against imported files by their crc32
+        _, stats = self.extract(self.v2, '3.0.0')
+        self.assertEqual(stats['written'], 0)
+
+    def test_find_installed_member(self):
+        first, _ = self.extract(self.v1, '1.0.0')
+        with zipfile.ZipFile(make_zip(os.path.join(self.directory, 'v2.zip'), self.v2)) as zf:
+            core = zf.getinfo('app/lib/core.dll')
+            hash = self.store.find_installed_member('app', os.path.join('app', 'lib', 'core.dll'), core)
+            self.assertIsNotNone(hash)
+            # Only a file kept at the same path of the same package is trusted without reading the member
+            self.assertIsNone(self.store.find_installed_member('app', os.path.join('app', 'core.dll'), core))
+            self.assertIsNone(self.store.find_installed_member('other', os.path.join('app', 'lib', 'core.dll'), core))
+            self.assertIsNone(self.store.find_installed_member('app', os.path.join('app', 'app.exe'), zf.getinfo('app/app.exe')))
+
+        # Files linked before the tree is imported aren't read again
+        extracted = os.path.join(self.directory, 'app@2.0.0')
+        os.makedirs(os.path.join(extracted, 'app', 'lib'))
+        self.store.link(hash, os.path.join(extracted, 'app', 'lib', 'core.dll'))
+        stats = self.store.import_tree(extracted, 'app', '2.0.0', linked={os.path.join('app', 'lib', 'core.dll'): hash})
+        self.assertEqual(stats, {'written': 0, 'linked': 1, 'copied': 0})
+        self.store.release('app', '1.0.0')
+        self.store.collect()
+        self.assertEqual(read(os.path.join(extracted, 'app', 'lib', 'core.dll')), self.v1['app/lib/core.dll'])
+
+
+if __name__ == "__main__":
+    unittest.main()
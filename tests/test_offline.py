@@ -0,0 +1,100 @@
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+import offline
+from types import SimpleNamespace
+from unittest import mock
+
+
+def manifest(name: str, version: str, data: bytes, dependencies: list = None) -> dict:
+    return {
+        'package-name': name,
+        'display-name': name.title(),
+        'latest-version': version,
+        '0.9.0': {'url': f'https://example.com/{name}-0.9.0.exe', 'file-type': '.exe'},
+        version: {
+            'url': f'https://example.com/{name}.exe',
+            'file-type': '.exe',
+            'dependencies': dependencies,
+            'checksum': hashlib.sha256(data).hexdigest().upper(),
+        },
+    }
+
+
+def chunks(data: bytes) -> list:
+    return [data[i:i + 65536] for i in range(0, len(data), 65536)]
+
+
+class TestOffline(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = os.path.join(self.directory, 'dev.ebundle')
+        self.installers = {'git': os.urandom(300000), 'nodejs': os.urandom(1000)}
+
+    def tearDown(self):
+        if offline.bundle:
+            offline.bundle.close()
+        offline.bundle = None
+
+    def write(self):
+        # Installers arrive in chunks like a streamed download
+        entries = [
+            (manifest(name, '1.0.0', data), '1.0.0', chunks(data))
+            for name, data in self.installers.items()
+        ]
+        return offline.write_bundle(self.path, 'dev', entries, ['git'])
+
+    def test_round_trip(self):
+        index = self.write()
+        self.assertEqual(index['packages']['git']['size'], 300000)
+
+        bundle = offline.load(self.path)
+        self.assertEqual(bundle.packages, ['git'])
+        self.assertIsNone(bundle.get_manifest('atom'))
+
+        # Only the bundled version is kept so installs resolve to the bundled installer
+        git = bundle.get_manifest('git')
+        self.assertEqual(git['latest-version'], '1.0.0')
+        self.assertNotIn('0.9.0', git)
+
+        path = bundle.extract_installer('nodejs', os.path.join(self.directory, 'nodejs.exe'))
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), self.installers['nodejs'])
+
+    def test_installers_are_stored(self):
+        self.write()
+        with zipfile.ZipFile(self.path) as archive:
+            info = archive.getinfo('installers/git@1.0.0.exe')
+            self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+
+    def test_checksum_mismatch(self):
+        data = self.installers['git']
+        entries = [(manifest('git', '1.0.0', b'other'), '1.0.0', [data])]
+        with self.assertRaises(offline.BundleError):
+            offline.write_bundle(self.path, 'dev', entries, ['git'])
+
+    def test_invalid_bundle(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'not a zip')
+        with self.assertRaises(offline.BundleError):
+            offline.OfflineBundle(self.path)
+
+    def test_portable_packages_are_not_resolved(self):
+        manifests = {
+            'git': manifest('git', '1.0.0', b'git', ['ffmpeg']),
+            'ffmpeg': {'package-name': 'ffmpeg', 'display-name': 'FFmpeg', 'portable': {'latest-version': '4.4'}},
+        }
+        with mock.patch.dict(sys.modules, {'utils': SimpleNamespace(send_req_package=manifests.get)}):
+            with self.assertRaises(offline.BundleError):
+                offline.resolve(['git'])
+            self.assertEqual([version for _, version in offline.resolve(['git'], {'git': '0.9.0'})], ['0.9.0'])
+
+
+if __name__ == "__main__":
+    unittest.main()
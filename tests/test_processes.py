@@ -0,0 +1,50 @@
+import os
+import unittest
+import processes
+from processes import ProcBackend, StaticBackend
+
+
+class TestProcesses(unittest.TestCase):
+
+    def setUp(self):
+        processes.set_backend(StaticBackend([
+            (4, 'System'),
+            (1200, 'explorer.exe'),
+            (3400, 'sublime_text.exe'),
+            (5120, 'Setup.tmp'),
+            (6000, 'powershell.exe'),
+            (6001, 'cmd.exe'),
+        ]))
+
+    def tearDown(self):
+        processes.set_backend(None)
+
+    def test_get_pid(self):
+        snapshot = processes.get_snapshot()
+        self.assertEqual(snapshot.get_pid('Explorer.exe'), 1200)
+        self.assertEqual(snapshot.get_pid('Setup'), 5120)
+        self.assertIsNone(snapshot.get_pid('notepad.exe'))
+
+    def test_find_approx_pid(self):
+        snapshot = processes.get_snapshot()
+        self.assertEqual(snapshot.find_approx_pid('Sublime Text'), 3400)
+        self.assertIsNone(snapshot.find_approx_pid('Visual Studio Code'))
+
+    def test_snapshot_is_reused(self):
+        snapshot = processes.get_snapshot()
+        processes.get_backend().entries.append((7000, 'notepad.exe'))
+        self.assertIs(processes.get_snapshot(), snapshot)
+        self.assertEqual(processes.get_snapshot(refresh=True).get_pid('notepad.exe'), 7000)
+
+    def test_count(self):
+        self.assertEqual(processes.get_snapshot().count('powershell.exe', 'cmd.exe'), 2)
+
+    @unittest.skipUnless(os.path.isdir('/proc/self'), 'procfs is not available')
+    def test_proc_backend(self):
+        processes.set_backend(ProcBackend())
+        pids = [pid for pid, _ in processes.get_snapshot().processes]
+        self.assertIn(os.getpid(), pids)
+
+
+if __name__ == "__main__":
+    unittest.main()
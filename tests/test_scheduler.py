@@ -0,0 +1,51 @@
+import threading
+import time
+import unittest
+from Classes.InstallScheduler import InstallScheduler
+
+
+class FakeInstall:
+    def __init__(self, json_name, download_type, conflicts=None, timeout=None):
+        self.json_name = json_name
+        self.display_name = json_name
+        self.download_type = download_type
+        self.conflicts = conflicts or []
+        self.timeout = timeout
+
+
+class TestInstallScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.lock = threading.Lock()
+        self.intervals = {}
+
+    def runner(self, install, timeout):
+        start = time.monotonic()
+        time.sleep(0.1)
+        with self.lock:
+            self.intervals[install.json_name] = (start, time.monotonic())
+        return timeout
+
+    def overlap(self, first, second):
+        a, b = self.intervals[first], self.intervals[second]
+        return a[0] < b[1] and b[0] < a[1]
+
+    def test_msi_installers_hold_the_mutex(self):
+        installs = [FakeInstall('a', '.msi'), FakeInstall('b', '.msi'), FakeInstall('c', '.exe')]
+        InstallScheduler(self.runner, max_workers=3).run(installs)
+        self.assertFalse(self.overlap('a', 'b'))
+        self.assertTrue(self.overlap('a', 'c'))
+
+    def test_conflicting_installers_never_overlap(self):
+        installs = [FakeInstall('vscode', '.exe', ['vscode-insiders']), FakeInstall('vscode-insiders', '.exe')]
+        InstallScheduler(self.runner, max_workers=2).run(installs)
+        self.assertFalse(self.overlap('vscode', 'vscode-insiders'))
+
+    def test_results_and_timeouts(self):
+        installs = [FakeInstall('a', '.exe', timeout=5), FakeInstall('b', '.exe')]
+        results = InstallScheduler(self.runner, max_workers=2, timeout=60).run(installs)
+        self.assertEqual(results, {'a': 5, 'b': 60})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from script_host import ScriptHost
+
+
+# Stand-in for the PowerShell host loop, speaks the same framing but runs Python
+STAND_IN = r'''
+import contextlib, io, re, sys
+while True:
+    line = sys.stdin.readline()
+    if not line:
+        break
+    match = re.match(r'^<<<electric:begin (\S+)>>>$', line.rstrip('\n'))
+    if not match:
+        continue
+    step = match.group(1)
+    lines = []
+    while True:
+        line = sys.stdin.readline()
+        if not line or line.rstrip('\n') == f'<<<electric:end {step}>>>':
+            break
+        lines.append(line)
+    code = 0
+    try:
+        exec(''.join(lines), {})
+    except SystemExit as err:
+        code = err.code or 0
+    except Exception as err:
+        print(err)
+        code = 1
+    print(f'<<<electric:exit {step} {code}>>>', flush=True)
+'''
+
+
+class TestScriptHost(unittest.TestCase):
+
+    def setUp(self):
+        descriptor, self.path = tempfile.mkstemp(suffix='.py')
+        with os.fdopen(descriptor, 'w') as f:
+            f.write(STAND_IN)
+        self.host = ScriptHost([sys.executable, '-u', self.path])
+
+    def tearDown(self):
+        self.host.close()
+        os.remove(self.path)
+
+    def test_output_and_exit_codes(self):
+        output = io.StringIO()
+        self.assertEqual(self.host.run(['print("hello")'], output), 0)
+        self.assertEqual(output.getvalue(), 'hello\n')
+        self.assertEqual(self.host.run(['raise SystemExit(3)'], output), 3)
+
+    def test_host_is_reused(self):
+        output = io.StringIO()
+        self.host.run(['pass'], output)
+        pid = self.host.proc.pid
+        self.host.run(['pass'], output)
+        self.assertEqual(self.host.proc.pid, pid)
+
+    def test_steps_do_not_share_scope(self):
+        output = io.StringIO()
+        self.host.run(['value = 1'], output)
+        self.assertEqual(self.host.run(['print(value)'], output), 1)
+
+    def test_output_resembling_a_frame(self):
+        output = io.StringIO()
+        code = self.host.run(['print("<<<electric:exit abc 5>>>")'], output)
+        self.assertEqual(code, 0)
+        self.assertIn('<<<electric:exit abc 5>>>', output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
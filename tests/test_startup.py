@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import unittest
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Budget for the modules `electric --help` imports on top of a bare interpreter
+IMPORT_BUDGET_MS = 150
+
+HELP = "import sys, electric; sys.argv = ['electric', '--help']\ntry:\n    electric.cli()\nexcept SystemExit:\n    pass\n"
+
+
+def run_python(code: str, *flags) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *flags, '-c', code], cwd=SRC, capture_output=True, text=True,
+                          env=dict(os.environ, PYTHONPATH=SRC))
+
+
+def imported_modules(stderr: str) -> dict:
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_time, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_time)
+    return modules
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_help_does_not_import_commands(self):
+        proc = run_python(HELP + "print(' '.join(sorted(sys.modules)))")
+        modules = proc.stdout.split()
+        for heavy in ['utils', 'requests', 'halo', 'keyboard', 'Classes.ThreadedInstaller', 'commands.install']:
+            self.assertNotIn(heavy, modules)
+
+    def test_help_import_budget(self):
+        baseline = imported_modules(run_python('pass', '-X', 'importtime').stderr)
+        modules = imported_modules(run_python(HELP, '-X', 'importtime').stderr)
+        spent = sum(us for name, us in modules.items() if name not in baseline) / 1000
+        self.assertLess(spent, IMPORT_BUDGET_MS,
+                        msg=f'electric --help spent {spent:.1f}ms importing modules')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import multiprocessing
+import os
+import shutil
+import state
+import tempfile
+import unittest
+from state import StateStore, migrations
+from unittest import mock
+
+
+def open_store(path: str):
+    StateStore(path).close()
+
+
+class TestStateStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'state.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_migrates_legacy_timestamps(self):
+        with open(os.path.join(self.directory, 'superlog.txt'), 'w') as f:
+            f.write('2021 3 14')
+
+        store = StateStore(self.path)
+        self.assertTrue(store.created)
+        self.assertEqual(store.version, len(migrations))
+        self.assertEqual(store.get('last-refresh'), '2021-03-14')
+        self.assertFalse(os.path.isfile(os.path.join(self.directory, 'superlog.txt')))
+        store.close()
+
+    def test_values_persist(self):
+        store = StateStore(self.path)
+        self.assertIsNone(store.days_since('last-refresh'))
+        store.touch('last-refresh')
+        store.set('flags', ['--yes'])
+        store.close()
+
+        store = StateStore(self.path)
+        self.assertFalse(store.created)
+        self.assertEqual(store.days_since('last-refresh'), 0)
+        self.assertEqual(store.get('flags'), ['--yes'])
+        store.close()
+
+    def test_migrates_json_receipts(self):
+        os.makedirs(os.path.join(self.directory, 'Current'))
+        with open(os.path.join(self.directory, 'Current', 'sublime-text-3@3.2.2.json'), 'w') as f:
+            json.dump({'display-name': 'Sublime Text 3', 'json-name': 'sublime-text-3', 'version': '3.2.2',
+                       'custom-location-switch': None, 'custom-install-directory': '', 'flags': ['--yes']}, f)
+
+        store = StateStore(self.path)
+        receipt = store.get_receipt('sublime-text-3')
+        self.assertEqual(receipt['version'], '3.2.2')
+        self.assertEqual(receipt['flags'], ['--yes'])
+        self.assertEqual(os.listdir(os.path.join(self.directory, 'Current')), [])
+        store.close()
+
+    def test_receipts(self):
+        store = StateStore(self.path)
+        store.add_receipt('git', '2.30.0', 'Git', registry_key='Git_is1')
+        store.add_receipt('nodejs', '15.5.1', 'Node.js', install_dir=r'D:\node')
+        self.assertTrue(store.is_installed('git'))
+        self.assertEqual(store.get_receipt('git')['registry-key'], 'Git_is1')
+        self.assertIsNone(store.get_receipt('git', '2.29.0'))
+        self.assertEqual([r['json-name'] for r in store.get_receipts()], ['git', 'nodejs'])
+
+        store.remove_receipt('git', '2.30.0')
+        self.assertFalse(store.is_installed('git'))
+        self.assertEqual(store.get_receipt('nodejs')['custom-install-directory'], r'D:\node')
+        store.close()
+
+    def test_failed_migration_is_rolled_back(self):
+        def fail(connection, directory):
+            connection.execute('CREATE TABLE IF NOT EXISTS partial (name TEXT)')
+            raise OSError('Disk full')
+
+        with mock.patch.object(state, 'migrations', migrations[:2] + [fail]):
+            with self.assertRaises(OSError):
+                StateStore(self.path)
+
+        store = StateStore(self.path)
+        self.assertEqual(store.version, len(migrations))
+        self.assertIsNone(store.connection.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'partial'").fetchone())
+        store.close()
+
+    def test_failed_migration_keeps_legacy_receipts(self):
+        os.makedirs(os.path.join(self.directory, 'Current'))
+        receipt = os.path.join(self.directory, 'Current', 'git@2.30.0.json')
+        with open(receipt, 'w') as f:
+            json.dump({'display-name': 'Git', 'version': '2.30.0'}, f)
+
+        def fail(connection, directory):
+            migrations[1](connection, directory)
+            raise OSError('Disk full')
+
+        with mock.patch.object(state, 'migrations', [migrations[0], fail]):
+            with self.assertRaises(OSError):
+                StateStore(self.path)
+        self.assertTrue(os.path.isfile(receipt))
+
+        store = StateStore(self.path)
+        self.assertEqual(store.get_receipt('git')['version'], '2.30.0')
+        self.assertFalse(os.path.isfile(receipt))
+        store.close()
+
+    def test_concurrent_first_open(self):
+        processes = [multiprocessing.Process(target=open_store, args=(self.path,)) for _ in range(6)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        self.assertEqual([process.exitcode for process in processes], [0] * 6)
+
+        store = StateStore(self.path)
+        self.assertEqual(store.version, len(migrations))
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
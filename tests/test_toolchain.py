@@ -0,0 +1,82 @@
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import state
+import toolchain
+from state import StateStore
+
+
+@unittest.skipIf(sys.platform == 'win32', 'Fake executables are shell scripts')
+class TestToolchain(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.store = StateStore(os.path.join(self.directory, 'state.db'))
+        self.addCleanup(self.store.close)
+        for patcher in [mock.patch.object(state, 'state', self.store), mock.patch.dict(toolchain.tools, clear=True)]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.bin = os.path.join(self.directory, 'bin')
+        os.makedirs(self.bin)
+        self.pip = self.executable('pip', 'echo "pip 21.2.4 from /usr/lib/python3/site-packages/pip (python 3.9)"')
+        patcher = mock.patch.dict(os.environ, {'PATH': self.bin})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        patcher = mock.patch('toolchain.read_version', side_effect=toolchain.read_version)
+        self.read_version = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def executable(self, name: str, script: str) -> str:
+        path = os.path.join(self.bin, name)
+        with open(path, 'w') as f:
+            f.write(f'#!/bin/sh\n{script}\n')
+        os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+        return path
+
+    def test_version_is_read_once(self):
+        tool = toolchain.find('pip')
+        self.assertEqual((tool.path, tool.version), (self.pip, '21.2.4'))
+        self.assertIs(toolchain.find('pip'), tool)
+
+        # A new session reuses the version stored by the last one
+        toolchain.tools.clear()
+        self.assertEqual(toolchain.find('pip').version, '21.2.4')
+        self.assertEqual(self.read_version.call_count, 1)
+
+    def test_changed_executable_is_read_again(self):
+        toolchain.find('pip')
+        toolchain.tools.clear()
+
+        self.executable('pip', 'echo "pip 22.0.0 from /usr/lib/python3/site-packages/pip (python 3.10)"')
+        os.utime(self.pip, (1, 1))
+        self.assertEqual(toolchain.find('pip').version, '22.0.0')
+        self.assertEqual(self.read_version.call_count, 2)
+
+    def test_path_change(self):
+        self.assertIsNone(toolchain.find('code'))
+        self.assertEqual(self.read_version.call_count, 0)
+
+        insiders = os.path.join(self.directory, 'insiders')
+        os.makedirs(insiders)
+        self.bin = insiders
+        self.executable('code-insiders', 'echo 1.61.0-insider; echo 0123abc; echo x64')
+        os.environ['PATH'] = os.pathsep.join([self.directory, insiders])
+
+        tool = toolchain.find_any('code', 'code-insiders')
+        self.assertEqual((tool.name, tool.version), ('code-insiders', '1.61.0'))
+
+    def test_broken_executable(self):
+        self.executable('npm', 'exit 1')
+        self.assertIsNone(toolchain.find('npm'))
+        self.assertIsNone(self.store.get_tool('npm'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import tracing
+
+
+class TestTracing(unittest.TestCase):
+
+    def tearDown(self):
+        tracing.tracer = None
+
+    def test_disabled_spans_are_free(self):
+        self.assertIs(tracing.span('download'), tracing.NULL_SPAN)
+        tracing.record(bytes=10)
+
+        @tracing.traced('checksum')
+        def verify():
+            return True
+
+        self.assertTrue(verify())
+
+    def test_records_outcome_and_bytes(self):
+        tracer = tracing.enable()
+        with tracing.span('download', track='git'):
+            tracing.record(bytes=1000)
+            tracing.record(bytes=500)
+
+        with self.assertRaises(ValueError):
+            with tracing.span('installer', track='git'):
+                raise ValueError
+
+        rows = {row[0]: row for row in tracer.summary()}
+        self.assertEqual(rows['download'][4], 1500)
+        self.assertEqual(rows['download'][5], 0)
+        self.assertEqual(rows['installer'][5], 1)
+
+    def test_concurrent_tracks(self):
+        tracer = tracing.enable()
+
+        @tracing.traced('installer')
+        def install():
+            with tracing.span('post-install'):
+                pass
+
+        def run(package):
+            tracing.set_track(package)
+            install()
+
+        with ThreadPoolExecutor(4) as pool:
+            list(pool.map(run, ['git', 'nodejs', 'atom', 'python']))
+
+        events = tracer.chrome_trace()['traceEvents']
+        tracks = {event['args']['name']: event['tid'] for event in events if event['ph'] == 'M'}
+        self.assertEqual(sorted(tracks), ['atom', 'git', 'nodejs', 'python'])
+        for event in events:
+            if event['ph'] == 'X':
+                self.assertIn(event['tid'], tracks.values())
+                self.assertGreaterEqual(event['dur'], 0)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, 'electric-profile.json')
+        tracer.write(path)
+        with open(path) as f:
+            self.assertEqual(len(json.load(f)['traceEvents']), 12)
+        self.assertIn('post-install', tracer.format_summary())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+import state
+import validation
+from state import StateStore
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.store = StateStore(os.path.join(directory, 'state.db'))
+        patcher = mock.patch.object(state, 'state', self.store)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.store.close)
+
+        patcher = mock.patch('validation.get_local_index', return_value={'git', 'atom'})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = []
+
+    def exists(self, kind: str, name: str) -> bool:
+        self.calls.append((kind, name))
+        if name == 'offline':
+            raise ConnectionError('Connection refused')
+        return not name.startswith('missing')
+
+    def test_reports_every_failure(self):
+        checks = [('electric', 'git'), ('electric', 'missing-app'), ('pip', 'requests'),
+                  ('pip', 'missing-module'), ('node', 'offline')]
+        with mock.patch('validation.exists', side_effect=self.exists):
+            failures = validation.validate(checks)
+
+        self.assertEqual([(kind, name) for kind, name, _ in failures],
+                         [('electric', 'missing-app'), ('pip', 'missing-module'), ('node', 'offline')])
+        self.assertIn('Connection refused', failures[2][2])
+        # Electric packages are looked up in the local package list
+        self.assertEqual(sorted(self.calls), [('node', 'offline'), ('pip', 'missing-module'), ('pip', 'requests')])
+
+    def test_results_are_cached(self):
+        checks = [('pip', 'requests'), ('vscode', 'missing.extension')]
+        with mock.patch('validation.exists', side_effect=self.exists):
+            validation.validate(checks)
+            failures = validation.validate(checks)
+            # Names which weren't found are checked again
+            self.assertEqual(self.calls, [('pip', 'requests'), ('vscode', 'missing.extension'),
+                                          ('vscode', 'missing.extension')])
+            self.assertEqual(len(failures), 1)
+
+            # An expired result is checked again
+            validation.validate(checks, ttl=0)
+            self.assertEqual(len(self.calls), 5)
+
+    def test_host_limit(self):
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def get(url, **_):
+            with lock:
+                active.append(url)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.remove(url)
+            response = mock.MagicMock(status_code=200)
+            response.__enter__.return_value = response
+            return response
+
+        session = mock.MagicMock()
+        session.get.side_effect = get
+        with mock.patch('utils.get_session', return_value=session):
+            failures = validation.validate([('pip', f'module-{index}') for index in range(12)])
+
+        self.assertEqual(failures, [])
+        self.assertLessEqual(max(peak), validation.HOST_LIMIT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import io
+import os
+import random
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+import zip_extract
+
+
+def generate_files(count: int) -> dict:
+    rng = random.Random(0)
+    return {f'pkg/dir-{index % 7}/file-{index}.bin': rng.randbytes(rng.randint(0, 20000)) for index in range(count)}
+
+
+def read_tree(directory: str) -> dict:
+    tree = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                tree[os.path.relpath(path, directory).replace(os.sep, '/')] = f.read()
+    return tree
+
+
+class TestZipExtract(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.destination = os.path.join(self.directory, 'out')
+        self.files = generate_files(200)
+
+    def test_partition(self):
+        parts = zip_extract.partition(list(range(10)), 3, lambda _: 1)
+        self.assertEqual(parts, [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]])
+        self.assertEqual(zip_extract.partition([5], 4, lambda size: size), [[5]])
+        self.assertEqual(zip_extract.partition([], 4, lambda size: size), [])
+
+    def test_zip(self):
+        path = os.path.join(self.directory, 'archive.zip')
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(zipfile.ZipInfo('pkg/empty/'), b'')
+            for name, content in self.files.items():
+                zf.writestr(name, content)
+
+        extracted = []
+        with mock.patch('zipfile.ZipFile', wraps=zipfile.ZipFile) as handles:
+            self.assertEqual(zip_extract.extract_zip(path, self.destination, workers=4, progress=extracted.append), 200)
+        # One handle to read the central directory, then one for each worker
+        self.assertEqual(handles.call_count, 5)
+
+        self.assertEqual(len(extracted), 200)
+        self.assertEqual(read_tree(self.destination), self.files)
+        self.assertTrue(os.path.isdir(os.path.join(self.destination, 'pkg', 'empty')))
+
+    @unittest.skipIf(sys.platform == 'win32', 'Symlinks need developer mode')
+    def test_tar(self):
+        path = os.path.join(self.directory, 'archive.tar')
+        with tarfile.open(path, 'w') as tar:
+            for name, content in self.files.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(content)
+                info.mode = 0o755
+                info.mtime = 1600000000
+                tar.addfile(info, io.BytesIO(content))
+            link = tarfile.TarInfo('pkg/current')
+            link.type = tarfile.SYMTYPE
+            link.linkname = 'dir-0'
+            tar.addfile(link)
+            hardlink = tarfile.TarInfo('pkg/copy.bin')
+            hardlink.type = tarfile.LNKTYPE
+            hardlink.linkname = 'pkg/dir-0/file-0.bin'
+            tar.addfile(hardlink)
+
+        self.assertEqual(zip_extract.extract_tar(path, self.destination, workers=4), 202)
+
+        tree = read_tree(self.destination)
+        self.assertEqual({name: tree[name] for name in self.files}, self.files)
+        self.assertEqual(tree['pkg/copy.bin'], self.files['pkg/dir-0/file-0.bin'])
+        self.assertEqual(os.readlink(os.path.join(self.destination, 'pkg', 'current')), 'dir-0')
+        stat = os.stat(os.path.join(self.destination, 'pkg', 'dir-1', 'file-1.bin'))
+        self.assertEqual((stat.st_mtime, stat.st_mode & 0o777), (1600000000, 0o755))
+
+
+if __name__ == "__main__":
+    unittest.main()
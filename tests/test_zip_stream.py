@@ -0,0 +1,161 @@
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+import requests
+import zip_stream
+from zip_stream import StreamError, stream_archive
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks'))
+
+from registry_server import Registry, RegistryServer  # noqa: E402
+
+FILES = {
+    'app/app.exe': os.urandom(300000),
+    'app/lib/core.dll': bytes(200000),
+    'app/README.txt': b'readme',
+}
+
+
+def make_zip() -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr(zipfile.ZipInfo('app/plugins/'), b'')
+        for index, (name, content) in enumerate(FILES.items()):
+            zf.writestr(name, content, zipfile.ZIP_DEFLATED if index % 2 else zipfile.ZIP_STORED)
+    return buffer.getvalue()
+
+
+def make_tar() -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+        for name, content in FILES.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class TestZipStream(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = Registry(packages=1, blob_size=10, archive_files=1)
+        cls.registry.files['/blobs/app.zip'] = make_zip()
+        cls.registry.files['/blobs/app.tar.gz'] = make_tar()
+        cls.server = RegistryServer(cls.registry)
+        cls.server.start()
+        cls.session = requests.Session()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.session.close()
+        cls.server.stop()
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.destination = os.path.join(directory, 'app@1.0.0')
+
+    def assertExtracted(self):
+        for name, content in FILES.items():
+            with open(os.path.join(self.destination, name), 'rb') as f:
+                self.assertEqual(f.read(), content)
+
+    def test_zip_members_are_extracted_in_parallel_spans(self):
+        updates = []
+        with mock.patch.object(zip_stream, 'SPAN_SIZE', 1024):
+            archive = zipfile.ZipFile(io.BytesIO(self.registry.files['/blobs/app.zip']))
+            spans = zip_stream.get_spans([member for member in archive.infolist() if not member.is_dir()], archive.start_dir)
+            # The compressed zeros and the readme are small enough to share a span
+            self.assertEqual([len(members) for _, _, members in spans], [1, 2])
+            self.assertEqual(spans[-1][1], archive.start_dir)
+            result = stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, session=self.session,
+                                    progress=lambda downloaded, total: updates.append((downloaded, total)))
+
+        self.assertExtracted()
+        self.assertTrue(os.path.isdir(os.path.join(self.destination, 'app', 'plugins')))
+        self.assertIsNone(result['checksum'])
+        # The central directory isn't counted, only the members
+        self.assertLess(result['downloaded'], len(self.registry.files['/blobs/app.zip']))
+        self.assertEqual(updates[-1], (result['downloaded'], len(self.registry.files['/blobs/app.zip'])))
+
+    def test_resolved_members_are_not_downloaded(self):
+        archive = zipfile.ZipFile(io.BytesIO(self.registry.files['/blobs/app.zip']))
+        members = [member for member in archive.infolist() if not member.is_dir()]
+        spans = zip_stream.get_spans(members, archive.start_dir, skip={'app/lib/core.dll'})
+        self.assertEqual([[member.filename for member in span_members] for _, _, span_members in spans],
+                         [['app/app.exe'], ['app/README.txt']])
+        self.assertEqual(spans[0][1], archive.getinfo('app/lib/core.dll').header_offset)
+
+        def resolve(member, directory):
+            if member.filename != 'app/app.exe':
+                return False
+            with open(os.path.join(directory, 'app', 'app.exe'), 'wb') as f:
+                f.write(FILES['app/app.exe'])
+            return True
+
+        result = stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, session=self.session,
+                                resolve=resolve)
+        self.assertExtracted()
+        # The resolved member isn't part of any range which is requested
+        self.assertLessEqual(result['downloaded'], archive.start_dir - archive.getinfo('app/app.exe').compress_size)
+
+        # The checksum still covers the whole archive, the resolved member is read but never written
+        result = stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, checksum=True,
+                                session=self.session, resolve=resolve)
+        self.assertExtracted()
+        self.assertEqual(result['checksum'], hashlib.sha256(self.registry.files['/blobs/app.zip']).hexdigest().upper())
+
+    def test_zip_checksum(self):
+        result = stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, checksum=True, session=self.session)
+        self.assertExtracted()
+        self.assertEqual(result['checksum'], hashlib.sha256(self.registry.files['/blobs/app.zip']).hexdigest().upper())
+
+    def test_tar_is_extracted_as_it_arrives(self):
+        result = stream_archive(f'{self.server.url}/blobs/app.tar.gz', '.tar.gz', self.destination, checksum=True, session=self.session)
+        self.assertExtracted()
+        self.assertEqual(result['checksum'], hashlib.sha256(self.registry.files['/blobs/app.tar.gz']).hexdigest().upper())
+
+    def test_server_without_ranges(self):
+        server = RegistryServer(self.registry, ranges=False)
+        server.start()
+        self.addCleanup(server.stop)
+
+        with self.assertRaises(StreamError):
+            stream_archive(f'{server.url}/blobs/app.zip', '.zip', self.destination, session=self.session)
+        self.assertFalse(os.path.exists(self.destination))
+
+    def test_broken_download_leaves_nothing(self):
+        with mock.patch.object(zip_stream, 'extract_members', side_effect=EOFError):
+            with self.assertRaises(StreamError):
+                stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, session=self.session)
+        self.assertEqual(os.listdir(os.path.dirname(self.destination)), [])
+
+    def test_existing_install_is_only_replaced_once_extracted(self):
+        os.makedirs(os.path.join(self.destination, 'app'))
+        with open(os.path.join(self.destination, 'app', 'app.exe'), 'wb') as f:
+            f.write(b'installed')
+
+        with mock.patch.object(zip_stream, 'extract_members', side_effect=requests.ConnectionError):
+            with self.assertRaises(StreamError):
+                stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, session=self.session)
+        result = stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, checksum=True,
+                                session=self.session, accept=lambda result: False)
+        self.assertFalse(result['accepted'])
+        with open(os.path.join(self.destination, 'app', 'app.exe'), 'rb') as f:
+            self.assertEqual(f.read(), b'installed')
+
+        stream_archive(f'{self.server.url}/blobs/app.zip', '.zip', self.destination, session=self.session)
+        self.assertExtracted()
+        self.assertEqual(os.listdir(os.path.dirname(self.destination)), ['app@1.0.0'])
+
+
+if __name__ == "__main__":
+    unittest.main()
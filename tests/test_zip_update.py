@@ -0,0 +1,117 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import zip_update
+from Classes.PortablePacket import PortablePacket
+
+RES = {
+    'display-name': 'Portable App',
+    'package-name': 'portable-app',
+    'latest-version': '1.10.0',
+    'portable': {
+        'latest-version': '1.10.0',
+        '1.10.0': {'url': 'https://example.com/1.10.0.zip', 'file-type': '.zip', 'chdir': 'app-<version>', 'persist': ['data', 'settings.json']},
+        '1.9.0': {'url': 'https://example.com/1.9.0.zip', 'file-type': '.zip', 'chdir': 'app-<version>', 'persist': ['data', 'settings.json']},
+    },
+}
+
+
+def write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def read(path: str) -> str:
+    with open(path, 'r') as f:
+        return f.read()
+
+
+class TestZipUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.old = PortablePacket(zip_update.get_portable_data(RES, '1.9.0'))
+        self.new = PortablePacket(zip_update.get_portable_data(RES, '1.10.0'))
+
+    def test_find_installed_version(self):
+        self.assertIsNone(zip_update.find_installed_version('portable-app', self.directory))
+        for name in ['portable-app@1.9.0', 'portable-app@1.10.0', 'portable-app-extra@2.0.0']:
+            os.makedirs(os.path.join(self.directory, name))
+        write(os.path.join(self.directory, 'portable-app@3.0.0.zip'), '')
+
+        self.assertEqual(zip_update.find_installed_version('portable-app', self.directory), '1.10.0')
+
+    def test_persisted_paths_are_moved(self):
+        old_directory = zip_update.get_install_directory(self.old, self.directory)
+        self.assertTrue(old_directory.endswith(os.path.join('portable-app@1.9.0', 'app-1.9.0')))
+        write(os.path.join(old_directory, 'data', 'cache', 'blob'), 'cached')
+        write(os.path.join(old_directory, 'settings.json'), '{"theme": "dark"}')
+        inode = os.stat(os.path.join(old_directory, 'data', 'cache', 'blob')).st_ino
+
+        # The new version ships its own defaults, which the persisted data replaces
+        new_directory = zip_update.get_install_directory(self.new, self.directory)
+        write(os.path.join(new_directory, 'settings.json'), '{}')
+        self.assertEqual(zip_update.move_persisted(self.old, self.new, self.directory), ['data', 'settings.json'])
+
+        blob = os.path.join(new_directory, 'data', 'cache', 'blob')
+        self.assertEqual(read(blob), 'cached')
+        self.assertEqual(read(os.path.join(new_directory, 'settings.json')), '{"theme": "dark"}')
+        # Renamed rather than copied
+        self.assertEqual(os.stat(blob).st_ino, inode)
+        self.assertFalse(os.path.exists(os.path.join(old_directory, 'data')))
+
+    def test_failed_move_is_undone(self):
+        old_directory = zip_update.get_install_directory(self.old, self.directory)
+        write(os.path.join(old_directory, 'data', 'profile'), 'profile')
+        write(os.path.join(old_directory, 'settings.json'), '{"theme": "dark"}')
+        move_tree = zip_update.move_tree
+
+        def locked(source, destination):
+            if source.endswith('settings.json'):
+                raise PermissionError(errno.EACCES, 'Permission denied', source)
+            return move_tree(source, destination)
+
+        with mock.patch('zip_update.move_tree', side_effect=locked):
+            with self.assertRaises(OSError) as context:
+                zip_update.move_persisted(self.old, self.new, self.directory)
+        self.assertEqual(context.exception.filename, os.path.join(old_directory, 'settings.json'))
+        self.assertEqual(read(os.path.join(old_directory, 'data', 'profile')), 'profile')
+
+    def test_failed_switch_is_undone(self):
+        old_directory = zip_update.get_install_directory(self.old, self.directory)
+        write(os.path.join(old_directory, 'data', 'profile'), 'profile')
+        os.makedirs(zip_update.get_install_directory(self.new, self.directory))
+
+        with mock.patch('zip_versions.activate', side_effect=OSError(errno.EACCES, 'Permission denied')):
+            with self.assertRaises(OSError):
+                zip_update.switch_version(self.old, self.new, self.directory)
+        self.assertEqual(read(os.path.join(old_directory, 'data', 'profile')), 'profile')
+
+        with mock.patch('zip_versions.activate', return_value=[]):
+            self.assertEqual(zip_update.switch_version(self.old, self.new, self.directory), (['data'], []))
+        self.assertFalse(os.path.exists(os.path.join(old_directory, 'data')))
+
+    def test_version_packet(self):
+        self.assertEqual(zip_update.get_version_packet(RES, '1.9.0').url, 'https://example.com/1.9.0.zip')
+        unpublished = zip_update.get_version_packet(RES, '1.8.0')
+        self.assertEqual((unpublished.latest_version, unpublished.chdir), ('1.8.0', 'app-<version>'))
+
+    def test_move_across_volumes(self):
+        source = os.path.join(self.directory, 'source')
+        write(os.path.join(source, 'profile', 'prefs'), 'prefs')
+        destination = os.path.join(self.directory, 'other', 'destination')
+
+        with mock.patch('os.rename', side_effect=OSError(errno.EXDEV, 'Invalid cross-device link')):
+            self.assertTrue(zip_update.move_tree(source, destination))
+
+        self.assertEqual(read(os.path.join(destination, 'profile', 'prefs')), 'prefs')
+        self.assertFalse(os.path.exists(source))
+
+
+if __name__ == "__main__":
+    unittest.main()
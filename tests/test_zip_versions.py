@@ -0,0 +1,94 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+import object_store
+import zip_update
+import zip_versions
+from Classes.PortablePacket import PortablePacket
+from object_store import ObjectStore
+from state import StateStore
+
+
+def get_packet(version: str) -> PortablePacket:
+    return PortablePacket({
+        'display-name': 'Portable App',
+        'package-name': 'portable-app',
+        'latest-version': version,
+        'url': f'https://example.com/{version}.zip',
+        'file-type': '.zip',
+        'chdir': 'app-<version>',
+        'bin': ['bin\\app.exe', {'file-name': 'tools\\helper-<version>.cmd', 'shim-name': 'app-helper'}],
+    })
+
+
+@unittest.skipIf(sys.platform == 'win32', 'Links are junctions on Windows')
+class TestZipVersions(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        state = StateStore(os.path.join(self.directory, 'state.db'))
+        self.addCleanup(state.close)
+        patcher = mock.patch.object(object_store, 'store', ObjectStore(os.path.join(self.directory, '.store'), state))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def install(self, version: str) -> PortablePacket:
+        packet = get_packet(version)
+        os.makedirs(os.path.join(zip_update.get_install_directory(packet, self.directory), 'bin'))
+        return packet
+
+    def read_shim(self, name: str) -> str:
+        with open(os.path.join(self.directory, 'shims', f'{name}.bat')) as f:
+            return f.read()
+
+    def test_shims(self):
+        shims = zip_versions.get_shims(get_packet('1.0.0'), 'root')
+        self.assertEqual(shims, [
+            ('app', os.path.join('root', 'bin', 'app.exe')),
+            ('app-helper', os.path.join('root', 'tools', 'helper-1.0.0.cmd')),
+        ])
+
+    def test_activate_switches_current(self):
+        zip_versions.activate(self.install('1.0.0'), self.directory)
+        self.assertEqual(zip_versions.get_current_version('portable-app', self.directory), '1.0.0')
+
+        zip_versions.activate(self.install('1.1.0'), self.directory)
+        self.assertEqual(zip_versions.get_current_version('portable-app', self.directory), '1.1.0')
+        # Shims run the package through the link, so the switch is all that changes the version they start
+        self.assertIn(os.path.join('portable-app@current', 'app-1.1.0', 'bin', 'app.exe'), self.read_shim('app'))
+        self.assertEqual(os.path.realpath(zip_versions.get_current_directory(get_packet('1.1.0'), self.directory)),
+                         os.path.realpath(zip_update.get_install_directory(get_packet('1.1.0'), self.directory)))
+
+        # Only versions are listed, not the link or what is left of an interrupted switch
+        self.assertEqual(zip_versions.get_installed_versions('portable-app', self.directory), ['1.0.0', '1.1.0'])
+        self.assertEqual(sorted(os.listdir(self.directory)),
+                         ['.store', 'portable-app@1.0.0', 'portable-app@1.1.0', 'portable-app@current', 'shims', 'state.db'])
+        self.assertEqual(zip_update.find_installed_version('portable-app', self.directory), '1.1.0')
+
+    def test_prune_keeps_newest_versions(self):
+        for version in ['1.0.0', '1.1.0', '1.9.0', '1.10.0']:
+            zip_versions.activate(self.install(version), self.directory)
+        zip_versions.activate(get_packet('1.1.0'), self.directory)
+
+        self.assertEqual(zip_versions.prune_versions('portable-app', 2, self.directory), ['1.0.0'])
+        self.assertEqual(zip_versions.get_installed_versions('portable-app', self.directory), ['1.1.0', '1.9.0', '1.10.0'])
+
+        # The active version is never deleted
+        self.assertEqual(zip_versions.prune_versions('portable-app', 0, self.directory), ['1.9.0', '1.10.0'])
+        self.assertEqual(zip_versions.get_installed_versions('portable-app', self.directory), ['1.1.0'])
+
+    def test_previous_version(self):
+        self.assertIsNone(zip_versions.get_previous_version('portable-app', self.directory))
+        for version in ['1.9.0', '1.10.0', '2.0.0']:
+            zip_versions.activate(self.install(version), self.directory)
+        zip_versions.activate(get_packet('1.10.0'), self.directory)
+
+        self.assertEqual(zip_versions.get_previous_version('portable-app', self.directory), '1.9.0')
+
+
+if __name__ == "__main__":
+    unittest.main()